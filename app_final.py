@@ -15,8 +15,11 @@ import shutil
 
 # Import des modules de l'application
 from lib.database import CardRepo, ensure_db
-from lib.config import DB_FILE, APP_TITLE, load_settings
+from lib.db_connection import close_all_connections
+from lib.config import DB_FILE, APP_TITLE, RARITY_VALUES, load_settings
 from lib.utils import write_bat_scripts
+from lib.lua_chunks import CHUNK_GROUPINGS
+from lib.lua_compact import LUA_PROFILES
 from lib.tests import run_tests
 from lib.ui_components import CardForm, CardList
 from lib.settings_window import SettingsWindow
@@ -342,6 +345,7 @@ class FinalMainApp(tk.Tk):
             error_count = 0
             
             cards = self.repo.list_cards()
+            migrated_cards = []
             
             for card in cards:
                 if not card.img or not os.path.exists(card.img):
@@ -355,13 +359,15 @@ class FinalMainApp(tk.Tk):
                 new_path = copy_image_to_originals(card.img, card.name)
                 
                 if new_path:
-                    # Mettre à jour en base
                     card.img = new_path.replace('\\', '/')
-                    self.repo.update(card)
+                    migrated_cards.append(card)
                     migrated_count += 1
                 else:
                     error_count += 1
             
+            # Mettre à jour la base en une seule transaction
+            self.repo.update_many(migrated_cards)
+            
             # Actualiser l'interface
             self.refresh_all_tabs()
             
@@ -613,12 +619,69 @@ Vérifiez manuellement les fichiers si nécessaire."""
         except Exception as e:
             messagebox.showerror("Erreur", f"Erreur lors du lancement de la démonstration :\n{e}")
 
+def run_template_fusion(args) -> int:
+    """Régénère les images fusionnées de toutes les cartes (commande sans interface)."""
+    from lib.card_fusion import TemplateFusionEngine
+    
+    db_path = default_db_path()
+    ensure_db(db_path)
+    load_settings()
+    try:
+        engine = TemplateFusionEngine(CardRepo(db_path), workers=args.workers)
+        report = engine.run(args.rarity, force=args.force,
+                            progress=lambda done, total, name: log_info(f"[{done}/{total}] {name}"))
+    finally:
+        close_all_connections()
+    
+    log_success(f"✅ {report.summary()}")
+    for error in report.errors:
+        log_error(f"❌ {error['name']} : {error['error']}")
+    return 1 if report.errors else 0
+
+def run_lua_export(args) -> int:
+    """Exporte les données Lua Love2D dans un dossier (commande sans interface)."""
+    from lib.lua_exporter_love2d import Love2DLuaExporter
+    
+    db_path = default_db_path()
+    ensure_db(db_path)
+    load_settings()
+    os.makedirs(args.export_lua, exist_ok=True)
+    try:
+        exporter = Love2DLuaExporter(CardRepo(db_path), profile=args.lua_profile)
+        if args.chunk_size:
+            chunks = exporter.export_chunked_to_dir(args.export_lua, args.group_by, args.chunk_size)
+            count = chunks[-1].last if chunks else 0
+            log_success(f"✅ {count} cartes en {len(chunks)} morceaux → {args.export_lua} "
+                        f"(cards_index.lua, cards_data.lua)")
+        else:
+            size = exporter.export_to_file(os.path.join(args.export_lua, "cards_data.lua"))
+            log_success(f"✅ cards_data.lua : {size:,} caractères → {args.export_lua}")
+    finally:
+        close_all_connections()
+    return 0
+
 def main(argv=None):
     """Point d'entrée principal de l'application."""
     parser = argparse.ArgumentParser(description=APP_TITLE)
     parser.add_argument('--test', action='store_true', help='Exécuter la suite de tests et quitter')
     parser.add_argument('--write-bats', action='store_true', 
                        help='Générer run.bat et build.bat dans le dossier du script')
+    parser.add_argument('--fuse-templates', action='store_true',
+                       help='Régénérer les images fusionnées carte + template (sans interface) et quitter')
+    parser.add_argument('--rarity', action='append', choices=RARITY_VALUES,
+                       help='Avec --fuse-templates : rareté à traiter (répétable, défaut : toutes)')
+    parser.add_argument('--force', action='store_true',
+                       help='Avec --fuse-templates : régénérer aussi les images inchangées')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Avec --fuse-templates : nombre de processus de fusion')
+    parser.add_argument('--export-lua', metavar='DOSSIER',
+                       help='Exporter les données Lua Love2D dans DOSSIER (sans interface) et quitter')
+    parser.add_argument('--chunk-size', type=int, default=None,
+                       help='Avec --export-lua : découper en modules de N cartes chargés à la demande')
+    parser.add_argument('--group-by', choices=CHUNK_GROUPINGS, default='id',
+                       help='Avec --chunk-size : regroupement des morceaux (défaut : id)')
+    parser.add_argument('--lua-profile', choices=LUA_PROFILES, default='verbose',
+                       help='Avec --export-lua : verbose (commenté) ou compact (valeurs par défaut partagées)')
     args = parser.parse_args(argv)
 
     if args.test:
@@ -631,6 +694,12 @@ def main(argv=None):
         log_info(f"Scripts générés : {paths}")
         sys.exit(0)
 
+    if args.fuse_templates:
+        sys.exit(run_template_fusion(args))
+
+    if args.export_lua:
+        sys.exit(run_lua_export(args))
+
     # Initialisation et vérification de la base de données
     setup_logging()
     log_info("🚀 Démarrage de l'éditeur de cartes Love2D...")
@@ -692,6 +761,12 @@ def main(argv=None):
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        # Fermer proprement les connexions SQLite (checkpoint du journal WAL)
+        close_all_connections()
 
 if __name__ == '__main__':
+    # Nécessaire pour le rendu d'images multi-processus dans l'exécutable Windows
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()
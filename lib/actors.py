@@ -6,11 +6,32 @@
 Ce module gère la transition du système binaire IA/Joueur 
 vers un système flexible d'acteurs personnalisés.
 """
-import sqlite3
+import itertools
+import json
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 
+try:
+    from .db_connection import get_connection_manager
+except ImportError:
+    from db_connection import get_connection_manager
+
+# Ordres de tri acceptés par get_actor_cards / get_cards_by_actor
+CARD_ORDERINGS = {
+    'id': "c.id",
+    'name': "c.name COLLATE NOCASE, c.id",
+    'rarity': "c.rarity_rank, c.updated_at DESC, c.id DESC",
+    'updated': "c.updated_at DESC, c.id DESC",
+}
+
+
+def _as_id_list(ids) -> List[int]:
+    """Normalise un ID ou un itérable d'IDs en liste d'entiers."""
+    if isinstance(ids, int):
+        return [ids]
+    return [int(i) for i in ids if i is not None]
+
 
 class ActorManager:
     """Gestionnaire des acteurs et de leurs liaisons avec les cartes."""
@@ -23,12 +44,13 @@ class ActorManager:
             db_path: Chemin vers la base de données SQLite
         """
         self.db_path = db_path
+        self.db = get_connection_manager(db_path)
         self.ensure_actors_table()
         self.migrate_legacy_data()
     
     def ensure_actors_table(self):
         """Crée les tables nécessaires pour les acteurs si elles n'existent pas."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.db.transaction() as conn:
             # Table des acteurs
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS actors (
@@ -59,14 +81,12 @@ class ActorManager:
             # Index pour optimiser les requêtes
             conn.execute("CREATE INDEX IF NOT EXISTS idx_card_actors_card_id ON card_actors(card_id)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_card_actors_actor_id ON card_actors(actor_id)")
-            
-            conn.commit()
+            # Index couvrant pour get_actor_cards (acteur → cartes sans accès à la table)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_card_actors_actor_card ON card_actors(actor_id, card_id)")
     
     def migrate_legacy_data(self):
         """Migre les données de l'ancien système IA/Joueur vers les acteurs."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            
+        with self.db.transaction() as conn:
             # Vérifier si des acteurs par défaut existent déjà
             cursor = conn.execute("SELECT COUNT(*) as count FROM actors")
             if cursor.fetchone()['count'] > 0:
@@ -106,14 +126,11 @@ class ActorManager:
                     INSERT OR IGNORE INTO card_actors (card_id, actor_id, created_at)
                     VALUES (?, ?, ?)
                 """, (card['id'], target_actor_id, now))
-            
-            conn.commit()
             print(f"✅ Migration réussie : {len(default_actors)} acteurs créés, {len(cards)} cartes migrées")
 
     def list_actors(self):
         """Liste tous les acteurs actifs."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self.db.read() as conn:
             cursor = conn.execute("""
                 SELECT * FROM actors 
                 WHERE is_active = 1 
@@ -124,7 +141,7 @@ class ActorManager:
     def create_actor(self, name: str, description: str = '', color: str = '#2196F3', icon: str = '🎭'):
         """Crée un nouvel acteur."""
         now = datetime.utcnow().isoformat()
-        with sqlite3.connect(self.db_path) as conn:
+        with self.db.transaction() as conn:
             cursor = conn.execute("""
                 INSERT INTO actors (name, description, color, icon, created_at, updated_at)
                 VALUES (?, ?, ?, ?, ?, ?)
@@ -134,7 +151,7 @@ class ActorManager:
     def delete_actor(self, actor_id: int):
         """Supprime un acteur (désactive)."""
         now = datetime.utcnow().isoformat()
-        with sqlite3.connect(self.db_path) as conn:
+        with self.db.transaction() as conn:
             # Marquer comme inactif au lieu de supprimer physiquement
             conn.execute("""
                 UPDATE actors 
@@ -144,7 +161,6 @@ class ActorManager:
             
             # Supprimer les liaisons avec les cartes
             conn.execute("DELETE FROM card_actors WHERE actor_id = ?", (actor_id,))
-            conn.commit()
 
     def update_actor(self, actor_id: int, name: str = None, description: str = None, 
                     color: str = None, icon: str = None):
@@ -171,41 +187,83 @@ class ActorManager:
             params.append(now)
             params.append(actor_id)
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self.db.transaction() as conn:
                 query = f"UPDATE actors SET {', '.join(updates)} WHERE id = ?"
                 conn.execute(query, params)
-                conn.commit()
 
-    def get_actor_cards(self, actor_id: int):
-        """Récupère toutes les cartes liées à un acteur."""
-        from .database import CardRepo
-        
-        # Récupérer les IDs des cartes liées à cet acteur
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("""
-                SELECT card_id FROM card_actors
-                WHERE actor_id = ?
-                ORDER BY card_id
-            """, (actor_id,))
-            card_ids = [row[0] for row in cursor.fetchall()]
-        
-        # Récupérer les objets Card complets
-        if not card_ids:
+    def _card_order_clause(self, order_by: str) -> str:
+        try:
+            return CARD_ORDERINGS[order_by]
+        except KeyError:
+            raise ValueError(f"Ordre de tri inconnu : {order_by} (attendu : {', '.join(CARD_ORDERINGS)})")
+
+    def get_actor_cards(self, actor_ids, order_by: str = 'id'):
+        """
+        Récupère les cartes liées à un ou plusieurs acteurs en une seule requête.
+
+        Args:
+            actor_ids: ID d'acteur ou liste d'IDs
+            order_by: Ordre des cartes ('id', 'name', 'rarity' ou 'updated')
+
+        Returns:
+            Liste de Card, sans doublon si une carte est liée à plusieurs acteurs
+        """
+        try:
+            from .database import Card
+        except ImportError:
+            from database import Card
+
+        ids = _as_id_list(actor_ids)
+        if not ids:
             return []
-        
-        repo = CardRepo(self.db_path)
-        cards = []
-        for card_id in card_ids:
-            card = repo.get(card_id)
-            if card:
-                cards.append(card)
-        
-        return cards
+
+        with self.db.read() as conn:
+            cursor = conn.execute(f"""
+                SELECT c.* FROM cards c
+                WHERE c.id IN (
+                    SELECT card_id FROM card_actors
+                    WHERE actor_id IN (SELECT value FROM json_each(?))
+                )
+                ORDER BY {self._card_order_clause(order_by)}
+            """, (json.dumps(ids),))
+            return Card.from_cursor(cursor)
+
+    def get_cards_by_actor(self, actor_ids, order_by: str = 'id') -> Dict[int, List[Any]]:
+        """
+        Récupère les cartes de plusieurs acteurs, regroupées par acteur, en une seule requête.
+
+        Args:
+            actor_ids: Liste d'IDs d'acteurs
+            order_by: Ordre des cartes dans chaque groupe ('id', 'name', 'rarity' ou 'updated')
+
+        Returns:
+            Dictionnaire {actor_id: [Card, ...]} ; chaque acteur demandé est présent
+        """
+        try:
+            from .database import Card
+        except ImportError:
+            from database import Card
+
+        ids = _as_id_list(actor_ids)
+        result: Dict[int, List[Any]] = {actor_id: [] for actor_id in ids}
+        if not ids:
+            return result
+
+        with self.db.read() as conn:
+            cursor = conn.execute(f"""
+                SELECT ca.actor_id AS link_actor_id, c.* FROM card_actors ca
+                JOIN cards c ON c.id = ca.card_id
+                WHERE ca.actor_id IN (SELECT value FROM json_each(?))
+                ORDER BY ca.actor_id, {self._card_order_clause(order_by)}
+            """, (json.dumps(ids),))
+            decode = Card.row_decoder([d[0] for d in cursor.description])
+            for row in cursor:
+                result[row['link_actor_id']].append(decode(row))
+        return result
 
     def get_card_actors(self, card_id: int):
         """Récupère tous les acteurs liés à une carte."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self.db.read() as conn:
             cursor = conn.execute("""
                 SELECT a.* FROM actors a
                 JOIN card_actors ca ON a.id = ca.actor_id
@@ -214,29 +272,56 @@ class ActorManager:
             """, (card_id,))
             return cursor.fetchall()
 
+    def get_actors_for_cards(self, card_ids) -> Dict[int, List[Any]]:
+        """
+        Récupère les acteurs de plusieurs cartes en une seule requête.
+
+        Args:
+            card_ids: Identifiants des cartes
+
+        Returns:
+            Dictionnaire {card_id: [acteurs triés par nom]} ; chaque carte
+            demandée est présente, avec une liste vide si elle n'a pas d'acteur
+        """
+        ids = _as_id_list(card_ids)
+        result: Dict[int, List[Any]] = {card_id: [] for card_id in ids}
+        if not ids:
+            return result
+
+        # Les ids sont passés en un seul paramètre JSON pour éviter la limite
+        # du nombre de variables SQLite sur les gros projets
+        with self.db.read() as conn:
+            cursor = conn.execute("""
+                SELECT ca.card_id AS card_id, a.* FROM card_actors ca
+                JOIN actors a ON a.id = ca.actor_id
+                WHERE ca.card_id IN (SELECT value FROM json_each(?))
+                  AND a.is_active = 1
+                ORDER BY ca.card_id, a.name
+            """, (json.dumps(ids),))
+            for row in cursor:
+                result[row['card_id']].append(row)
+        return result
+
     def link_card_to_actor(self, card_id: int, actor_id: int):
         """Lie une carte à un acteur."""
         now = datetime.utcnow().isoformat()
-        with sqlite3.connect(self.db_path) as conn:
+        with self.db.transaction() as conn:
             conn.execute("""
                 INSERT OR IGNORE INTO card_actors (card_id, actor_id, created_at)
                 VALUES (?, ?, ?)
             """, (card_id, actor_id, now))
-            conn.commit()
 
     def unlink_card_from_actor(self, card_id: int, actor_id: int):
         """Retire le lien entre une carte et un acteur."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.db.transaction() as conn:
             conn.execute("""
                 DELETE FROM card_actors 
                 WHERE card_id = ? AND actor_id = ?
             """, (card_id, actor_id))
-            conn.commit()
 
     def get_actor_by_id(self, actor_id: int) -> Optional[Dict[str, Any]]:
         """Récupère un acteur par son ID."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self.db.read() as conn:
             cursor = conn.execute("""
                 SELECT * FROM actors 
                 WHERE id = ? AND is_active = 1
@@ -246,9 +331,7 @@ class ActorManager:
 
     def get_actors_stats(self) -> Dict[str, Any]:
         """Récupère des statistiques sur les acteurs."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            
+        with self.db.read() as conn:
             # Nombre total d'acteurs
             cursor = conn.execute("SELECT COUNT(*) as count FROM actors WHERE is_active = 1")
             total_actors = cursor.fetchone()['count']
@@ -272,28 +355,38 @@ class ActorManager:
 
 def generate_lua_content(cards):
     """Génère le contenu Lua pour une liste de cartes."""
-    if not cards:
-        return "-- Aucune carte disponible\nlocal cards = {}\nreturn cards"
+    return "".join(iter_lua_content(cards))
+
+
+def iter_lua_content(cards):
+    """
+    Produit le contenu Lua de generate_lua_content morceau par morceau.
     
-    lua_content = []
-    lua_content.append("-- Cartes générées automatiquement")
-    lua_content.append("local cards = {")
+    Accepte n'importe quel itérable de cartes ; une seule carte est mise en
+    forme à la fois.
+    """
+    cards = iter(cards or ())
+    first = next(cards, None)
+    if first is None:
+        yield "-- Aucune carte disponible\nlocal cards = {}\nreturn cards"
+        return
     
-    for i, card in enumerate(cards, 1):
-        lua_content.append(f"    -- Carte {i}: {card.name}")
-        lua_content.append("    {")
-        lua_content.append(f'        name = "{card.name}",')
-        lua_content.append(f'        description = "{card.description}",')
-        lua_content.append(f'        rarity = "{card.rarity}",')
-        lua_content.append(f'        powerblow = {card.powerblow},')
-        types_str = ", ".join(f'"{t}"' for t in card.types)
-        lua_content.append(f'        types = {{{types_str}}},')
-        lua_content.append("    },")
+    yield "-- Cartes générées automatiquement\nlocal cards = {"
     
-    lua_content.append("}")
-    lua_content.append("return cards")
+    for i, card in enumerate(itertools.chain((first,), cards), 1):
+        types_str = ", ".join(f'"{t}"' for t in card.types)
+        yield (
+            f"\n    -- Carte {i}: {card.name}"
+            "\n    {"
+            f'\n        name = "{card.name}",'
+            f'\n        description = "{card.description}",'
+            f'\n        rarity = "{card.rarity}",'
+            f'\n        powerblow = {card.powerblow},'
+            f'\n        types = {{{types_str}}},'
+            "\n    },"
+        )
     
-    return "\n".join(lua_content)
+    yield "\n}\nreturn cards"
 
 
 def export_lua_for_actor(card_repo, actor_manager: ActorManager, actor_id: int, filename: str = None):
@@ -325,14 +418,14 @@ def export_lua_for_actor(card_repo, actor_manager: ActorManager, actor_id: int,
             
             def get_cards_for_side(self, side):
                 # Récupérer seulement les cartes de cet acteur
-                actor_cards = self.actor_manager.get_actor_cards(self.target_actor_id)
-                return actor_cards
+                return cards
+        
+        cards = actor_manager.get_actor_cards(actor_id)
         
         # Utiliser le nouvel exporteur
         exporter = ActorLuaExporter(card_repo, actor_id)
         exporter.export_to_file(filename)
         
-        cards = actor_manager.get_actor_cards(actor_id)
         print(f"✅ Export Love2D {actor['icon']} {actor['name']} : {len(cards)} cartes → {filename}")
         print(f"🎯 AVEC TextFormatting et dimensions Love2D")
         
@@ -374,44 +467,51 @@ def export_all_actors_lua(card_repo, actor_manager: ActorManager, filename: str
     if not actors:
         raise ValueError("Aucun acteur trouvé")
     
-    # Collecter toutes les cartes organisées par acteur
-    all_sections = []
-    total_cards = 0
+    # Cartes de tous les acteurs en une seule requête
+    cards_by_actor = actor_manager.get_cards_by_actor([actor['id'] for actor in actors])
+    sections = [(actor, cards_by_actor[actor['id']]) for actor in actors if cards_by_actor[actor['id']]]
     
-    for actor in actors:
-        cards = actor_manager.get_actor_cards(actor['id'])
-        if cards:
-            # Créer une section pour cet acteur
-            section_comment = f"    --[[ ACTEUR: {actor['icon']} {actor['name']} - {len(cards)} cartes ]]"
-            card_contents = []
-            
-            for i, card in enumerate(cards, start=1):
-                card_lua = build_card_lua_content(card)
-                card_contents.append(f"    --[[ CARTE {i} ]]\n{card_lua}")
-            
-            if card_contents:
-                all_sections.append(f"{section_comment}\n" + ",\n\n".join(card_contents))
-                total_cards += len(cards)
-    
-    if not all_sections:
+    if not sections:
         raise ValueError("Aucune carte trouvée pour aucun acteur")
     
-    # Assembler le contenu final
-    content = "local Cards = {\n\n"
-    content += ",\n\n".join(all_sections)
-    content += "\n\n}\n\nreturn Cards\n"
-    
-    # Écrire le fichier
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write(content)
+    # Écrire le fichier au fur et à mesure, une carte à la fois
+    try:
+        from .lua_export import write_lua_file
+    except ImportError:
+        from lua_export import write_lua_file
+    write_lua_file(filename, iter_actor_sections_lua(sections))
     
+    total_cards = sum(len(cards) for _, cards in sections)
     print(f"📤 Export de tous les acteurs : {len(actors)} acteurs, {total_cards} cartes → {filename}")
     return filename
 
 
+def iter_actor_sections_lua(sections):
+    """
+    Produit le fichier Lua multi-acteurs morceau par morceau.
+    
+    Args:
+        sections: Liste de (acteur, cartes) des acteurs ayant des cartes
+    """
+    yield "local Cards = {\n\n"
+    for index, (actor, cards) in enumerate(sections):
+        if index:
+            yield ",\n\n"
+        # Une section par acteur
+        yield f"    --[[ ACTEUR: {actor['icon']} {actor['name']} - {len(cards)} cartes ]]\n"
+        for i, card in enumerate(cards, start=1):
+            if i > 1:
+                yield ",\n\n"
+            yield f"    --[[ CARTE {i} ]]\n{build_card_lua_content(card)}"
+    yield "\n\n}\n\nreturn Cards\n"
+
+
 def build_card_lua_content(card):
     """Construit le contenu Lua pour une carte individuelle."""
-    from .lua_export import build_card_lua
+    try:
+        from .lua_export import build_card_lua
+    except ImportError:
+        from lua_export import build_card_lua
     return build_card_lua(card)
 
 
@@ -436,8 +536,11 @@ def demo_actors_system():
     
     # Test d'export pour chaque acteur ayant des cartes
     print(f"\n📤 Test d'export pour chaque acteur :")
+    # Cartes de tous les acteurs en une seule requête
+    cards_by_actor = actor_manager.get_cards_by_actor([actor['id'] for actor in actors])
+    
     for actor in actors:
-        cards = actor_manager.get_actor_cards(actor['id'])
+        cards = cards_by_actor[actor['id']]
         if cards:
             try:
                 filename = export_lua_for_actor(repo, actor_manager, actor['id'])
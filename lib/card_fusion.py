@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🎨 FUSION DES CARTES AVEC LES TEMPLATES DE RARETÉ
+=================================================
+
+Moteur de régénération en lot des images fusionnées (images/cards/) :
+- chaque template est décodé une seule fois (cache par chemin et date de modification)
+- les cartes sont fusionnées en parallèle dans des processus de travail
+- les cartes dont les fichiers sources n'ont pas changé sont ignorées
+- débit (cartes/s) rapporté en fin de traitement
+
+Utilisable en ligne de commande : python app_final.py --fuse-templates
+"""
+import io
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from PIL import Image, ImageFile
+
+try:
+    from .config import APP_SETTINGS
+    from .render_cache import RenderCache, get_render_cache, render_key, file_signature
+    from .utils import ensure_images_subfolders, sanitize_filename
+except ImportError:
+    from config import APP_SETTINGS
+    from render_cache import RenderCache, get_render_cache, render_key, file_signature
+    from utils import ensure_images_subfolders, sanitize_filename
+
+# En dessous de ce nombre de cartes, la fusion reste dans le processus courant
+PARALLEL_FUSION_MIN_CARDS = 8
+
+# Fichier (dans images/cards/) mémorisant la clé des entrées de chaque image produite
+FUSION_MANIFEST = ".fusion_manifest.json"
+
+
+# Nombre de templates décodés gardés en mémoire (un par rareté en pratique)
+TEMPLATE_CACHE_SIZE = 8
+
+# Couleur de fond sous les zones transparentes de l'image de carte
+BACKGROUND_COLOR = (255, 255, 255)
+
+
+class FusionTemplate:
+    """Template de rareté décodé une fois : couleurs RGB et masque alpha pré-séparés."""
+
+    def __init__(self, path: str, image: Image.Image, signature: Optional[tuple] = None):
+        self.path = path
+        # (date de modification, taille) du fichier au moment du décodage
+        self.signature = signature
+        rgba = image if image.mode == 'RGBA' else image.convert('RGBA')
+        self.rgb = rgba.convert('RGB')
+        self.alpha = rgba.getchannel('A')
+        # Un template sans transparence recouvre entièrement la carte
+        self.has_alpha = self.alpha.getextrema()[0] < 255
+        self.size = rgba.size
+
+    @classmethod
+    def load(cls, path: str, signature: Optional[tuple] = None) -> "FusionTemplate":
+        """Décode un template depuis le disque."""
+        ImageFile.LOAD_TRUNCATED_IMAGES = True  # Permet de charger les images tronquées
+        with Image.open(path) as image:
+            image.load()
+            return cls(path, image, signature)
+
+
+_template_cache: "OrderedDict[str, FusionTemplate]" = OrderedDict()
+_template_cache_lock = threading.Lock()
+
+
+def get_template(path: str) -> FusionTemplate:
+    """
+    Template décodé, mis en cache par (chemin, date de modification).
+
+    Un template modifié sur le disque est automatiquement relu.
+
+    Raises:
+        OSError: si le fichier est absent ou illisible
+    """
+    key = os.path.normcase(os.path.abspath(path))
+    st = os.stat(path)
+    signature = (st.st_mtime_ns, st.st_size)
+    with _template_cache_lock:
+        template = _template_cache.get(key)
+        if template is not None and template.signature == signature:
+            _template_cache.move_to_end(key)
+            return template
+
+    template = FusionTemplate.load(path, signature)
+    with _template_cache_lock:
+        _template_cache[key] = template
+        _template_cache.move_to_end(key)
+        while len(_template_cache) > TEMPLATE_CACHE_SIZE:
+            _template_cache.popitem(last=False)
+    return template
+
+
+def clear_template_cache() -> None:
+    """Oublie les templates décodés."""
+    with _template_cache_lock:
+        _template_cache.clear()
+
+
+def open_card_image(path: str, size: tuple) -> Image.Image:
+    """
+    Décode l'image d'une carte.
+
+    Les JPEG bien plus grands que le template sont décodés directement à
+    une échelle réduite (au moins la taille demandée).
+    """
+    ImageFile.LOAD_TRUNCATED_IMAGES = True  # Permet de charger les images tronquées
+    image = Image.open(path)
+    image.draft('RGB', size)
+    image.load()
+    return image
+
+
+def fuse_images(card_img: Image.Image, template: FusionTemplate) -> Image.Image:
+    """
+    Superpose le template à l'image de la carte redimensionnée.
+
+    Un seul tampon intermédiaire : l'image redimensionnée, sur laquelle le
+    template est collé en place à travers son masque alpha pré-séparé
+    (équivalent à Image.alpha_composite sur un fond opaque).
+
+    Returns:
+        Image RGB fusionnée (fond blanc sous les zones transparentes de la carte)
+    """
+    if card_img.mode in ('RGBA', 'LA', 'PA') or 'transparency' in card_img.info:
+        card_rgba = card_img.convert('RGBA').resize(template.size, Image.Resampling.LANCZOS)
+        base = Image.new('RGB', template.size, BACKGROUND_COLOR)
+        base.paste(card_rgba, (0, 0), card_rgba.getchannel('A'))
+    else:
+        if card_img.mode != 'RGB':
+            card_img = card_img.convert('RGB')
+        base = card_img.resize(template.size, Image.Resampling.LANCZOS)
+    base.paste(template.rgb, (0, 0), template.alpha)
+    return base
+
+
+def fuse_to_png(card_image_path: str, template: FusionTemplate) -> bytes:
+    """Fusionne une image de carte avec un template déjà décodé ; retourne le PNG."""
+    with open_card_image(card_image_path, template.size) as card_img:
+        final_img = fuse_images(card_img, template)
+    buffer = io.BytesIO()
+    final_img.save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def template_for_rarity(rarity: str) -> str:
+    """Template configuré pour une rareté (ou le template par défaut, legacy)."""
+    rarity_templates = APP_SETTINGS.get("rarity_templates", {})
+    return rarity_templates.get(rarity or 'commun', "") or APP_SETTINGS.get("template_image", "")
+
+
+class FusionJob(NamedTuple):
+    """Une image à (re)générer."""
+    card_id: int
+    name: str
+    source: str
+    template: str
+    output: str
+    key: str
+
+
+class FusionReport:
+    """Bilan d'une régénération en lot."""
+
+    def __init__(self):
+        self.total = 0
+        self.fused = 0
+        self.from_cache = 0
+        self.skipped = 0
+        self.ignored = 0
+        self.errors: List[Dict] = []
+        self.updated_cards = 0
+        self.elapsed = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Images produites par seconde."""
+        return self.fused / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        """Résumé lisible du traitement."""
+        return (f"{self.fused} image(s) fusionnée(s) dont {self.from_cache} depuis le cache, "
+                f"{self.skipped} inchangée(s), {self.ignored} sans image originale ou template, "
+                f"{len(self.errors)} erreur(s) en {self.elapsed:.2f}s "
+                f"({self.throughput:.1f} cartes/s)")
+
+
+class TemplateFusionEngine:
+    """Régénère les images fusionnées de toutes les cartes concernées."""
+
+    def __init__(self, repo, workers: Optional[int] = None, cards_dir: Optional[str] = None,
+                 render_cache: Optional[RenderCache] = None, use_render_cache: bool = True):
+        """
+        Args:
+            repo: CardRepo des cartes à traiter
+            workers: Nombre de processus (None = nombre de cœurs, 1 = séquentiel)
+            cards_dir: Dossier des images fusionnées (défaut : images/cards)
+            render_cache: Cache de rendu à utiliser (défaut : cache partagé)
+            use_render_cache: False pour ne jamais lire ni écrire le cache de rendu
+        """
+        self.repo = repo
+        self.workers = workers
+        self.cards_dir = cards_dir or ensure_images_subfolders()['cards']
+        if use_render_cache:
+            self.render_cache = render_cache or get_render_cache()
+        else:
+            self.render_cache = None
+
+    # ----------------------- Manifeste -----------------------
+
+    def manifest_path(self) -> str:
+        return os.path.join(self.cards_dir, FUSION_MANIFEST)
+
+    def load_manifest(self) -> Dict[str, str]:
+        """Clé des entrées de chaque image produite {nom_fichier: clé}."""
+        try:
+            with open(self.manifest_path(), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_manifest(self, manifest: Dict[str, str]) -> None:
+        os.makedirs(self.cards_dir, exist_ok=True)
+        tmp_path = f"{self.manifest_path()}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path())
+
+    # ----------------------- Planification -----------------------
+
+    def plan(self, cards: Iterable, force: bool = False, report: Optional[FusionReport] = None) -> List[FusionJob]:
+        """
+        Liste les images à régénérer.
+
+        Une carte est ignorée si son image existe et que la clé de ses entrées
+        (image originale + template, signatures fichier) n'a pas changé.
+        """
+        report = report or FusionReport()
+        manifest = self.load_manifest()
+        cards_dir = os.path.normcase(os.path.abspath(self.cards_dir))
+        jobs: Dict[str, FusionJob] = {}
+
+        for card in cards:
+            report.total += 1
+            source = getattr(card, 'original_img', '') or card.img
+            template = template_for_rarity(getattr(card, 'rarity', 'commun'))
+            # Sans image originale connue, une image déjà fusionnée ne doit pas être refusionnée
+            if (not source or not template
+                    or os.path.normcase(os.path.dirname(os.path.abspath(source))) == cards_dir):
+                report.ignored += 1
+                continue
+            output_name = f"{sanitize_filename(card.name or 'carte_sans_nom')}.png"
+            output = os.path.join(self.cards_dir, output_name)
+            key = render_key('fusion', file_signature(source), file_signature(template))
+            if not force and manifest.get(output_name) == key and os.path.exists(output):
+                report.skipped += 1
+                continue
+            # Même fichier de sortie : la dernière carte l'emporte (comme un enregistrement manuel)
+            jobs.pop(output_name, None)
+            jobs[output_name] = FusionJob(card.id, card.name, source, template, output, key)
+        return list(jobs.values())
+
+    def _resolve_workers(self, job_count: int) -> int:
+        if job_count < PARALLEL_FUSION_MIN_CARDS:
+            return 1
+        workers = self.workers if self.workers else (os.cpu_count() or 1)
+        return max(1, min(workers, job_count))
+
+    # ----------------------- Exécution -----------------------
+
+    def run(self, rarities: Optional[Iterable[str]] = None, force: bool = False,
+            progress: Optional[Callable[[int, int, str], None]] = None) -> FusionReport:
+        """
+        Régénère les images fusionnées.
+
+        Args:
+            rarities: Raretés à traiter (None = toutes)
+            force: Régénère même les images dont les entrées n'ont pas changé
+            progress: Callback optionnel progress(fait, total, nom_carte)
+
+        Returns:
+            Bilan du traitement
+        """
+        report = FusionReport()
+        started = time.perf_counter()
+        rarities = list(rarities) if rarities else [None]
+        cards = [card for rarity in rarities for card in self.repo.iter_cards(rarity=rarity)]
+        jobs = self.plan(cards, force, report)
+
+        # Chaque template n'est décodé qu'une fois (puis transmis tel quel aux processus)
+        templates: Dict[str, FusionTemplate] = {}
+        for job in jobs:
+            if job.template not in templates:
+                try:
+                    templates[job.template] = get_template(job.template)
+                except Exception as e:
+                    templates[job.template] = None
+                    print(f"⚠️ Template illisible {job.template}: {e}")
+
+        os.makedirs(self.cards_dir, exist_ok=True)
+        manifest = self.load_manifest()
+        updates = []
+        done = 0
+
+        def record(job: FusionJob, result) -> None:
+            nonlocal done
+            done += 1
+            error, cached = result
+            if error:
+                report.errors.append({'card_id': job.card_id, 'name': job.name, 'error': error})
+            else:
+                report.fused += 1
+                report.from_cache += cached
+                manifest[os.path.basename(job.output)] = job.key
+                updates.append((job.card_id, {'img': job.output.replace('\\', '/'),
+                                              'original_img': job.source}))
+            if progress:
+                progress(done, len(jobs), job.name)
+
+        workers = self._resolve_workers(len(jobs))
+        if workers > 1:
+            print(f"⚙️  Fusion parallèle sur {workers} processus")
+            try:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_fusion_worker,
+                                         initargs=(templates, self.render_cache)) as pool:
+                    chunksize = max(1, len(jobs) // (workers * 8))
+                    for job, result in zip(jobs, pool.map(_fuse_job, jobs, chunksize=chunksize)):
+                        record(job, result)
+            except (OSError, BrokenProcessPool) as e:
+                # Processus indisponibles (environnement restreint...) : on termine en séquentiel
+                print(f"⚠️ Fusion parallèle indisponible ({e}), poursuite en séquentiel")
+
+        if done < len(jobs):
+            _init_fusion_worker(templates, self.render_cache)
+            for job in jobs[done:]:
+                record(job, _fuse_job(job))
+
+        if updates:
+            report.updated_cards = self.repo.update_fields_many(updates)
+        if jobs:
+            self.save_manifest(manifest)
+        report.elapsed = time.perf_counter() - started
+        return report
+
+
+# ======================= Fusion dans les processus de travail =======================
+
+# Templates décodés du processus courant {chemin: FusionTemplate}
+_worker_templates: Dict[str, Optional[FusionTemplate]] = {}
+_worker_cache: Optional[RenderCache] = None
+
+
+def _init_fusion_worker(templates: Dict[str, Optional[FusionTemplate]],
+                        render_cache: Optional[RenderCache]) -> None:
+    """Initialise un processus de fusion avec les templates déjà convertis."""
+    global _worker_templates, _worker_cache
+    _worker_templates = templates
+    _worker_cache = render_cache
+
+
+def _fuse_job(job: FusionJob):
+    """Produit une image fusionnée ; retourne (erreur ou None, depuis_cache)."""
+    template = _worker_templates.get(job.template)
+    if template is None:
+        return f"Template illisible : {job.template}", False
+    try:
+        data = _worker_cache.get(job.key) if _worker_cache else None
+        cached = data is not None
+        if data is None:
+            data = fuse_to_png(job.source, template)
+            if _worker_cache:
+                _worker_cache.put(job.key, data)
+        tmp_path = f"{job.output}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, job.output)
+    except Exception as e:
+        return f"{type(e).__name__}: {e}", False
+    return None, cached
+
@@ -45,6 +45,7 @@ APP_SETTINGS = {
         "mythique": ""
     },
     "output_folder": IMAGES_FOLDER,
+    "render_cache_max_mb": 1024,  # Taille maximale du cache de rendu (images/.cache)
     "theme": "auto"  # "auto", "light", "dark"
 }
 
@@ -4,18 +4,77 @@
 Modèle de données et gestion de la base de données
 """
 import json
+import re
 import sqlite3
 from datetime import datetime
+from functools import lru_cache
 
 # Pattern try/except pour imports relatifs/absolus
 try:
     from .config import RARITY_VALUES
+    from .db_connection import get_connection_manager
 except ImportError:
     from config import RARITY_VALUES
+    from db_connection import get_connection_manager
 
 # ======================= Modèle de données =======================
 
+# Champs de formatage (colonnes optionnelles de cards) et leurs valeurs par défaut
+FORMATTING_DEFAULTS = {
+    'title_x': 50,
+    'title_y': 30,
+    'title_font': 'Arial',
+    'title_size': 16,
+    'title_color': '#000000',
+    'text_x': 50,
+    'text_y': 100,
+    'text_width': 200,
+    'text_height': 150,
+    'text_font': 'Arial',
+    'text_size': 12,
+    'text_color': '#000000',
+    'text_align': 'left',
+    'line_spacing': 1.2,
+    'text_wrap': 1,
+    # Formatage du coût en énergie
+    'energy_x': 25,
+    'energy_y': 25,
+    'energy_font': 'Arial',
+    'energy_size': 14,
+    'energy_color': '#FFFFFF',
+}
+
+# Colonnes copiées telles quelles depuis une ligne de la table cards
+_PLAIN_COLUMNS = (
+    'id', 'side', 'name', 'img', 'description', 'powerblow', 'rarity',
+    'action', 'action_param', 'created_at', 'updated_at',
+)
+
+
+def _default_effects():
+    return {
+        "heal": 0,
+        "shield": 0,
+        "Epine": 0,
+        "attack": 0,
+        "AttackReduction": 0,
+        "shield_pass": 0,
+        "bleeding": {"value": 0, "number_turns": 0},
+        "force_augmented": {"value": 0, "number_turns": 0},
+        "chancePassedTour": 0,
+        "energyCostIncrease": 0,
+        "energyCostDecrease": 0
+    }
+
+
 class Card:
+    # Attributs fixes (pas de __dict__) ; les JSON hero/enemy/types sont
+    # conservés bruts et décodés au premier accès
+    __slots__ = _PLAIN_COLUMNS + (
+        'original_img',
+        '_types', '_types_json', '_hero', '_hero_json', '_enemy', '_enemy_json',
+    ) + tuple(FORMATTING_DEFAULTS)
+
     def __init__(self, row=None):
         self.id: int | None = None
         self.side = 'joueur'  # 'joueur' | 'ia'
@@ -26,32 +85,8 @@ class Card:
         self.powerblow = 0
         self.rarity = 'commun'
         self.types: list[str] = []
-        self.hero = {
-            "heal": 0,
-            "shield": 0,
-            "Epine": 0,
-            "attack": 0,
-            "AttackReduction": 0,
-            "shield_pass": 0,
-            "bleeding": {"value": 0, "number_turns": 0},
-            "force_augmented": {"value": 0, "number_turns": 0},
-            "chancePassedTour": 0,
-            "energyCostIncrease": 0,
-            "energyCostDecrease": 0
-        }
-        self.enemy = {
-            "heal": 0,
-            "shield": 0,
-            "Epine": 0,
-            "attack": 0,
-            "AttackReduction": 0,
-            "shield_pass": 0,
-            "bleeding": {"value": 0, "number_turns": 0},
-            "force_augmented": {"value": 0, "number_turns": 0},
-            "chancePassedTour": 0,
-            "energyCostIncrease": 0,
-            "energyCostDecrease": 0
-        }
+        self.hero = _default_effects()
+        self.enemy = _default_effects()
         self.action = ''
         self.action_param = ''  # '' ou '_user'
         self.created_at = ''
@@ -59,52 +94,108 @@ class Card:
         if row:
             self.from_row(row)
 
+    # ----------------------- JSON décodé à la demande -----------------------
+
+    @property
+    def types(self) -> list:
+        if self._types is None:
+            self._types = json.loads(self._types_json) if self._types_json else []
+            self._types_json = None
+        return self._types
+
+    @types.setter
+    def types(self, value):
+        self._types = value
+        self._types_json = None
+
+    @property
+    def hero(self) -> dict:
+        if self._hero is None:
+            self._hero = json.loads(self._hero_json)
+            self._hero_json = None
+        return self._hero
+
+    @hero.setter
+    def hero(self, value):
+        self._hero = value
+        self._hero_json = None
+
+    @property
+    def enemy(self) -> dict:
+        if self._enemy is None:
+            self._enemy = json.loads(self._enemy_json)
+            self._enemy_json = None
+        return self._enemy
+
+    @enemy.setter
+    def enemy(self, value):
+        self._enemy = value
+        self._enemy_json = None
+
+    def _json_column(self, parsed, raw) -> str:
+        """JSON à enregistrer : texte d'origine s'il n'a jamais été décodé."""
+        if parsed is None and raw is not None:
+            return raw
+        return json.dumps(parsed, ensure_ascii=False)
+
+    # ----------------------- Décodage des lignes -----------------------
+
+    @staticmethod
+    def row_decoder(columns):
+        """
+        Construit une fonction ligne → Card pour un ensemble de colonnes donné.
+
+        La correspondance nom → index est calculée une seule fois (par curseur) ;
+        les lignes peuvent ensuite être des tuples ou des sqlite3.Row.
+
+        Args:
+            columns: Noms des colonnes (row.keys() ou [d[0] for d in cursor.description])
+        """
+        index = {name: i for i, name in enumerate(columns)}
+        plain = [(name, index[name]) for name in _PLAIN_COLUMNS]
+        formatting = [
+            (name, index.get(name), default) for name, default in FORMATTING_DEFAULTS.items()
+        ]
+        img_i = index['img']
+        original_i = index.get('original_img')
+        types_i = index.get('types_json')
+        hero_i = index['hero_json']
+        enemy_i = index['enemy_json']
+        new = Card.__new__
+        setattr_ = object.__setattr__
+
+        def decode(row, card=None):
+            if card is None:
+                card = new(Card)
+            for name, i in plain:
+                setattr_(card, name, row[i])
+            # Fallback vers img si pas de original_img
+            original = row[original_i] if original_i is not None else None
+            card.original_img = original or row[img_i]
+            card._types = None if types_i is not None else []
+            card._types_json = row[types_i] if types_i is not None else None
+            card._hero = None
+            card._hero_json = row[hero_i]
+            card._enemy = None
+            card._enemy_json = row[enemy_i]
+            # Champs de formatage (avec valeurs par défaut si colonne absente ou NULL)
+            for name, i, default in formatting:
+                value = row[i] if i is not None else None
+                setattr_(card, name, default if value is None else value)
+            return card
+
+        return decode
+
+    @classmethod
+    def from_cursor(cls, cursor) -> list:
+        """Décode toutes les lignes d'un curseur (index des colonnes calculé une fois)."""
+        decode = _row_decoder_for(tuple(d[0] for d in cursor.description))
+        return [decode(row) for row in cursor]
+
     def from_row(self, row):
         # Support sqlite3.Row (nommé) ou tuple ancien schéma
         if isinstance(row, sqlite3.Row):
-            self.id = row['id']
-            self.side = row['side']
-            self.name = row['name']
-            self.img = row['img']
-            # Gestion du champ original_img avec fallback
-            if 'original_img' in row.keys() and row['original_img']:
-                self.original_img = row['original_img']
-            else:
-                self.original_img = row['img']  # Fallback vers img si pas de original_img
-            self.description = row['description']
-            self.powerblow = row['powerblow']
-            self.rarity = row['rarity']
-            self.types = json.loads(row['types_json']) if 'types_json' in row.keys() else []
-            self.hero = json.loads(row['hero_json'])
-            self.enemy = json.loads(row['enemy_json'])
-            self.action = row['action']
-            self.action_param = row['action_param']
-            self.created_at = row['created_at']
-            self.updated_at = row['updated_at']
-            
-            # Champs de formatage de texte (avec valeurs par défaut)
-            self.title_x = row['title_x'] if 'title_x' in row.keys() else 50
-            self.title_y = row['title_y'] if 'title_y' in row.keys() else 30
-            self.title_font = row['title_font'] if 'title_font' in row.keys() else 'Arial'
-            self.title_size = row['title_size'] if 'title_size' in row.keys() else 16
-            self.title_color = row['title_color'] if 'title_color' in row.keys() else '#000000'
-            self.text_x = row['text_x'] if 'text_x' in row.keys() else 50
-            self.text_y = row['text_y'] if 'text_y' in row.keys() else 100
-            self.text_width = row['text_width'] if 'text_width' in row.keys() else 200
-            self.text_height = row['text_height'] if 'text_height' in row.keys() else 150
-            self.text_font = row['text_font'] if 'text_font' in row.keys() else 'Arial'
-            self.text_size = row['text_size'] if 'text_size' in row.keys() else 12
-            self.text_color = row['text_color'] if 'text_color' in row.keys() else '#000000'
-            self.text_align = row['text_align'] if 'text_align' in row.keys() else 'left'
-            self.line_spacing = row['line_spacing'] if 'line_spacing' in row.keys() else 1.2
-            self.text_wrap = row['text_wrap'] if 'text_wrap' in row.keys() else 1
-            
-            # Champs de formatage du coût en énergie (avec valeurs par défaut)
-            self.energy_x = row['energy_x'] if 'energy_x' in row.keys() else 25
-            self.energy_y = row['energy_y'] if 'energy_y' in row.keys() else 25
-            self.energy_font = row['energy_font'] if 'energy_font' in row.keys() else 'Arial'
-            self.energy_size = row['energy_size'] if 'energy_size' in row.keys() else 14
-            self.energy_color = row['energy_color'] if 'energy_color' in row.keys() else '#FFFFFF'
+            _row_decoder_for(tuple(row.keys()))(row, self)
         else:
             (
                 self.id,
@@ -134,106 +225,456 @@ class Card:
             self.description,
             int(self.powerblow),
             self.rarity,
-            json.dumps(self.types, ensure_ascii=False),
-            json.dumps(self.hero, ensure_ascii=False),
-            json.dumps(self.enemy, ensure_ascii=False),
+            self._json_column(self._types, self._types_json),
+            self._json_column(self._hero, self._hero_json),
+            self._json_column(self._enemy, self._enemy_json),
             self.action,
             self.action_param,
             now,
             now,
+        ) + tuple(
+            getattr(self, name, default) for name, default in FORMATTING_DEFAULTS.items()
         )
 
+    def formatting_fields(self) -> tuple:
+        """Noms des champs de formatage renseignés sur cette carte."""
+        return tuple(name for name in FORMATTING_DEFAULTS if hasattr(self, name))
+
+_ROW_DECODERS: dict = {}
+
+
+def _row_decoder_for(columns: tuple):
+    """Décodeur mis en cache par jeu de colonnes (pour Card(row) ligne à ligne)."""
+    decode = _ROW_DECODERS.get(columns)
+    if decode is None:
+        decode = _ROW_DECODERS[columns] = Card.row_decoder(columns)
+    return decode
+
 # ======================= Repository =======================
 
+_CARD_COLUMNS = (
+    "side", "name", "img", "original_img", "description", "powerblow",
+    "rarity", "types_json", "hero_json", "enemy_json", "action", "action_param",
+    "created_at", "updated_at",
+) + tuple(FORMATTING_DEFAULTS)
+
+_INSERT_SQL = (
+    f"INSERT INTO cards ({', '.join(_CARD_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in _CARD_COLUMNS)})"
+)
+
+# Colonnes principales réécrites par update (le formatage n'est écrit que s'il est renseigné)
+_UPDATE_COLUMNS = (
+    "side", "name", "img", "original_img", "description", "powerblow",
+    "rarity", "types_json", "hero_json", "enemy_json", "action", "action_param",
+)
+
+# Champs acceptés par update_fields (hero/enemy/types sont sérialisés en JSON)
+_JSON_FIELDS = {'types': 'types_json', 'hero': 'hero_json', 'enemy': 'enemy_json'}
+_UPDATABLE_FIELDS = set(_UPDATE_COLUMNS) | set(FORMATTING_DEFAULTS) | set(_JSON_FIELDS)
+
+
+@lru_cache(maxsize=None)
+def _update_sql(formatting: tuple = ()) -> str:
+    """UPDATE des colonnes principales et des champs de formatage donnés."""
+    columns = _UPDATE_COLUMNS + formatting + ("updated_at",)
+    return f"UPDATE cards SET {', '.join(f'{col}=?' for col in columns)} WHERE id=?"
+
+
+@lru_cache(maxsize=None)
+def _upsert_sql(formatting: tuple = ()) -> str:
+    """Insertion avec id explicite ; en cas de conflit, mise à jour sans toucher created_at."""
+    updated = _UPDATE_COLUMNS + formatting + ("updated_at",)
+    return (
+        f"INSERT INTO cards (id, {', '.join(_CARD_COLUMNS)}) "
+        f"VALUES (?, {', '.join('?' for _ in _CARD_COLUMNS)}) "
+        "ON CONFLICT(id) DO UPDATE SET "
+        + ", ".join(f"{col}=excluded.{col}" for col in updated)
+    )
+
+
+@lru_cache(maxsize=None)
+def _update_fields_sql(columns: tuple) -> str:
+    """UPDATE partiel : seulement les colonnes données (plus updated_at)."""
+    return f"UPDATE cards SET {', '.join(f'{col}=?' for col in columns)}, updated_at=? WHERE id=?"
+
+
+def _field_columns_and_values(fields: dict) -> tuple:
+    """Convertit des champs Card en (colonnes, valeurs) pour update_fields."""
+    unknown = set(fields) - _UPDATABLE_FIELDS
+    if unknown:
+        raise ValueError(f"Champs inconnus : {', '.join(sorted(unknown))}")
+    columns, values = [], []
+    for name in sorted(fields):
+        value = fields[name]
+        if name in _JSON_FIELDS:
+            columns.append(_JSON_FIELDS[name])
+            values.append(json.dumps(value, ensure_ascii=False))
+        else:
+            columns.append(name)
+            values.append(int(value) if name == 'powerblow' else value)
+    return tuple(columns), values
+
+
+def _group_by(items, key):
+    """Regroupe des éléments par clé en conservant l'ordre d'apparition."""
+    groups = {}
+    for item in items:
+        groups.setdefault(key(item), []).append(item)
+    return groups.items()
+
+
+# Ordre d'affichage des cartes (servi par les index idx_cards_*_order)
+LIST_ORDER = "rarity_rank, updated_at DESC, id DESC"
+
+
+def build_fts_query(search_text: str) -> str | None:
+    """
+    Convertit une saisie utilisateur en requête FTS5 de préfixes.
+
+    Chaque mot devient un préfixe entre guillemets ("feu"*), les mots étant
+    combinés en ET. Retourne None si la saisie ne contient aucun mot.
+    """
+    words = re.findall(r"\w+", search_text or "")
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def _update_params(card: Card, now: str, formatting: tuple = ()) -> tuple:
+    """Paramètres de _update_sql(formatting) pour une carte."""
+    return (
+        card.side,
+        card.name,
+        card.img,
+        card.original_img,
+        card.description,
+        int(card.powerblow),
+        card.rarity,
+        card._json_column(card._types, card._types_json),
+        card._json_column(card._hero, card._hero_json),
+        card._json_column(card._enemy, card._enemy_json),
+        card.action,
+        card.action_param,
+    ) + tuple(getattr(card, name) for name in formatting) + (now, card.id)
+
+
 class CardRepo:
     def __init__(self, db_file: str):
         self.db_file = db_file
+        self.db = get_connection_manager(db_file)
+        self._fts_available = False
 
     def connect(self):
+        """Connexion indépendante (hors pool), conservée pour compatibilité."""
         con = sqlite3.connect(self.db_file)
         con.row_factory = sqlite3.Row
         return con
 
+    def has_fts(self) -> bool:
+        """Indique si l'index plein texte cards_fts est disponible."""
+        if not self._fts_available:
+            with self.db.read() as con:
+                row = con.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type='table' AND name='cards_fts'"
+                ).fetchone()
+            self._fts_available = row is not None
+        return self._fts_available
+
+    def _search_clause(self, search_text: str):
+        """Condition WHERE de recherche : FTS5 si possible, sinon LIKE."""
+        match = build_fts_query(search_text) if self.has_fts() else None
+        if match:
+            return "id IN (SELECT rowid FROM cards_fts WHERE cards_fts MATCH ?)", [match]
+        return "(name LIKE ? OR description LIKE ?)", [f"%{search_text}%", f"%{search_text}%"]
+
     def list_cards(self, side: str | None = None, search_text: str | None = None, rarity: str | None = None):
-        con = self.connect(); cur = con.cursor()
-        q = "SELECT * FROM cards"; params = []; where = []
+        q, params = self.build_list_query(side, search_text, rarity)
+        with self.db.read() as con:
+            return Card.from_cursor(con.execute(q, params))
+
+    def _filter_clause(self, side: str | None, search_text: str | None, rarity: str | None):
+        """Conditions WHERE (liste) et paramètres communs aux requêtes de liste."""
+        params = []; where = []
         if side in ('joueur', 'ia'):
             where.append("side = ?"); params.append(side)
         if rarity in RARITY_VALUES:
             where.append("rarity = ?"); params.append(rarity)
         if search_text:
-            where.append("(name LIKE ? OR description LIKE ?)")
-            params.extend([f"%{search_text}%", f"%{search_text}%"])
+            clause, clause_params = self._search_clause(search_text)
+            where.append(clause); params.extend(clause_params)
+        return where, params
+
+    def build_list_query(self, side: str | None = None, search_text: str | None = None,
+                         rarity: str | None = None):
+        """Construit la requête (SQL, paramètres) de list_cards ; utilisée aussi par les tests de plan."""
+        where, params = self._filter_clause(side, search_text, rarity)
+        q = "SELECT * FROM cards"
         if where:
             q += " WHERE " + " AND ".join(where)
-        q += (
-            " ORDER BY CASE rarity "
-            "WHEN 'commun' THEN 1 WHEN 'rare' THEN 2 WHEN 'legendaire' THEN 3 WHEN 'mythique' THEN 4 ELSE 5 END, "
-            "updated_at DESC, id DESC"
-        )
-        cur.execute(q, params); rows = cur.fetchall(); con.close()
-        return [Card(row) for row in rows]
+        q += f" ORDER BY {LIST_ORDER}"
+        return q, params
+
+    def count_cards(self, side: str | None = None, search_text: str | None = None,
+                    rarity: str | None = None) -> int:
+        """Nombre de cartes correspondant aux mêmes filtres que list_cards."""
+        where, params = self._filter_clause(side, search_text, rarity)
+        q = "SELECT COUNT(*) FROM cards"
+        if where:
+            q += " WHERE " + " AND ".join(where)
+        with self.db.read() as con:
+            return con.execute(q, params).fetchone()[0]
+
+    def iter_card_pages(self, side: str | None = None, search_text: str | None = None,
+                        rarity: str | None = None, page_size: int = 500):
+        """
+        Parcourt les cartes page par page (listes de Card), dans l'ordre de list_cards.
+
+        Pagination par clé (rarity_rank, updated_at, id) : chaque page reprend
+        après la dernière carte lue via l'index de tri, sans OFFSET.
+        """
+        where, params = self._filter_clause(side, search_text, rarity)
+
+        def fetch(extra_where, extra_params, limit):
+            clauses = where + extra_where
+            q = "SELECT * FROM cards"
+            if clauses:
+                q += " WHERE " + " AND ".join(clauses)
+            q += f" ORDER BY {LIST_ORDER} LIMIT ?"
+            with self.db.read() as con:
+                return con.execute(q, params + extra_params + [limit]).fetchall()
+
+        last = None
+        while True:
+            if last is None:
+                rows = fetch([], [], page_size)
+            else:
+                rank, updated_at, card_id = last['rarity_rank'], last['updated_at'], last['id']
+                # Suite du même rang de rareté, puis rangs suivants
+                rows = fetch(["rarity_rank = ?", "(updated_at, id) < (?, ?)"],
+                             [rank, updated_at, card_id], page_size)
+                if len(rows) < page_size:
+                    rows += fetch(["rarity_rank > ?"], [rank], page_size - len(rows))
+            if not rows:
+                return
+            decode = _row_decoder_for(tuple(rows[0].keys()))
+            yield [decode(row) for row in rows]
+            if len(rows) < page_size:
+                return
+            last = rows[-1]
+
+    def iter_cards(self, side: str | None = None, search_text: str | None = None,
+                   rarity: str | None = None, page_size: int = 500):
+        """Générateur de cartes (mêmes filtres et ordre que list_cards), lues par pages."""
+        for page in self.iter_card_pages(side, search_text, rarity, page_size):
+            yield from page
+
+    def search_cards(self, search_text: str, limit: int | None = 50):
+        """
+        Recherche des cartes triées par pertinence.
+
+        Utilise le classement bm25 de FTS5 (le nom pèse plus que la description) ;
+        sans FTS5, les cartes dont le nom correspond sont placées en premier.
+        """
+        match = build_fts_query(search_text) if self.has_fts() else None
+        if match:
+            q = (
+                "SELECT cards.* FROM cards_fts JOIN cards ON cards.id = cards_fts.rowid "
+                "WHERE cards_fts MATCH ? ORDER BY bm25(cards_fts, 10.0, 1.0), cards.id"
+            )
+            params = [match]
+        else:
+            pattern = f"%{search_text}%"
+            q = (
+                "SELECT * FROM cards WHERE name LIKE ? OR description LIKE ? "
+                "ORDER BY (name LIKE ?) DESC, name, id"
+            )
+            params = [pattern, pattern, pattern]
+        if limit:
+            q += " LIMIT ?"; params.append(int(limit))
+        with self.db.read() as con:
+            return Card.from_cursor(con.execute(q, params))
 
     def get(self, card_id: int) -> Card | None:
-        con = self.connect(); cur = con.cursor()
-        cur.execute("SELECT * FROM cards WHERE id = ?", (card_id,))
-        row = cur.fetchone(); con.close()
+        with self.db.read() as con:
+            row = con.execute("SELECT * FROM cards WHERE id = ?", (card_id,)).fetchone()
         return Card(row) if row else None
 
     def insert(self, card: Card) -> int:
-        con = self.connect(); cur = con.cursor()
-        cur.execute(
-            """
-            INSERT INTO cards (
-                side, name, img, original_img, description, powerblow,
-                rarity, types_json,
-                hero_json, enemy_json, action, action_param,
-                created_at, updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            card.to_db_tuple(),
-        )
-        con.commit(); card.id = cur.lastrowid; con.close()
+        with self.db.transaction() as con:
+            cur = con.execute(_INSERT_SQL, card.to_db_tuple())
+            card.id = cur.lastrowid
         return int(card.id)
 
     def update(self, card: Card) -> int:
         if card.id is None:
             return self.insert(card)
-        con = self.connect(); cur = con.cursor()
         now = datetime.utcnow().isoformat()
-        cur.execute(
-            """
-            UPDATE cards SET
-              side=?, name=?, img=?, original_img=?, description=?, powerblow=?,
-              rarity=?, types_json=?,
-              hero_json=?, enemy_json=?, action=?, action_param=?,
-              updated_at=?
-            WHERE id=?
-            """,
-            (
-                card.side,
-                card.name,
-                card.img,
-                card.original_img,
-                card.description,
-                int(card.powerblow),
-                card.rarity,
-                json.dumps(card.types, ensure_ascii=False),
-                json.dumps(card.hero, ensure_ascii=False),
-                json.dumps(card.enemy, ensure_ascii=False),
-                card.action,
-                card.action_param,
-                now,
-                card.id,
-            ),
-        )
-        con.commit(); con.close()
+        formatting = card.formatting_fields()
+        with self.db.transaction() as con:
+            con.execute(_update_sql(formatting), _update_params(card, now, formatting))
         return int(card.id)
 
+    def update_fields(self, card_id: int, **fields) -> bool:
+        """
+        Met à jour uniquement les champs donnés d'une carte, en une requête.
+
+        Exemple : repo.update_fields(12, title_x=40, text_font='Georgia')
+
+        Returns:
+            True si la carte existe
+        """
+        if not fields:
+            return self.get(card_id) is not None
+        columns, values = _field_columns_and_values(fields)
+        now = datetime.utcnow().isoformat()
+        with self.db.transaction() as con:
+            cur = con.execute(_update_fields_sql(columns), values + [now, card_id])
+        return cur.rowcount > 0
+
+    def update_fields_many(self, updates, chunk_size: int | None = None, progress=None) -> int:
+        """
+        Variante en lot de update_fields.
+
+        Args:
+            updates: Itérable de (card_id, {champ: valeur}) ; les mises à jour
+                portant sur les mêmes champs sont groupées dans un executemany
+            chunk_size: Nombre de mises à jour par transaction (None = une seule transaction)
+            progress: Callback optionnel progress(fait, total)
+
+        Returns:
+            Nombre de cartes mises à jour
+        """
+        prepared = []
+        for card_id, fields in updates:
+            columns, values = _field_columns_and_values(fields)
+            prepared.append((columns, values, card_id))
+        now = datetime.utcnow().isoformat()
+        updated = 0
+
+        def write_chunk(con, chunk):
+            nonlocal updated
+            for columns, group in _group_by(chunk, lambda item: item[0]):
+                if not columns:
+                    continue
+                cur = con.executemany(
+                    _update_fields_sql(columns),
+                    [values + [now, card_id] for _, values, card_id in group],
+                )
+                updated += cur.rowcount
+
+        self._run_batches(prepared, chunk_size, progress, write_chunk)
+        return updated
+
+    # ----------------------- Opérations en lot -----------------------
+
+    def _run_batches(self, items, chunk_size, progress, write_chunk):
+        """
+        Exécute `write_chunk(con, chunk)` par paquets.
+
+        Sans `chunk_size`, tout le lot est écrit dans une seule transaction ;
+        sinon chaque paquet est validé séparément. `progress(fait, total)`
+        est appelé après chaque paquet.
+        """
+        total = len(items)
+        if total == 0:
+            return
+        size = chunk_size if chunk_size and chunk_size > 0 else total
+        done = 0
+        for start in range(0, total, size):
+            chunk = items[start:start + size]
+            with self.db.transaction() as con:
+                write_chunk(con, chunk)
+            done += len(chunk)
+            if progress:
+                progress(done, total)
+
+    @staticmethod
+    def _insert_chunk(con, chunk):
+        con.executemany(_INSERT_SQL, [card.to_db_tuple() for card in chunk])
+        # Sous BEGIN IMMEDIATE (écrivain unique), les rowid sont attribués consécutivement
+        last_id = con.execute("SELECT last_insert_rowid()").fetchone()[0]
+        first_id = last_id - len(chunk) + 1
+        for offset, card in enumerate(chunk):
+            card.id = first_id + offset
+
+    def insert_many(self, cards, chunk_size: int | None = None, progress=None) -> list[int]:
+        """
+        Insère plusieurs cartes avec executemany.
+
+        Args:
+            cards: Cartes à insérer (leur attribut id est renseigné)
+            chunk_size: Nombre de cartes par transaction (None = une seule transaction)
+            progress: Callback optionnel progress(fait, total)
+
+        Returns:
+            Liste des ids attribués, dans l'ordre des cartes
+        """
+        cards = list(cards)
+        self._run_batches(cards, chunk_size, progress, self._insert_chunk)
+        return [int(card.id) for card in cards]
+
+    def update_many(self, cards, chunk_size: int | None = None, progress=None) -> list[int]:
+        """
+        Met à jour plusieurs cartes existantes avec executemany.
+
+        Args:
+            cards: Cartes à mettre à jour (id obligatoire)
+            chunk_size: Nombre de cartes par transaction (None = une seule transaction)
+            progress: Callback optionnel progress(fait, total)
+
+        Returns:
+            Liste des ids mis à jour
+        """
+        cards = list(cards)
+        if any(card.id is None for card in cards):
+            raise ValueError("update_many nécessite des cartes avec un id")
+        now = datetime.utcnow().isoformat()
+
+        def write_chunk(con, chunk):
+            for formatting, group in _group_by(chunk, Card.formatting_fields):
+                con.executemany(
+                    _update_sql(formatting),
+                    [_update_params(card, now, formatting) for card in group],
+                )
+
+        self._run_batches(cards, chunk_size, progress, write_chunk)
+        return [int(card.id) for card in cards]
+
+    def upsert_many(self, cards, chunk_size: int | None = None, progress=None) -> list[int]:
+        """
+        Insère ou met à jour plusieurs cartes.
+
+        Les cartes sans id sont insérées ; celles avec un id sont mises à jour
+        (ou insérées avec cet id si elles n'existent pas encore).
+
+        Args:
+            cards: Cartes à enregistrer
+            chunk_size: Nombre de cartes par transaction (None = une seule transaction)
+            progress: Callback optionnel progress(fait, total)
+
+        Returns:
+            Liste des ids, dans l'ordre des cartes
+        """
+        cards = list(cards)
+
+        def write_chunk(con, chunk):
+            existing = [card for card in chunk if card.id is not None]
+            new = [card for card in chunk if card.id is None]
+            for formatting, group in _group_by(existing, Card.formatting_fields):
+                con.executemany(
+                    _upsert_sql(formatting),
+                    [(card.id,) + card.to_db_tuple() for card in group],
+                )
+            if new:
+                self._insert_chunk(con, new)
+
+        self._run_batches(cards, chunk_size, progress, write_chunk)
+        return [int(card.id) for card in cards]
+
     def delete(self, card_id: int) -> None:
-        con = self.connect(); cur = con.cursor()
-        cur.execute("DELETE FROM cards WHERE id=?", (card_id,))
-        con.commit(); con.close()
+        with self.db.transaction() as con:
+            con.execute("DELETE FROM cards WHERE id=?", (card_id,))
 
 # ======================= Database Setup =======================
 
@@ -285,6 +726,19 @@ def ensure_db_legacy(db_path: str) -> None:
         cur.execute("UPDATE cards SET original_img = img WHERE original_img = ''")
         print("✅ Migration: Ajout du champ original_img et initialisation avec les images actuelles")
     
+    # Rang de rareté et index de tri : requis par list_cards / iter_card_pages
+    try:
+        from .database_migration import create_cards_indexes, add_formatting_columns, create_lua_fragments_table
+    except ImportError:
+        from database_migration import create_cards_indexes, add_formatting_columns, create_lua_fragments_table
+    cur.execute("PRAGMA table_xinfo(cards)")
+    if 'rarity_rank' not in [r[1] for r in cur.fetchall()]:
+        create_cards_indexes(cur)
+    # Colonnes de formatage : écrites par insert / update
+    add_formatting_columns(cur)
+    # Cache des fragments Lua de l'exporteur Love2D
+    create_lua_fragments_table(cur)
+    
     # Migration pour la table des favoris de formatage
     ensure_formatting_favorites_table(cur)
     
@@ -347,45 +801,42 @@ def save_formatting_favorite(db_path: str, slot_number: int, data: dict, name: s
         raise ValueError(f"Slot invalide: {slot_number}. Doit être 1, 2 ou 3.")
     
     try:
-        con = sqlite3.connect(db_path)
-        cur = con.cursor()
-        
-        # Vérifier que la table existe
-        cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='formatting_favorites'")
-        if not cur.fetchone():
-            ensure_formatting_favorites_table(cur)
-        
         from datetime import datetime
         now = datetime.now().isoformat()
         
-        # Utiliser INSERT OR REPLACE pour mettre à jour ou créer
-        cur.execute("""
-            INSERT OR REPLACE INTO formatting_favorites (
-                slot_number, name,
-                title_x, title_y, title_font, title_size, title_color,
-                text_x, text_y, text_width, text_height, text_font, text_size, 
-                text_color, text_align, line_spacing, text_wrap,
-                energy_x, energy_y, energy_font, energy_size, energy_color,
-                created_at, updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            slot_number, name or f"Favori {slot_number}",
-            data.get('title_x', 50), data.get('title_y', 30), 
-            data.get('title_font', 'Arial'), data.get('title_size', 16), 
-            data.get('title_color', '#000000'),
-            data.get('text_x', 50), data.get('text_y', 100),
-            data.get('text_width', 200), data.get('text_height', 150),
-            data.get('text_font', 'Arial'), data.get('text_size', 12),
-            data.get('text_color', '#000000'), data.get('text_align', 'left'),
-            data.get('line_spacing', 1.2), data.get('text_wrap', 1),
-            data.get('energy_x', 25), data.get('energy_y', 25),
-            data.get('energy_font', 'Arial'), data.get('energy_size', 14),
-            data.get('energy_color', '#FFFFFF'),
-            now, now
-        ))
-        
-        con.commit()
-        con.close()
+        with get_connection_manager(db_path).transaction() as con:
+            cur = con.cursor()
+            
+            # Vérifier que la table existe
+            cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='formatting_favorites'")
+            if not cur.fetchone():
+                ensure_formatting_favorites_table(cur)
+            
+            # Utiliser INSERT OR REPLACE pour mettre à jour ou créer
+            cur.execute("""
+                INSERT OR REPLACE INTO formatting_favorites (
+                    slot_number, name,
+                    title_x, title_y, title_font, title_size, title_color,
+                    text_x, text_y, text_width, text_height, text_font, text_size, 
+                    text_color, text_align, line_spacing, text_wrap,
+                    energy_x, energy_y, energy_font, energy_size, energy_color,
+                    created_at, updated_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                slot_number, name or f"Favori {slot_number}",
+                data.get('title_x', 50), data.get('title_y', 30), 
+                data.get('title_font', 'Arial'), data.get('title_size', 16), 
+                data.get('title_color', '#000000'),
+                data.get('text_x', 50), data.get('text_y', 100),
+                data.get('text_width', 200), data.get('text_height', 150),
+                data.get('text_font', 'Arial'), data.get('text_size', 12),
+                data.get('text_color', '#000000'), data.get('text_align', 'left'),
+                data.get('line_spacing', 1.2), data.get('text_wrap', 1),
+                data.get('energy_x', 25), data.get('energy_y', 25),
+                data.get('energy_font', 'Arial'), data.get('energy_size', 14),
+                data.get('energy_color', '#FFFFFF'),
+                now, now
+            ))
         
         display_name = name or f"Favori {slot_number}"
         print(f"✅ Favori '{display_name}' sauvegardé dans slot {slot_number}")
@@ -402,18 +853,13 @@ def get_formatting_favorite(db_path: str, slot_number: int):
         raise ValueError(f"Slot invalide: {slot_number}. Doit être 1, 2 ou 3.")
     
     try:
-        con = sqlite3.connect(db_path)
-        cur = con.cursor()
-        
-        # Vérifier que la table existe
-        cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='formatting_favorites'")
-        if not cur.fetchone():
-            con.close()
-            return None
-        
-        cur.execute("SELECT * FROM formatting_favorites WHERE slot_number = ?", (slot_number,))
-        row = cur.fetchone()
-        con.close()
+        with get_connection_manager(db_path).read() as con:
+            # Vérifier que la table existe
+            cur = con.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='formatting_favorites'")
+            if not cur.fetchone():
+                return None
+            
+            row = con.execute("SELECT * FROM formatting_favorites WHERE slot_number = ?", (slot_number,)).fetchone()
         
         if not row:
             return None
@@ -440,18 +886,13 @@ def get_formatting_favorite(db_path: str, slot_number: int):
 def list_formatting_favorites(db_path: str):
     """Liste tous les favoris de formatage."""
     try:
-        con = sqlite3.connect(db_path)
-        cur = con.cursor()
-        
-        # Vérifier que la table existe
-        cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='formatting_favorites'")
-        if not cur.fetchone():
-            con.close()
-            return {}
-        
-        cur.execute("SELECT slot_number, name FROM formatting_favorites ORDER BY slot_number")
-        rows = cur.fetchall()
-        con.close()
+        with get_connection_manager(db_path).read() as con:
+            # Vérifier que la table existe
+            cur = con.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='formatting_favorites'")
+            if not cur.fetchone():
+                return {}
+            
+            rows = con.execute("SELECT slot_number, name FROM formatting_favorites ORDER BY slot_number").fetchall()
         
         favorites = {}
         for slot, name in rows:
@@ -470,19 +911,14 @@ def delete_formatting_favorite(db_path: str, slot_number: int):
         raise ValueError(f"Slot invalide: {slot_number}. Doit être 1, 2 ou 3.")
     
     try:
-        con = sqlite3.connect(db_path)
-        cur = con.cursor()
-        
-        # Vérifier que la table existe
-        cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='formatting_favorites'")
-        if not cur.fetchone():
-            con.close()
-            return False
-        
-        cur.execute("DELETE FROM formatting_favorites WHERE slot_number = ?", (slot_number,))
-        deleted = cur.rowcount > 0
-        con.commit()
-        con.close()
+        with get_connection_manager(db_path).transaction() as con:
+            # Vérifier que la table existe
+            cur = con.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='formatting_favorites'")
+            if not cur.fetchone():
+                return False
+            
+            cur = con.execute("DELETE FROM formatting_favorites WHERE slot_number = ?", (slot_number,))
+            deleted = cur.rowcount > 0
         
         if deleted:
             print(f"🗑️ Favori slot {slot_number} supprimé")
@@ -18,7 +18,7 @@ except ImportError:
 # ======================= Constantes =======================
 
 # Version actuelle de la base de données
-CURRENT_DB_VERSION = 5
+CURRENT_DB_VERSION = 9
 
 # Schéma requis pour la table cards
 REQUIRED_SCHEMA = {
@@ -39,6 +39,44 @@ REQUIRED_SCHEMA = {
     'updated_at': 'TEXT NOT NULL'
 }
 
+# Colonnes de formatage du texte de la carte (titre, description, coût en énergie)
+FORMATTING_COLUMNS = {
+    'title_x': 'INTEGER DEFAULT 50',
+    'title_y': 'INTEGER DEFAULT 30',
+    'title_font': "TEXT DEFAULT 'Arial'",
+    'title_size': 'INTEGER DEFAULT 16',
+    'title_color': "TEXT DEFAULT '#000000'",
+    'text_x': 'INTEGER DEFAULT 50',
+    'text_y': 'INTEGER DEFAULT 100',
+    'text_width': 'INTEGER DEFAULT 200',
+    'text_height': 'INTEGER DEFAULT 150',
+    'text_font': "TEXT DEFAULT 'Arial'",
+    'text_size': 'INTEGER DEFAULT 12',
+    'text_color': "TEXT DEFAULT '#000000'",
+    'text_align': "TEXT DEFAULT 'left'",
+    'line_spacing': 'REAL DEFAULT 1.2',
+    'text_wrap': 'INTEGER DEFAULT 1',
+    'energy_x': 'INTEGER DEFAULT 25',
+    'energy_y': 'INTEGER DEFAULT 25',
+    'energy_font': "TEXT DEFAULT 'Arial'",
+    'energy_size': 'INTEGER DEFAULT 14',
+    'energy_color': "TEXT DEFAULT '#FFFFFF'",
+}
+
+# Rang de rareté (colonne générée rarity_rank, utilisée pour le tri indexé)
+RARITY_RANK_SQL = (
+    "CASE rarity WHEN 'commun' THEN 1 WHEN 'rare' THEN 2 "
+    "WHEN 'legendaire' THEN 3 WHEN 'mythique' THEN 4 ELSE 5 END"
+)
+
+# Index de la table cards : (nom, colonnes), alignés sur les requêtes de CardRepo.list_cards
+CARDS_INDEXES = [
+    ('idx_cards_order', 'rarity_rank, updated_at DESC, id DESC'),
+    ('idx_cards_side_order', 'side, rarity_rank, updated_at DESC, id DESC'),
+    ('idx_cards_rarity_order', 'rarity, rarity_rank, updated_at DESC, id DESC'),
+    ('idx_cards_side_rarity_order', 'side, rarity, rarity_rank, updated_at DESC, id DESC'),
+]
+
 # ======================= Fonctions de migration =======================
 
 def get_db_version(db_path: str) -> int:
@@ -351,6 +389,172 @@ def migrate_v4_to_v5(db_path: str) -> None:
     finally:
         con.close()
 
+def create_cards_fts(cur) -> bool:
+    """
+    Crée l'index plein texte cards_fts (FTS5) et ses triggers de synchronisation.
+
+    L'index est une table à contenu externe sur cards(name, description),
+    insensible aux accents (unicode61 remove_diacritics 2).
+
+    Returns:
+        True si l'index existe, False si SQLite n'est pas compilé avec FTS5
+    """
+    try:
+        cur.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS cards_fts USING fts5(
+                name, description,
+                content='cards', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+        """)
+    except sqlite3.OperationalError as e:
+        print(f"   ⚠️  FTS5 indisponible, la recherche utilisera LIKE : {e}")
+        return False
+
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS cards_fts_ai AFTER INSERT ON cards BEGIN
+            INSERT INTO cards_fts(rowid, name, description)
+            VALUES (new.id, new.name, new.description);
+        END
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS cards_fts_ad AFTER DELETE ON cards BEGIN
+            INSERT INTO cards_fts(cards_fts, rowid, name, description)
+            VALUES ('delete', old.id, old.name, old.description);
+        END
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS cards_fts_au AFTER UPDATE OF name, description ON cards BEGIN
+            INSERT INTO cards_fts(cards_fts, rowid, name, description)
+            VALUES ('delete', old.id, old.name, old.description);
+            INSERT INTO cards_fts(rowid, name, description)
+            VALUES (new.id, new.name, new.description);
+        END
+    """)
+    # Indexer les cartes existantes
+    cur.execute("INSERT INTO cards_fts(cards_fts) VALUES ('rebuild')")
+    return True
+
+def migrate_v5_to_v6(db_path: str) -> None:
+    """Migration de la version 5 à la version 6 - Index plein texte FTS5 sur les cartes."""
+    print("🔄 Migration v5 → v6 : Création de l'index de recherche plein texte...")
+    
+    con = sqlite3.connect(db_path)
+    cur = con.cursor()
+    
+    try:
+        if create_cards_fts(cur):
+            con.commit()
+            cur.execute("SELECT COUNT(*) FROM cards")
+            print(f"   ✅ Index cards_fts créé ({cur.fetchone()[0]} cartes indexées)")
+    except Exception as e:
+        con.rollback()
+        print(f"   ❌ Erreur lors de la création de l'index FTS5 : {e}")
+        raise
+    finally:
+        con.close()
+
+def create_cards_indexes(cur) -> None:
+    """Ajoute la colonne générée rarity_rank et les index de tri/filtre de cards."""
+    cur.execute("PRAGMA table_xinfo(cards)")
+    existing_columns = [row[1] for row in cur.fetchall()]
+    if 'rarity_rank' not in existing_columns:
+        cur.execute(
+            f"ALTER TABLE cards ADD COLUMN rarity_rank INTEGER "
+            f"GENERATED ALWAYS AS ({RARITY_RANK_SQL}) VIRTUAL"
+        )
+    for name, columns in CARDS_INDEXES:
+        cur.execute(f"CREATE INDEX IF NOT EXISTS {name} ON cards ({columns})")
+    cur.execute("ANALYZE cards")
+
+def migrate_v6_to_v7(db_path: str) -> None:
+    """Migration de la version 6 à la version 7 - Rang de rareté et index de tri."""
+    print("🔄 Migration v6 → v7 : Ajout du rang de rareté et des index de la table cards...")
+    
+    con = sqlite3.connect(db_path)
+    cur = con.cursor()
+    
+    try:
+        create_cards_indexes(cur)
+        con.commit()
+        print(f"   ✅ Colonne rarity_rank et {len(CARDS_INDEXES)} index créés")
+    except Exception as e:
+        con.rollback()
+        print(f"   ❌ Erreur lors de la création des index : {e}")
+        raise
+    finally:
+        con.close()
+
+def add_formatting_columns(cur) -> list:
+    """Ajoute les colonnes de formatage manquantes ; retourne les colonnes ajoutées."""
+    cur.execute("PRAGMA table_info(cards)")
+    existing_columns = {row[1] for row in cur.fetchall()}
+    added = []
+    for name, definition in FORMATTING_COLUMNS.items():
+        if name not in existing_columns:
+            cur.execute(f"ALTER TABLE cards ADD COLUMN {name} {definition}")
+            added.append(name)
+    return added
+
+def migrate_v7_to_v8(db_path: str) -> None:
+    """Migration de la version 7 à la version 8 - Colonnes de formatage du texte."""
+    print("🔄 Migration v7 → v8 : Ajout des colonnes de formatage...")
+    
+    con = sqlite3.connect(db_path)
+    cur = con.cursor()
+    
+    try:
+        added = add_formatting_columns(cur)
+        con.commit()
+        if added:
+            print(f"   ✅ Colonnes ajoutées : {', '.join(added)}")
+        else:
+            print("   ℹ️  Colonnes de formatage déjà présentes")
+    except Exception as e:
+        con.rollback()
+        print(f"   ❌ Erreur lors de l'ajout des colonnes de formatage : {e}")
+        raise
+    finally:
+        con.close()
+
+def create_lua_fragments_table(cur) -> None:
+    """
+    Table du cache des fragments Lua : un fragment par carte et par variante
+    d'export (profil, mode atlas). Une table d'un ancien format (un seul
+    fragment par carte) est recréée : ce n'est qu'un cache.
+    """
+    cur.execute("PRAGMA table_info(lua_fragments)")
+    existing_columns = {row[1] for row in cur.fetchall()}
+    if existing_columns and 'variant' not in existing_columns:
+        cur.execute("DROP TABLE lua_fragments")
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS lua_fragments (
+            card_id INTEGER NOT NULL,
+            variant TEXT NOT NULL,
+            cache_key TEXT NOT NULL,
+            fragment TEXT NOT NULL,
+            PRIMARY KEY (card_id, variant)
+        )
+    """)
+
+def migrate_v8_to_v9(db_path: str) -> None:
+    """Migration de la version 8 à la version 9 - Cache des fragments Lua par variante d'export."""
+    print("🔄 Migration v8 → v9 : Cache des fragments Lua par variante d'export...")
+    
+    con = sqlite3.connect(db_path)
+    cur = con.cursor()
+    
+    try:
+        create_lua_fragments_table(cur)
+        con.commit()
+        print("   ✅ Table lua_fragments prête")
+    except Exception as e:
+        con.rollback()
+        print(f"   ❌ Erreur lors de la création de la table lua_fragments : {e}")
+        raise
+    finally:
+        con.close()
+
 def verify_database_integrity(db_path: str) -> bool:
     """Vérifie l'intégrité de la base de données."""
     try:
@@ -431,6 +635,22 @@ def migrate_database(db_path: str) -> bool:
             migrate_v4_to_v5(db_path)
             set_db_version(db_path, 5)
         
+        if current_version < 6:
+            migrate_v5_to_v6(db_path)
+            set_db_version(db_path, 6)
+        
+        if current_version < 7:
+            migrate_v6_to_v7(db_path)
+            set_db_version(db_path, 7)
+        
+        if current_version < 8:
+            migrate_v7_to_v8(db_path)
+            set_db_version(db_path, 8)
+        
+        if current_version < 9:
+            migrate_v8_to_v9(db_path)
+            set_db_version(db_path, 9)
+        
         print(f"✅ Migration terminée ! Version {current_version} → {CURRENT_DB_VERSION}")
         
         # Vérifier l'intégrité après migration
@@ -459,6 +679,15 @@ def ensure_db_with_migration(db_path: str) -> bool:
         columns_def = ", ".join([f"{name} {definition}" for name, definition in REQUIRED_SCHEMA.items()])
         cur.execute(f"CREATE TABLE cards ({columns_def})")
         
+        # Index de recherche plein texte (ajouté en v6)
+        create_cards_fts(cur)
+        # Rang de rareté et index de tri (ajoutés en v7)
+        create_cards_indexes(cur)
+        # Colonnes de formatage (ajoutées en v8)
+        add_formatting_columns(cur)
+        # Cache des fragments Lua (v9)
+        create_lua_fragments_table(cur)
+        
         con.commit()
         con.close()
         
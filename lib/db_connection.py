@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🔌 GESTIONNAIRE DE CONNEXIONS SQLITE
+====================================
+
+Connexions persistantes partagées par CardRepo, ActorManager et les favoris :
+- une seule connexion d'écriture (protégée par un verrou)
+- une connexion de lecture par thread, fermée à la fin du thread
+- journal WAL et pragmas appliqués une seule fois par connexion
+"""
+import os
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Dict
+
+# Pragmas appliqués à chaque nouvelle connexion
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -20000",  # ~20 Mo de cache de pages
+    "PRAGMA busy_timeout = 5000",
+)
+
+
+def _close_quietly(con: sqlite3.Connection) -> None:
+    try:
+        con.close()
+    except sqlite3.Error:
+        pass
+
+
+class _ReaderSlot:
+    """
+    Connexion de lecture d'un thread.
+
+    L'objet n'est référencé que par le stockage local du thread : quand le
+    thread se termine, il est libéré et la connexion est fermée.
+    """
+
+    def __init__(self, con: sqlite3.Connection, generation: int):
+        self.con = con
+        self.generation = generation
+        self._finalizer = weakref.finalize(self, _close_quietly, con)
+
+    def close(self) -> None:
+        self._finalizer()
+
+
+class ConnectionManager:
+    """Pool de connexions SQLite pour une base de données donnée."""
+
+    def __init__(self, db_path: str, timeout: float = 30.0):
+        """
+        Initialise le gestionnaire de connexions.
+
+        Args:
+            db_path: Chemin vers la base de données SQLite
+            timeout: Délai d'attente du verrou SQLite (secondes)
+        """
+        self.db_path = db_path
+        self.timeout = timeout
+        self.in_memory = db_path == ':memory:'
+        self._write_lock = threading.RLock()
+        self._writer: sqlite3.Connection | None = None
+        self._local = threading.local()
+        self._readers: weakref.WeakSet[_ReaderSlot] = weakref.WeakSet()
+        self._readers_lock = threading.Lock()
+        self._wal_enabled = False
+        self._identity: tuple | None = None
+        # Incrémentée à chaque remplacement du fichier : les lecteurs plus
+        # anciens sont rouverts par leur thread au prochain read()
+        self._generation = 0
+
+    def _open(self) -> sqlite3.Connection:
+        """Ouvre une connexion configurée (autocommit, Row, pragmas)."""
+        con = sqlite3.connect(
+            self.db_path,
+            timeout=self.timeout,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        con.row_factory = sqlite3.Row
+        if not self.in_memory and not self._wal_enabled:
+            try:
+                con.execute("PRAGMA journal_mode = WAL")
+                self._wal_enabled = True
+            except sqlite3.DatabaseError:
+                pass  # Base en lecture seule ou système de fichiers sans WAL
+        for pragma in CONNECTION_PRAGMAS:
+            con.execute(pragma)
+        return con
+
+    def _file_identity(self) -> tuple | None:
+        try:
+            st = os.stat(self.db_path)
+        except OSError:
+            return None
+        return (st.st_dev, st.st_ino)
+
+    def _check_file(self) -> None:
+        """
+        Rouvre les connexions si le fichier de base a été supprimé ou remplacé.
+
+        Seules la connexion d'écriture et celle du thread courant sont fermées ;
+        les autres threads rouvrent la leur au prochain read(), sans perdre une
+        lecture en cours.
+        """
+        if self.in_memory:
+            return
+        identity = self._file_identity()
+        if identity == self._identity:
+            return
+        with self._write_lock:
+            if identity == self._identity:
+                return
+            if self._identity is not None:
+                self._generation += 1
+                self._wal_enabled = False
+                if self._writer is not None:
+                    _close_quietly(self._writer)
+                    self._writer = None
+            self._identity = identity
+
+    @property
+    def writer(self) -> sqlite3.Connection:
+        """Connexion d'écriture unique (créée à la demande)."""
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = self._open()
+            return self._writer
+
+    def reader(self) -> sqlite3.Connection:
+        """Connexion de lecture propre au thread courant."""
+        if self.in_memory:
+            # Une base en mémoire n'est visible que depuis sa propre connexion
+            return self.writer
+        slot = getattr(self._local, 'slot', None)
+        if slot is not None and slot.generation != self._generation:
+            slot.close()
+            slot = None
+        if slot is None:
+            slot = _ReaderSlot(self._open(), self._generation)
+            self._local.slot = slot
+            with self._readers_lock:
+                self._readers.add(slot)
+        return slot.con
+
+    @contextmanager
+    def read(self):
+        """Contexte de lecture : fournit la connexion de lecture du thread."""
+        self._check_file()
+        if self.in_memory:
+            with self._write_lock:
+                yield self.writer
+        else:
+            yield self.reader()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Contexte d'écriture transactionnel.
+
+        Ouvre une transaction BEGIN IMMEDIATE sur la connexion d'écriture,
+        valide à la sortie et annule en cas d'exception. Les transactions
+        imbriquées réutilisent la transaction englobante.
+        """
+        with self._write_lock:
+            if self._writer is None or not self._writer.in_transaction:
+                self._check_file()
+            con = self.writer
+            if con.in_transaction:
+                yield con
+                return
+            con.execute("BEGIN IMMEDIATE")
+            try:
+                yield con
+            except BaseException:
+                con.rollback()
+                raise
+            else:
+                con.commit()
+
+    def close(self) -> None:
+        """Ferme toutes les connexions ouvertes par ce gestionnaire."""
+        with self._readers_lock:
+            slots = list(self._readers)
+            self._readers.clear()
+        for slot in slots:
+            slot.close()
+        self._local = threading.local()
+        self._wal_enabled = False
+        with self._write_lock:
+            if self._writer is not None:
+                _close_quietly(self._writer)
+                self._writer = None
+
+
+# Gestionnaires globaux, un par fichier de base
+_managers: Dict[str, ConnectionManager] = {}
+_managers_lock = threading.Lock()
+
+
+def _manager_key(db_path: str) -> str:
+    if db_path == ':memory:':
+        return db_path
+    return os.path.normcase(os.path.abspath(db_path))
+
+
+def get_connection_manager(db_path: str) -> ConnectionManager:
+    """Retourne le gestionnaire de connexions partagé pour cette base."""
+    key = _manager_key(db_path)
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = ConnectionManager(db_path)
+            _managers[key] = manager
+        return manager
+
+
+def close_connection_manager(db_path: str) -> None:
+    """Ferme et oublie le gestionnaire associé à une base (ex: avant suppression)."""
+    with _managers_lock:
+        manager = _managers.pop(_manager_key(db_path), None)
+    if manager is not None:
+        manager.close()
+
+
+def close_all_connections() -> None:
+    """Ferme tous les gestionnaires de connexions (arrêt de l'application)."""
+    with _managers_lock:
+        managers = list(_managers.values())
+        _managers.clear()
+    for manager in managers:
+        manager.close()
@@ -7,13 +7,18 @@ import os
 import tkinter as tk
 from tkinter import ttk
 
+from .database import CardRepo
+
 try:
     from PIL import Image, ImageTk
+    from .thumbnails import get_thumbnail_cache
+    from .image_loader import AsyncImageLoader
     PILLOW_AVAILABLE = True
 except ImportError:
     PILLOW_AVAILABLE = False
 
-from .database import CardRepo
+# Hauteur approximative d'une tuile (image + nom + informations), en pixels
+TILE_EXTRA_HEIGHT = 90
 
 class DeckViewerWindow:
     """Fenêtre de visualisation du deck avec tri et affichage en grille."""
@@ -25,6 +30,10 @@ class DeckViewerWindow:
         self.cards = []
         self.filtered_cards = []
         self.images = {}  # Cache des images chargées
+        self.image_labels = {}  # {chemin image: [labels en attente de l'image]}
+        self.tile_sources = []  # Chemin d'image de chaque tuile affichée (ordre de la grille)
+        self.image_loader = None
+        self.card_actors = {}  # {card_id: [acteurs]} chargé en une requête
         self.current_filter = "Toutes"
         self.current_sort = "rarity"
         
@@ -55,6 +64,9 @@ class DeckViewerWindow:
         
         self.create_sidebar()
         self.create_main_area()
+        if PILLOW_AVAILABLE:
+            # Décodage des miniatures en arrière-plan, PhotoImage créées par lots
+            self.image_loader = AsyncImageLoader(self.window, self._load_thumbnail)
         self.load_cards()
         
     def create_sidebar(self):
@@ -179,7 +191,11 @@ class DeckViewerWindow:
         )
         
         self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.canvas.configure(yscrollcommand=scrollbar.set)
+        
+        def on_scroll(first, last):
+            scrollbar.set(first, last)
+            self.prioritize_visible_tiles()
+        self.canvas.configure(yscrollcommand=on_scroll)
         
         self.canvas.grid(row=1, column=0, sticky="nsew")
         scrollbar.grid(row=1, column=1, sticky="ns")
@@ -193,7 +209,12 @@ class DeckViewerWindow:
         
     def load_cards(self):
         """Charge toutes les cartes depuis la base."""
-        self.cards = self.repo.list_cards()
+        # Lecture par pages : acteurs chargés page par page en une requête chacune
+        self.cards = []
+        self.card_actors = {}
+        for page in self.repo.iter_card_pages():
+            self.cards.extend(page)
+            self.card_actors.update(self.actor_manager.get_actors_for_cards(c.id for c in page))
         self.filtered_cards = self.cards.copy()
         self.update_info_label()
         self.display_cards()
@@ -291,7 +312,7 @@ class DeckViewerWindow:
         elif sort_by == "actor":
             # Tri par acteur - regrouper les cartes par acteur
             def get_card_actors(card):
-                actors = self.actor_manager.get_card_actors(card.id)
+                actors = self.card_actors.get(card.id)
                 if actors:
                     return actors[0]['name']  # Premier acteur si plusieurs
                 return "Zzz_Aucun"  # Mettre à la fin les cartes sans acteur
@@ -337,6 +358,12 @@ class DeckViewerWindow:
         
     def display_cards(self):
         """Affiche les cartes dans la grille."""
+        # Abandonner les chargements de l'affichage précédent
+        if self.image_loader:
+            self.image_loader.cancel()
+        self.image_labels = {}
+        self.tile_sources = []
+        
         # Nettoyer l'affichage précédent
         for widget in self.scrollable_frame.winfo_children():
             widget.destroy()
@@ -361,12 +388,73 @@ class DeckViewerWindow:
         # Configurer les colonnes pour qu'elles aient la même largeur
         for col in range(self.cards_per_row):
             self.scrollable_frame.grid_columnconfigure(col, weight=1)
+        
+        self.request_tile_images()
+    
+    def _load_thumbnail(self, source):
+        """Miniature d'une tuile (appelée dans un thread de chargement)."""
+        return get_thumbnail_cache().load(source, (self.card_width, self.card_height))
+    
+    def visible_tile_range(self):
+        """Indices (début, fin) des tuiles visibles dans la zone de défilement."""
+        total = len(self.tile_sources)
+        rows = -(-total // self.cards_per_row)
+        if not rows:
+            return 0, 0
+        first, last = self.canvas.yview()
+        if last <= first:
+            # Fenêtre pas encore dessinée : estimer d'après la hauteur demandée
+            visible_rows = max(1, 600 // (self.card_height + TILE_EXTRA_HEIGHT) + 1)
+            return 0, min(total, visible_rows * self.cards_per_row)
+        first_row = int(first * rows)
+        last_row = min(rows, int(last * rows) + 1)
+        return first_row * self.cards_per_row, min(total, last_row * self.cards_per_row)
+    
+    def request_tile_images(self):
+        """Demande les images des tuiles : les tuiles visibles d'abord."""
+        if not self.image_loader:
+            return
+        start, end = self.visible_tile_range()
+        total = len(self.tile_sources)
+        for index, source in enumerate(self.tile_sources):
+            if source is None:
+                continue
+            # Visibles : priorités négatives ; les autres dans l'ordre de la grille
+            priority = index - total if start <= index < end else index
+            self.image_loader.request(source, self._on_image_loaded, priority)
+    
+    def prioritize_visible_tiles(self):
+        """Après un défilement, passe les tuiles devenues visibles en tête de file."""
+        if not self.image_loader or not self.image_loader.pending:
+            return
+        start, end = self.visible_tile_range()
+        self.image_loader.prioritize(
+            (source for source in self.tile_sources[start:end] if source),
+            priority=-len(self.tile_sources) - 1
+        )
+    
+    def _on_image_loaded(self, source, photo, error):
+        """Remplace les indicateurs de chargement par l'image (thread Tk)."""
+        labels = self.image_labels.pop(source, [])
+        if photo is not None:
+            self.images[source] = photo  # Cache
+        elif error is not None:
+            print(f"Erreur chargement image {source}: {error}")
+        for label in labels:
+            try:
+                if photo is not None:
+                    label.config(image=photo, text="", width=0, height=0, bg=self.window.cget("bg"))
+                else:
+                    label.config(text="❌\nErreur image", bg="salmon")
+            except tk.TclError:
+                pass  # Tuile détruite entre-temps
             
     def create_card_widget(self, card):
         """Crée le widget d'affichage d'une carte."""
         card_frame = ttk.Frame(self.scrollable_frame)
+        self.tile_sources.append(None)
         
-        # Chargement de l'image
+        # Chargement de l'image (indicateur tant que la miniature n'est pas prête)
         img_widget = self.load_card_image(card, card_frame)  # Passer le parent
         if img_widget:
             img_widget.pack()
@@ -387,7 +475,9 @@ class DeckViewerWindow:
         info_text += f"\n⚡ {card.powerblow}"
         
         # Ajouter les acteurs associés
-        actors = self.actor_manager.get_card_actors(card.id)
+        actors = self.card_actors.get(card.id)
+        if actors is None:
+            actors = self.actor_manager.get_card_actors(card.id)
         if actors:
             actor_names = [f"{actor['icon']} {actor['name']}" for actor in actors[:2]]  # Limiter à 2 acteurs
             info_text += f"\n🎭 {', '.join(actor_names)}"
@@ -425,17 +515,18 @@ class DeckViewerWindow:
                 img_label = tk.Label(parent_frame, image=self.images[card.img])
                 return img_label
             
-            if PILLOW_AVAILABLE:
-                # Charger et redimensionner l'image avec PIL
-                pil_image = Image.open(card.img)
-                pil_image = pil_image.resize((self.card_width, self.card_height), Image.Resampling.LANCZOS)
-                
-                # Convertir pour Tkinter
-                tk_image = ImageTk.PhotoImage(pil_image)
-                self.images[card.img] = tk_image  # Cache
-                
-                img_label = tk.Label(parent_frame, image=tk_image)
-                return img_label
+            if PILLOW_AVAILABLE and self.image_loader:
+                # Indicateur affiché tout de suite ; la miniature est chargée en arrière-plan
+                placeholder = tk.Label(
+                    parent_frame,
+                    text="⏳",
+                    width=15, height=8,
+                    bg="#eeeeee",
+                    font=("Arial", 10)
+                )
+                self.image_labels.setdefault(card.img, []).append(placeholder)
+                self.tile_sources[-1] = card.img
+                return placeholder
             else:
                 # Fallback sans PIL - juste un placeholder avec le nom du fichier
                 filename = os.path.basename(card.img)
@@ -463,6 +554,8 @@ class DeckViewerWindow:
             
     def refresh_deck(self):
         """Actualise l'affichage du deck."""
+        if self.image_loader:
+            self.image_loader.cancel()
         self.images.clear()  # Vider le cache d'images
         
         # Trouver le frame des acteurs et le mettre à jour
@@ -477,6 +570,8 @@ class DeckViewerWindow:
         
     def on_close(self):
         """Gestionnaire de fermeture de fenêtre."""
+        if self.image_loader:
+            self.image_loader.shutdown()
         self.images.clear()  # Libérer la mémoire
         self.window.destroy()
 
@@ -5,7 +5,6 @@ Gestionnaire des favoris de formatage
 Gère la logique métier pour les favoris de formatage de texte
 """
 
-import sqlite3
 from pathlib import Path
 from datetime import datetime
 
@@ -14,14 +13,16 @@ try:
     from .database import (
         save_formatting_favorite, get_formatting_favorite,
         list_formatting_favorites, delete_formatting_favorite,
-        validate_formatting_data
+        validate_formatting_data, CardRepo, FORMATTING_DEFAULTS
     )
+    from .db_connection import get_connection_manager
 except ImportError:
     from database import (
         save_formatting_favorite, get_formatting_favorite,
         list_formatting_favorites, delete_formatting_favorite,
-        validate_formatting_data
+        validate_formatting_data, CardRepo, FORMATTING_DEFAULTS
     )
+    from db_connection import get_connection_manager
 
 
 class FavoritesManager:
@@ -38,9 +39,9 @@ class FavoritesManager:
             if not Path(self.db_path).exists():
                 raise FileNotFoundError(f"Base de données introuvable: {self.db_path}")
             
-            # Test de connexion
-            con = sqlite3.connect(self.db_path)
-            con.close()
+            # Test de connexion (via le pool partagé)
+            with get_connection_manager(self.db_path).read() as con:
+                con.execute("SELECT 1")
             
         except Exception as e:
             print(f"❌ Erreur accès base de données: {e}")
@@ -118,6 +119,32 @@ class FavoritesManager:
             print(f"❌ {error_msg}")
             return None, error_msg
     
+    def apply_favorite_to_cards(self, slot_number: int, card_ids) -> tuple[int, str]:
+        """
+        Applique un favori à plusieurs cartes en une seule transaction.
+        
+        Args:
+            slot_number: Numéro du slot (1, 2 ou 3)
+            card_ids: Identifiants des cartes à mettre à jour
+            
+        Returns:
+            tuple[int, str]: (nombre de cartes mises à jour, message)
+        """
+        favorite, message = self.load_favorite(slot_number)
+        if not favorite:
+            return 0, message
+        
+        fields = {name: favorite[name] for name in FORMATTING_DEFAULTS if favorite.get(name) is not None}
+        try:
+            updated = CardRepo(self.db_path).update_fields_many(
+                (card_id, fields) for card_id in card_ids
+            )
+            return updated, f"Favori '{favorite['name']}' appliqué à {updated} carte(s)"
+        except Exception as e:
+            error_msg = f"Erreur application favori: {e}"
+            print(f"❌ {error_msg}")
+            return 0, error_msg
+    
     def get_all_favorites_status(self) -> dict:
         """
         Récupère l'état de tous les slots.
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🔤 INDEX ET CACHE DES POLICES
+=============================
+
+Partagés par tout le processus :
+- index des fichiers du dossier fonts/ (un seul parcours du dossier,
+  reconstruit quand la date de modification d'un de ses dossiers change)
+- cache LRU des objets ImageFont.FreeTypeFont par (chemin, taille),
+  avec compteurs de succès/échecs
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from PIL import ImageFont
+
+# Sous-dossiers prioritaires de fonts/ (même ordre que la recherche historique)
+FONT_SUBDIRS = ("titre", "texte", "special")
+
+# Nombre maximal de (police, taille) gardés en mémoire
+FONT_CACHE_SIZE = 64
+
+# Délai (secondes) pendant lequel l'index est utilisé sans revérifier les dossiers
+FONT_INDEX_CHECK_INTERVAL = 1.0
+
+
+class FontIndex:
+    """Index nom de police -> fichier, construit en un seul parcours de fonts/."""
+
+    def __init__(self, fonts_dir: str = "fonts"):
+        self.fonts_dir = Path(fonts_dir)
+        self._by_name: Dict[str, str] = {}
+        self._files: List[str] = []
+        self._dir_names: Dict[str, Dict[str, str]] = {}
+        self._dir_mtimes: Dict[str, Optional[int]] = {}
+        self.version = ""
+        self.checked_at = 0.0
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Reconstruit l'index (après ajout ou suppression de polices)."""
+        by_name: Dict[str, str] = {}
+        files: List[str] = []
+        dir_names: Dict[str, Dict[str, str]] = {}
+        dir_mtimes: Dict[str, Optional[int]] = {}
+
+        def add(path: Path) -> None:
+            if path.is_file() and path.suffix.lower() in (".ttf", ".otf"):
+                by_name.setdefault(path.stem.lower(), str(path))
+                if str(path) not in seen:
+                    seen.add(str(path))
+                    files.append(str(path))
+
+        def scan_dir(label: str, directory: Path) -> None:
+            # Fichiers d'un dossier prioritaire, par nom exact (casse du système)
+            names = dir_names.setdefault(label, {})
+            for path in sorted(directory.iterdir()):
+                add(path)
+                if path.is_file():
+                    names[os.path.normcase(path.name)] = path.name
+
+        def stat_dir(directory: Path) -> None:
+            try:
+                dir_mtimes[str(directory)] = os.stat(directory).st_mtime_ns
+            except OSError:
+                dir_mtimes[str(directory)] = None
+
+        seen = set()
+        stat_dir(self.fonts_dir)
+        if self.fonts_dir.is_dir():
+            # 1. Sous-dossiers prioritaires, 2. racine de fonts/, 3. tout le reste
+            for subdir in FONT_SUBDIRS:
+                subdir_path = self.fonts_dir / subdir
+                if subdir_path.is_dir():
+                    scan_dir(subdir, subdir_path)
+            scan_dir("", self.fonts_dir)
+            for path in sorted(self.fonts_dir.rglob("*")):
+                if path.is_dir():
+                    stat_dir(path)
+                else:
+                    add(path)
+
+        self._by_name = by_name
+        self._files = files
+        self._dir_names = dir_names
+        self._dir_mtimes = dir_mtimes
+        self.checked_at = time.monotonic()
+        # Empreinte de la liste des polices : change dès qu'une police est ajoutée ou retirée
+        self.version = hashlib.sha1("\n".join(files).encode('utf-8')).hexdigest()
+
+    def is_stale(self) -> bool:
+        """True si un dossier indexé a changé (fichier ou dossier ajouté, retiré, renommé)."""
+        for directory, mtime in self._dir_mtimes.items():
+            try:
+                current = os.stat(directory).st_mtime_ns
+            except OSError:
+                current = None
+            if current != mtime:
+                return True
+        return False
+
+    def revalidate(self, max_age: float = 0.0) -> None:
+        """Reconstruit l'index si un dossier a changé depuis plus de max_age secondes."""
+        now = time.monotonic()
+        if now - self.checked_at < max_age:
+            return
+        if self.is_stale():
+            self.refresh()
+        else:
+            self.checked_at = now
+
+    def resolve(self, font_name: str) -> Optional[str]:
+        """
+        Chemin fonts/<dossier>/<nom>.<ext> d'une police, par nom exact.
+
+        Même recherche que l'export Lua historique : sous-dossiers titre,
+        texte, special puis racine de fonts/, extension .ttf puis .otf.
+        """
+        for label in FONT_SUBDIRS + ("",):
+            names = self._dir_names.get(label)
+            if not names:
+                continue
+            for ext in (".ttf", ".otf"):
+                if os.path.normcase(f"{font_name}{ext}") in names:
+                    return str(self.fonts_dir / label / f"{font_name}{ext}")
+        return None
+
+    def find(self, font_name: str) -> Optional[str]:
+        """Chemin du fichier d'une police (nom sans extension, casse ignorée)."""
+        clean_name = font_name.replace("🎨 ", "").strip()
+        for suffix in (".ttf", ".otf"):
+            if clean_name.lower().endswith(suffix):
+                clean_name = clean_name[:-len(suffix)]
+        return self._by_name.get(clean_name.lower())
+
+    def files(self) -> List[str]:
+        """Tous les fichiers de police indexés."""
+        return list(self._files)
+
+
+_indexes: Dict[str, FontIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_font_index(fonts_dir: str = "fonts", max_age: float = FONT_INDEX_CHECK_INTERVAL) -> FontIndex:
+    """
+    Retourne l'index partagé du dossier de polices.
+
+    Construit au premier appel ; ensuite, au plus toutes les max_age secondes,
+    les dates de modification des dossiers sont comparées et l'index est
+    reconstruit si une police a été ajoutée ou retirée (max_age=0 : vérifier
+    maintenant, par exemple au début d'une exportation).
+    """
+    key = os.path.normcase(os.path.abspath(fonts_dir))
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = FontIndex(fonts_dir)
+            _indexes[key] = index
+        else:
+            index.revalidate(max_age)
+        return index
+
+
+# ======================= Cache des objets FreeTypeFont =======================
+
+_font_cache: "OrderedDict[tuple, ImageFont.FreeTypeFont]" = OrderedDict()
+_font_cache_lock = threading.Lock()
+_font_cache_stats = {'hits': 0, 'misses': 0}
+
+
+def load_truetype(font_path: str, size: int) -> ImageFont.FreeTypeFont:
+    """
+    Équivalent mis en cache de ImageFont.truetype(font_path, size).
+
+    Les polices sont partagées : ne pas modifier l'objet retourné.
+    """
+    key = (font_path, size)
+    with _font_cache_lock:
+        font = _font_cache.get(key)
+        if font is not None:
+            _font_cache.move_to_end(key)
+            _font_cache_stats['hits'] += 1
+            return font
+        _font_cache_stats['misses'] += 1
+
+    font = ImageFont.truetype(font_path, size)
+    with _font_cache_lock:
+        _font_cache[key] = font
+        _font_cache.move_to_end(key)
+        while len(_font_cache) > FONT_CACHE_SIZE:
+            _font_cache.popitem(last=False)
+    return font
+
+
+def font_cache_stats() -> Dict[str, int]:
+    """Compteurs du cache de polices du processus : succès, échecs, entrées."""
+    with _font_cache_lock:
+        return {**_font_cache_stats, 'size': len(_font_cache)}
+
+
+def clear_font_cache() -> None:
+    """Vide le cache de polices et remet les compteurs à zéro."""
+    with _font_cache_lock:
+        _font_cache.clear()
+        _font_cache_stats['hits'] = 0
+        _font_cache_stats['misses'] = 0
@@ -13,32 +13,329 @@ Crée un package ZIP structuré contenant :
 Prêt pour intégration dans un projet Love2D
 """
 
+import hashlib
+import io
 import os
 import zipfile
 import shutil
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Dict, Set, Optional
+from typing import List, Dict, Set, Optional, Callable
 import json
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from PIL import Image, ImageDraw, ImageFont
 import logging
 
 try:
     # Import avec préfixe de module pour intégration UI
     from .database import CardRepo
-    from .font_manager import FontManager
+    from .font_manager import get_font_manager
+    from .font_index import get_font_index, load_truetype, font_cache_stats
+    from .text_layout import wrap_text, layout_card_text, default_font
     from .config import DB_FILE
     from .lua_exporter_love2d import sanitize_filename
+    from .render_cache import RenderCache, get_render_cache, render_key, file_signature
+    from .texture_atlas import build_atlas, atlas_data_lua, ATLAS_LOADER_LUA, DEFAULT_MAX_SHEET_SIZE, DEFAULT_PADDING
 except ImportError:
     # Import direct pour utilisation standalone
     from database import CardRepo
-    from font_manager import FontManager
+    from font_manager import get_font_manager
+    from font_index import get_font_index, load_truetype, font_cache_stats
+    from text_layout import wrap_text, layout_card_text, default_font
     from config import DB_FILE
     from lua_exporter_love2d import sanitize_filename
+    from render_cache import RenderCache, get_render_cache, render_key, file_signature
+    from texture_atlas import build_atlas, atlas_data_lua, ATLAS_LOADER_LUA, DEFAULT_MAX_SHEET_SIZE, DEFAULT_PADDING
+
+# En dessous de ce nombre de cartes, le rendu reste dans le processus courant
+# (le démarrage des processus coûterait plus cher que le rendu lui-même)
+PARALLEL_RENDER_MIN_CARDS = 8
+
+# Chemins de polices résolus, partagés par tous les exporteurs du processus ;
+# valables pour une version de l'index du dossier fonts/ (vidés quand elle change)
+_resolved_font_paths: Dict[str, Optional[str]] = {}
+_resolved_fonts_version: Optional[str] = None
+_resolved_font_paths_lock = threading.Lock()
+
+
+def _font_paths_for(fonts_version: str) -> Dict[str, Optional[str]]:
+    """Chemins mémorisés pour cette version de fonts/ (oubliés si une police a été ajoutée ou retirée)."""
+    global _resolved_fonts_version
+    with _resolved_font_paths_lock:
+        if fonts_version != _resolved_fonts_version:
+            _resolved_font_paths.clear()
+            _resolved_fonts_version = fonts_version
+        return _resolved_font_paths
+
+def find_windows_system_font(font_name: str) -> Optional[str]:
+    """
+    Trouve une police dans le dossier système Windows.
+    
+    Args:
+        font_name: Nom de la police
+        
+    Returns:
+        Chemin vers la police système ou None
+    """
+    windows_fonts_dir = Path("C:/Windows/Fonts")
+    if not windows_fonts_dir.exists():
+        return None
+    
+    # Mapping des noms de polices vers leurs fichiers
+    system_font_mapping = {
+        "Arial": ["arial.ttf", "Arial.ttf"],
+        "Times New Roman": ["times.ttf", "timesbd.ttf", "Times New Roman.ttf"],
+        "Courier New": ["cour.ttf", "Courier New.ttf"],
+        "Verdana": ["verdana.ttf", "Verdana.ttf"],
+        "Calibri": ["calibri.ttf", "Calibri.ttf"],
+        "Cambria": ["cambria.ttc", "cambria.ttf", "Cambria.ttf"],
+        "Tahoma": ["tahoma.ttf", "Tahoma.ttf"],
+        "Georgia": ["georgia.ttf", "Georgia.ttf"],
+        "Comic Sans MS": ["comic.ttf", "Comic Sans MS.ttf"],
+        "Impact": ["impact.ttf", "Impact.ttf"],
+        "Trebuchet MS": ["trebuc.ttf", "Trebuchet MS.ttf"],
+        "Segoe UI": ["segoeui.ttf", "Segoe UI.ttf"],
+        "Microsoft Sans Serif": ["micross.ttf", "Microsoft Sans Serif.ttf"]
+    }
+    
+    if font_name in system_font_mapping:
+        for font_filename in system_font_mapping[font_name]:
+            font_path = windows_fonts_dir / font_filename
+            if font_path.exists():
+                return str(font_path)
+    
+    # Recherche générale dans le dossier Windows Fonts
+    for ext in [".ttf", ".ttc", ".otf", ".TTF", ".TTC", ".OTF"]:
+        font_path = windows_fonts_dir / f"{font_name}{ext}"
+        if font_path.exists():
+            return str(font_path)
+    
+    return None
+
+
+def resolve_card_font_path(font_name: str) -> Optional[str]:
+    """
+    Trouve le fichier utilisé pour dessiner une police sur les cartes.
+    
+    Partagé par le rendu des images du package et l'aperçu de l'éditeur de
+    formatage. Ordre : FontManager, dossier fonts/ (index), polices système
+    Windows. Résultat mémorisé tant que l'index du dossier fonts/ ne change pas.
+    """
+    font_paths = _font_paths_for(get_font_index().version)
+    if font_name in font_paths:
+        return font_paths[font_name]
+    
+    # Nettoyer le nom de police (enlever l'emoji et espaces)
+    clean_font_name = font_name.replace("🎨 ", "").strip()
+    font_path = None
+    
+    # D'abord essayer d'utiliser le FontManager
+    try:
+        candidate = get_font_manager().get_font_path(clean_font_name)
+        if candidate and os.path.exists(candidate):
+            logging.info(f"Police trouvée via FontManager: {candidate}")
+            font_path = candidate
+    except Exception as e:
+        logging.warning(f"FontManager failed for {clean_font_name}: {e}")
+    
+    # Essayer une police personnalisée
+    if not font_path:
+        candidate = get_font_index().find(clean_font_name)
+        if candidate and os.path.exists(candidate):
+            logging.info(f"Police trouvée: {candidate}")
+            font_path = candidate
+        else:
+            logging.warning(f"Police personnalisée '{clean_font_name}' non trouvée dans le dossier fonts/")
+    
+    # Essayer les polices système Windows
+    if not font_path and os.name == 'nt':
+        font_path = find_windows_system_font(clean_font_name)
+        if font_path:
+            logging.info(f"Police système trouvée: {font_path}")
+    
+    font_paths[font_name] = font_path
+    return font_path
+
+
+def load_card_font(font_name: str, size: int) -> ImageFont.FreeTypeFont:
+    """
+    Police PIL d'un élément de carte (titre, texte, énergie).
+    
+    Utilisée pour dessiner les images du package et pour mesurer le texte
+    de l'aperçu : les deux mettent le texte en page avec la même police.
+    Police par défaut de PIL à la taille demandée si le fichier est introuvable.
+    """
+    try:
+        font_path = resolve_card_font_path(font_name)
+        if font_path:
+            return load_truetype(font_path, size)
+        logging.warning(f"Police '{font_name}' non trouvée, utilisation de la police par défaut")
+    except Exception as e:
+        logging.error(f"Erreur lors du chargement de la police '{font_name}': {e}")
+    return default_font(size)
+
+
+# Champs de la carte qui influencent l'image fusionnée (clé du cache de rendu)
+RENDERED_CARD_FIELDS = (
+    'name', 'description', 'powerblow',
+    'title_x', 'title_y', 'title_font', 'title_size', 'title_color',
+    'text_x', 'text_y', 'text_width', 'text_height', 'text_font', 'text_size', 'text_color',
+    'text_align', 'line_spacing', 'text_wrap',
+    'energy_x', 'energy_y', 'energy_font', 'energy_size', 'energy_color',
+)
+
+# Tampon des entrées texte écrites en flux dans l'archive
+TEXT_ENTRY_BUFFER = 1024 * 1024
+
+# Formats déjà compressés : stockés tels quels dans le ZIP (pas de re-deflate)
+STORED_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.ttf', '.otf', '.woff', '.woff2'}
+
+
+class PackageWriter:
+    """
+    Écrit un package directement dans l'archive ZIP, sans dossier temporaire.
+    
+    Les images et polices (déjà compressées) sont stockées, le texte (Lua,
+    documentation) est compressé. L'archive est écrite dans un fichier
+    .part puis renommée, pour ne jamais laisser de package incomplet.
+    """
+    
+    def __init__(self, zip_path: Path):
+        self.zip_path = Path(zip_path)
+        self._part_path = self.zip_path.with_name(self.zip_path.name + ".part")
+        self._zip: Optional[zipfile.ZipFile] = None
+        # Empreinte de chaque entrée écrite {arcname: {'sha256', 'size'}}
+        self.files: Dict[str, Dict] = {}
+    
+    def __enter__(self) -> "PackageWriter":
+        self._zip = zipfile.ZipFile(self._part_path, 'w', zipfile.ZIP_DEFLATED)
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._zip.close()
+        if exc_type is None:
+            os.replace(self._part_path, self.zip_path)
+        else:
+            self._part_path.unlink(missing_ok=True)
+    
+    @staticmethod
+    def compression_for(arcname: str) -> int:
+        """Mode de compression d'une entrée selon son extension."""
+        if os.path.splitext(arcname)[1].lower() in STORED_EXTENSIONS:
+            return zipfile.ZIP_STORED
+        return zipfile.ZIP_DEFLATED
+    
+    def write_bytes(self, arcname: str, data: bytes) -> None:
+        """Ajoute une entrée depuis un tampon mémoire."""
+        self._zip.writestr(arcname, data, compress_type=self.compression_for(arcname))
+        self.files[arcname] = {'sha256': hashlib.sha256(data).hexdigest(), 'size': len(data)}
+    
+    def write_text(self, arcname: str, text: str) -> None:
+        """Ajoute une entrée texte (UTF-8)."""
+        self.write_bytes(arcname, text.encode('utf-8'))
+    
+    @contextmanager
+    def open_text(self, arcname: str):
+        """
+        Entrée texte (UTF-8) écrite en flux dans l'archive.
+        
+        Le texte n'est jamais assemblé en mémoire ; l'empreinte et la taille
+        sont calculées au fil de l'écriture.
+        
+        Exemple : with package.open_text("cards_data.lua") as stream: stream.write(...)
+        """
+        info = zipfile.ZipInfo(arcname, date_time=time.localtime(time.time())[:6])
+        info.compress_type = self.compression_for(arcname)
+        info.external_attr = 0o600 << 16
+        with self._zip.open(info, 'w') as entry:
+            hashing = _HashingWriter(entry)
+            stream = io.TextIOWrapper(io.BufferedWriter(hashing, TEXT_ENTRY_BUFFER),
+                                      encoding='utf-8', newline='\n')
+            yield stream
+            stream.flush()
+            stream.detach()
+        self.files[arcname] = {'sha256': hashing.digest.hexdigest(), 'size': hashing.size}
+    
+    def write_text_chunks(self, arcname: str, chunks) -> int:
+        """Ajoute une entrée texte produite morceau par morceau ; retourne le nombre de caractères."""
+        written = 0
+        with self.open_text(arcname) as stream:
+            for chunk in chunks:
+                stream.write(chunk)
+                written += len(chunk)
+        return written
+    
+    def write_file(self, arcname: str, path: str) -> None:
+        """Ajoute un fichier existant (ex: police) sans copie intermédiaire."""
+        self._zip.write(path, arcname, compress_type=self.compression_for(arcname))
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        self.files[arcname] = {'sha256': digest.hexdigest(), 'size': os.path.getsize(path)}
+    
+    def build_id(self) -> str:
+        """Identifiant du build : empreinte de toutes les entrées écrites."""
+        digest = hashlib.sha256()
+        for arcname in sorted(self.files):
+            digest.update(f"{arcname}\0{self.files[arcname]['sha256']}\n".encode('utf-8'))
+        return digest.hexdigest()
+
+
+class _HashingWriter(io.RawIOBase):
+    """Flux binaire qui transmet les octets à une entrée ZIP en calculant leur empreinte."""
+    
+    def __init__(self, target):
+        self.target = target
+        self.digest = hashlib.sha256()
+        self.size = 0
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        self.target.write(data)
+        self.digest.update(data)
+        self.size += len(data)
+        return len(data)
+
+
+# Fichier du package qui porte le manifeste (exclu du manifeste lui-même)
+PACKAGE_CONFIG_FILE = "package_config.json"
+
+# Version du format de manifeste
+MANIFEST_FORMAT = 1
+
+
+def read_package_manifest(zip_path) -> Optional[Dict]:
+    """
+    Lit le manifeste d'un package existant.
+    
+    Returns:
+        Manifeste {'build_id', 'files', 'cards', ...} ou None si absent/illisible
+    """
+    try:
+        with zipfile.ZipFile(zip_path) as zf:
+            config = json.loads(zf.read(PACKAGE_CONFIG_FILE).decode('utf-8'))
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return None
+    manifest = config.get("manifest")
+    if not manifest or manifest.get("format") != MANIFEST_FORMAT:
+        return None
+    return manifest
 
 class GamePackageExporter:
     """Exporteur de package de jeu complet."""
     
-    def __init__(self, repo: CardRepo, output_dir: str = "game_packages", export_type: str = "complete"):
+    def __init__(self, repo: CardRepo, output_dir: str = "game_packages", export_type: str = "complete",
+                 workers: Optional[int] = None, render_cache: Optional[RenderCache] = None,
+                 use_render_cache: bool = True, atlas: bool = False,
+                 atlas_max_size: int = DEFAULT_MAX_SHEET_SIZE, atlas_padding: int = DEFAULT_PADDING,
+                 lua_chunk_size: Optional[int] = None, lua_group_by: str = "id",
+                 lua_profile: str = "verbose"):
         """
         Initialise l'exporteur de package.
         
@@ -46,17 +343,55 @@ class GamePackageExporter:
             repo: Repository des cartes
             output_dir: Dossier de sortie pour les packages
             export_type: Type d'export ("complete" = avec texte, "template" = template seul)
+            workers: Nombre de processus pour le rendu des images
+                     (None = nombre de cœurs, 1 = rendu séquentiel)
+            render_cache: Cache de rendu à utiliser (défaut : images/.cache partagé)
+            use_render_cache: False pour toujours re-rendre les images
+            atlas: Regrouper les images des cartes dans des planches (atlas/)
+                   au lieu d'un PNG par carte dans cards/
+            atlas_max_size: Taille maximale d'une planche (puissance de deux)
+            atlas_padding: Marge autour de chaque carte dans une planche
+            lua_chunk_size: Si donné, données Lua découpées en modules de ce
+                            nombre de cartes (cards_chunks/) chargés à la demande
+                            par cards_index.lua ; None = fichier cards_data.lua unique
+            lua_group_by: Regroupement des morceaux : "id", "rarity" ou "actor"
+            lua_profile: "verbose" (commenté, indenté) ou "compact" (valeurs par
+                         défaut partagées via setmetatable, champs par défaut omis)
         """
         self.repo = repo
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         self.export_type = export_type  # "complete" ou "template"
+        self.workers = workers
+        self.atlas = atlas
+        self.atlas_max_size = atlas_max_size
+        self.atlas_padding = atlas_padding
+        self.lua_chunk_size = lua_chunk_size
+        self.lua_group_by = lua_group_by
+        self.lua_profile = lua_profile
+        if use_render_cache:
+            self.render_cache = render_cache or get_render_cache()
+        else:
+            self.render_cache = None
+        
+        # Erreurs de rendu du dernier export : [{'card_id', 'name', 'image', 'error'}]
+        self.render_errors: List[Dict] = []
+        # Images du dernier export reprises du cache de rendu / du build précédent
+        self.cached_images = 0
+        self.reused_images = 0
+        # Cache de polices pendant le dernier rendu (tous processus confondus)
+        self.font_cache_hits = 0
+        self.font_cache_misses = 0
+        # Manifeste des cartes du dernier export {card_id: {'image', 'render_key'}}
+        self.card_manifest: Dict[str, Dict] = {}
+        # Bilan du dernier export par rapport au build précédent
+        self.delta_report: Dict = {}
         
         # Configuration du logging pour les diagnostics
         logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
         
-        # Gestionnaire de polices
-        self.font_manager = FontManager()
+        # Gestionnaire de polices (partagé par le processus)
+        self.font_manager = get_font_manager()
         try:
             font_info = self.font_manager.get_font_info()
             logging.info(f"FontManager initialisé: {font_info.get('total_fonts', 0)} polices disponibles")
@@ -119,114 +454,126 @@ class GamePackageExporter:
             True si succès, False sinon
         """
         try:
-            # Dimensions standard d'une carte Love2D
-            card_width = 280
-            card_height = 392
-            
-            # Créer une image de base
-            if hasattr(card, 'img') and card.img and os.path.exists(card.img):
-                # Charger l'image de base de la carte
-                base_image = Image.open(card.img)
-                base_image = base_image.resize((card_width, card_height), Image.Resampling.LANCZOS)
-            else:
-                # Créer une image par défaut
-                base_image = Image.new('RGB', (card_width, card_height), color='#f0f0f0')
-            
-            # Créer un objet de dessin
-            draw = ImageDraw.Draw(base_image)
-            
-            # Ajouter le titre
-            if hasattr(card, 'name') and card.name:
-                try:
-                    # Charger la police du titre
-                    title_font_size = getattr(card, 'title_size', 16)
-                    title_font_name = getattr(card, 'title_font', 'Arial')
-                    
-                    logging.info(f"Chargement police titre: '{title_font_name}' taille {title_font_size}")
-                    
-                    # Essayer de charger la police
-                    title_font = self._load_font_for_image(title_font_name, title_font_size)
-                    
-                    # Position du titre
-                    title_x = getattr(card, 'title_x', 20)
-                    title_y = getattr(card, 'title_y', 20)
-                    title_color = getattr(card, 'title_color', '#000000')
-                    
-                    logging.info(f"Dessin titre '{card.name}' à ({title_x}, {title_y}) couleur {title_color}")
-                    
-                    # Dessiner le titre
-                    draw.text((title_x, title_y), card.name, 
-                             font=title_font, fill=title_color)
-                    
-                except Exception as e:
-                    logging.warning(f"Erreur lors de l'ajout du titre: {e}")
-            
-            # Ajouter le coût d'énergie
-            if hasattr(card, 'powerblow') and card.powerblow is not None:
-                try:
-                    energy_font_size = getattr(card, 'energy_size', 14)
-                    energy_font_name = getattr(card, 'energy_font', 'Arial')
-                    energy_font = self._load_font_for_image(energy_font_name, energy_font_size)
-                    
-                    energy_x = getattr(card, 'energy_x', card_width - 40)
-                    energy_y = getattr(card, 'energy_y', 20)
-                    energy_color = getattr(card, 'energy_color', '#0066cc')
-                    
-                    # Dessiner le coût d'énergie dans un cercle
-                    circle_radius = 15
-                    draw.ellipse([energy_x - circle_radius, energy_y - circle_radius,
-                                 energy_x + circle_radius, energy_y + circle_radius],
-                                fill='#ffffff', outline=energy_color, width=2)
-                    
-                    # Centrer le texte dans le cercle
-                    energy_text = str(card.powerblow)
-                    bbox = draw.textbbox((0, 0), energy_text, font=energy_font)
-                    text_width = bbox[2] - bbox[0]
-                    text_height = bbox[3] - bbox[1]
-                    
-                    draw.text((energy_x - text_width // 2, energy_y - text_height // 2),
-                             energy_text, font=energy_font, fill=energy_color)
-                    
-                except Exception as e:
-                    logging.warning(f"Erreur lors de l'ajout de l'énergie: {e}")
-            
-            # Ajouter la description (si elle rentre)
-            if hasattr(card, 'description') and card.description:
-                try:
-                    text_font_size = getattr(card, 'text_size', 12)
-                    text_font_name = getattr(card, 'text_font', 'Arial')
-                    
-                    logging.info(f"Chargement police texte: '{text_font_name}' taille {text_font_size}")
-                    
-                    text_font = self._load_font_for_image(text_font_name, text_font_size)
-                    
-                    text_x = getattr(card, 'text_x', 20)
-                    text_y = getattr(card, 'text_y', 200)
-                    text_width = getattr(card, 'text_width', card_width - 40)
-                    text_color = getattr(card, 'text_color', '#333333')
-                    
-                    logging.info(f"Dessin description à ({text_x}, {text_y}) largeur {text_width} couleur {text_color}")
-                    
-                    # Diviser le texte en lignes
-                    lines = self._wrap_text(card.description, text_font, text_width, draw)
-                    
-                    # Dessiner chaque ligne
-                    line_height = text_font_size + 2
-                    for i, line in enumerate(lines[:6]):  # Limiter à 6 lignes
-                        draw.text((text_x, text_y + i * line_height),
-                                 line, font=text_font, fill=text_color)
-                    
-                except Exception as e:
-                    logging.warning(f"Erreur lors de l'ajout de la description: {e}")
-            
-            # Sauvegarder l'image fusionnée
-            base_image.save(output_path, "PNG", quality=90)
+            self._save_card_image(self._render_fused_image(card), output_path)
             return True
             
         except Exception as e:
             logging.error(f"Erreur lors de la création de l'image fusionnée: {e}")
             return False
     
+    def _render_fused_image(self, card) -> Image.Image:
+        """Dessine l'image fusionnée (fond + titre + énergie + description) ; lève une exception en cas d'échec."""
+        # Dimensions standard d'une carte Love2D
+        card_width = 280
+        card_height = 392
+        
+        # Créer une image de base
+        if hasattr(card, 'img') and card.img and os.path.exists(card.img):
+            # Charger l'image de base de la carte
+            base_image = Image.open(card.img)
+            base_image = base_image.resize((card_width, card_height), Image.Resampling.LANCZOS)
+        else:
+            # Créer une image par défaut
+            base_image = Image.new('RGB', (card_width, card_height), color='#f0f0f0')
+        
+        # Créer un objet de dessin
+        draw = ImageDraw.Draw(base_image)
+        
+        # Ajouter le titre
+        if hasattr(card, 'name') and card.name:
+            try:
+                # Charger la police du titre
+                title_font_size = getattr(card, 'title_size', 16)
+                title_font_name = getattr(card, 'title_font', 'Arial')
+                
+                logging.info(f"Chargement police titre: '{title_font_name}' taille {title_font_size}")
+                
+                # Essayer de charger la police
+                title_font = self._load_font_for_image(title_font_name, title_font_size)
+                
+                # Position du titre
+                title_x = getattr(card, 'title_x', 20)
+                title_y = getattr(card, 'title_y', 20)
+                title_color = getattr(card, 'title_color', '#000000')
+                
+                logging.info(f"Dessin titre '{card.name}' à ({title_x}, {title_y}) couleur {title_color}")
+                
+                # Dessiner le titre
+                draw.text((title_x, title_y), card.name, 
+                         font=title_font, fill=title_color)
+                
+            except Exception as e:
+                logging.warning(f"Erreur lors de l'ajout du titre: {e}")
+        
+        # Ajouter le coût d'énergie
+        if hasattr(card, 'powerblow') and card.powerblow is not None:
+            try:
+                energy_font_size = getattr(card, 'energy_size', 14)
+                energy_font_name = getattr(card, 'energy_font', 'Arial')
+                energy_font = self._load_font_for_image(energy_font_name, energy_font_size)
+                
+                energy_x = getattr(card, 'energy_x', card_width - 40)
+                energy_y = getattr(card, 'energy_y', 20)
+                energy_color = getattr(card, 'energy_color', '#0066cc')
+                
+                # Dessiner le coût d'énergie dans un cercle
+                circle_radius = 15
+                draw.ellipse([energy_x - circle_radius, energy_y - circle_radius,
+                             energy_x + circle_radius, energy_y + circle_radius],
+                            fill='#ffffff', outline=energy_color, width=2)
+                
+                # Centrer le texte dans le cercle
+                energy_text = str(card.powerblow)
+                bbox = draw.textbbox((0, 0), energy_text, font=energy_font)
+                text_width = bbox[2] - bbox[0]
+                text_height = bbox[3] - bbox[1]
+                
+                draw.text((energy_x - text_width // 2, energy_y - text_height // 2),
+                         energy_text, font=energy_font, fill=energy_color)
+                
+            except Exception as e:
+                logging.warning(f"Erreur lors de l'ajout de l'énergie: {e}")
+        
+        # Ajouter la description (si elle rentre)
+        if hasattr(card, 'description') and card.description:
+            try:
+                text_x = getattr(card, 'text_x', 20)
+                text_y = getattr(card, 'text_y', 200)
+                text_color = getattr(card, 'text_color', '#333333')
+                
+                logging.info(f"Dessin description à ({text_x}, {text_y}) couleur {text_color}")
+                
+                # Mise en page commune avec l'aperçu de l'éditeur de formatage
+                text_font, boxes = self.layout_description(card)
+                
+                # Dessiner chaque ligne
+                for box in boxes:
+                    draw.text((text_x + box.x, text_y + box.y),
+                             box.text, font=text_font, fill=text_color)
+                
+            except Exception as e:
+                logging.warning(f"Erreur lors de l'ajout de la description: {e}")
+        
+        return base_image
+    
+    def layout_description(self, card):
+        """
+        Police et lignes de la description d'une carte (relatives à la zone de texte).
+        
+        Même mise en page que l'aperçu de l'éditeur : interligne, alignement,
+        hauteur de zone et retour à la ligne de la carte.
+        """
+        text_font_size = getattr(card, 'text_size', 12)
+        text_font = self._load_font_for_image(getattr(card, 'text_font', 'Arial'), text_font_size)
+        boxes = layout_card_text(
+            card.description, text_font, text_font_size,
+            getattr(card, 'text_width', 240), getattr(card, 'text_height', 150),
+            line_spacing=getattr(card, 'line_spacing', 1.2),
+            align=getattr(card, 'text_align', 'left'),
+            wrap=getattr(card, 'text_wrap', True),
+        )
+        return text_font, boxes
+    
     def _load_font_for_image(self, font_name: str, size: int) -> ImageFont.FreeTypeFont:
         """
         Charge une police pour PIL/ImageDraw.
@@ -238,84 +585,15 @@ class GamePackageExporter:
         Returns:
             Police chargée ou police par défaut
         """
-        try:
-            # Nettoyer le nom de police (enlever l'emoji et espaces)
-            clean_font_name = font_name.replace("🎨 ", "").strip()
-            
-            # D'abord essayer d'utiliser le FontManager
-            try:
-                font_path = self.font_manager.get_font_path(clean_font_name)
-                if font_path and os.path.exists(font_path):
-                    logging.info(f"Police trouvée via FontManager: {font_path}")
-                    return ImageFont.truetype(font_path, size)
-            except Exception as e:
-                logging.warning(f"FontManager failed for {clean_font_name}: {e}")
-            
-            # Essayer de charger une police personnalisée
-            font_path = self._find_font_file(clean_font_name)
-            if font_path and os.path.exists(font_path):
-                logging.info(f"Police trouvée: {font_path}")
-                return ImageFont.truetype(font_path, size)
-            
-            # Essayer les polices système Windows
-            if os.name == 'nt':
-                system_path = self._find_windows_system_font(clean_font_name)
-                if system_path:
-                    logging.info(f"Police système trouvée: {system_path}")
-                    return ImageFont.truetype(system_path, size)
-            
-            # Si rien ne fonctionne, utiliser la police par défaut
-            logging.warning(f"Police '{clean_font_name}' non trouvée, utilisation de la police par défaut")
-            return ImageFont.load_default()
-            
-        except Exception as e:
-            logging.error(f"Erreur lors du chargement de la police '{font_name}': {e}")
-            return ImageFont.load_default()
+        return load_card_font(font_name, size)
+    
+    def _resolve_font_path(self, font_name: str) -> Optional[str]:
+        """Trouve le fichier utilisé pour dessiner une police (voir resolve_card_font_path)."""
+        return resolve_card_font_path(font_name)
     
     def _find_windows_system_font(self, font_name: str) -> Optional[str]:
-        """
-        Trouve une police dans le dossier système Windows.
-        
-        Args:
-            font_name: Nom de la police
-            
-        Returns:
-            Chemin vers la police système ou None
-        """
-        windows_fonts_dir = Path("C:/Windows/Fonts")
-        if not windows_fonts_dir.exists():
-            return None
-        
-        # Mapping des noms de polices vers leurs fichiers
-        system_font_mapping = {
-            "Arial": ["arial.ttf", "Arial.ttf"],
-            "Times New Roman": ["times.ttf", "timesbd.ttf", "Times New Roman.ttf"],
-            "Courier New": ["cour.ttf", "Courier New.ttf"],
-            "Verdana": ["verdana.ttf", "Verdana.ttf"],
-            "Calibri": ["calibri.ttf", "Calibri.ttf"],
-            "Cambria": ["cambria.ttc", "cambria.ttf", "Cambria.ttf"],
-            "Tahoma": ["tahoma.ttf", "Tahoma.ttf"],
-            "Georgia": ["georgia.ttf", "Georgia.ttf"],
-            "Comic Sans MS": ["comic.ttf", "Comic Sans MS.ttf"],
-            "Impact": ["impact.ttf", "Impact.ttf"],
-            "Trebuchet MS": ["trebuc.ttf", "Trebuchet MS.ttf"],
-            "Segoe UI": ["segoeui.ttf", "Segoe UI.ttf"],
-            "Microsoft Sans Serif": ["micross.ttf", "Microsoft Sans Serif.ttf"]
-        }
-        
-        if font_name in system_font_mapping:
-            for font_filename in system_font_mapping[font_name]:
-                font_path = windows_fonts_dir / font_filename
-                if font_path.exists():
-                    return str(font_path)
-        
-        # Recherche générale dans le dossier Windows Fonts
-        for ext in [".ttf", ".ttc", ".otf", ".TTF", ".TTC", ".OTF"]:
-            font_path = windows_fonts_dir / f"{font_name}{ext}"
-            if font_path.exists():
-                return str(font_path)
-        
-        return None
+        """Trouve une police dans le dossier système Windows (voir find_windows_system_font)."""
+        return find_windows_system_font(font_name)
     
     def _find_font_file(self, font_name: str) -> Optional[str]:
         """
@@ -330,37 +608,10 @@ class GamePackageExporter:
         # Nettoyer le nom de police pour supprimer le préfixe 🎨
         clean_font_name = font_name.replace("🎨 ", "").strip()
         
-        # 1. Chercher dans le dossier fonts personnalisées
-        fonts_dir = Path("fonts")
-        
-        # Chercher dans tous les sous-dossiers
-        for subdir in ["titre", "texte", "special"]:
-            subdir_path = fonts_dir / subdir
-            if subdir_path.exists():
-                for ext in [".ttf", ".otf", ".TTF", ".OTF"]:
-                    font_file = subdir_path / f"{clean_font_name}{ext}"
-                    if font_file.exists():
-                        logging.info(f"Police personnalisée trouvée: {font_file}")
-                        return str(font_file)
-        
-        # 2. Chercher dans le dossier fonts racine
-        if fonts_dir.exists():
-            for ext in [".ttf", ".otf", ".TTF", ".OTF"]:
-                font_file = fonts_dir / f"{clean_font_name}{ext}"
-                if font_file.exists():
-                    logging.info(f"Police trouvée dans fonts/: {font_file}")
-                    return str(font_file)
-        
-        # 3. Chercher récursivement dans tous les sous-dossiers de fonts
-        if fonts_dir.exists():
-            for font_file in fonts_dir.rglob("*"):
-                if font_file.is_file() and font_file.suffix.lower() in ['.ttf', '.otf']:
-                    # Vérifier si le nom correspond (avec ou sans extension)
-                    if (font_file.stem.lower() == clean_font_name.lower() or 
-                        font_file.name.lower() == f"{clean_font_name.lower()}.ttf" or
-                        font_file.name.lower() == f"{clean_font_name.lower()}.otf"):
-                        logging.info(f"Police trouvée (recherche récursive): {font_file}")
-                        return str(font_file)
+        # Index du dossier fonts/ (sous-dossiers titre/texte/special, racine, puis le reste)
+        font_file = get_font_index().find(clean_font_name)
+        if font_file:
+            return font_file
         
         logging.warning(f"Police personnalisée '{clean_font_name}' non trouvée dans le dossier fonts/")
         return None
@@ -463,26 +714,7 @@ class GamePackageExporter:
         Returns:
             Liste des lignes
         """
-        words = text.split()
-        lines = []
-        current_line = ""
-        
-        for word in words:
-            test_line = current_line + (" " if current_line else "") + word
-            bbox = draw.textbbox((0, 0), test_line, font=font)
-            line_width = bbox[2] - bbox[0]
-            
-            if line_width <= max_width:
-                current_line = test_line
-            else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = word
-        
-        if current_line:
-            lines.append(current_line)
-        
-        return lines
+        return [line for line, _ in wrap_text(text, font, max_width)]
     
     def create_template_card_image(self, card, output_path: str) -> bool:
         """
@@ -496,46 +728,207 @@ class GamePackageExporter:
             True si succès, False sinon
         """
         try:
-            # Dimensions standard d'une carte Love2D
-            card_width = 280
-            card_height = 392
-            
-            # Créer une image de base (template seul)
-            if hasattr(card, 'img') and card.img and os.path.exists(card.img):
-                # Charger l'image de base de la carte (template/fond)
-                base_image = Image.open(card.img)
-                base_image = base_image.resize((card_width, card_height), Image.Resampling.LANCZOS)
-            else:
-                # Créer une image par défaut
-                base_image = Image.new('RGB', (card_width, card_height), color='#f0f0f0')
-            
-            # Pour le template, on ne dessine RIEN par-dessus
-            # L'image reste juste le fond/template original
-            # Le texte sera positionné dynamiquement dans Love2D
-            
-            # Sauvegarder l'image template
-            base_image.save(output_path, "PNG", quality=90)
+            self._save_card_image(self._render_template_image(card), output_path)
             return True
             
         except Exception as e:
             logging.error(f"Erreur lors de la création de l'image template: {e}")
             return False
+    
+    def _render_template_image(self, card) -> Image.Image:
+        """Charge et redimensionne le fond de la carte, sans texte ; lève une exception en cas d'échec."""
+        # Dimensions standard d'une carte Love2D
+        card_width = 280
+        card_height = 392
+        
+        # Créer une image de base (template seul)
+        if hasattr(card, 'img') and card.img and os.path.exists(card.img):
+            # Charger l'image de base de la carte (template/fond)
+            base_image = Image.open(card.img)
+            base_image = base_image.resize((card_width, card_height), Image.Resampling.LANCZOS)
+        else:
+            # Créer une image par défaut
+            base_image = Image.new('RGB', (card_width, card_height), color='#f0f0f0')
+        
+        # Pour le template, on ne dessine RIEN par-dessus
+        # L'image reste juste le fond/template original
+        # Le texte sera positionné dynamiquement dans Love2D
+        return base_image
+    
+    @staticmethod
+    def _save_card_image(image: Image.Image, output) -> None:
+        """Enregistre une image de carte au format PNG (chemin ou tampon)."""
+        image.save(output, "PNG", quality=90)
+    
+    def render_card_image(self, card) -> Image.Image:
+        """
+        Rend l'image d'une carte selon le type d'export.
+        
+        Contrairement à create_*_card_image, les erreurs sont propagées
+        pour pouvoir être collectées carte par carte.
+        """
+        if self.export_type == "template":
+            return self._render_template_image(card)
+        return self._render_fused_image(card)
+    
+    def render_card_file(self, card, output_path: str) -> None:
+        """Rend l'image d'une carte et l'enregistre sur disque."""
+        self._save_card_image(self.render_card_image(card), output_path)
+    
+    def render_cache_key(self, card) -> str:
+        """
+        Clé du cache de rendu : image source, type d'export et, pour l'export
+        complet, textes, formatage et fichiers de police de la carte.
+        """
+        parts = [file_signature(getattr(card, 'img', None))]
+        if self.export_type != "template":
+            parts.append({field: getattr(card, field, None) for field in RENDERED_CARD_FIELDS})
+            fonts = sorted({getattr(card, attr, None) or 'Arial'
+                            for attr in ('title_font', 'text_font', 'energy_font')})
+            parts.append({font: file_signature(self._resolve_font_path(font)) for font in fonts})
+        return render_key(f"package-{self.export_type}", *parts)
+    
+    def render_card_png(self, card) -> bytes:
+        """Rend l'image d'une carte et retourne le PNG encodé (depuis le cache si possible)."""
+        cache_key = self.render_cache_key(card) if self.render_cache else None
+        if cache_key:
+            data = self.render_cache.get(cache_key)
+            if data is not None:
+                return data
+        
+        buffer = io.BytesIO()
+        self._save_card_image(self.render_card_image(card), buffer)
+        data = buffer.getvalue()
+        
+        if cache_key:
+            try:
+                self.render_cache.put(cache_key, data)
+            except OSError as e:
+                logging.warning(f"Impossible d'enregistrer le rendu en cache: {e}")
+        return data
+    
+    def _resolve_workers(self, task_count: int) -> int:
+        """Nombre de processus de rendu à utiliser pour task_count images."""
+        if task_count < PARALLEL_RENDER_MIN_CARDS:
+            return 1
+        workers = self.workers if self.workers else (os.cpu_count() or 1)
+        return max(1, min(workers, task_count))
+    
+    def render_card_images(self, cards: List, write_image: Callable[[str, bytes], None],
+                           progress: Optional[Callable[[int, int, str], None]] = None,
+                           reuse: Optional[Callable[[object, str, str], Optional[bytes]]] = None) -> int:
+        """
+        Rend les images de toutes les cartes, en parallèle si possible.
+        
+        Les PNG sont produits en mémoire et transmis à write_image(nom, données)
+        dans l'ordre des cartes : le résultat est déterministe. Chaque fichier
+        est produit par une seule tâche (si deux cartes ont le même nom de
+        fichier, la dernière l'emporte, comme lors d'un rendu séquentiel) et
+        les erreurs sont listées dans l'ordre des cartes dans self.render_errors.
+        Les entrées du manifeste sont rassemblées dans self.card_manifest.
+        
+        Args:
+            cards: Cartes à rendre
+            write_image: Reçoit (nom_image, png) pour chaque image réussie
+            progress: Callback optionnel progress(fait, total, nom_carte)
+            reuse: Callback optionnel reuse(carte, nom_image, clé_de_rendu) retournant
+                   le PNG d'un build précédent si la carte n'a pas changé (sinon None)
+            
+        Returns:
+            Nombre d'images créées
+        """
+        # Polices ajoutées ou retirées depuis le dernier export : index (et chemins) à jour
+        get_font_index(max_age=0)
+        
+        # Une tâche par fichier de sortie, attribuée à la dernière carte qui le produit
+        tasks_by_image: Dict[str, int] = {}
+        for index, card in enumerate(cards):
+            tasks_by_image[f"{sanitize_filename(card.name)}.png"] = index
+        tasks = sorted((index, image_name) for image_name, index in tasks_by_image.items())
+        tasks = [(index, cards[index], image_name, self.render_cache_key(cards[index]))
+                 for index, image_name in tasks]
+        
+        # Images reprises telles quelles d'un build précédent
+        reused: Dict[int, bytes] = {}
+        if reuse:
+            for index, card, image_name, key in tasks:
+                data = reuse(card, image_name, key)
+                if data is not None:
+                    reused[index] = data
+        
+        total = len(tasks)
+        done: Set[int] = set()
+        self.render_errors = []
+        self.cached_images = 0
+        self.reused_images = len(reused)
+        self.font_cache_hits = 0
+        self.font_cache_misses = 0
+        self.card_manifest = {}
+        
+        def record(task, result) -> None:
+            index, card, image_name, key = task
+            done.add(index)
+            data, error, cached, (font_hits, font_misses) = result
+            self.cached_images += cached
+            self.font_cache_hits += font_hits
+            self.font_cache_misses += font_misses
+            if error:
+                self.render_errors.append({
+                    'card_id': getattr(card, 'id', None),
+                    'name': card.name,
+                    'image': image_name,
+                    'error': error,
+                })
+            else:
+                write_image(image_name, data)
+                self.card_manifest[str(getattr(card, 'id', image_name))] = {
+                    'image': f"cards/{image_name}",
+                    'render_key': key,
+                }
+            if progress:
+                progress(len(done), total, card.name)
+        
+        def resolve(task):
+            if task[0] in reused:
+                return reused[task[0]], None, False, (0, 0)
+            return _render_card_task(task[1], self)
+        
+        to_render = [task for task in tasks if task[0] not in reused]
+        workers = self._resolve_workers(len(to_render))
+        if workers > 1:
+            print(f"   ⚙️  Rendu parallèle sur {workers} processus")
+            try:
+                chunksize = max(1, len(to_render) // (workers * 8))
+                with ProcessPoolExecutor(max_workers=workers,
+                                         initializer=_init_render_worker,
+                                         initargs=(str(self.output_dir), self.export_type,
+                                                   self.render_cache)) as pool:
+                    rendered = pool.map(_render_card_task, [task[1] for task in to_render],
+                                        chunksize=chunksize)
+                    for task in tasks:
+                        record(task, resolve(task) if task[0] in reused else next(rendered))
+            except (OSError, BrokenProcessPool) as e:
+                # Processus indisponibles (environnement restreint...) : on termine en séquentiel
+                logging.warning(f"Rendu parallèle indisponible ({e}), poursuite en séquentiel")
+        
+        for task in tasks:
+            if task[0] not in done:
+                record(task, resolve(task))
+        
+        return total - len(self.render_errors)
 
-    def copy_used_fonts(self, fonts: Set[str], fonts_dir: Path) -> Dict[str, str]:
+    def resolve_used_fonts(self, fonts: Set[str]) -> Dict[str, str]:
         """
-        Copie les polices utilisées dans le package.
+        Localise les fichiers des polices utilisées.
         
         Args:
             fonts: Set des noms de polices utilisées
-            fonts_dir: Dossier de destination
             
         Returns:
-            Dictionnaire {nom_police: chemin_copié}
+            Dictionnaire {nom_police: chemin_du_fichier}
         """
-        copied_fonts = {}
-        fonts_dir.mkdir(exist_ok=True)
-        
-        for font_name in fonts:
+        font_files = {}
+        for font_name in sorted(fonts):
             # Nettoyer le nom de police pour supprimer le préfixe 🎨
             clean_font_name = font_name.replace("🎨 ", "")
             
@@ -547,27 +940,50 @@ class GamePackageExporter:
                 font_file = self._find_system_font_file(clean_font_name)
             
             if font_file and os.path.exists(font_file):
-                # Copier le fichier
-                dest_file = fonts_dir / os.path.basename(font_file)
-                shutil.copy2(font_file, dest_file)
-                copied_fonts[font_name] = str(dest_file)
-                print(f"📝 Police copiée: {font_name} -> {dest_file.name}")
+                font_files[font_name] = font_file
             else:
                 print(f"⚠️  Police non trouvée: {font_name}")
         
+        return font_files
+    
+    def copy_used_fonts(self, fonts: Set[str], fonts_dir: Path) -> Dict[str, str]:
+        """
+        Copie les polices utilisées dans le package.
+        
+        Args:
+            fonts: Set des noms de polices utilisées
+            fonts_dir: Dossier de destination
+            
+        Returns:
+            Dictionnaire {nom_police: chemin_copié}
+        """
+        copied_fonts = {}
+        fonts_dir.mkdir(exist_ok=True)
+        
+        for font_name, font_file in self.resolve_used_fonts(fonts).items():
+            # Copier le fichier
+            dest_file = fonts_dir / os.path.basename(font_file)
+            shutil.copy2(font_file, dest_file)
+            copied_fonts[font_name] = str(dest_file)
+            print(f"📝 Police copiée: {font_name} -> {dest_file.name}")
+        
         return copied_fonts
     
-    def export_lua_data(self, cards: List, lua_file: Path) -> int:
+    def generate_lua_data(self, cards: List, atlas_quads: Optional[Dict[str, Dict]] = None) -> str:
         """
-        Exporte les données Lua des cartes.
+        Génère le contenu Lua des cartes.
         
         Args:
             cards: Liste des cartes
-            lua_file: Fichier de destination
+            atlas_quads: Positions des cartes dans l'atlas (mode atlas)
             
         Returns:
-            Taille du fichier généré
+            Contenu du fichier cards_data.lua
         """
+        return self._lua_exporter().export_cards_love2d(cards, atlas_quads)
+    
+    def _lua_exporter(self):
+        """Exporteur Love2D des données de cartes."""
         # Import de l'exporteur Love2D
         try:
             from lua_exporter_love2d import Love2DLuaExporter
@@ -584,13 +1000,7 @@ class GamePackageExporter:
                     sys.path.insert(0, lib_dir)
                 from lua_exporter_love2d import Love2DLuaExporter
         
-        exporter = Love2DLuaExporter(self.repo)
-        content = exporter.export_cards_love2d(cards)
-        
-        with open(lua_file, 'w', encoding='utf-8') as f:
-            f.write(content)
-        
-        return len(content)
+        return Love2DLuaExporter(self.repo, profile=self.lua_profile)
     
     def create_package_documentation(self, package_dir: Path, resources: Dict) -> None:
         """
@@ -600,6 +1010,21 @@ class GamePackageExporter:
             package_dir: Dossier du package
             resources: Informations sur les ressources
         """
+        readme_file = package_dir / "README.md"
+        with open(readme_file, 'w', encoding='utf-8') as f:
+            f.write(self.build_package_documentation(package_dir.name, resources))
+    
+    def build_package_documentation(self, package_name: str, resources: Dict) -> str:
+        """
+        Génère le README.md du package.
+        
+        Args:
+            package_name: Nom du dossier racine du package
+            resources: Informations sur les ressources
+            
+        Returns:
+            Contenu Markdown de la documentation
+        """
         # Type d'export pour la documentation
         export_type_info = ""
         if self.export_type == "template":
@@ -631,6 +1056,50 @@ Les cartes sont prêtes à utiliser directement sans repositioning.
 - Compatible avec tous les systèmes
 
 **Usage recommandé:** Prototypage rapide ou jeux avec texte fixe.
+"""
+        
+        atlas_info = ""
+        if self.atlas:
+            atlas_info = """## 🧩 Atlas de textures
+
+Les images des cartes sont regroupées dans `atlas/sheet_N.png` ; chaque carte
+porte un champ `Atlas = { sheet, x, y, w, h }` dans `cards_data.lua`.
+
+```lua
+local Atlas = require("atlas_loader")
+local cards = Atlas.attach(require("cards_data"))  -- card.image + card.quad
+
+function love.draw()
+    Atlas.draw(cards[1], 100, 100)
+end
+```
+
+"""
+        
+        chunks_info = ""
+        if self.lua_profile == "compact":
+            chunks_info += """## 🗜️ Données compactes
+
+Les données Lua utilisent le profil compact : les valeurs par défaut (formatage,
+effets nuls...) sont regroupées dans une table unique dont chaque carte hérite
+via `setmetatable`. `card.TextFormatting.title.size` se lit comme d'habitude,
+mais `pairs()` ne parcourt que les champs propres à la carte, et les tables
+héritées sont partagées : les lire, ne pas les modifier.
+
+"""
+        if self.lua_chunk_size:
+            chunks_info += f"""## 📚 Données par morceaux
+
+Les cartes sont réparties dans `cards_chunks/` (au plus {self.lua_chunk_size} cartes par
+module, regroupées par `{self.lua_group_by}`). `cards_data.lua` renvoie toujours le tableau
+complet ; `cards_index.lua` ne charge un morceau qu'au premier accès à l'une de ses cartes.
+
+```lua
+local cards = require("cards_index")
+local card = cards[42]               -- charge seulement le morceau de la carte 42
+for i, card in cards.iter() do end   -- cards.count cartes
+```
+
 """
         
         readme_content = f"""# 🎮 Package de Cartes Love2D
@@ -645,7 +1114,7 @@ Les cartes sont prêtes à utiliser directement sans repositioning.
 ## Structure du Package
 
 ```
-📁 {package_dir.name}/
+📁 {package_name}/
 ├── 📁 cards/               # Images des cartes ({self.export_type})
 ├── 📁 fonts/               # Polices utilisées
 ├── 📄 cards_data.lua       # Données des cartes
@@ -727,6 +1196,17 @@ function love.draw()
 end
 ```
 
+{atlas_info}{chunks_info}## Mises à jour par patch
+
+`package_config.json` contient un manifeste (empreinte de chaque fichier, image
+de chaque carte). Un export delta produit `<package>_patch.zip` avec uniquement
+les fichiers modifiés ; montez-le avant le package pour qu'il soit prioritaire :
+
+```lua
+love.filesystem.mount("cartes_patch.zip", "", false)
+local patch = require("patch_info")  -- patch.removed : fichiers supprimés
+```
+
 ## Notes
 
 - Les images fusionnées incluent déjà le texte rendu
@@ -737,10 +1217,7 @@ end
 ---
 *Généré automatiquement par l'Éditeur de Cartes*
 """
-        
-        readme_file = package_dir / "README.md"
-        with open(readme_file, 'w', encoding='utf-8') as f:
-            f.write(readme_content)
+        return readme_content
     
     def create_package_config(self, package_dir: Path, resources: Dict) -> None:
         """
@@ -750,6 +1227,21 @@ end
             package_dir: Dossier du package
             resources: Informations sur les ressources
         """
+        config_file = package_dir / "package_config.json"
+        with open(config_file, 'w', encoding='utf-8') as f:
+            f.write(self.build_package_config(resources))
+    
+    def build_package_config(self, resources: Dict, manifest: Optional[Dict] = None) -> str:
+        """
+        Génère le contenu de package_config.json.
+        
+        Args:
+            resources: Informations sur les ressources
+            manifest: Manifeste du build (empreintes des fichiers, cartes)
+            
+        Returns:
+            JSON indenté de la configuration
+        """
         config = {
             **self.package_config,
             "resources": {
@@ -765,21 +1257,121 @@ end
                 "lua_file": "cards_data.lua"
             }
         }
+        if self.lua_chunk_size:
+            config["structure"]["lua_index"] = "cards_index.lua"
+            config["structure"]["lua_chunks_dir"] = "cards_chunks/"
+        config["structure"]["lua_profile"] = self.lua_profile
+        if manifest:
+            config["manifest"] = manifest
         
-        config_file = package_dir / "package_config.json"
-        with open(config_file, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=2, ensure_ascii=False)
+        return json.dumps(config, indent=2, ensure_ascii=False)
     
-    def export_complete_package(self, package_name_or_ids, package_name: str = None) -> str:
+    def build_manifest(self, package: PackageWriter) -> Dict:
+        """
+        Manifeste du build : empreinte de chaque fichier et image de chaque carte.
+        
+        Sert de référence à l'export delta suivant (voir export_complete_package).
+        """
+        return {
+            "format": MANIFEST_FORMAT,
+            "build_id": package.build_id(),
+            "export_type": self.export_type,
+            "files": dict(sorted(package.files.items())),
+            "cards": self.card_manifest,
+        }
+    
+    def write_atlas(self, package: PackageWriter, images: Dict[str, bytes]) -> Dict[str, Dict]:
+        """
+        Regroupe les images des cartes dans des planches et ajoute au package
+        atlas/sheet_N.png, atlas_data.lua et le chargeur atlas_loader.lua.
+        
+        Returns:
+            Quads des cartes {'cards/<nom>.png': {'sheet', 'x', 'y', 'w', 'h'}}
+        """
+        print(f"🧩 Création de l'atlas (planches ≤ {self.atlas_max_size}px, marge {self.atlas_padding}px)...")
+        sheet_pngs, quads, sheets = build_atlas(images, self.atlas_max_size, self.atlas_padding)
+        sheet_files = []
+        for number, data in enumerate(sheet_pngs, 1):
+            sheet_file = f"atlas/sheet_{number}.png"
+            package.write_bytes(sheet_file, data)
+            sheet_files.append(sheet_file)
+        package.write_text("atlas_data.lua", atlas_data_lua(sheet_files, sheets))
+        package.write_text("atlas_loader.lua", ATLAS_LOADER_LUA)
+        
+        for entry in self.card_manifest.values():
+            if entry['image'] in quads:
+                entry['atlas'] = quads[entry['image']]
+        print(f"   ✅ Atlas créé: {len(sheets)} planche(s) pour {len(quads)} carte(s)")
+        return quads
+    
+    @staticmethod
+    def compare_manifests(previous: Optional[Dict], current: Dict) -> Dict:
+        """
+        Compare deux manifestes.
+        
+        Returns:
+            {'changed': [fichiers ajoutés ou modifiés], 'removed': [fichiers supprimés],
+             'unchanged': nombre, 'patch': None}
+        """
+        previous_files = previous["files"] if previous else {}
+        current_files = current["files"]
+        changed = [name for name, info in current_files.items()
+                   if previous_files.get(name, {}).get("sha256") != info["sha256"]]
+        removed = sorted(set(previous_files) - set(current_files))
+        return {
+            'changed': changed,
+            'removed': removed,
+            'unchanged': len(current_files) - len(changed),
+            'patch': None,
+        }
+    
+    def write_patch_archive(self, zip_path: Path, patch_path: Path, previous: Dict,
+                            manifest: Dict, report: Dict) -> None:
+        """
+        Écrit l'archive de patch : fichiers modifiés, nouvelle configuration et
+        patch_info.lua (builds de départ/d'arrivée, fichiers supprimés).
+        """
+        def lua_list(names):
+            return ", ".join(json.dumps(name, ensure_ascii=False) for name in names)
+        
+        patch_info = (
+            "-- Patch de package généré par l'Éditeur de Cartes\n"
+            "return {\n"
+            f"    base_build = \"{previous['build_id']}\",\n"
+            f"    target_build = \"{manifest['build_id']}\",\n"
+            f"    changed = {{{lua_list(report['changed'])}}},\n"
+            f"    removed = {{{lua_list(report['removed'])}}},\n"
+            "}\n"
+        )
+        with zipfile.ZipFile(zip_path) as source, PackageWriter(patch_path) as patch:
+            for name in report['changed'] + [PACKAGE_CONFIG_FILE]:
+                patch.write_bytes(name, source.read(name))
+            patch.write_text("patch_info.lua", patch_info)
+    
+    def export_complete_package(self, package_name_or_ids, package_name: str = None,
+                                progress: Optional[Callable[[int, int, str], None]] = None,
+                                delta: bool = False, write_patch: bool = False) -> str:
         """
         Exporte un package complet de jeu.
         
+        En mode delta, le package précédent (même nom) sert de référence : les
+        images des cartes inchangées (même clé de rendu) sont reprises de
+        l'ancienne archive sans nouveau rendu. Avec write_patch, une archive
+        <nom>_patch.zip ne contenant que les fichiers modifiés (et
+        patch_info.lua listant les suppressions) est aussi produite, à monter
+        par-dessus le package précédent côté Love2D.
+        
         Args:
             package_name_or_ids: Nom du package (str) ou liste d'IDs de cartes (list)
             package_name: Nom du package si le premier argument est une liste d'IDs
+            progress: Callback optionnel progress(fait, total, nom_carte) appelé
+                      après le rendu de chaque image (les erreurs de rendu sont
+                      ensuite disponibles dans self.render_errors)
+            delta: Réutiliser les images inchangées du package précédent
+            write_patch: Produire aussi l'archive de patch (mode delta)
             
         Returns:
-            Chemin vers le fichier ZIP créé
+            Chemin vers le fichier ZIP créé (le bilan du delta est dans self.delta_report)
         """
         # Déterminer si on a des IDs ou un nom de package
         if isinstance(package_name_or_ids, list):
@@ -794,9 +1386,9 @@ end
         
         # Récupérer les cartes
         if card_ids:
-            # Filtrer les cartes par IDs
-            all_cards = self.repo.list_cards()
-            cards = [card for card in all_cards if card.id in card_ids]
+            # Filtrer les cartes par IDs (lecture par pages, sans charger toute la table)
+            wanted_ids = set(card_ids)
+            cards = [card for card in self.repo.iter_cards() if card.id in wanted_ids]
             if not cards:
                 raise ValueError(f"Aucune carte trouvée pour les IDs: {card_ids}")
         else:
@@ -812,93 +1404,154 @@ end
         print(f"🎨 Polices utilisées: {len(resources['fonts'])}")
         print(f"🖼️  Images utilisées: {len(resources['images'])}")
         
-        # Créer le dossier temporaire
-        temp_dir = self.output_dir / f"{actual_package_name}_temp"
-        if temp_dir.exists():
-            shutil.rmtree(temp_dir)
-        temp_dir.mkdir(parents=True)
+        # Écrire chaque entrée directement dans l'archive (aucun dossier temporaire)
+        zip_path = self.output_dir / f"{actual_package_name}_{self.export_type}.zip"
+        previous = read_package_manifest(zip_path) if delta and zip_path.exists() else None
+        if delta:
+            if previous and previous.get("export_type") == self.export_type:
+                print(f"🔁 Export delta depuis le build {previous['build_id'][:12]}")
+            else:
+                print("🔁 Aucun manifeste précédent exploitable : export complet")
+                previous = None
+        previous_zip = zipfile.ZipFile(zip_path) if previous else None
+        
+        def reuse_previous_image(card, image_name, key):
+            entry = previous["cards"].get(str(getattr(card, 'id', image_name)))
+            if entry and entry["render_key"] == key and entry["image"] == f"cards/{image_name}":
+                try:
+                    return previous_zip.read(entry["image"])
+                except KeyError:
+                    return None
+            return None
         
         try:
-            # 1. Créer les dossiers de structure
-            cards_dir = temp_dir / "cards"
-            fonts_dir = temp_dir / "fonts"
-            cards_dir.mkdir()
-            fonts_dir.mkdir()
-            
-            # 2. Exporter le fichier Lua
-            print("📄 Export des données Lua...")
-            lua_file = temp_dir / "cards_data.lua"
-            lua_size = self.export_lua_data(cards, lua_file)
-            print(f"   ✅ Fichier Lua créé: {lua_size:,} caractères")
-            
-            # 3. Créer les images selon le type d'export
-            if self.export_type == "template":
-                print("🖼️  Création des images templates (sans texte)...")
-                for i, card in enumerate(cards, 1):
-                    # Utiliser le nom de la carte pour le fichier
-                    safe_name = sanitize_filename(card.name)
-                    image_name = f"{safe_name}.png"
-                    image_path = cards_dir / image_name
-                    
-                    if self.create_template_card_image(card, str(image_path)):
-                        print(f"   ✅ Template créé: {image_name} ({card.name})")
-                    else:
-                        print(f"   ⚠️  Erreur template: {image_name}")
-            else:
-                print("🖼️  Création des images fusionnées (avec texte)...")
-                for i, card in enumerate(cards, 1):
-                    # Utiliser le nom de la carte pour le fichier
-                    safe_name = sanitize_filename(card.name)
-                    image_name = f"{safe_name}.png"
-                    image_path = cards_dir / image_name
-                    
-                    if self.create_fused_card_image(card, str(image_path)):
-                        print(f"   ✅ Image créée: {image_name} ({card.name})")
-                    else:
-                        print(f"   ⚠️  Erreur image: {image_name}")
-            
-            # 4. Copier les polices utilisées
-            print("🎨 Copie des polices...")
-            copied_fonts = self.copy_used_fonts(resources['fonts'], fonts_dir)
-            print(f"   ✅ Polices copiées: {len(copied_fonts)}")
-            
-            # 5. Créer la documentation
-            print("📚 Création de la documentation...")
-            self.create_package_documentation(temp_dir, resources)
-            self.create_package_config(temp_dir, resources)
-            print("   ✅ Documentation créée")
-            
-            # 6. Créer le fichier ZIP
-            print("📦 Création du package ZIP...")
-            zip_path = self.output_dir / f"{actual_package_name}_{self.export_type}.zip"
-            if zip_path.exists():
-                zip_path.unlink()
-            
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for root, dirs, files in os.walk(temp_dir):
-                    for file in files:
-                        file_path = Path(root) / file
-                        arc_path = file_path.relative_to(temp_dir)
-                        zipf.write(file_path, arc_path)
-            
-            # Calculer la taille du ZIP
-            zip_size = zip_path.stat().st_size
-            print(f"   ✅ Package créé: {zip_path.name} ({zip_size:,} octets)")
-            
-            # 7. Nettoyer le dossier temporaire
-            shutil.rmtree(temp_dir)
-            
-            print(f"\n🎉 Package complet créé avec succès!")
-            print(f"📍 Emplacement: {zip_path}")
-            print(f"📊 Contenu: {len(cards)} cartes, {len(copied_fonts)} polices, documentation")
+            with PackageWriter(zip_path) as package:
+                # 1. Créer les images selon le type d'export
+                if self.export_type == "template":
+                    print("🖼️  Création des images templates (sans texte)...")
+                else:
+                    print("🖼️  Création des images fusionnées (avec texte)...")
+                atlas_images: Dict[str, bytes] = {}
+                if self.atlas:
+                    write_image = lambda image_name, data: atlas_images.__setitem__(f"cards/{image_name}", data)
+                else:
+                    write_image = lambda image_name, data: package.write_bytes(f"cards/{image_name}", data)
+                rendered = self.render_card_images(
+                    cards, write_image, progress,
+                    reuse=reuse_previous_image if previous and not self.atlas else None
+                )
+                print(f"   ✅ Images créées: {rendered}")
+                if self.render_cache:
+                    print(f"   ♻️  Cache de rendu: {self.cached_images} image(s) réutilisée(s)")
+                if self.font_cache_hits or self.font_cache_misses:
+                    print(f"   🔤 Cache de polices: {self.font_cache_hits} succès, "
+                          f"{self.font_cache_misses} chargement(s)")
+                if previous:
+                    print(f"   🔁 Reprises du build précédent: {self.reused_images}")
+                for failure in self.render_errors:
+                    print(f"   ⚠️  Erreur image: {failure['image']} ({failure['name']}) - {failure['error']}")
+                
+                # 1 bis. Regrouper les images dans l'atlas
+                atlas_quads = self.write_atlas(package, atlas_images) if self.atlas else None
+                
+                # 2. Exporter le fichier Lua
+                print("📄 Export des données Lua...")
+                if self.lua_chunk_size:
+                    chunks = self._lua_exporter().export_chunked(
+                        package.write_text_chunks,
+                        cards, self.lua_group_by, self.lua_chunk_size, atlas_quads
+                    )
+                    print(f"   ✅ Données Lua en {len(chunks)} morceaux de {self.lua_chunk_size} cartes "
+                          f"au plus (index: cards_index.lua)")
+                else:
+                    # Écriture en flux dans l'archive : le fichier n'est jamais assemblé en mémoire
+                    with package.open_text("cards_data.lua") as stream:
+                        size = self._lua_exporter().write_cards_love2d(cards, stream, atlas_quads)
+                    print(f"   ✅ Fichier Lua créé: {size:,} caractères")
+                
+                # 3. Ajouter les polices utilisées
+                print("🎨 Copie des polices...")
+                font_files = self.resolve_used_fonts(resources['fonts'])
+                added_fonts = set()
+                for font_name, font_file in font_files.items():
+                    arcname = f"fonts/{os.path.basename(font_file)}"
+                    if arcname not in added_fonts:
+                        package.write_file(arcname, font_file)
+                        added_fonts.add(arcname)
+                    print(f"📝 Police copiée: {font_name} -> {os.path.basename(font_file)}")
+                print(f"   ✅ Polices copiées: {len(font_files)}")
             
-            return str(zip_path)
+                # 4. Créer la documentation
+                print("📚 Création de la documentation...")
+                package.write_text("README.md", self.build_package_documentation(actual_package_name, resources))
+                package.write_text(PACKAGE_CONFIG_FILE,
+                                   self.build_package_config(resources, self.build_manifest(package)))
+                print("   ✅ Documentation créée")
             
-        except Exception as e:
-            # Nettoyer en cas d'erreur
-            if temp_dir.exists():
-                shutil.rmtree(temp_dir)
-            raise e
+                # L'ancienne archive doit être fermée avant d'être remplacée (Windows)
+                if previous_zip:
+                    previous_zip.close()
+                print("📦 Finalisation du package ZIP...")
+        finally:
+            if previous_zip:
+                previous_zip.close()
+        
+        manifest = read_package_manifest(zip_path)
+        self.delta_report = self.compare_manifests(previous, manifest)
+        if previous:
+            print(f"   📝 Fichiers modifiés: {len(self.delta_report['changed'])}, "
+                  f"supprimés: {len(self.delta_report['removed'])}")
+            if write_patch:
+                patch_path = self.output_dir / f"{actual_package_name}_{self.export_type}_patch.zip"
+                self.write_patch_archive(zip_path, patch_path, previous, manifest, self.delta_report)
+                self.delta_report['patch'] = str(patch_path)
+                print(f"   ✅ Patch créé: {patch_path.name} ({patch_path.stat().st_size:,} octets)")
+        
+        # Calculer la taille du ZIP
+        zip_size = zip_path.stat().st_size
+        print(f"   ✅ Package créé: {zip_path.name} ({zip_size:,} octets)")
+        
+        print(f"\n🎉 Package complet créé avec succès!")
+        print(f"📍 Emplacement: {zip_path}")
+        print(f"📊 Contenu: {len(cards)} cartes, {len(font_files)} polices, documentation")
+        
+        return str(zip_path)
+
+# ======================= Rendu dans les processus de travail =======================
+
+# Exporteur propre à chaque processus de rendu (créé par _init_render_worker)
+_worker_exporter: Optional[GamePackageExporter] = None
+
+def _init_render_worker(output_dir: str, export_type: str, render_cache: Optional[RenderCache]) -> None:
+    """Initialise un processus de rendu (polices chargées une fois par processus)."""
+    global _worker_exporter
+    _worker_exporter = GamePackageExporter(None, output_dir, export_type,
+                                           render_cache=render_cache,
+                                           use_render_cache=render_cache is not None)
+
+def _render_card_task(card, exporter: Optional[GamePackageExporter] = None):
+    """
+    Rend une carte.
+    
+    Returns:
+        (png, None, depuis_cache, (succès, échecs) du cache de polices)
+        ou (None, message d'erreur, False, (succès, échecs))
+    """
+    exporter = exporter or _worker_exporter
+    hits = exporter.render_cache.hits if exporter.render_cache else 0
+    fonts_before = font_cache_stats()
+    try:
+        data = exporter.render_card_png(card)
+        error = None
+    except Exception as e:
+        data, error = None, f"{type(e).__name__}: {e}"
+    fonts_after = font_cache_stats()
+    font_counts = (fonts_after['hits'] - fonts_before['hits'],
+                   fonts_after['misses'] - fonts_before['misses'])
+    if error:
+        return None, error, False, font_counts
+    cached = exporter.render_cache is not None and exporter.render_cache.hits > hits
+    return data, None, cached, font_counts
 
 
 def main():
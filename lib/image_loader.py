@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⏳ CHARGEMENT ASYNCHRONE DES IMAGES DE L'INTERFACE
+=================================================
+
+Décode et redimensionne les images sur un pool de threads, puis rend la
+main à la boucle Tk pour créer les PhotoImage par lots (via after()) :
+- les demandes sont servies par priorité (tuiles visibles d'abord)
+- les priorités peuvent être revues (défilement)
+- cancel() abandonne tout le travail en attente (changement de filtre)
+"""
+import heapq
+import itertools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+# Nombre de threads de décodage
+DEFAULT_WORKERS = 4
+
+# Nombre maximal de PhotoImage créées par passage dans la boucle Tk
+DEFAULT_BATCH_SIZE = 16
+
+# Intervalle entre deux passages (ms)
+DEFAULT_POLL_MS = 30
+
+
+def _default_photo_factory(image):
+    from PIL import ImageTk
+    return ImageTk.PhotoImage(image)
+
+
+class AsyncImageLoader:
+    """File de chargement d'images : décodage en arrière-plan, PhotoImage dans le thread Tk."""
+
+    def __init__(self, widget, load_func: Callable[[str], object],
+                 max_workers: int = DEFAULT_WORKERS, batch_size: int = DEFAULT_BATCH_SIZE,
+                 poll_ms: int = DEFAULT_POLL_MS, photo_factory: Optional[Callable] = None):
+        """
+        Args:
+            widget: Widget Tk servant à planifier les passages (after/after_cancel)
+            load_func: Charge une source en image PIL (appelée dans un thread)
+            max_workers: Nombre de threads de décodage
+            batch_size: PhotoImage créées au plus par passage dans la boucle Tk
+            poll_ms: Intervalle entre deux passages
+            photo_factory: Crée l'image Tk à partir de l'image PIL (défaut : ImageTk.PhotoImage)
+        """
+        self.widget = widget
+        self.load_func = load_func
+        self.batch_size = batch_size
+        self.poll_ms = poll_ms
+        self.photo_factory = photo_factory or _default_photo_factory
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="image-loader")
+        self._lock = threading.Lock()
+        # Entrées du tas : [priorité, ordre, source, génération, en_attente]
+        self._heap: List[list] = []
+        self._entries: Dict[str, list] = {}
+        self._callbacks: Dict[str, List[Callable]] = {}
+        self._results: "queue.Queue[tuple]" = queue.Queue()
+        self._generation = 0
+        self._counter = itertools.count()
+        self._outstanding = 0
+        self._after_id = None
+        self._closed = False
+
+    # ----------------------- Demandes (thread Tk) -----------------------
+
+    def request(self, source: str, callback: Callable, priority: int = 0) -> None:
+        """
+        Demande le chargement d'une source.
+
+        callback(source, photo, erreur) est appelé dans le thread Tk ; plusieurs
+        demandes pour la même source partagent un seul décodage.
+        """
+        if self._closed:
+            return
+        with self._lock:
+            self._callbacks.setdefault(source, []).append(callback)
+            entry = self._entries.get(source)
+            if entry is not None:
+                if entry[4] and priority < entry[0]:
+                    self._reprioritize(entry, priority)
+                return
+            entry = [priority, next(self._counter), source, self._generation, True]
+            self._entries[source] = entry
+            heapq.heappush(self._heap, entry)
+            self._outstanding += 1
+        self._executor.submit(self._work)
+        self._schedule()
+
+    def prioritize(self, sources: Iterable[str], priority: int = -1) -> None:
+        """Remonte des sources encore en attente (ex : tuiles devenues visibles)."""
+        with self._lock:
+            for source in sources:
+                entry = self._entries.get(source)
+                if entry is not None and entry[4] and priority < entry[0]:
+                    self._reprioritize(entry, priority)
+
+    def _reprioritize(self, entry: list, priority: int) -> None:
+        # L'ancienne entrée est neutralisée ; une copie prend sa place dans le tas
+        entry[4] = False
+        new_entry = [priority, next(self._counter), entry[2], entry[3], True]
+        self._entries[entry[2]] = new_entry
+        heapq.heappush(self._heap, new_entry)
+
+    def cancel(self) -> None:
+        """Abandonne toutes les demandes en attente et les résultats non encore affichés."""
+        with self._lock:
+            self._generation += 1
+            self._heap.clear()
+            self._entries.clear()
+            self._callbacks.clear()
+            self._outstanding = 0
+        # Les résultats déjà produits sont ignorés lors du prochain passage
+        while True:
+            try:
+                self._results.get_nowait()
+            except queue.Empty:
+                break
+
+    def shutdown(self) -> None:
+        """Annule tout et arrête les threads (fermeture de la fenêtre)."""
+        self.cancel()
+        self._closed = True
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    @property
+    def pending(self) -> int:
+        """Nombre de sources demandées dont l'image n'a pas encore été remise."""
+        with self._lock:
+            return self._outstanding
+
+    # ----------------------- Décodage (threads) -----------------------
+
+    def _work(self) -> None:
+        with self._lock:
+            entry = None
+            while self._heap:
+                candidate = heapq.heappop(self._heap)
+                if candidate[4]:
+                    entry = candidate
+                    break
+            if entry is None:
+                return
+            # En cours de décodage : ne peut plus être repriorisée
+            entry[4] = False
+            _, _, source, generation, _ = entry
+        try:
+            image, error = self.load_func(source), None
+        except Exception as e:
+            image, error = None, e
+        self._results.put((generation, source, image, error))
+
+    # ----------------------- Remise dans la boucle Tk -----------------------
+
+    def _schedule(self) -> None:
+        if self._after_id is None and not self._closed:
+            self._after_id = self.widget.after(self.poll_ms, self.process_results)
+
+    def process_results(self) -> int:
+        """
+        Crée les PhotoImage d'un lot de résultats et appelle les callbacks.
+
+        Appelé par after() dans le thread Tk ; se replanifie tant qu'il reste
+        du travail. Retourne le nombre de sources remises.
+        """
+        self._after_id = None
+        delivered = 0
+        while delivered < self.batch_size:
+            try:
+                generation, source, image, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                if generation != self._generation:
+                    continue
+                callbacks = self._callbacks.pop(source, [])
+                self._entries.pop(source, None)
+                self._outstanding -= 1
+            photo = None
+            if error is None and image is not None:
+                try:
+                    photo = self.photo_factory(image)
+                except Exception as e:
+                    error = e
+            for callback in callbacks:
+                callback(source, photo, error)
+            delivered += 1
+        if self.pending:
+            self._schedule()
+        return delivered
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+📚 EXPORT LUA PAR MORCEAUX
+==========================
+
+Pour les gros jeux de cartes, le fichier unique cards_data.lua est découpé :
+- cards_chunks/<groupe>_<n>.lua : modules de N cartes au plus, regroupées
+  par plage d'ids (ordre de l'export), par rareté ou par acteur
+- cards_index.lua : petit index dont la métatable charge (require) un
+  morceau au premier accès à l'une de ses cartes
+- cards_data.lua : compatibilité, renvoie le tableau complet comme avant
+"""
+import re
+import unicodedata
+from collections import OrderedDict
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+# Regroupements possibles des cartes en morceaux
+CHUNK_GROUPINGS = ("id", "rarity", "actor")
+
+# Nombre de cartes par morceau par défaut
+DEFAULT_CHUNK_SIZE = 250
+
+# Package Lua (dossier) des morceaux et nom du module d'index
+CHUNKS_PACKAGE = "cards_chunks"
+INDEX_MODULE = "cards_index"
+
+# Groupe unique du regroupement par plage d'ids
+ID_GROUP = "cartes"
+
+
+class LuaChunk(NamedTuple):
+    """Un module de cartes : positions first..last dans l'index."""
+    module: str
+    group: str
+    first: int
+    last: int
+
+    @property
+    def file_name(self) -> str:
+        """Chemin du fichier du module, relatif à la racine du jeu."""
+        return self.module.replace(".", "/") + ".lua"
+
+
+def group_name(value) -> str:
+    """Nom de groupe utilisable dans un nom de module Lua (ASCII, minuscules)."""
+    text = unicodedata.normalize("NFKD", str(value or "")).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^0-9a-z]+", "_", text.lower()).strip("_") or "sans_groupe"
+
+
+def split_into_chunks(cards: Iterable, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      group_of: Optional[Callable] = None) -> Iterator[Tuple[LuaChunk, List]]:
+    """
+    Découpe les cartes en morceaux.
+
+    Sans group_of, les cartes gardent l'ordre de l'export et sont lues au fur
+    et à mesure. Avec group_of(carte) -> groupe, les cartes sont regroupées
+    (groupes dans l'ordre de première apparition, ordre conservé dans chaque
+    groupe) puis découpées : l'index numérote les cartes groupe par groupe.
+
+    Yields:
+        (morceau, cartes du morceau)
+    """
+    if chunk_size < 1:
+        raise ValueError(f"Taille de morceau invalide : {chunk_size}")
+
+    if group_of is None:
+        groups = [(ID_GROUP, iter(cards))]
+    else:
+        grouped: "OrderedDict[str, List]" = OrderedDict()
+        for card in cards:
+            grouped.setdefault(group_name(group_of(card)), []).append(card)
+        groups = [(name, iter(group_cards)) for name, group_cards in grouped.items()]
+
+    first = 1
+    for name, group_cards in groups:
+        number = 0
+        while True:
+            batch = list(islice(group_cards, chunk_size))
+            if not batch:
+                break
+            number += 1
+            chunk = LuaChunk(f"{CHUNKS_PACKAGE}.{name}_{number:03d}", name, first, first + len(batch) - 1)
+            yield chunk, batch
+            first = chunk.last + 1
+
+
+def build_index_lua(chunks: List[LuaChunk]) -> str:
+    """Module cards_index.lua : liste des morceaux et chargeur à la demande."""
+    count = chunks[-1].last if chunks else 0
+    lines = [
+        "-- Index des cartes généré par l'Éditeur de Cartes (export par morceaux)",
+        "-- Usage :",
+        f'--   local cards = require("{INDEX_MODULE}")',
+        "--   local card = cards[42]              -- charge uniquement le morceau de la carte 42",
+        "--   for i, card in cards.iter() do end  -- parcours complet (charge au fil de l'eau)",
+        '--   local rares = cards.group("rare")   -- cartes d\'un groupe',
+        "--   local all = cards.all()             -- tableau complet, comme cards_data",
+        "-- cards.count donne le nombre de cartes (# et ipairs ne voient que les cartes chargées)",
+        "local chunks = {",
+    ]
+    for chunk in chunks:
+        lines.append(f'    {{ module = "{chunk.module}", group = "{chunk.group}", '
+                     f'first = {chunk.first}, last = {chunk.last} }},')
+    lines += ["}", "", f"local Index = {{ count = {count}, chunks = chunks }}", CHUNK_LOADER_LUA]
+    return "\n".join(lines)
+
+
+# Chargeur commun à tous les index (suit la table chunks dans cards_index.lua)
+CHUNK_LOADER_LUA = '''local cards = {}
+local loaded = {}
+
+-- Morceau contenant la carte i (recherche dichotomique sur first/last)
+local function chunk_of(i)
+    local low, high = 1, #chunks
+    while low <= high do
+        local mid = math.floor((low + high) / 2)
+        local chunk = chunks[mid]
+        if i < chunk.first then
+            high = mid - 1
+        elseif i > chunk.last then
+            low = mid + 1
+        else
+            return mid
+        end
+    end
+    return nil
+end
+
+-- Charge un morceau (une seule fois) et range ses cartes à leur position
+function Index.load(c)
+    if not loaded[c] then
+        local chunk = chunks[c]
+        local data = require(chunk.module)
+        for offset, card in ipairs(data) do
+            rawset(cards, chunk.first + offset - 1, card)
+        end
+        loaded[c] = true
+    end
+end
+
+-- Itérateur sur toutes les cartes, dans l'ordre de l'index
+function Index.iter()
+    local i = 0
+    return function()
+        i = i + 1
+        if i <= Index.count then
+            return i, cards[i]
+        end
+    end
+end
+
+-- Cartes d'un groupe (rareté, acteur...), dans l'ordre de l'index
+function Index.group(name)
+    local result = {}
+    for c, chunk in ipairs(chunks) do
+        if chunk.group == name then
+            Index.load(c)
+            for i = chunk.first, chunk.last do
+                result[#result + 1] = rawget(cards, i)
+            end
+        end
+    end
+    return result
+end
+
+-- Tableau complet (ordinaire : # et ipairs fonctionnent)
+function Index.all()
+    local result = {}
+    for c in ipairs(chunks) do
+        Index.load(c)
+    end
+    for i = 1, Index.count do
+        result[i] = rawget(cards, i)
+    end
+    return result
+end
+
+return setmetatable(cards, {
+    __index = function(t, key)
+        if type(key) == "number" then
+            local c = chunk_of(key)
+            if c then
+                Index.load(c)
+                return rawget(t, key)
+            end
+            return nil
+        end
+        return Index[key]
+    end,
+    __len = function()
+        return Index.count
+    end,
+})
+'''
+
+
+# cards_data.lua en mode morceaux : mêmes données qu'avant pour les consommateurs existants
+CARDS_DATA_COMPAT_LUA = f'''-- Données des cartes (export par morceaux)
+-- Renvoie le tableau complet comme le fichier unique ; pour ne charger que
+-- les cartes utilisées, préférer require("{INDEX_MODULE}")
+return require("{INDEX_MODULE}").all()
+'''
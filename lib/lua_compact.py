@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🗜️ PROFIL D'EXPORT LUA COMPACT
+==============================
+
+Variante compacte du fichier de cartes Love2D :
+- une table de valeurs par défaut (formatage, effets...) en tête de fichier,
+  héritée par chaque carte via setmetatable(..., {__index = defaults})
+- les champs égaux à leur valeur par défaut sont omis
+- ni commentaires ni indentation
+
+Les cartes sont décrites par des arbres {clé: littéral Lua | sous-arbre} ;
+les feuilles sont déjà du code Lua (nombres, chaînes échappées, fonctions).
+"""
+from typing import Dict, List, Union
+
+# Profils d'export Lua disponibles
+PROFILE_VERBOSE = "verbose"
+PROFILE_COMPACT = "compact"
+LUA_PROFILES = (PROFILE_VERBOSE, PROFILE_COMPACT)
+
+LuaTree = Dict[str, Union[str, list, dict]]
+
+
+def lua_number(value) -> str:
+    """Littéral numérique : 50.0 s'écrit 50 (même valeur en Lua)."""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def lua_table(tree) -> str:
+    """Table Lua sans espaces : {clé=valeur,...} ou {valeur,...} pour une liste."""
+    if isinstance(tree, dict):
+        return "{" + ",".join(f"{key}={lua_table(value)}" for key, value in tree.items()) + "}"
+    if isinstance(tree, list):
+        return "{" + ",".join(lua_table(value) for value in tree) + "}"
+    return tree
+
+
+def strip_defaults(tree: LuaTree, defaults: LuaTree) -> LuaTree:
+    """
+    Retire d'un arbre les champs égaux à leur valeur par défaut.
+
+    Une sous-table entièrement par défaut disparaît ; sinon seuls ses champs
+    différents sont gardés (elle héritera du reste via sa métatable).
+    """
+    result: LuaTree = {}
+    for key, value in tree.items():
+        default = defaults.get(key)
+        if isinstance(value, dict) and isinstance(default, dict):
+            value = strip_defaults(value, default)
+            if value:
+                result[key] = value
+        elif value != default:
+            result[key] = value
+    return result
+
+
+def compact_prologue(defaults: LuaTree) -> str:
+    """
+    En-tête du fichier compact : table des valeurs par défaut et fonction
+    C{...} qui rattache chaque carte (et ses sous-tables) à ces valeurs.
+
+    Les tables par défaut sont partagées par toutes les cartes : les
+    consulter, ne pas les modifier.
+    """
+    return (
+        f"local D={lua_table(defaults)}\n"
+        "local M={}\n"
+        "local function I(t,d)for k,v in pairs(t)do local s=d[k]"
+        " if type(v)=='table'and type(s)=='table'then I(v,s)end end"
+        " local m=M[d]if not m then m={__index=d}M[d]=m end return setmetatable(t,m)end\n"
+        "local function C(t)return I(t,D)end\n"
+        "local cards={\n"
+    )
+
+
+# Fin du fichier compact
+COMPACT_EPILOGUE = "}\nreturn cards\n"
+
+# Séparateur entre deux cartes du fichier compact
+COMPACT_SEPARATOR = ",\n"
+
+
+def compact_card(tree: LuaTree, defaults: LuaTree) -> str:
+    """Carte compacte : C{...} avec uniquement les champs hors valeurs par défaut."""
+    return "C" + lua_table(strip_defaults(tree, defaults))
+
+
+def lua_function(lines: List[str]) -> str:
+    """Fonction Lua sans paramètre dont le corps est donné ligne par ligne."""
+    if not lines:
+        return "function()end"
+    return "function()\n" + "\n".join(lines) + "\nend"
@@ -3,6 +3,8 @@
 """
 Export des cartes au format Lua
 """
+import os
+
 # Pattern try/except pour imports relatifs/absolus
 try:
     from .utils import to_int, lua_escape, get_card_image_for_export
@@ -16,6 +18,35 @@ except ImportError:
 LUA_HEADER = "local Cards = {\n"
 LUA_FOOTER = "}\n\nreturn Cards\n"
 
+# Taille du tampon d'écriture des fichiers Lua (octets)
+LUA_WRITE_BUFFER = 1024 * 1024
+
+
+def write_lua_file(filename, chunks):
+    """
+    Écrit des morceaux de texte Lua dans un fichier, sans les assembler en mémoire.
+    
+    Le fichier est écrit à côté puis renommé : en cas d'erreur en cours
+    d'export, l'ancien fichier reste intact.
+    
+    Returns:
+        Nombre de caractères écrits
+    """
+    filename = os.fspath(filename)
+    tmp_path = f"{filename}.{os.getpid()}.tmp"
+    written = 0
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', buffering=LUA_WRITE_BUFFER) as f:
+            for chunk in chunks:
+                f.write(chunk)
+                written += len(chunk)
+        os.replace(tmp_path, filename)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return written
+
 def build_hero_lua(hero: dict) -> str:
     attack = to_int(hero.get("attack", 0))
     ared = to_int(hero.get("AttackReduction", 0))
@@ -5,11 +5,37 @@ Export Lua compatible avec le format cards_joueur.lua
 Inclut les données de formatage de texte
 """
 
-from lib.database import CardRepo
+from lib.database import CardRepo, Card, FORMATTING_DEFAULTS
 from lib.config import DB_FILE
-from pathlib import Path
+from lib.lua_export import write_lua_file
+from lib.lua_fragment_cache import LuaFragmentCache
+from lib.font_index import get_font_index
+from lib.lua_chunks import (split_into_chunks, build_index_lua, CARDS_DATA_COMPAT_LUA,
+                            CHUNK_GROUPINGS, CHUNKS_PACKAGE, DEFAULT_CHUNK_SIZE, INDEX_MODULE)
+from lib.lua_compact import (PROFILE_VERBOSE, PROFILE_COMPACT, LUA_PROFILES, COMPACT_EPILOGUE,
+                             COMPACT_SEPARATOR, compact_card, compact_prologue, lua_function, lua_number)
+import hashlib
+import itertools
+import json
 import os
 
+# À incrémenter à chaque changement du texte Lua produit pour une carte
+# (invalide les fragments en cache)
+LUA_EXPORTER_VERSION = 1
+
+# Nombre de cartes dont les fragments sont lus/écrits ensemble dans le cache
+FRAGMENT_BATCH_SIZE = 500
+
+# Ordre des champs d'effet, comme dans la section Effect du profil verbeux
+CASTER_FIELDS = ('heal', 'shield', 'Epine', 'attack', 'AttackReduction', 'shield_pass', 'bleeding',
+                 'force_augmented', 'chancePassedTour', 'energyCostIncrease', 'energyCostDecrease')
+TARGET_FIELDS = ('heal', 'attack', 'AttackReduction', 'Epine', 'shield', 'shield_pass', 'bleeding',
+                 'force_augmented', 'chancePassedTour', 'energyCostIncrease', 'energyCostDecrease')
+
+# Champs propres à chaque carte, jamais hérités des valeurs par défaut
+# (Type et Cards sont des listes que le jeu peut modifier)
+CARD_OWN_FIELDS = ('name', 'ImgIlustration', 'Atlas', 'Type', 'Cards')
+
 def lua_escape(text):
     """Escape special characters for Lua strings."""
     if text is None:
@@ -80,24 +106,11 @@ def get_font_path_with_extension(font_name):
     if '.' in clean_name and clean_name.lower().endswith(('.ttf', '.otf')):
         return clean_name
     
-    # Chercher dans les dossiers de polices
-    fonts_base = Path("fonts")
-    
-    # 1. Chercher dans les sous-dossiers (titre, texte, special)
-    for subdir in ["titre", "texte", "special"]:
-        subdir_path = fonts_base / subdir
-        if subdir_path.exists():
-            for ext in [".ttf", ".otf"]:
-                font_file = subdir_path / f"{clean_name}{ext}"
-                if font_file.exists():
-                    return str(font_file).replace('\\', '/')
-    
-    # 2. Chercher dans le dossier fonts racine
-    if fonts_base.exists():
-        for ext in [".ttf", ".otf"]:
-            font_file = fonts_base / f"{clean_name}{ext}"
-            if font_file.exists():
-                return str(font_file).replace('\\', '/')
+    # 1. Sous-dossiers (titre, texte, special) puis 2. dossier fonts racine :
+    # index du dossier fonts/ partagé (un seul parcours, pas de stat par police)
+    font_file = get_font_index().resolve(clean_name)
+    if font_file:
+        return font_file.replace('\\', '/')
     
     # 3. Pour les polices système communes, retourner un chemin Love2D standard
     system_fonts_mapping = {
@@ -117,66 +130,40 @@ def get_font_path_with_extension(font_name):
     
     # 4. Dernier recours : ajouter .ttf par défaut
     return f"fonts/{clean_name}.ttf"
+
+def card_fragment_key(card, fonts_version, atlas_quad=None, profile=PROFILE_VERBOSE):
     """
-    Retourne le chemin de la police avec son extension pour Love2D.
+    Clé du fragment Lua d'une carte.
     
-    Args:
-        font_name: Nom de la police (peut inclure 🎨 préfixe)
-        
-    Returns:
-        Chemin de la police avec extension ou nom original si non trouvé
+    Couvre la carte (id, date de modification), la version de l'exporteur,
+    l'état du dossier de polices, la position éventuelle dans l'atlas et le
+    profil d'export.
     """
-    if not font_name or font_name.strip() == '':
-        return 'fonts/Arial.ttf'  # Police par défaut
-    
-    # Nettoyer le nom de police
-    clean_name = font_name.replace("🎨 ", "").strip()
-    
-    # Si c'est déjà un chemin avec extension, le retourner tel quel
-    if '.' in clean_name and clean_name.lower().endswith(('.ttf', '.otf')):
-        return clean_name
-    
-    # Chercher dans les dossiers de polices
-    fonts_base = Path("fonts")
-    
-    # 1. Chercher dans les sous-dossiers (titre, texte, special)
-    for subdir in ["titre", "texte", "special"]:
-        subdir_path = fonts_base / subdir
-        if subdir_path.exists():
-            for ext in [".ttf", ".otf"]:
-                font_file = subdir_path / f"{clean_name}{ext}"
-                if font_file.exists():
-                    return str(font_file).replace('\\', '/')
-    
-    # 2. Chercher dans le dossier fonts racine
-    if fonts_base.exists():
-        for ext in [".ttf", ".otf"]:
-            font_file = fonts_base / f"{clean_name}{ext}"
-            if font_file.exists():
-                return str(font_file).replace('\\', '/')
-    
-    # 3. Pour les polices système communes, retourner un chemin Love2D standard
-    system_fonts_mapping = {
-        "Arial": "fonts/Arial.ttf",
-        "Times New Roman": "fonts/Times.ttf", 
-        "Courier New": "fonts/Courier.ttf",
-        "Verdana": "fonts/Verdana.ttf",
-        "Calibri": "fonts/Calibri.ttf",
-        "Georgia": "fonts/Georgia.ttf",
-        "Trebuchet MS": "fonts/Trebuchet.ttf",
-        "Comic Sans MS": "fonts/Comic.ttf",
-        "Impact": "fonts/Impact.ttf"
-    }
-    
-    if clean_name in system_fonts_mapping:
-        return system_fonts_mapping[clean_name]
-    
-    # 4. Dernier recours : ajouter .ttf par défaut
-    return f"fonts/{clean_name}.ttf"
+    payload = json.dumps(
+        [card.id, card.updated_at, LUA_EXPORTER_VERSION, fonts_version, atlas_quad, profile],
+        sort_keys=True, ensure_ascii=False
+    )
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+def default_card():
+    """Carte vierge : valeurs par défaut de la base (effets nuls, formatage)"""
+    card = Card()
+    for name, default in FORMATTING_DEFAULTS.items():
+        setattr(card, name, default)
+    return card
 
 class Love2DLuaExporter:
-    def __init__(self, repo):
+    def __init__(self, repo, use_fragment_cache=True, profile=PROFILE_VERBOSE):
+        if profile not in LUA_PROFILES:
+            raise ValueError(f"Profil Lua inconnu : {profile} (attendu : {', '.join(LUA_PROFILES)})")
         self.repo = repo
+        # "verbose" (commenté, indenté) ou "compact" (valeurs par défaut partagées)
+        self.profile = profile
+        self._compact_defaults = None
+        # Fragments Lua par carte, persistés dans la base des cartes
+        self.fragment_cache = None
+        if use_fragment_cache and getattr(repo, 'db_file', None):
+            self.fragment_cache = LuaFragmentCache(repo.db_file)
 
     def build_types_array(self, types_list):
         """Construit le tableau des types au format Lua"""
@@ -248,8 +235,106 @@ class Love2DLuaExporter:
             }}
         }}"""
 
-    def build_card_lua_love2d(self, card, card_number):
+    def build_atlas_entry(self, quad):
+        """Construit le champ Atlas (planche et quad) d'une carte"""
+        return (f"Atlas = {{ sheet = {quad['sheet']}, x = {quad['x']}, y = {quad['y']}, "
+                f"w = {quad['w']}, h = {quad['h']} }},\n        ")
+
+    def build_effect_tree(self, effects, fields):
+        """Arbre Caster/Target (profil compact)"""
+        tree = {}
+        for field in fields:
+            value = effects[field]
+            if isinstance(value, dict):
+                tree[field] = {'value': lua_number(value['value']),
+                               'number_turns': lua_number(value['number_turns'])}
+            else:
+                tree[field] = lua_number(value)
+        return tree
+
+    def build_card_tree(self, card, atlas_quads=None):
+        """
+        Carte sous forme d'arbre {champ: littéral Lua} (profil compact).
+        
+        Mêmes champs et mêmes valeurs que build_card_body.
+        """
+        image_name = get_card_image_name(card)
+        tree = {'name': lua_escape(card.name), 'ImgIlustration': lua_escape(image_name)}
+        if atlas_quads and image_name in atlas_quads:
+            quad = atlas_quads[image_name]
+            tree['Atlas'] = {key: lua_number(quad[key]) for key in ('sheet', 'x', 'y', 'w', 'h')}
+        
+        action_lines = card.action.strip().split('\n') if card.action and card.action.strip() else []
+        tree.update({
+            'Description': lua_escape(card.description),
+            'PowerBlow': lua_number(card.powerblow),
+            'Rarete': lua_escape(card.rarity),
+            'Type': [lua_escape(t) for t in card.types or []],
+            'Effect': {
+                'Caster': self.build_effect_tree(card.hero, CASTER_FIELDS),
+                'Target': self.build_effect_tree(card.enemy, TARGET_FIELDS),
+                'action': lua_function(action_lines),
+            },
+            'TextFormatting': {
+                'card': {'width': '280', 'height': '392', 'scale': '1'},
+                'title': {
+                    'x': lua_number(card.title_x),
+                    'y': lua_number(card.title_y),
+                    'font': lua_escape(get_font_path_with_extension(card.title_font)),
+                    'size': lua_number(card.title_size),
+                    'color': lua_escape(card.title_color),
+                },
+                'text': {
+                    'x': lua_number(card.text_x),
+                    'y': lua_number(card.text_y),
+                    'width': lua_number(card.text_width),
+                    'height': lua_number(card.text_height),
+                    'font': lua_escape(get_font_path_with_extension(card.text_font)),
+                    'size': lua_number(card.text_size),
+                    'color': lua_escape(card.text_color),
+                    'align': lua_escape(card.text_align),
+                    'line_spacing': lua_number(card.line_spacing),
+                    'wrap': 'true' if card.text_wrap else 'false',
+                },
+                'energy': {
+                    'x': lua_number(card.energy_x),
+                    'y': lua_number(card.energy_y),
+                    'font': lua_escape(get_font_path_with_extension(card.energy_font)),
+                    'size': lua_number(card.energy_size),
+                    'color': lua_escape(card.energy_color),
+                },
+            },
+            'Cards': [],
+        })
+        return tree
+
+    def compact_defaults(self):
+        """
+        Valeurs par défaut partagées du profil compact (carte vierge sans ses
+        champs propres), calculées une fois par exportation.
+        """
+        if self._compact_defaults is None:
+            tree = self.build_card_tree(default_card())
+            for field in CARD_OWN_FIELDS:
+                tree.pop(field, None)
+            self._compact_defaults = tree
+        return self._compact_defaults
+
+    def build_card_lua_love2d(self, card, card_number, atlas_quads=None):
         """Construit l'export Lua d'une carte au format Love2D"""
+        return self.build_card_header(card_number) + self.build_card_body(card, atlas_quads)
+
+    def build_card_header(self, card_number):
+        """Commentaire numéroté placé avant chaque carte (aucun en profil compact)"""
+        if self.profile == PROFILE_COMPACT:
+            return ""
+        return f"    --[[ CARTE {card_number} - 🎮 Joueur ]]\n"
+
+    def build_card_body(self, card, atlas_quads=None):
+        """Table Lua d'une carte, indépendante de sa position dans le fichier"""
+        if self.profile == PROFILE_COMPACT:
+            return compact_card(self.build_card_tree(card, atlas_quads), self.compact_defaults())
+        
         types = self.build_types_array(card.types)
         effect = self.build_effect_section(card)
         formatting = self.build_text_formatting_section(card)
@@ -257,11 +342,15 @@ class Love2DLuaExporter:
         # Utiliser le nom de la carte pour générer le nom d'image
         image_name = get_card_image_name(card)
         
-        return f"""    --[[ CARTE {card_number} - 🎮 Joueur ]]
-    {{
+        # Position dans l'atlas de textures (export en mode atlas)
+        atlas = ""
+        if atlas_quads and image_name in atlas_quads:
+            atlas = self.build_atlas_entry(atlas_quads[image_name])
+        
+        return f"""    {{
         name = {lua_escape(card.name)},
         ImgIlustration = {lua_escape(image_name)},
-        Description = {lua_escape(card.description)},
+        {atlas}Description = {lua_escape(card.description)},
         PowerBlow = {card.powerblow},
         Rarete = {lua_escape(card.rarity)},
         Type = {types},
@@ -272,30 +361,178 @@ class Love2DLuaExporter:
 
     def export_all_cards_love2d(self):
         """Exporte toutes les cartes au format Love2D avec formatage"""
-        cards = self.repo.list_cards()
-        return self.export_cards_love2d(cards)
+        return self.export_cards_love2d(self.repo.iter_cards())
         
-    def export_cards_love2d(self, cards):
-        """Exporte une liste spécifique de cartes au format Love2D avec formatage"""
-        lua_content = "local cards = {\n"
+    def export_cards_love2d(self, cards, atlas_quads=None):
+        """
+        Exporte une liste spécifique de cartes au format Love2D avec formatage.
         
-        for i, card in enumerate(cards, 1):
-            lua_content += self.build_card_lua_love2d(card, i)
-            if i < len(cards):
-                lua_content += ",\n\n"
-            else:
-                lua_content += "\n"
+        Accepte n'importe quel itérable de cartes (liste ou générateur iter_cards).
+        atlas_quads ({'cards/<nom>.png': {'sheet', 'x', 'y', 'w', 'h'}}) ajoute
+        à chaque carte un champ Atlas pour le chargeur atlas_loader.lua.
+        """
+        return "".join(self.iter_cards_love2d(cards, atlas_quads))
+
+    def iter_cards_love2d(self, cards, atlas_quads=None, first_number=1):
+        """
+        Produit le fichier Lua morceau par morceau, une carte à la fois.
+        
+        La concaténation des morceaux est identique à export_cards_love2d ;
+        la mémoire utilisée ne dépend pas du nombre de cartes. first_number
+        numérote les commentaires des cartes (export par morceaux).
+        """
+        compact = self.profile == PROFILE_COMPACT
+        if compact:
+            # Polices résolues à nouveau : les valeurs par défaut suivent fonts/
+            self._compact_defaults = None
+            yield compact_prologue(self.compact_defaults())
+        else:
+            yield "local cards = {\n"
+        card_number = first_number - 1
+        fonts_version = self.fonts_version() if self.fragment_cache else None
+        cards = iter(cards)
+        while True:
+            batch = list(itertools.islice(cards, FRAGMENT_BATCH_SIZE))
+            if not batch:
+                break
+            for body in self.build_card_bodies(batch, atlas_quads, fonts_version):
+                if card_number >= first_number:
+                    yield COMPACT_SEPARATOR if compact else ",\n\n"
+                card_number += 1
+                yield self.build_card_header(card_number) + body
+        if card_number >= first_number:
+            yield "\n"
+        yield COMPACT_EPILOGUE if compact else "}\n\nreturn cards\n"
+
+    def fonts_version(self):
+        """Empreinte du dossier fonts/ (vérifiée une fois par exportation)"""
+        return get_font_index(max_age=0).version
+
+    def build_card_bodies(self, cards, atlas_quads=None, fonts_version=None):
+        """
+        Tables Lua d'un lot de cartes, dans l'ordre.
         
-        lua_content += "}\n\nreturn cards\n"
+        Avec le cache de fragments, seules les cartes modifiées depuis la
+        dernière exportation sont remises en forme.
+        """
+        if self.fragment_cache is None:
+            return [self.build_card_body(card, atlas_quads) for card in cards]
         
-        return lua_content
+        keys = {}
+        for card in cards:
+            # Cartes non enregistrées (sans id ni date) : jamais mises en cache
+            if getattr(card, 'id', None) and getattr(card, 'updated_at', None):
+                atlas_quad = atlas_quads.get(get_card_image_name(card)) if atlas_quads else None
+                keys[card.id] = card_fragment_key(card, fonts_version, atlas_quad, self.profile)
+        variant = self.fragment_variant(atlas_quads)
+        cached = self.fragment_cache.get_many(keys, variant)
+        
+        bodies = []
+        new_entries = []
+        for card in cards:
+            body = cached.get(card.id) if card.id in keys else None
+            if body is None:
+                body = self.build_card_body(card, atlas_quads)
+                if card.id in keys:
+                    new_entries.append((card.id, keys[card.id], body))
+                    # Une carte en double dans le lot n'est remise en forme qu'une fois
+                    cached[card.id] = body
+            bodies.append(body)
+        self.fragment_cache.put_many(new_entries, variant)
+        return bodies
+
+    def fragment_variant(self, atlas_quads=None):
+        """Variante d'export des fragments en cache : profil et mode atlas"""
+        return f"{self.profile}:{'atlas' if atlas_quads else 'fichier'}"
+
+    def write_cards_love2d(self, cards, stream, atlas_quads=None):
+        """
+        Écrit le fichier Lua dans un flux texte au fur et à mesure.
+        
+        Returns:
+            Nombre de caractères écrits
+        """
+        written = 0
+        for chunk in self.iter_cards_love2d(cards, atlas_quads):
+            stream.write(chunk)
+            written += len(chunk)
+        return written
+
+    def chunk_grouping(self, cards, group_by="id"):
+        """
+        Fonction de regroupement des cartes pour l'export par morceaux.
+        
+        Returns:
+            (cartes, group_of) : group_of vaut None pour le découpage par plage
+            d'ids ; les cartes sont matérialisées en liste si le regroupement
+            en a besoin
+        """
+        if group_by not in CHUNK_GROUPINGS:
+            raise ValueError(f"Regroupement inconnu : {group_by} (attendu : {', '.join(CHUNK_GROUPINGS)})")
+        if group_by == "id":
+            return cards, None
+        if group_by == "rarity":
+            return cards, lambda card: card.rarity or "commun"
+        
+        # Par acteur : premier acteur (par nom) de chaque carte, en une requête
+        from lib.actors import ActorManager
+        cards = list(cards)
+        actors = ActorManager(self.repo.db_file).get_actors_for_cards(
+            [card.id for card in cards if card.id]
+        )
+        return cards, lambda card: actors[card.id][0]['name'] if actors.get(card.id) else "sans_acteur"
+
+    def export_chunked(self, write, cards, group_by="id", chunk_size=DEFAULT_CHUNK_SIZE, atlas_quads=None):
+        """
+        Exporte les cartes en modules Lua de chunk_size cartes au plus.
+        
+        Args:
+            write: write(chemin_relatif, morceaux_de_texte) écrit un fichier
+            cards: Itérable de cartes
+            group_by: "id" (plages dans l'ordre de l'export), "rarity" ou "actor"
+            chunk_size: Nombre maximal de cartes par module
+            atlas_quads: Positions des cartes dans l'atlas (mode atlas)
+            
+        Returns:
+            Liste des morceaux écrits (LuaChunk)
+        """
+        cards, group_of = self.chunk_grouping(cards, group_by)
+        chunks = []
+        for chunk, chunk_cards in split_into_chunks(cards, chunk_size, group_of):
+            write(chunk.file_name, self.iter_cards_love2d(chunk_cards, atlas_quads, chunk.first))
+            chunks.append(chunk)
+        write(f"{INDEX_MODULE}.lua", iter([build_index_lua(chunks)]))
+        write("cards_data.lua", iter([CARDS_DATA_COMPAT_LUA]))
+        return chunks
+
+    def export_chunked_to_dir(self, directory, group_by="id", chunk_size=DEFAULT_CHUNK_SIZE):
+        """Exporte toutes les cartes par morceaux dans un dossier (cards_data.lua, index, morceaux)"""
+        written = set()
+        
+        def write(relative_path, chunks):
+            path = os.path.normpath(os.path.join(directory, relative_path))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            write_lua_file(path, chunks)
+            written.add(path)
+        
+        chunks = self.export_chunked(write, self.repo.iter_cards(), group_by, chunk_size)
+        
+        # Morceaux d'un export précédent qui ne sont plus référencés par l'index
+        chunks_dir = os.path.join(directory, CHUNKS_PACKAGE)
+        for name in os.listdir(chunks_dir) if os.path.isdir(chunks_dir) else ():
+            path = os.path.normpath(os.path.join(chunks_dir, name))
+            if name.endswith(".lua") and path not in written:
+                os.remove(path)
+        return chunks
 
     def export_to_file(self, filename):
-        """Exporte les cartes dans un fichier Lua"""
-        content = self.export_all_cards_love2d()
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(content)
-        return len(content)
+        """Exporte les cartes dans un fichier Lua (écriture en flux)"""
+        size = write_lua_file(filename, self.iter_cards_love2d(self.repo.iter_cards()))
+        if self.fragment_cache:
+            # Export complet : les fragments des cartes supprimées ne servent plus
+            self.fragment_cache.prune()
+        return size
+
 
 if __name__ == "__main__":
     # Test de l'exporteur
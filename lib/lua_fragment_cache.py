@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧩 CACHE DES FRAGMENTS LUA PAR CARTE
+====================================
+
+Garde dans la base (table lua_fragments, créée par la migration v9) le
+texte Lua déjà produit pour chaque carte, avec la clé qui l'a produit :
+- une réexportation ne remet en forme que les cartes modifiées
+- un fragment par variante d'export (profil, mode atlas) : alterner
+  entre les exports ne remet pas toutes les cartes en forme
+- la clé couvre la date de modification de la carte, la version de
+  l'exporteur et l'état du dossier de polices (voir l'exporteur Love2D)
+- une clé différente remplace simplement l'ancien fragment de la variante
+"""
+from typing import Dict, Iterable, Tuple
+
+try:
+    from .db_connection import get_connection_manager
+except ImportError:
+    from db_connection import get_connection_manager
+
+# Nombre maximal de paramètres par requête IN (limite SQLite prudente)
+QUERY_CHUNK_SIZE = 500
+
+
+class LuaFragmentCache:
+    """Fragments Lua des cartes, persistés dans la base des cartes."""
+
+    def __init__(self, db_path: str):
+        """
+        Initialise le cache.
+
+        Args:
+            db_path: Chemin vers la base de données SQLite des cartes
+        """
+        self.db_path = db_path
+        self.db = get_connection_manager(db_path)
+        self.hits = 0
+        self.misses = 0
+        # Base non migrée (mode legacy, base externe) : cache inactif
+        with self.db.read() as conn:
+            self.enabled = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'lua_fragments'"
+            ).fetchone() is not None
+
+    def get_many(self, keys: Dict[int, str], variant: str = "") -> Dict[int, str]:
+        """
+        Fragments en cache dont la clé correspond encore.
+
+        Args:
+            keys: {card_id: clé attendue}
+            variant: Variante d'export (profil, mode atlas)
+
+        Returns:
+            {card_id: fragment} pour les cartes à jour seulement
+        """
+        found: Dict[int, str] = {}
+        card_ids = list(keys) if self.enabled else []
+        with self.db.read() as conn:
+            for start in range(0, len(card_ids), QUERY_CHUNK_SIZE):
+                chunk = card_ids[start:start + QUERY_CHUNK_SIZE]
+                rows = conn.execute(
+                    f"SELECT card_id, cache_key, fragment FROM lua_fragments "
+                    f"WHERE variant = ? AND card_id IN ({', '.join('?' for _ in chunk)})",
+                    [variant] + chunk
+                ).fetchall()
+                for row in rows:
+                    if keys[row['card_id']] == row['cache_key']:
+                        found[row['card_id']] = row['fragment']
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, entries: Iterable[Tuple[int, str, str]], variant: str = "") -> None:
+        """Enregistre des fragments (card_id, clé, fragment) d'une variante en une transaction."""
+        entries = [(card_id, variant, key, fragment) for card_id, key, fragment in entries]
+        if not entries or not self.enabled:
+            return
+        with self.db.transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO lua_fragments (card_id, variant, cache_key, fragment) "
+                "VALUES (?, ?, ?, ?)",
+                entries
+            )
+
+    def prune(self) -> int:
+        """Supprime les fragments (toutes variantes) des cartes qui n'existent plus. Retourne leur nombre."""
+        if not self.enabled:
+            return 0
+        with self.db.transaction() as conn:
+            cursor = conn.execute(
+                "DELETE FROM lua_fragments WHERE card_id NOT IN (SELECT id FROM cards)"
+            )
+            return cursor.rowcount
+
+    def clear(self) -> None:
+        """Vide le cache (la prochaine exportation remet toutes les cartes en forme)."""
+        if not self.enabled:
+            return
+        with self.db.transaction() as conn:
+            conn.execute("DELETE FROM lua_fragments")
+
+    def stats(self) -> Dict[str, int]:
+        """Compteurs de la session : fragments réutilisés et remis en forme."""
+        return {'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🗃️ CACHE DE RENDU DES IMAGES DE CARTES
+======================================
+
+Cache adressé par contenu des PNG rendus (fusion carte + template, images
+de package). La clé est un hash de tout ce qui influence le rendu :
+- signature des fichiers sources (image, template, polices)
+- champs de formatage, textes de la carte
+- version du moteur de rendu (RENDERER_VERSION)
+
+Les PNG sont stockés sous images/.cache/ avec une éviction LRU bornée en
+taille (date de modification = date du dernier accès).
+"""
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    from .config import APP_SETTINGS, IMAGES_FOLDER
+except ImportError:
+    from config import APP_SETTINGS, IMAGES_FOLDER
+
+# À incrémenter à chaque changement du code de rendu (invalide tout le cache)
+RENDERER_VERSION = 4
+
+# Taille maximale par défaut du cache (Mo), surchargeable via APP_SETTINGS
+DEFAULT_MAX_MB = 1024
+
+# Après éviction, le cache redescend à cette fraction de la taille maximale
+EVICTION_LOW_WATER = 0.9
+
+
+def file_signature(path: Optional[str]) -> Optional[list]:
+    """Signature d'un fichier source : chemin absolu, taille et date de modification."""
+    if not path:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return [os.path.abspath(path), None]
+    return [os.path.abspath(path), st.st_size, st.st_mtime_ns]
+
+
+def render_key(kind: str, *parts) -> str:
+    """
+    Calcule la clé de cache d'un rendu.
+
+    Args:
+        kind: Type de rendu (ex: 'fusion', 'package-complete')
+        parts: Éléments sérialisables en JSON influençant le rendu
+
+    Returns:
+        Empreinte SHA-256 hexadécimale
+    """
+    payload = json.dumps([RENDERER_VERSION, kind, parts], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def default_cache_dir() -> str:
+    """Dossier images/.cache à la racine du projet."""
+    base = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', IMAGES_FOLDER, '.cache')
+    return os.path.normpath(base)
+
+
+class RenderCache:
+    """Cache disque de PNG rendus, avec éviction LRU bornée en taille."""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None):
+        """
+        Initialise le cache.
+
+        Args:
+            cache_dir: Dossier du cache (défaut : images/.cache)
+            max_bytes: Taille maximale en octets (défaut : APP_SETTINGS['render_cache_max_mb'])
+        """
+        self.cache_dir = Path(cache_dir or default_cache_dir())
+        if max_bytes is None:
+            max_bytes = int(APP_SETTINGS.get('render_cache_max_mb', DEFAULT_MAX_MB)) * 1024 * 1024
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Transmis aux processus de rendu : seuls le dossier et la limite comptent
+        return {'cache_dir': self.cache_dir, 'max_bytes': self.max_bytes}
+
+    def __setstate__(self, state):
+        self.__init__(state['cache_dir'], state['max_bytes'])
+
+    def path_for(self, key: str) -> Path:
+        """Chemin du PNG associé à une clé (réparti en sous-dossiers)."""
+        return self.cache_dir / key[:2] / f"{key}.png"
+
+    def get_path(self, key: str) -> Optional[Path]:
+        """Retourne le chemin du PNG en cache (et le marque comme récent), ou None."""
+        path = self.path_for(key)
+        try:
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Retourne le PNG en cache, ou None."""
+        path = self.get_path(key)
+        if path is None:
+            return None
+        try:
+            return path.read_bytes()
+        except OSError:
+            # Évincé entre-temps par un autre processus
+            self.hits -= 1
+            self.misses += 1
+            return None
+
+    def put(self, key: str, data: bytes) -> Path:
+        """Enregistre un PNG rendu (écriture atomique) et applique la limite de taille."""
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(data)
+            if self._size > self.max_bytes:
+                self._evict()
+        return path
+
+    def _entries(self):
+        if not self.cache_dir.exists():
+            return []
+        entries = []
+        for path in self.cache_dir.glob("*/*.png"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, path))
+        return entries
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self) -> None:
+        """Supprime les entrées les moins récemment utilisées jusqu'au seuil bas."""
+        entries = sorted(self._entries())
+        size = sum(entry_size for _, entry_size, _ in entries)
+        target = int(self.max_bytes * EVICTION_LOW_WATER)
+        for _, entry_size, path in entries:
+            if size <= target:
+                break
+            path.unlink(missing_ok=True)
+            size -= entry_size
+        self._size = size
+
+    def clear(self) -> None:
+        """Vide entièrement le cache."""
+        with self._lock:
+            for _, _, path in self._entries():
+                path.unlink(missing_ok=True)
+            self._size = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Statistiques d'utilisation (succès, échecs, taille)."""
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            return {'hits': self.hits, 'misses': self.misses, 'size': self._size, 'max_bytes': self.max_bytes}
+
+
+# Cache partagé du processus (dossier par défaut)
+_render_cache: Optional[RenderCache] = None
+_render_cache_lock = threading.Lock()
+
+
+def get_render_cache() -> RenderCache:
+    """Retourne le cache de rendu partagé (images/.cache)."""
+    global _render_cache
+    with _render_cache_lock:
+        if _render_cache is None:
+            _render_cache = RenderCache()
+        return _render_cache
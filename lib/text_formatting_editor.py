@@ -15,9 +15,15 @@ from pathlib import Path
 try:
     from .font_manager import get_font_manager, get_available_fonts
     from .favorites_manager import create_favorites_manager
+    from .text_layout import layout_card_text
+    from .game_package_exporter import load_card_font
+    from .thumbnails import get_thumbnail_cache
 except ImportError:
     from font_manager import get_font_manager, get_available_fonts
     from favorites_manager import create_favorites_manager
+    from text_layout import layout_card_text
+    from game_package_exporter import load_card_font
+    from thumbnails import get_thumbnail_cache
 
 class TextFormattingEditor:
     def __init__(self, parent, card_id=None, card_data=None, repo=None):
@@ -86,16 +92,13 @@ class TextFormattingEditor:
                 image_path = base_path / self.card_image_path.strip()
             
             if image_path.exists():
-                # Charger l'image
-                self.card_image = Image.open(image_path)
-                
                 # Pour l'éditeur de formatage, utiliser les dimensions exactes Love2D
                 # pour un positionnement précis
                 love2d_width = 280
                 love2d_height = 392
                 
-                # Redimensionner l'image aux dimensions exactes Love2D
-                self.card_image = self.card_image.resize((love2d_width, love2d_height), Image.Resampling.LANCZOS)
+                # Miniature en cache aux dimensions exactes Love2D
+                self.card_image = get_thumbnail_cache().load(str(image_path), (love2d_width, love2d_height))
                 self.card_image_tk = ImageTk.PhotoImage(self.card_image)
             else:
                 print(f"⚠️ Image non trouvée : {image_path}")
@@ -708,7 +711,8 @@ class TextFormattingEditor:
             (self.text_font_var.get(), self.text_size_var.get()),
             self.text_color_var.get(),
             self.text_align_var.get(),
-            self.line_spacing_var.get()
+            self.line_spacing_var.get(),
+            self.text_wrap_var.get()
         )
         
         # Ajouter des guides visuels
@@ -730,61 +734,29 @@ class TextFormattingEditor:
             font=('Arial', 8), fill='#666666', anchor='sw'
         )
         
-    def draw_wrapped_text(self, x, y, width, height, text, font_tuple, color, align, line_spacing):
+    def draw_wrapped_text(self, x, y, width, height, text, font_tuple, color, align, line_spacing, wrap=True):
         """Dessine du texte avec retour à la ligne"""
         if not text.strip():
             return
             
-        # Simuler le retour à la ligne (basique)
-        font_size = font_tuple[1]
-        line_height = int(font_size * line_spacing)
-        
-        # Diviser le texte en mots
-        words = text.split()
-        lines = []
-        current_line = ""
-        
-        # Estimation approximative de la largeur des caractères
-        avg_char_width = font_size * 0.6
-        max_chars_per_line = int(width / avg_char_width)
-        
-        for word in words:
-            if len(current_line + " " + word) < max_chars_per_line:
-                if current_line:
-                    current_line += " " + word
-                else:
-                    current_line = word
-            else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = word
-        
-        if current_line:
-            lines.append(current_line)
-        
-        # Dessiner chaque ligne
-        for i, line in enumerate(lines):
-            line_y = y + (i * line_height)
-            if line_y + line_height > y + height:
-                break  # Ne pas dépasser la zone
-                
-            if align == 'center':
-                line_x = x + width // 2
-                anchor = 'n'
-            elif align == 'right':
-                line_x = x + width - 5
-                anchor = 'ne'
-            else:  # left
-                line_x = x + 5
-                anchor = 'nw'
-                
+        # Même mise en page que le rendu des images du package (layout_card_text)
+        font_name, font_size = font_tuple[0], font_tuple[1]
+        boxes = layout_card_text(text, self.get_layout_font(font_name, font_size), font_size,
+                                 width, height, line_spacing=line_spacing, align=align, wrap=wrap)
+        
+        # Dessiner chaque ligne (taille en pixels, comme PIL)
+        for box in boxes:
             self.preview_canvas.create_text(
-                line_x, line_y,
-                text=line,
-                font=font_tuple,
+                x + box.x, y + box.y,
+                text=box.text,
+                font=(font_name, -font_size),
                 fill=color,
-                anchor=anchor
+                anchor='nw'
             )
+    
+    def get_layout_font(self, font_name, size):
+        """Police PIL utilisée pour mesurer le texte de l'aperçu (même résolution que le package)"""
+        return load_card_font(font_name, size)
             
     def save_formatting(self):
         """Sauvegarde les paramètres de formatage en base de données"""
@@ -793,7 +765,19 @@ class TextFormattingEditor:
             return
             
         try:
-            if self.repo:
+            if hasattr(self.repo, 'update_fields'):
+                # CardRepo : une seule requête UPDATE sur les colonnes de formatage
+                formatting = self.get_current_formatting_data()
+                if not formatting:
+                    messagebox.showerror("Erreur", "Paramètres de formatage invalides.")
+                    return
+                if not self.repo.update_fields(self.card_id, **formatting):
+                    messagebox.showerror("Erreur", f"Carte non trouvée pour l'ID {self.card_id}.")
+                    return
+                
+                messagebox.showinfo("Succès", "Paramètres de formatage sauvegardés !")
+                self.window.destroy()
+            elif self.repo:
                 # Utiliser le repo personnalisé
                 # Créer un objet avec les données de formatage
                 class FormattingData:
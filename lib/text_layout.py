@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+📐 MISE EN PAGE DU TEXTE DES CARTES
+===================================
+
+Module commun à l'aperçu Tk et au rendu PIL des images :
+- avances des glyphes et paires de crénage mises en cache par police
+- retour à la ligne en temps linéaire (chaque mot mesuré une seule fois)
+- résultat sous forme de boîtes de ligne (texte, position, dimensions)
+- mémo des découpages par (texte, police, taille, largeur)
+- layout_card_text : mise en page de la description d'une carte, la même
+  pour l'aperçu de l'éditeur et pour les images du package
+"""
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from PIL import ImageFont
+
+# Nombre maximal de découpages mémorisés
+LAYOUT_MEMO_SIZE = 2048
+
+# Nombre maximal de polices dont les métriques sont gardées
+METRICS_CACHE_SIZE = 64
+
+# Nombre maximal de mots mémorisés par police
+WORD_CACHE_SIZE = 8192
+
+
+class LineBox(NamedTuple):
+    """Une ligne mise en page, relative au coin haut-gauche de la zone de texte."""
+    text: str
+    x: float
+    y: float
+    width: float
+    height: float
+
+
+class GlyphMetrics:
+    """Avances et crénage d'une police, mesurés à la demande puis mis en cache."""
+
+    def __init__(self, font):
+        self.font = font
+        self._advances: Dict[str, float] = {}
+        self._kerning: Dict[Tuple[str, str], float] = {}
+        self._words: Dict[str, float] = {}
+
+    def advance(self, char: str) -> float:
+        """Avance horizontale d'un caractère."""
+        width = self._advances.get(char)
+        if width is None:
+            width = self.font.getlength(char)
+            self._advances[char] = width
+        return width
+
+    def kerning(self, left: str, right: str) -> float:
+        """Correction de crénage entre deux caractères consécutifs."""
+        pair = (left, right)
+        value = self._kerning.get(pair)
+        if value is None:
+            value = self.font.getlength(left + right) - self.advance(left) - self.advance(right)
+            self._kerning[pair] = value
+        return value
+
+    def text_width(self, text: str) -> float:
+        """Largeur d'un texte : somme des avances et des crénages."""
+        width = self._words.get(text)
+        if width is not None:
+            return width
+        width = 0.0
+        previous = None
+        for char in text:
+            width += self.advance(char)
+            if previous is not None:
+                width += self.kerning(previous, char)
+            previous = char
+        if len(self._words) >= WORD_CACHE_SIZE:
+            self._words.clear()
+        self._words[text] = width
+        return width
+
+
+_metrics: "OrderedDict[tuple, GlyphMetrics]" = OrderedDict()
+_layout_memo: "OrderedDict[tuple, Tuple[Tuple[str, float], ...]]" = OrderedDict()
+_layout_stats = {'hits': 0, 'misses': 0}
+
+
+def font_key(font) -> Optional[tuple]:
+    """Identité stable d'une police (fichier, taille), ou None pour une police en mémoire."""
+    path = getattr(font, 'path', None)
+    if isinstance(path, str):
+        return path, getattr(font, 'size', None)
+    return None
+
+
+def get_metrics(font) -> GlyphMetrics:
+    """Métriques partagées d'une police chargée depuis un fichier."""
+    key = font_key(font)
+    if key is None:
+        return GlyphMetrics(font)
+    metrics = _metrics.get(key)
+    if metrics is None:
+        metrics = GlyphMetrics(font)
+        _metrics[key] = metrics
+        while len(_metrics) > METRICS_CACHE_SIZE:
+            _metrics.popitem(last=False)
+    else:
+        _metrics.move_to_end(key)
+    return metrics
+
+
+def measure_text(text: str, font) -> float:
+    """Largeur d'un texte sur une ligne avec la police donnée."""
+    return get_metrics(font).text_width(text)
+
+
+def _wrap(text: str, metrics: GlyphMetrics, max_width: float) -> Tuple[Tuple[str, float], ...]:
+    """Découpe glouton, mot par mot : chaque mot n'est mesuré qu'une fois."""
+    space = metrics.advance(" ")
+    lines = []
+    current: List[str] = []
+    current_width = 0.0
+
+    for word in text.split():
+        word_width = metrics.text_width(word)
+        if current:
+            last = current[-1][-1]
+            joined = (current_width + space + word_width
+                      + metrics.kerning(last, " ") + metrics.kerning(" ", word[0]))
+            if joined <= max_width:
+                current.append(word)
+                current_width = joined
+                continue
+            lines.append((" ".join(current), current_width))
+        # Un mot plus large que la zone occupe sa propre ligne
+        current = [word]
+        current_width = word_width
+
+    if current:
+        lines.append((" ".join(current), current_width))
+    return tuple(lines)
+
+
+def wrap_text(text: str, font, max_width: float) -> List[Tuple[str, float]]:
+    """
+    Découpe un texte en lignes ne dépassant pas max_width.
+
+    Args:
+        text: Texte à découper (les espaces et retours à la ligne séparent les mots)
+        font: Police PIL (FreeTypeFont)
+        max_width: Largeur maximale en pixels
+
+    Returns:
+        Liste de (texte de la ligne, largeur)
+    """
+    key = font_key(font)
+    if key is None:
+        return list(_wrap(text, GlyphMetrics(font), max_width))
+
+    memo_key = (text, key[0], key[1], max_width)
+    lines = _layout_memo.get(memo_key)
+    if lines is not None:
+        _layout_memo.move_to_end(memo_key)
+        _layout_stats['hits'] += 1
+        return list(lines)
+
+    _layout_stats['misses'] += 1
+    lines = _wrap(text, get_metrics(font), max_width)
+    _layout_memo[memo_key] = lines
+    while len(_layout_memo) > LAYOUT_MEMO_SIZE:
+        _layout_memo.popitem(last=False)
+    return list(lines)
+
+
+def layout_text(text: str, font, max_width: float, line_height: Optional[float] = None,
+                align: str = 'left', max_lines: Optional[int] = None,
+                max_height: Optional[float] = None, wrap: bool = True) -> List[LineBox]:
+    """
+    Met en page un texte dans une zone de largeur donnée.
+
+    Args:
+        text: Texte à mettre en page
+        font: Police PIL (FreeTypeFont)
+        max_width: Largeur de la zone
+        line_height: Hauteur d'une ligne (défaut : ascendante + descendante)
+        align: 'left', 'center' ou 'right'
+        max_lines: Nombre maximal de lignes
+        max_height: Hauteur de la zone (les lignes qui dépassent sont omises)
+        wrap: False pour ne couper qu'aux retours à la ligne du texte
+
+    Returns:
+        Boîtes de ligne relatives au coin haut-gauche de la zone
+    """
+    if line_height is None:
+        ascent, descent = font.getmetrics()
+        line_height = ascent + descent
+
+    if wrap:
+        lines = wrap_text(text, font, max_width)
+    else:
+        lines = [(line, measure_text(line, font)) for line in text.splitlines()]
+
+    boxes = []
+    for index, (line, width) in enumerate(lines):
+        if max_lines is not None and index >= max_lines:
+            break
+        y = index * line_height
+        if max_height is not None and y + line_height > max_height:
+            break
+        if align == 'center':
+            x = (max_width - width) / 2
+        elif align == 'right':
+            x = max_width - width
+        else:
+            x = 0
+        boxes.append(LineBox(line, x, y, width, line_height))
+    return boxes
+
+
+def layout_card_text(text: str, font, font_size: int, width: float, height: float,
+                     line_spacing: float = 1.2, align: str = 'left', wrap: bool = True) -> List[LineBox]:
+    """
+    Mise en page de la description d'une carte (zone de texte de la carte).
+
+    Seul point d'entrée de l'aperçu de l'éditeur et du rendu du package :
+    interligne int(taille * line_spacing), alignement, hauteur de la zone
+    et retour à la ligne de la carte.
+    """
+    return layout_text(text, font, width, line_height=int(font_size * line_spacing),
+                       align=align, max_height=height, wrap=bool(wrap))
+
+
+def default_font(size: int):
+    """Police par défaut de PIL à la taille demandée (si la version le permet)."""
+    try:
+        return ImageFont.load_default(size)
+    except TypeError:
+        return ImageFont.load_default()
+
+
+def layout_stats() -> Dict[str, int]:
+    """Compteurs du mémo de mise en page."""
+    return {**_layout_stats, 'size': len(_layout_memo), 'fonts': len(_metrics)}
+
+
+def clear_layout_cache() -> None:
+    """Vide le mémo et les métriques de polices."""
+    _layout_memo.clear()
+    _metrics.clear()
+    _layout_stats['hits'] = 0
+    _layout_stats['misses'] = 0
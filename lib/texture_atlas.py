@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧩 ATLAS DE TEXTURES (SPRITESHEETS)
+===================================
+
+Regroupe des images (cartes rendues, icônes...) dans des planches de
+dimensions puissances de deux, pour Love2D :
+- placement MaxRects (heuristique « best short side fit »)
+- taille maximale des planches et marge entre images configurables
+- coordonnées des quads + module Lua de chargement
+"""
+import io
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image
+
+# Taille maximale par défaut d'une planche (compatible avec la plupart des GPU)
+DEFAULT_MAX_SHEET_SIZE = 2048
+
+# Marge par défaut autour de chaque image (évite le débordement du filtrage)
+DEFAULT_PADDING = 2
+
+Rect = Tuple[int, int, int, int]  # (x, y, largeur, hauteur)
+
+
+def next_power_of_two(value: int) -> int:
+    """Plus petite puissance de deux >= value."""
+    power = 1
+    while power < value:
+        power *= 2
+    return power
+
+
+def _contains(outer: Rect, inner: Rect) -> bool:
+    return (inner[0] >= outer[0] and inner[1] >= outer[1]
+            and inner[0] + inner[2] <= outer[0] + outer[2]
+            and inner[1] + inner[3] <= outer[1] + outer[3])
+
+
+def _split_free_rect(free: Rect, used: Rect) -> List[Rect]:
+    """Découpe un rectangle libre autour d'un rectangle occupé (rectangles maximaux)."""
+    fx, fy, fw, fh = free
+    ux, uy, uw, uh = used
+    if ux >= fx + fw or ux + uw <= fx or uy >= fy + fh or uy + uh <= fy:
+        return [free]
+    parts = []
+    if ux > fx:
+        parts.append((fx, fy, ux - fx, fh))
+    if ux + uw < fx + fw:
+        parts.append((ux + uw, fy, fx + fw - (ux + uw), fh))
+    if uy > fy:
+        parts.append((fx, fy, fw, uy - fy))
+    if uy + uh < fy + fh:
+        parts.append((fx, uy + uh, fw, fy + fh - (uy + uh)))
+    return parts
+
+
+class MaxRectsBin:
+    """Une planche en cours de remplissage (algorithme MaxRects)."""
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.free: List[Rect] = [(0, 0, width, height)]
+        self.used: List[Rect] = []
+
+    def find_position(self, width: int, height: int) -> Optional[Tuple[Tuple[int, int], int, int]]:
+        """
+        Meilleure position pour un rectangle (best short side fit).
+
+        Returns:
+            (score, x, y) ou None si le rectangle ne rentre pas
+        """
+        best = None
+        for fx, fy, fw, fh in self.free:
+            if width <= fw and height <= fh:
+                leftover_w, leftover_h = fw - width, fh - height
+                score = (min(leftover_w, leftover_h), max(leftover_w, leftover_h))
+                if best is None or score < best[0]:
+                    best = (score, fx, fy)
+        return best
+
+    def place(self, rect: Rect) -> None:
+        """Occupe un rectangle et met à jour la liste des rectangles libres."""
+        kept, created = [], []
+        for free in self.free:
+            parts = _split_free_rect(free, rect)
+            if parts == [free]:
+                kept.append(free)
+            else:
+                created.extend(parts)
+        # Seuls les nouveaux rectangles peuvent être contenus dans un autre
+        pruned = []
+        for i, rect_i in enumerate(created):
+            if any(_contains(other, rect_i) for other in kept):
+                continue
+            # Doublons : on garde la première occurrence
+            if any(j != i and _contains(other, rect_i) and (other != rect_i or j < i)
+                   for j, other in enumerate(created)):
+                continue
+            pruned.append(rect_i)
+        self.free = kept + pruned
+        self.used.append(rect)
+
+    def used_size(self) -> Tuple[int, int]:
+        """Étendue réellement occupée (largeur, hauteur)."""
+        if not self.used:
+            return 0, 0
+        return (max(x + w for x, _, w, _ in self.used),
+                max(y + h for _, y, _, h in self.used))
+
+
+class AtlasSheet:
+    """Planche finale : dimensions puissances de deux et position de chaque image."""
+
+    def __init__(self, width: int, height: int, placements: Dict[str, Rect]):
+        self.width = width
+        self.height = height
+        self.placements = placements
+
+
+def pack_rectangles(sizes: Dict[str, Tuple[int, int]],
+                    max_size: int = DEFAULT_MAX_SHEET_SIZE,
+                    padding: int = DEFAULT_PADDING) -> List[AtlasSheet]:
+    """
+    Répartit des rectangles nommés dans des planches puissances de deux.
+
+    Args:
+        sizes: {nom: (largeur, hauteur)}
+        max_size: Taille maximale (largeur et hauteur) d'une planche
+        padding: Marge autour de chaque image (pixels)
+
+    Returns:
+        Liste de planches ; les positions sont celles des images (marge exclue)
+
+    Raises:
+        ValueError: si une image est plus grande qu'une planche
+    """
+    # Les plus grands d'abord (ordre déterministe)
+    order = sorted(sizes, key=lambda name: (-max(sizes[name]), -sizes[name][0] * sizes[name][1], name))
+    bins: List[MaxRectsBin] = []
+    placements: List[Dict[str, Rect]] = []
+
+    for name in order:
+        width, height = sizes[name]
+        padded_w, padded_h = width + 2 * padding, height + 2 * padding
+        if padded_w > max_size or padded_h > max_size:
+            raise ValueError(f"Image trop grande pour l'atlas ({width}x{height} > {max_size}) : {name}")
+
+        target = None
+        for index, sheet in enumerate(bins):
+            found = sheet.find_position(padded_w, padded_h)
+            if found:
+                target = (index, found[1], found[2])
+                break
+        if target is None:
+            bins.append(MaxRectsBin(max_size, max_size))
+            placements.append({})
+            target = (len(bins) - 1, 0, 0)
+
+        index, x, y = target
+        bins[index].place((x, y, padded_w, padded_h))
+        placements[index][name] = (x + padding, y + padding, width, height)
+
+    sheets = []
+    for sheet, sheet_placements in zip(bins, placements):
+        used_w, used_h = sheet.used_size()
+        sheets.append(AtlasSheet(next_power_of_two(used_w), next_power_of_two(used_h), sheet_placements))
+    return sheets
+
+
+def build_atlas(images: Dict[str, bytes],
+                max_size: int = DEFAULT_MAX_SHEET_SIZE,
+                padding: int = DEFAULT_PADDING) -> Tuple[List[bytes], Dict[str, Dict], List[AtlasSheet]]:
+    """
+    Construit les planches PNG à partir d'images encodées.
+
+    Les images ne sont décodées qu'au moment de coller leur planche :
+    la mémoire reste bornée à une planche à la fois.
+
+    Args:
+        images: {nom: png}
+        max_size: Taille maximale d'une planche
+        padding: Marge autour de chaque image
+
+    Returns:
+        (planches PNG, quads {nom: {'sheet', 'x', 'y', 'w', 'h'}} avec sheet à partir de 1, planches)
+    """
+    sizes = {}
+    for name, data in images.items():
+        with Image.open(io.BytesIO(data)) as image:
+            sizes[name] = image.size
+
+    sheets = pack_rectangles(sizes, max_size, padding)
+    sheet_pngs: List[bytes] = []
+    quads: Dict[str, Dict] = {}
+    for number, sheet in enumerate(sheets, 1):
+        canvas = Image.new('RGBA', (sheet.width, sheet.height), (0, 0, 0, 0))
+        for name, (x, y, w, h) in sorted(sheet.placements.items()):
+            with Image.open(io.BytesIO(images[name])) as image:
+                canvas.paste(image.convert('RGBA'), (x, y))
+            quads[name] = {'sheet': number, 'x': x, 'y': y, 'w': w, 'h': h}
+        buffer = io.BytesIO()
+        canvas.save(buffer, 'PNG')
+        sheet_pngs.append(buffer.getvalue())
+    return sheet_pngs, quads, sheets
+
+
+def atlas_data_lua(sheet_files: List[str], sheets: List[AtlasSheet]) -> str:
+    """Module Lua décrivant les planches (fichier et dimensions)."""
+    lines = ["-- Planches de l'atlas généré par l'Éditeur de Cartes", "return {", "    sheets = {"]
+    for file_name, sheet in zip(sheet_files, sheets):
+        lines.append(f'        {{ file = "{file_name}", width = {sheet.width}, height = {sheet.height} }},')
+    lines += ["    }", "}", ""]
+    return "\n".join(lines)
+
+
+# Module Lua de chargement : crée les images des planches et un quad par carte
+ATLAS_LOADER_LUA = '''-- Chargeur d'atlas généré par l'Éditeur de Cartes
+-- Usage :
+--   local Atlas = require("atlas_loader")
+--   local cards = Atlas.attach(require("cards_data"))
+--   Atlas.draw(cards[1], 100, 100)
+local atlas_data = require("atlas_data")
+
+local Atlas = { images = {}, quads = {} }
+
+-- Charge les planches (une seule fois)
+function Atlas.load()
+    if #Atlas.images == 0 then
+        for i, sheet in ipairs(atlas_data.sheets) do
+            Atlas.images[i] = love.graphics.newImage(sheet.file)
+        end
+    end
+    return Atlas.images
+end
+
+-- Quad d'une entrée { sheet, x, y, w, h } (mis en cache)
+function Atlas.quad(entry)
+    local key = entry.sheet .. ":" .. entry.x .. ":" .. entry.y
+    local quad = Atlas.quads[key]
+    if not quad then
+        local sheet = atlas_data.sheets[entry.sheet]
+        quad = love.graphics.newQuad(entry.x, entry.y, entry.w, entry.h, sheet.width, sheet.height)
+        Atlas.quads[key] = quad
+    end
+    return quad
+end
+
+-- Ajoute card.image (planche) et card.quad à chaque carte ayant un champ Atlas
+function Atlas.attach(cards)
+    Atlas.load()
+    for _, card in ipairs(cards) do
+        if card.Atlas then
+            card.image = Atlas.images[card.Atlas.sheet]
+            card.quad = Atlas.quad(card.Atlas)
+        end
+    end
+    return cards
+end
+
+-- Dessine une carte (mêmes paramètres que love.graphics.draw)
+function Atlas.draw(card, x, y, r, sx, sy, ox, oy)
+    love.graphics.draw(card.image, card.quad, x, y, r, sx, sy, ox, oy)
+end
+
+-- SpriteBatch sur une planche : un seul appel de dessin pour toutes ses cartes
+function Atlas.newBatch(sheet_index, size)
+    Atlas.load()
+    return love.graphics.newSpriteBatch(Atlas.images[sheet_index], size or 1000)
+end
+
+return Atlas
+'''
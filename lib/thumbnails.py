@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🖼️ MINIATURES DES IMAGES DE CARTES
+==================================
+
+Pyramide de miniatures sur disque (images/.thumbs/) pour l'interface :
+- quelques largeurs fixes par image (64, 140 et 280 pixels)
+- toutes les tailles produites en un seul décodage de l'image source
+- invalidation par la date de modification de la source
+- l'interface ne décode jamais un PNG pleine résolution pour une vignette
+"""
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Optional, Tuple
+
+from PIL import Image, ImageFile
+
+try:
+    from .config import IMAGES_FOLDER
+except ImportError:
+    from config import IMAGES_FOLDER
+
+# Largeurs des niveaux de la pyramide (pixels)
+THUMBNAIL_WIDTHS = (64, 140, 280)
+
+
+def default_thumbnail_dir() -> str:
+    """Dossier images/.thumbs à la racine du projet."""
+    base = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', IMAGES_FOLDER, '.thumbs')
+    return os.path.normpath(base)
+
+
+class ThumbnailCache:
+    """Cache disque des miniatures, une pyramide de largeurs fixes par image source."""
+
+    def __init__(self, cache_dir: Optional[str] = None, widths: Tuple[int, ...] = THUMBNAIL_WIDTHS):
+        self.cache_dir = Path(cache_dir or default_thumbnail_dir())
+        self.widths = tuple(sorted(widths))
+        self.generated = 0
+        self._lock = threading.Lock()
+
+    def level_for(self, width: int) -> int:
+        """Plus petit niveau au moins aussi large que demandé (ou le plus grand)."""
+        for level in self.widths:
+            if level >= width:
+                return level
+        return self.widths[-1]
+
+    def path_for(self, source: str, width: int) -> Path:
+        """Chemin de la miniature d'une source pour un niveau donné."""
+        key = hashlib.sha1(os.path.normcase(os.path.abspath(source)).encode('utf-8')).hexdigest()
+        return self.cache_dir / key[:2] / f"{key}_{width}.png"
+
+    def get_path(self, source: str, width: int) -> Optional[Path]:
+        """
+        Miniature du niveau adapté à la largeur demandée, générée si besoin.
+
+        Returns:
+            Chemin du PNG de la miniature, ou None si la source n'existe pas
+        """
+        try:
+            source_mtime = os.stat(source).st_mtime_ns
+        except OSError:
+            return None
+        level = self.level_for(width)
+        path = self.path_for(source, level)
+        try:
+            if os.stat(path).st_mtime_ns == source_mtime:
+                return path
+        except OSError:
+            pass
+        self._build(source, source_mtime)
+        return path
+
+    def _build(self, source: str, source_mtime: int) -> None:
+        """Produit tous les niveaux de la pyramide en un seul décodage de la source."""
+        ImageFile.LOAD_TRUNCATED_IMAGES = True  # Permet de charger les images tronquées
+        with Image.open(source) as image:
+            width, height = image.size
+            largest = self.widths[-1]
+            # JPEG : décodage direct à l'échelle réduite la plus proche
+            image.draft('RGB', (largest, max(1, height * largest // max(1, width))))
+            image.load()
+            has_alpha = image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info
+            current = image.convert('RGBA' if has_alpha else 'RGB')
+
+        for level in reversed(self.widths):
+            if level < current.width:
+                # Chaque niveau est réduit depuis le niveau supérieur (jamais agrandi)
+                current = current.resize((level, max(1, round(height * level / width))),
+                                         Image.Resampling.LANCZOS)
+            path = self.path_for(source, level)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            current.save(tmp_path, 'PNG')
+            os.utime(tmp_path, ns=(source_mtime, source_mtime))
+            os.replace(tmp_path, path)
+        with self._lock:
+            self.generated += 1
+
+    def load(self, source: str, size: Tuple[int, int], keep_ratio: bool = False) -> Optional[Image.Image]:
+        """
+        Image PIL d'une miniature aux dimensions demandées.
+
+        Args:
+            source: Image source
+            size: (largeur, hauteur) voulues
+            keep_ratio: True pour tenir dans size en gardant les proportions,
+                False pour remplir exactement size
+
+        Returns:
+            Image chargée, ou None si la source n'existe pas
+        """
+        max_width, max_height = size
+        if keep_ratio:
+            # Proportions lues dans l'en-tête de la plus petite miniature
+            smallest = self.get_path(source, self.widths[0])
+            if smallest is None:
+                return None
+            with Image.open(smallest) as image:
+                ratio = image.height / image.width
+            max_width = min(max_width, max(1, int(max_height / ratio)))
+        path = self.get_path(source, max_width)
+        if path is None:
+            return None
+
+        with Image.open(path) as image:
+            image.load()
+            if keep_ratio:
+                image.thumbnail(size, Image.Resampling.LANCZOS)
+            elif image.size != size:
+                return image.resize(size, Image.Resampling.LANCZOS)
+            return image
+
+    def clear(self) -> None:
+        """Supprime toutes les miniatures."""
+        if not self.cache_dir.exists():
+            return
+        for path in self.cache_dir.glob("*/*.png"):
+            path.unlink(missing_ok=True)
+
+
+# Cache partagé du processus (dossier par défaut)
+_thumbnail_cache: Optional[ThumbnailCache] = None
+_thumbnail_cache_lock = threading.Lock()
+
+
+def get_thumbnail_cache() -> ThumbnailCache:
+    """Retourne le cache de miniatures partagé (images/.thumbs)."""
+    global _thumbnail_cache
+    with _thumbnail_cache_lock:
+        if _thumbnail_cache is None:
+            _thumbnail_cache = ThumbnailCache()
+        return _thumbnail_cache
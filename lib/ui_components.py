@@ -385,20 +385,35 @@ class CardForm(ttk.Frame):
             self._preview_img = None
             return
             
+        max_w, max_h = 360, 220
         try:
-            img = tk.PhotoImage(file=preview_path)
-        except Exception:
-            self.preview_label.config(text="Aperçu non disponible (format non supporté sans Pillow)", image='')
-            if hasattr(self, 'image_type_label'):
-                self.image_type_label.config(text="")
-            self._preview_img = None
-            return
+            # Miniature en cache : l'image pleine résolution n'est pas décodée
+            from PIL import ImageTk
+            try:
+                from .thumbnails import get_thumbnail_cache
+            except ImportError:
+                from thumbnails import get_thumbnail_cache
+            img = ImageTk.PhotoImage(get_thumbnail_cache().load(preview_path, (max_w, max_h), keep_ratio=True))
+        except ImportError:
+            img = None
+        except Exception as e:
+            print(f"⚠️ Miniature indisponible pour {preview_path}: {e}")
+            img = None
+        
+        if img is None:
+            try:
+                img = tk.PhotoImage(file=preview_path)
+            except Exception:
+                self.preview_label.config(text="Aperçu non disponible (format non supporté sans Pillow)", image='')
+                if hasattr(self, 'image_type_label'):
+                    self.image_type_label.config(text="")
+                self._preview_img = None
+                return
             
-        max_w, max_h = 360, 220
-        w, h = img.width(), img.height()
-        factor = max(1, int(max(w / max_w, h / max_h)))
-        if factor > 1:
-            img = img.subsample(factor, factor)
+            w, h = img.width(), img.height()
+            factor = max(1, int(max(w / max_w, h / max_h)))
+            if factor > 1:
+                img = img.subsample(factor, factor)
         self._preview_img = img
         
         # Indiquer quel type d'image est affiché
@@ -786,15 +801,6 @@ class CardForm(ttk.Frame):
             messagebox.showwarning(APP_TITLE, "La description est requise.")
             return
         
-        # Sauvegarde en base
-        if c.id is None:
-            new_id = self.repo.insert(c); self.current_id = new_id
-        else:
-            self.repo.update(c)
-        
-        # Gérer la liaison avec l'acteur sélectionné
-        self._update_actor_linkage(c.id if c.id else self.current_id)
-        
         # Détecter si la rareté a changé
         current_rarity = self.rarity_var.get()
         rarity_changed = (self.previous_rarity is not None and 
@@ -803,14 +809,21 @@ class CardForm(ttk.Frame):
         if rarity_changed:
             print(f"🔄 Changement de rareté détecté : {self.previous_rarity} → {current_rarity}")
         
-        # Génère l'image fusionnée si possible
+        # Génère l'image fusionnée si possible (avant l'écriture, pour un seul enregistrement)
         old_image_path = c.img  # Sauvegarder l'ancien chemin pour nettoyage si nécessaire
         generated_image = self.generate_card_image()
         if generated_image:
             self.generated_image_path = generated_image
             # Mettre à jour le chemin de l'image en base de données
             c.img = generated_image.replace('\\', '/')
-            self.repo.update(c)
+        
+        # Sauvegarde en base : carte et chemin d'image écrits dans une seule transaction
+        self.current_id = self.repo.upsert_many([c])[0]
+        
+        # Gérer la liaison avec l'acteur sélectionné
+        self._update_actor_linkage(self.current_id)
+        
+        if generated_image:
             # Actualiser l'aperçu pour montrer l'image générée
             self._update_preview()
             
@@ -884,118 +897,21 @@ class CardForm(ttk.Frame):
         try:
             # Utiliser le système principal unifié
             from .text_formatting_editor import TextFormattingEditor
-            import sqlite3
-            
-            # Récupérer les données de formatage depuis la base principale
-            conn = sqlite3.connect(self.repo.db_file)
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT title_x, title_y, title_font, title_size, title_color,
-                       text_x, text_y, text_width, text_height, text_font,
-                       text_size, text_color, text_align, line_spacing, text_wrap,
-                       energy_x, energy_y, energy_font, energy_size, energy_color
-                FROM cards WHERE id = ?
-            """, (self.current_id,))
-            
-            formatting_data = cursor.fetchone()
-            conn.close()
-            
-            if formatting_data:
-                # Adapter les données pour l'éditeur
-                card_data = {
-                    'id': self.current_id,
-                    'nom': card.name,
-                    'description': card.description,
-                    'img': card.img,
-                    'powerblow': card.powerblow,
-                    'title_x': formatting_data[0] or 50,
-                    'title_y': formatting_data[1] or 30,
-                    'title_font': formatting_data[2] or 'Arial',
-                    'title_size': formatting_data[3] or 16,
-                    'title_color': formatting_data[4] or '#000000',
-                    'text_x': formatting_data[5] or 50,
-                    'text_y': formatting_data[6] or 100,
-                    'text_width': formatting_data[7] or 200,
-                    'text_height': formatting_data[8] or 150,
-                    'text_font': formatting_data[9] or 'Arial',
-                    'text_size': formatting_data[10] or 12,
-                    'text_color': formatting_data[11] or '#000000',
-                    'text_align': formatting_data[12] or 'left',
-                    'line_spacing': formatting_data[13] or 1.2,
-                    'text_wrap': bool(formatting_data[14]) if formatting_data[14] is not None else True,
-                    'energy_x': formatting_data[15] or 25,
-                    'energy_y': formatting_data[16] or 25,
-                    'energy_font': formatting_data[17] or 'Arial',
-                    'energy_size': formatting_data[18] or 14,
-                    'energy_color': formatting_data[19] or '#FFFFFF'
-                }
-            else:
-                # Données par défaut si pas de formatage
-                card_data = {
-                    'id': self.current_id,
-                    'nom': card.name,
-                    'description': card.description,
-                    'img': card.img,
-                    'powerblow': card.powerblow,
-                    'title_x': 50, 'title_y': 30, 'title_font': 'Arial', 'title_size': 16, 'title_color': '#000000',
-                    'text_x': 50, 'text_y': 100, 'text_width': 200, 'text_height': 150, 'text_font': 'Arial',
-                    'text_size': 12, 'text_color': '#000000', 'text_align': 'left', 'line_spacing': 1.2, 'text_wrap': True,
-                    'energy_x': 25, 'energy_y': 25, 'energy_font': 'Arial', 'energy_size': 14, 'energy_color': '#FFFFFF'
-                }
-            
-            # Créer un repo de formatage personnalisé
-            class FormattingRepo:
-                def __init__(self, main_repo):
-                    self.main_repo = main_repo
-                
-                def get_card(self, card_id):
-                    # Retourner une pseudo-carte avec les bonnes données
-                    card = self.main_repo.get(card_id)
-                    if card:
-                        # Simuler l'objet database_simple Card
-                        class FormattingCard:
-                            pass
-                        
-                        fc = FormattingCard()
-                        fc.id = card.id
-                        fc.nom = card.name
-                        fc.description = card.description
-                        fc.img = card.img
-                        return fc
-                    return None
-                
-                def save_card(self, card_data):
-                    # Sauvegarder dans le système principal
-                    conn = sqlite3.connect(self.main_repo.db_file)
-                    cursor = conn.cursor()
-                    
-                    cursor.execute("""
-                        UPDATE cards SET 
-                            title_x=?, title_y=?, title_font=?, title_size=?, title_color=?,
-                            text_x=?, text_y=?, text_width=?, text_height=?, text_font=?,
-                            text_size=?, text_color=?, text_align=?, line_spacing=?, text_wrap=?,
-                            energy_x=?, energy_y=?, energy_font=?, energy_size=?, energy_color=?
-                        WHERE id=?
-                    """, (
-                        card_data.title_x, card_data.title_y, card_data.title_font,
-                        card_data.title_size, card_data.title_color,
-                        card_data.text_x, card_data.text_y, card_data.text_width,
-                        card_data.text_height, card_data.text_font, card_data.text_size,
-                        card_data.text_color, card_data.text_align, card_data.line_spacing,
-                        int(card_data.text_wrap),
-                        card_data.energy_x, card_data.energy_y, card_data.energy_font,
-                        card_data.energy_size, card_data.energy_color,
-                        card_data.id
-                    ))
-                    
-                    conn.commit()
-                    conn.close()
-            
-            formatting_repo = FormattingRepo(self.repo)
-            
-            # Créer l'éditeur avec le repo personnalisé
-            editor = TextFormattingEditor(self.winfo_toplevel(), self.current_id, card_data, formatting_repo)
+            from .database import FORMATTING_DEFAULTS
+            
+            # La carte chargée porte déjà ses colonnes de formatage (valeurs par défaut si vides)
+            card_data = {
+                'id': self.current_id,
+                'nom': card.name,
+                'description': card.description,
+                'img': card.img,
+                'powerblow': card.powerblow,
+            }
+            card_data.update({name: getattr(card, name) for name in FORMATTING_DEFAULTS})
+            card_data['text_wrap'] = bool(card_data['text_wrap'])
+            
+            # L'éditeur sauvegarde directement via CardRepo.update_fields
+            editor = TextFormattingEditor(self.winfo_toplevel(), self.current_id, card_data, self.repo)
             
             # Rafraîchir les données après fermeture de l'éditeur
             if callable(self.on_saved):
@@ -1127,14 +1043,28 @@ class CardList(ttk.Frame):
         if v == 'IA': return 'ia'
         return None
 
-    def _get_card_actors_display(self, card_id):
-        """Récupère l'affichage des acteurs liés à une carte."""
+    @property
+    def actor_manager(self):
+        """ActorManager créé une seule fois pour la liste (et non à chaque rafraîchissement)."""
+        if getattr(self, '_actor_manager', None) is None:
+            try:
+                from .actors import ActorManager
+            except ImportError:
+                from actors import ActorManager
+            self._actor_manager = ActorManager(self.repo.db_file)
+        return self._actor_manager
+
+    def _get_card_actors_display(self, card_id, actors=None):
+        """
+        Récupère l'affichage des acteurs liés à une carte.
+
+        Args:
+            card_id: ID de la carte
+            actors: Acteurs déjà chargés (via get_actors_for_cards) ; sinon requête unitaire
+        """
         try:
-            from .actors import ActorManager
-            from .config import DB_FILE
-            
-            manager = ActorManager(DB_FILE)
-            actors = manager.get_card_actors(card_id)
+            if actors is None:
+                actors = self.actor_manager.get_actors_for_cards([card_id])[card_id]
             
             if actors:
                 # Si plusieurs acteurs, afficher le nombre
@@ -1160,57 +1090,50 @@ class CardList(ttk.Frame):
             rarity_label = self.rarity_filter.get() if self.rarity_filter else 'Toutes'
             rarity = RARITY_FROM_LABEL.get(rarity_label) if rarity_label != 'Toutes' else None
         
-        # Obtenir toutes les cartes (sans filtre side pour l'instant)
-        cards = self.repo.list_cards(side=None, search_text=text, rarity=rarity)
+        # Vider la liste avant de la remplir page par page
+        for i in self.tree.get_children(): 
+            self.tree.delete(i)
         
-        # Filtrer par acteur si nécessaire
-        if side:
-            filtered_cards = []
+        # Parcourir les cartes par pages (sans filtre side pour l'instant)
+        for cards in self.repo.iter_card_pages(side=None, search_text=text, rarity=rarity):
+            # Acteurs de toute la page en une seule requête
             try:
-                from .actors import ActorManager
-                from .config import DB_FILE
-                
-                manager = ActorManager(DB_FILE)
-                
-                for card in cards:
-                    card_actors = manager.get_card_actors(card.id)
-                    
-                    # Vérifier si la carte a l'acteur recherché
-                    if side == 'joueur':
-                        has_joueur = any(actor['name'] == 'Joueur' for actor in card_actors)
-                        if has_joueur:
-                            filtered_cards.append(card)
-                    elif side == 'ia':
-                        has_ia = any(actor['name'] == 'IA' for actor in card_actors)
-                        if has_ia:
-                            filtered_cards.append(card)
-                
-                cards = filtered_cards
-                
+                card_actors = self.actor_manager.get_actors_for_cards(c.id for c in cards)
             except Exception as e:
-                print(f"Erreur filtrage par acteur : {e}")
-                # Fallback vers l'ancien système
-                cards = self.repo.list_cards(side=side, search_text=text, rarity=rarity)
-        
-        # Afficher les cartes avec leurs acteurs
-        for i in self.tree.get_children(): 
-            self.tree.delete(i)
+                print(f"Erreur lors de la récupération des acteurs : {e}")
+                card_actors = None
+            
+            # Filtrer par acteur si nécessaire
+            if side:
+                if card_actors is not None:
+                    actor_name = 'Joueur' if side == 'joueur' else 'IA'
+                    cards = [
+                        card for card in cards
+                        if any(actor['name'] == actor_name for actor in card_actors[card.id])
+                    ]
+                else:
+                    # Fallback vers l'ancien système
+                    cards = [card for card in cards if card.side == side]
             
-        for c in cards:
-            maj = c.updated_at.split('T')[0] if c.updated_at else ''
-            
-            # Obtenir l'affichage des acteurs pour cette carte
-            actors_display = self._get_card_actors_display(c.id)
-            
-            self.tree.insert('', 'end', values=(
-                c.id,
-                actors_display,  # Remplacer l'ancien système Joueur/IA
-                RARITY_LABELS.get(getattr(c,'rarity','commun'),'Commun'),
-                c.name,
-                c.powerblow,
-                (c.description or '')[:80],
-                maj
-            ))
+            # Afficher les cartes avec leurs acteurs
+            for c in cards:
+                maj = c.updated_at.split('T')[0] if c.updated_at else ''
+                
+                # Obtenir l'affichage des acteurs pour cette carte
+                if card_actors is not None:
+                    actors_display = self._get_card_actors_display(c.id, card_actors.get(c.id, []))
+                else:
+                    actors_display = 'Erreur acteurs'
+                
+                self.tree.insert('', 'end', values=(
+                    c.id,
+                    actors_display,  # Remplacer l'ancien système Joueur/IA
+                    RARITY_LABELS.get(getattr(c,'rarity','commun'),'Commun'),
+                    c.name,
+                    c.powerblow,
+                    (c.description or '')[:80],
+                    maj
+                ))
 
     def _on_double(self, _event):
         sel = self.tree.selection()
@@ -1319,8 +1242,7 @@ class CardList(ttk.Frame):
             size = exporter.export_to_file(filepath)
             
             # Compter les cartes exportées
-            cards = self.repo.list_cards()
-            card_count = len(cards)
+            card_count = self.repo.count_cards()
             
             messagebox.showinfo(
                 APP_TITLE, 
@@ -1344,8 +1266,8 @@ class CardList(ttk.Frame):
         """
         try:
             # Vérifier qu'il y a des cartes
-            cards = self.repo.list_cards()
-            if not cards:
+            card_count = self.repo.count_cards()
+            if not card_count:
                 messagebox.showwarning(APP_TITLE, "Aucune carte à exporter!")
                 return
             
@@ -1425,18 +1347,32 @@ class CardList(ttk.Frame):
                     status_var.set("Analyse des ressources...")
                     exporter = GamePackageExporter(self.repo, output_dir, export_type)
                     
-                    # Effectuer l'export
+                    # Effectuer l'export (progression du rendu renvoyée au thread Tk)
                     status_var.set("Création du package...")
-                    package_path = exporter.export_complete_package(package_name)
+                    package_path = exporter.export_complete_package(
+                        package_name,
+                        progress=lambda done, total, name: progress_window.after(
+                            0, lambda: show_progress(done, total, name))
+                    )
                     
                     # Succès
-                    progress_window.after(0, lambda: export_success(package_path))
+                    render_errors = list(exporter.render_errors)
+                    progress_window.after(0, lambda: export_success(package_path, render_errors))
                     
                 except Exception as e:
                     error_msg = str(e)  # Capturer la valeur de l'erreur
                     progress_window.after(0, lambda msg=error_msg: export_error(msg))
             
-            def export_success(package_path):
+            def show_progress(done, total, name):
+                if not progress_window.winfo_exists():
+                    return
+                if str(progress_bar['mode']) != 'determinate':
+                    progress_bar.stop()
+                    progress_bar.configure(mode='determinate', maximum=total)
+                progress_bar['value'] = done
+                status_var.set(f"Images : {done}/{total} - {name}")
+            
+            def export_success(package_path, render_errors):
                 progress_bar.stop()
                 progress_window.destroy()
                 
@@ -1463,6 +1399,12 @@ class CardList(ttk.Frame):
                         f"Le package contient tout pour jouer immédiatement."
                     )
                 
+                if render_errors:
+                    failed = ", ".join(error['name'] for error in render_errors[:5])
+                    if len(render_errors) > 5:
+                        failed += ", ..."
+                    success_msg += f"\n\n⚠️ {len(render_errors)} image(s) en erreur : {failed}"
+                
                 messagebox.showinfo(APP_TITLE, success_msg)
                 
                 # Ouvrir le dossier
@@ -1488,8 +1430,8 @@ class CardList(ttk.Frame):
         """Exporte un package complet de jeu avec fichier Lua, images fusionnées et polices."""
         try:
             # Vérifier qu'il y a des cartes
-            cards = self.repo.list_cards()
-            if not cards:
+            card_count = self.repo.count_cards()
+            if not card_count:
                 messagebox.showwarning(APP_TITLE, "Aucune carte à exporter!")
                 return
             
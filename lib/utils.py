@@ -3,8 +3,10 @@
 """
 Utilitaires pour l'éditeur de cartes Love2D
 """
+import io
 import os
 import re
+import shutil
 import sys
 from datetime import datetime
 from tkinter import messagebox
@@ -12,8 +14,10 @@ from tkinter import messagebox
 # Pattern try/except pour imports relatifs/absolus
 try:
     from .config import APP_SETTINGS, IMAGES_FOLDER, APP_TITLE
+    from .render_cache import get_render_cache, render_key, file_signature
 except ImportError:
     from config import APP_SETTINGS, IMAGES_FOLDER, APP_TITLE
+    from render_cache import get_render_cache, render_key, file_signature
 
 try:
     from PIL import Image
@@ -368,59 +372,57 @@ def create_card_image(card_image_path: str, template_image_path: str, card_name:
         print(f"❌ Fichier manquant : carte={os.path.exists(card_image_path)}, template={os.path.exists(template_image_path)}")
         return None
     
+    subfolders = ensure_images_subfolders()
+    output_path = os.path.join(subfolders['cards'], f"{sanitize_filename(card_name)}.png")
+    
+    # Rendu déjà en cache pour ces fichiers source : simple copie
+    cache = get_render_cache()
+    cache_key = render_key('fusion', file_signature(card_image_path), file_signature(template_image_path))
+    cached_path = cache.get_path(cache_key)
+    if cached_path is not None:
+        try:
+            shutil.copyfile(cached_path, output_path)
+            print(f"♻️ Image fusionnée reprise du cache : {output_path}")
+            return output_path
+        except OSError as e:
+            print(f"⚠️ Cache de rendu inutilisable ({e}), nouvelle fusion")
+    
     try:
         print(f"🖼️ Chargement des images...")
         print(f"   Carte : {card_image_path}")
         print(f"   Template : {template_image_path}")
         
-        # Charge les images avec gestion des erreurs améliorée
+        # Fusion commune avec la régénération en lot (card_fusion)
         try:
-            from PIL import ImageFile
-            ImageFile.LOAD_TRUNCATED_IMAGES = True  # Permet de charger les images tronquées
-            
-            card_img = Image.open(card_image_path)
-            card_img.load()  # Force le chargement complet de l'image
-            print(f"   ✅ Image carte chargée : {card_img.size} ({card_img.mode})")
-            
-        except Exception as e:
-            print(f"   ❌ Erreur image carte : {e}")
-            messagebox.showerror(APP_TITLE, f"Erreur lors du chargement de l'image de la carte :\n{e}\n\nVeuillez choisir une autre image.")
-            return None
+            from .card_fusion import get_template, open_card_image, fuse_images
+        except ImportError:
+            from card_fusion import get_template, open_card_image, fuse_images
         
+        # Template décodé une seule fois tant que le fichier ne change pas
         try:
-            template_img = Image.open(template_image_path)
-            template_img.load()  # Force le chargement complet du template
-            print(f"   ✅ Template chargé : {template_img.size} ({template_img.mode})")
+            template = get_template(template_image_path)
+            print(f"   ✅ Template chargé : {template.size}")
             
         except Exception as e:
             print(f"   ❌ Erreur template : {e}")
             messagebox.showerror(APP_TITLE, f"Erreur lors du chargement du template :\n{e}\n\nVérifiez le template configuré.")
             return None
         
-        # Redimensionne l'image de la carte pour qu'elle s'adapte au template
-        template_size = template_img.size
-        print(f"🔄 Redimensionnement vers {template_size}...")
-        card_img = card_img.resize(template_size, Image.Resampling.LANCZOS)
+        # Charge l'image de la carte avec gestion des erreurs améliorée
+        try:
+            card_img = open_card_image(card_image_path, template.size)
+            print(f"   ✅ Image carte chargée : {card_img.size} ({card_img.mode})")
+            
+        except Exception as e:
+            print(f"   ❌ Erreur image carte : {e}")
+            messagebox.showerror(APP_TITLE, f"Erreur lors du chargement de l'image de la carte :\n{e}\n\nVeuillez choisir une autre image.")
+            return None
         
-        # Crée l'image finale
-        print(f"🎨 Fusion des images...")
-        if template_img.mode == 'RGBA':
-            # Le template a de la transparence, on le superpose à la carte
-            final_img = Image.new('RGBA', template_size)
-            final_img.paste(card_img, (0, 0))
-            final_img.paste(template_img, (0, 0), template_img)
-        else:
-            # Le template est opaque, on le convertit en RGBA pour simuler la transparence
-            final_img = card_img.copy()
-            if template_img.mode != 'RGBA':
-                template_img = template_img.convert('RGBA')
-            final_img.paste(template_img, (0, 0), template_img)
+        print(f"🎨 Fusion des images ({template.size[0]}x{template.size[1]})...")
+        with card_img:
+            final_img = fuse_images(card_img, template)
         
         # Sauvegarde l'image dans le dossier cards
-        subfolders = ensure_images_subfolders()
-        filename = f"{sanitize_filename(card_name)}.png"
-        output_path = os.path.join(subfolders['cards'], filename)
-        
         # Vérifier si une image existe déjà et noter son remplacement
         if os.path.exists(output_path):
             old_size = os.path.getsize(output_path)
@@ -430,15 +432,16 @@ def create_card_image(card_image_path: str, template_image_path: str, card_name:
         
         print(f"💾 Sauvegarde vers {output_path}...")
         
-        # Convertit en RGB si nécessaire pour PNG
-        if final_img.mode == 'RGBA':
-            # Crée un fond blanc pour remplacer la transparence
-            rgb_img = Image.new('RGB', final_img.size, (255, 255, 255))
-            rgb_img.paste(final_img, mask=final_img.split()[-1])  # Utilise le canal alpha comme masque
-            final_img = rgb_img
-        
-        final_img.save(output_path, 'PNG')
+        buffer = io.BytesIO()
+        final_img.save(buffer, 'PNG')
+        with open(output_path, 'wb') as f:
+            f.write(buffer.getvalue())
         print(f"✅ Image fusionnée créée avec succès : {output_path}")
+        
+        try:
+            cache.put(cache_key, buffer.getvalue())
+        except OSError as e:
+            print(f"⚠️ Impossible d'enregistrer le rendu en cache : {e}")
         return output_path
         
     except Exception as e:
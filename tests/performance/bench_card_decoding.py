@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⏱️ BENCHMARK - Décodage des lignes cards → Card
+===============================================
+
+Compare, sur une table de 100 000 cartes, le décodage historique
+(`'x' in row.keys()` par champ + json.loads immédiat) avec le décodage
+actuel (index des colonnes calculé une fois par curseur, JSON décodé
+à la demande, Card à __slots__).
+
+Usage :
+    python tests/performance/bench_card_decoding.py [nombre_de_lignes]
+"""
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
+
+from database import Card, CardRepo, FORMATTING_DEFAULTS, ensure_db
+from db_connection import close_connection_manager
+
+
+class LegacyCard:
+    """Reproduction de l'ancien Card.from_row (référence du benchmark)."""
+
+    def __init__(self, row):
+        keys = row.keys
+        self.id = row['id']
+        self.side = row['side']
+        self.name = row['name']
+        self.img = row['img']
+        self.original_img = row['original_img'] if 'original_img' in keys() and row['original_img'] else row['img']
+        self.description = row['description']
+        self.powerblow = row['powerblow']
+        self.rarity = row['rarity']
+        self.types = json.loads(row['types_json']) if 'types_json' in keys() else []
+        self.hero = json.loads(row['hero_json'])
+        self.enemy = json.loads(row['enemy_json'])
+        self.action = row['action']
+        self.action_param = row['action_param']
+        self.created_at = row['created_at']
+        self.updated_at = row['updated_at']
+        for name, default in FORMATTING_DEFAULTS.items():
+            setattr(self, name, row[name] if name in keys() else default)
+
+
+def populate(repo: CardRepo, count: int) -> None:
+    cards = []
+    for i in range(count):
+        card = Card()
+        card.name = f'Carte {i}'
+        card.img = f'images/cards/carte_{i}.png'
+        card.description = f'Description de la carte {i}'
+        card.types = ['attaque', 'magie']
+        card.hero['attack'] = i % 10
+        cards.append(card)
+    repo.insert_many(cards, chunk_size=10000)
+
+
+def parse_effects(cards):
+    """Force le décodage des JSON (pire cas : tous les champs sont lus)."""
+    for card in cards:
+        card.hero, card.enemy, card.types
+    return cards
+
+
+def measure(label: str, decode_all, count: int) -> float:
+    start = time.perf_counter()
+    decoded = decode_all()
+    elapsed = time.perf_counter() - start
+    assert len(decoded) == count
+    rate = count / elapsed
+    print(f"   {label:<44} {elapsed * 1000:8.1f} ms   {rate:12,.0f} lignes/s")
+    return rate
+
+
+def main(count: int = 100_000) -> None:
+    temp_dir = tempfile.mkdtemp()
+    db_path = os.path.join(temp_dir, 'bench.db')
+    ensure_db(db_path)
+    repo = CardRepo(db_path)
+
+    print(f"📦 Création de {count:,} cartes...")
+    populate(repo, count)
+
+    with repo.db.read() as con:
+        con.row_factory = sqlite3.Row
+        query = "SELECT * FROM cards"
+
+        print("\n⏱️  Décodage des lignes")
+        legacy = measure("Avant (row.keys() + json.loads)",
+                         lambda: [LegacyCard(row) for row in con.execute(query)], count)
+        current = measure("Après (index par curseur, JSON paresseux)",
+                          lambda: Card.from_cursor(con.execute(query)), count)
+        measure("Après + accès à hero/enemy/types",
+                lambda: parse_effects(Card.from_cursor(con.execute(query))), count)
+
+    print(f"\n🚀 Gain : x{current / legacy:.1f}")
+    print(f"💾 Taille d'une Card : __slots__ ({len(Card.__slots__)} attributs), sans __dict__")
+
+    close_connection_manager(db_path)
+    for name in os.listdir(temp_dir):
+        os.unlink(os.path.join(temp_dir, name))
+    os.rmdir(temp_dir)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⏱️ BENCHMARK - Fusion carte + template
+======================================
+
+Compare, sur N cartes, la fusion historique de create_card_image
+(template relu et converti à chaque carte, canevas RGBA puis aplatissement
+sur fond blanc) avec la fusion actuelle (template décodé une fois et mis en
+cache, masque alpha pré-séparé, un seul tampon intermédiaire).
+
+Chaque variante tourne dans un processus neuf pour mesurer son pic de
+mémoire (RSS) indépendamment de l'autre.
+
+Usage :
+    python tests/performance/bench_card_fusion.py [nombre_de_cartes]
+"""
+import io
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
+
+from PIL import Image
+
+from card_fusion import get_template, open_card_image, fuse_images
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+TEMPLATE_SIZE = (750, 1050)
+SOURCE_SIZE = (1500, 2100)
+
+
+def legacy_fusion(card_image_path: str, template_image_path: str) -> bytes:
+    """Reproduction de l'ancienne fusion de create_card_image (référence du benchmark)."""
+    card_img = Image.open(card_image_path)
+    card_img.load()
+    template_img = Image.open(template_image_path)
+    template_img.load()
+    template_size = template_img.size
+    card_img = card_img.resize(template_size, Image.Resampling.LANCZOS)
+    if template_img.mode == 'RGBA':
+        final_img = Image.new('RGBA', template_size)
+        final_img.paste(card_img, (0, 0))
+        final_img.paste(template_img, (0, 0), template_img)
+    else:
+        final_img = card_img.copy()
+        template_img = template_img.convert('RGBA')
+        final_img.paste(template_img, (0, 0), template_img)
+    if final_img.mode == 'RGBA':
+        rgb_img = Image.new('RGB', final_img.size, (255, 255, 255))
+        rgb_img.paste(final_img, mask=final_img.split()[-1])
+        final_img = rgb_img
+    buffer = io.BytesIO()
+    final_img.save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def current_fusion(card_image_path: str, template_image_path: str) -> bytes:
+    """Fusion actuelle (template en cache, composition en place)."""
+    template = get_template(template_image_path)
+    with open_card_image(card_image_path, template.size) as card_img:
+        final_img = fuse_images(card_img, template)
+    buffer = io.BytesIO()
+    final_img.save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def peak_rss_mb() -> float:
+    """Pic de mémoire résidente du processus (Mo), ou -1 si non mesurable."""
+    # Linux : VmHWM repart de zéro à l'exec (ru_maxrss garde le pic du parent)
+    try:
+        with open('/proc/self/status', encoding='ascii') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is None:
+        return -1.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kio sous Linux, octets sous macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_variant(name: str, sources, template_path: str, queue) -> None:
+    fusion = legacy_fusion if name == 'legacy' else current_fusion
+    start = time.perf_counter()
+    for source in sources:
+        fusion(source, template_path)
+    elapsed = time.perf_counter() - start
+    queue.put((elapsed, peak_rss_mb()))
+
+
+def measure(label: str, name: str, sources, template_path: str) -> float:
+    context = multiprocessing.get_context('spawn')
+    queue = context.Queue()
+    process = context.Process(target=run_variant, args=(name, sources, template_path, queue))
+    process.start()
+    elapsed, peak = queue.get()
+    process.join()
+    per_card = elapsed / len(sources) * 1000
+    peak_text = f"{peak:8.1f} Mo" if peak >= 0 else "     n/d"
+    print(f"   {label:<44} {per_card:8.1f} ms/carte   pic RSS {peak_text}")
+    return per_card
+
+
+def main(count: int = 50) -> None:
+    temp_dir = tempfile.mkdtemp()
+    try:
+        print(f"📦 Création d'un template {TEMPLATE_SIZE[0]}x{TEMPLATE_SIZE[1]} "
+              f"et de {count} images {SOURCE_SIZE[0]}x{SOURCE_SIZE[1]}...")
+        template = Image.new('RGBA', TEMPLATE_SIZE, (40, 30, 120, 255))
+        template.paste((0, 0, 0, 0), (60, 120, TEMPLATE_SIZE[0] - 60, 700))
+        template.paste((255, 255, 255, 140), (60, 760, TEMPLATE_SIZE[0] - 60, 1000))
+        template_path = os.path.join(temp_dir, 'template.png')
+        template.save(template_path)
+
+        sources = []
+        for i in range(count):
+            source = Image.new('RGB', SOURCE_SIZE, ((i * 37) % 256, 90, 160))
+            source.paste((200, (i * 11) % 256, 40), (100, 100, 900, 1400))
+            path = os.path.join(temp_dir, f'carte_{i}.jpg')
+            source.save(path, quality=90)
+            sources.append(path)
+
+        print("\n⏱️  Fusion")
+        legacy = measure("Avant (template relu, canevas RGBA)", 'legacy', sources, template_path)
+        current = measure("Après (template en cache, masque alpha)", 'current', sources, template_path)
+        print(f"\n🚀 Gain : x{legacy / current:.1f}")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
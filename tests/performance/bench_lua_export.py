@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⏱️ BENCHMARK - Écriture du fichier Lua Love2D
+=============================================
+
+Compare, sur N cartes, l'assemblage historique de export_to_file (texte
+complet construit en mémoire puis écrit d'un bloc) avec l'écriture en flux
+(une carte mise en forme puis écrite à la fois, tampon de fichier).
+
+Vérifie que les deux fichiers sont identiques octet pour octet et mesure
+le pic d'allocation Python (tracemalloc) de chaque variante.
+
+Usage :
+    python tests/performance/bench_lua_export.py [nombre_de_cartes]
+"""
+import filecmp
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(__file__), '..', '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'lib'))
+
+from database import Card, FORMATTING_DEFAULTS
+from lua_exporter_love2d import Love2DLuaExporter
+
+
+def make_cards(count: int):
+    """Cartes synthétiques (générateur : aucune liste de N cartes en mémoire)."""
+    for i in range(count):
+        card = Card()
+        for name, default in FORMATTING_DEFAULTS.items():
+            setattr(card, name, default)
+        card.id = i + 1
+        card.name = f"Carte {i}"
+        card.description = f"Inflige {i % 50} dégâts.\nPioche une carte."
+        card.powerblow = i % 10
+        card.types = ['Attaque', 'Magie'] if i % 2 else ['Défense']
+        card.action = "target:damage(3)\nself:draw(1)" if i % 3 == 0 else ""
+        yield card
+
+
+def legacy_export(exporter, cards, filename: str) -> int:
+    """Ancien export_to_file : tout le texte en mémoire avant l'écriture."""
+    parts = []
+    for i, card in enumerate(cards, 1):
+        parts.append(exporter.build_card_lua_love2d(card, i))
+    content = "local cards = {\n"
+    if parts:
+        content += ",\n\n".join(parts) + "\n"
+    content += "}\n\nreturn cards\n"
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return len(content)
+
+
+def streaming_export(exporter, cards, filename: str) -> int:
+    """Écriture en flux (write_lua_file)."""
+    from lua_export import write_lua_file
+    return write_lua_file(filename, exporter.iter_cards_love2d(cards))
+
+
+def measure(label: str, func, count: int, filename: str) -> float:
+    exporter = Love2DLuaExporter(None)
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = func(exporter, make_cards(count), filename)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"   {label:<36} {elapsed:7.2f} s   pic mémoire {peak / (1024 * 1024):8.1f} Mo"
+          f"   ({size:,} caractères)")
+    return peak
+
+
+def main(count: int = 50000) -> None:
+    temp_dir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    try:
+        # Dossier vide : les recherches de polices ne trouvent rien (identique aux deux variantes)
+        os.chdir(temp_dir)
+        legacy_file = os.path.join(temp_dir, 'legacy.lua')
+        streaming_file = os.path.join(temp_dir, 'streaming.lua')
+
+        print(f"⏱️  Export Lua Love2D de {count:,} cartes")
+        legacy = measure("Avant (texte complet en mémoire)", legacy_export, count, legacy_file)
+        streaming = measure("Après (écriture en flux)", streaming_export, count, streaming_file)
+
+        identical = filecmp.cmp(legacy_file, streaming_file, shallow=False)
+        print(f"\n{'✅' if identical else '❌'} Fichiers identiques octet pour octet : {identical}")
+        print(f"🚀 Pic mémoire divisé par {legacy / max(streaming, 1):.0f}")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⏱️ BENCHMARK - Profils d'export Lua (verbose / compact)
+=======================================================
+
+Exporte N cartes dans les deux profils et compare la taille des fichiers.
+
+Si un interpréteur Lua (luajit, lua, lua5.4, lua5.3, lua5.1) est disponible,
+mesure aussi le temps de chargement de chaque fichier (dofile) et vérifie
+qu'une lecture de champs hérités donne le même résultat dans les deux profils.
+
+Usage :
+    python tests/performance/bench_lua_profiles.py [nombre_de_cartes]
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(__file__), '..', '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'lib'))
+
+from database import Card, FORMATTING_DEFAULTS
+from lua_export import write_lua_file
+from lua_exporter_love2d import Love2DLuaExporter
+
+LUA_INTERPRETERS = ('luajit', 'lua', 'lua5.4', 'lua5.3', 'lua5.1')
+
+# Charge le fichier 5 fois (meilleur temps) puis lit quelques champs de chaque carte
+LOAD_SCRIPT = '''
+local best = math.huge
+local cards
+for _ = 1, 5 do
+    collectgarbage("collect")
+    local start = os.clock()
+    cards = dofile(arg[1])
+    best = math.min(best, os.clock() - start)
+end
+local total = 0
+for _, card in ipairs(cards) do
+    total = total + card.PowerBlow + card.TextFormatting.title.size + card.Effect.Caster.attack
+        + card.Effect.Target.bleeding.value + #card.Type
+end
+print(string.format("%.6f %d %d", best, #cards, total))
+'''
+
+
+def make_cards(count: int):
+    """Cartes synthétiques : formatage par défaut, quelques effets et actions."""
+    for i in range(count):
+        card = Card()
+        for name, default in FORMATTING_DEFAULTS.items():
+            setattr(card, name, default)
+        card.id = i + 1
+        card.name = f"Carte {i}"
+        card.description = f"Inflige {i % 50} dégâts.\nPioche une carte."
+        card.powerblow = i % 10
+        card.types = ['Attaque', 'Magie'] if i % 2 else ['Défense']
+        card.hero['attack'] = i % 4
+        card.enemy['bleeding']['value'] = i % 3
+        if i % 5 == 0:
+            card.title_size = 18
+        card.action = "target:damage(3)\nself:draw(1)" if i % 3 == 0 else ""
+        yield card
+
+
+def find_lua():
+    """Premier interpréteur Lua trouvé dans le PATH (ou None)."""
+    for name in LUA_INTERPRETERS:
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+def load_time(lua: str, script: str, filename: str):
+    """(meilleur temps de chargement en s, nombre de cartes, somme de contrôle)"""
+    output = subprocess.run([lua, script, filename], capture_output=True, text=True, check=True)
+    best, count, total = output.stdout.split()
+    return float(best), int(count), int(total)
+
+
+def main(count: int = 20000) -> None:
+    temp_dir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    try:
+        # Dossier vide : les polices se résolvent de la même façon pour les deux profils
+        os.chdir(temp_dir)
+        print(f"⏱️  Profils d'export Lua sur {count:,} cartes")
+        files = {}
+        for profile in ('verbose', 'compact'):
+            exporter = Love2DLuaExporter(None, profile=profile)
+            filename = os.path.join(temp_dir, f'{profile}.lua')
+            start = time.perf_counter()
+            write_lua_file(filename, exporter.iter_cards_love2d(make_cards(count)))
+            elapsed = time.perf_counter() - start
+            files[profile] = filename
+            print(f"   {profile:<8} export {elapsed:6.2f} s   {os.path.getsize(filename) / 1024:10,.0f} Ko")
+
+        verbose_size = os.path.getsize(files['verbose'])
+        compact_size = os.path.getsize(files['compact'])
+        print(f"\n🗜️  Taille réduite de {100 * (1 - compact_size / verbose_size):.0f} %"
+              f" (÷{verbose_size / compact_size:.1f})")
+
+        lua = find_lua()
+        if not lua:
+            print("ℹ️  Aucun interpréteur Lua dans le PATH : temps de chargement non mesuré")
+            return
+        script = os.path.join(temp_dir, 'load.lua')
+        with open(script, 'w', encoding='utf-8') as f:
+            f.write(LOAD_SCRIPT)
+        results = {profile: load_time(lua, script, filename) for profile, filename in files.items()}
+        print(f"\n⏱️  Chargement ({os.path.basename(lua)}, meilleur de 5)")
+        for profile, (best, loaded, _) in results.items():
+            print(f"   {profile:<8} {best * 1000:8.1f} ms   {loaded:,} cartes")
+        same = results['verbose'][1:] == results['compact'][1:]
+        print(f"{'✅' if same else '❌'} Mêmes valeurs lues dans les deux profils : {same}")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
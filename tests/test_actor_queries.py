@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour les requêtes groupées cartes ↔ acteurs
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+
+# Ajouter le chemin lib pour les imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lib'))
+
+from db_connection import close_connection_manager
+from database import Card, CardRepo, ensure_db
+from actors import ActorManager
+
+
+def make_card(name, rarity='commun'):
+    card = Card()
+    card.name = name
+    card.img = f'images/cards/{name}.png'
+    card.description = f'Description de {name}'
+    card.rarity = rarity
+    return card
+
+
+class TestActorQueries(unittest.TestCase):
+    """Tests des requêtes groupées d'ActorManager."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        ensure_db(self.db_path)
+        self.repo = CardRepo(self.db_path)
+        self.manager = ActorManager(self.db_path)
+
+        self.hero = self.manager.create_actor('Mage')
+        self.boss = self.manager.create_actor('Dragon')
+        self.cards = [make_card(f'Carte {i}') for i in range(6)]
+        self.repo.insert_many(self.cards)
+        for card in self.cards[:3]:
+            self.manager.link_card_to_actor(card.id, self.hero)
+        for card in self.cards[2:4]:
+            self.manager.link_card_to_actor(card.id, self.boss)
+
+    def tearDown(self):
+        close_connection_manager(self.db_path)
+        shutil.rmtree(self.temp_dir)
+
+    def test_actors_for_cards_matches_single_lookup(self):
+        """get_actors_for_cards renvoie la même chose que get_card_actors."""
+        ids = [card.id for card in self.cards]
+        mapping = self.manager.get_actors_for_cards(ids)
+
+        self.assertEqual(set(mapping), set(ids))
+        for card_id in ids:
+            expected = [a['name'] for a in self.manager.get_card_actors(card_id)]
+            self.assertEqual([a['name'] for a in mapping[card_id]], expected)
+
+    def test_actors_for_cards_shared_card(self):
+        """Une carte liée à plusieurs acteurs les reçoit tous, triés par nom."""
+        mapping = self.manager.get_actors_for_cards([self.cards[2].id])
+        self.assertEqual([a['name'] for a in mapping[self.cards[2].id]], ['Dragon', 'Mage'])
+
+    def test_actors_for_cards_empty(self):
+        """Aucune requête utile pour une liste vide ; cartes sans acteur présentes."""
+        self.assertEqual(self.manager.get_actors_for_cards([]), {})
+        mapping = self.manager.get_actors_for_cards([self.cards[5].id])
+        self.assertEqual(mapping, {self.cards[5].id: []})
+
+    def test_actor_cards_single_actor(self):
+        """get_actor_cards accepte un seul ID et renvoie des Card complètes."""
+        cards = self.manager.get_actor_cards(self.hero)
+        self.assertEqual([c.id for c in cards], [c.id for c in self.cards[:3]])
+        self.assertTrue(all(isinstance(c, Card) for c in cards))
+        self.assertEqual(cards[0].description, 'Description de Carte 0')
+
+    def test_actor_cards_several_actors_distinct(self):
+        """Plusieurs acteurs : union des cartes, sans doublon."""
+        cards = self.manager.get_actor_cards([self.hero, self.boss])
+        self.assertEqual([c.id for c in cards], [c.id for c in self.cards[:4]])
+
+    def test_actor_cards_ordering(self):
+        """L'ordre demandé est respecté et un ordre inconnu est refusé."""
+        self.cards[0].rarity = 'mythique'
+        self.repo.update(self.cards[0])
+        cards = self.manager.get_actor_cards(self.hero, order_by='rarity')
+        self.assertEqual(cards[-1].id, self.cards[0].id)
+        with self.assertRaises(ValueError):
+            self.manager.get_actor_cards(self.hero, order_by='name; DROP TABLE cards')
+
+    def test_cards_by_actor(self):
+        """get_cards_by_actor regroupe les cartes par acteur."""
+        grouped = self.manager.get_cards_by_actor([self.hero, self.boss, 9999])
+        self.assertEqual([c.id for c in grouped[self.hero]], [c.id for c in self.cards[:3]])
+        self.assertEqual([c.id for c in grouped[self.boss]], [c.id for c in self.cards[2:4]])
+        self.assertEqual(grouped[9999], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
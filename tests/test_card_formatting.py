@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour la persistance du formatage de texte dans CardRepo
+"""
+
+import unittest
+import tempfile
+import shutil
+import sqlite3
+import os
+import sys
+
+# Ajouter le chemin lib pour les imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lib'))
+
+from db_connection import close_connection_manager
+from database import Card, CardRepo, ensure_db, FORMATTING_DEFAULTS
+from database_migration import migrate_database, set_db_version, FORMATTING_COLUMNS
+from favorites_manager import FavoritesManager
+
+
+def make_card(name='Carte', **formatting):
+    card = Card()
+    card.name = name
+    card.img = f'images/cards/{name}.png'
+    card.description = 'Description'
+    for field, value in formatting.items():
+        setattr(card, field, value)
+    return card
+
+
+class TestCardFormatting(unittest.TestCase):
+    """Tests d'écriture des colonnes de formatage."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.old_cwd = os.getcwd()
+        os.chdir(self.temp_dir)  # migrate_database écrit ses sauvegardes dans ./dbBackup
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        ensure_db(self.db_path)
+        self.repo = CardRepo(self.db_path)
+
+    def tearDown(self):
+        close_connection_manager(self.db_path)
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def raw(self, card_id, *columns):
+        with self.repo.db.read() as con:
+            return tuple(con.execute(
+                f"SELECT {', '.join(columns)} FROM cards WHERE id = ?", (card_id,)
+            ).fetchone())
+
+    def test_insert_roundtrip(self):
+        """Le formatage est écrit à l'insertion et relu par get."""
+        card_id = self.repo.insert(make_card(title_x=12, text_font='Georgia', line_spacing=1.5))
+        loaded = self.repo.get(card_id)
+        self.assertEqual((loaded.title_x, loaded.text_font, loaded.line_spacing), (12, 'Georgia', 1.5))
+        self.assertEqual(loaded.energy_color, FORMATTING_DEFAULTS['energy_color'])
+
+    def test_update_keeps_unset_formatting(self):
+        """Une carte sans formatage renseigné (formulaire) ne l'écrase pas."""
+        card_id = self.repo.insert(make_card(title_x=12))
+        card = make_card('Renommée')
+        card.id = card_id
+        self.repo.update(card)
+        self.assertEqual(self.raw(card_id, 'name', 'title_x'), ('Renommée', 12))
+
+        self.repo.upsert_many([card])
+        self.assertEqual(self.raw(card_id, 'title_x'), (12,))
+
+    def test_update_writes_loaded_formatting(self):
+        """Une carte relue puis modifiée réécrit son formatage."""
+        card_id = self.repo.insert(make_card())
+        card = self.repo.get(card_id)
+        card.text_size = 20
+        self.repo.update_many([card])
+        self.assertEqual(self.raw(card_id, 'text_size'), (20,))
+
+    def test_update_fields_partial(self):
+        """update_fields n'écrit que les colonnes données."""
+        card_id = self.repo.insert(make_card(title_x=12))
+        before = self.raw(card_id, 'name', 'title_x', 'updated_at')
+        self.assertTrue(self.repo.update_fields(card_id, text_color='#FF0000', hero={'heal': 1}))
+        after = self.raw(card_id, 'name', 'title_x', 'text_color', 'hero_json', 'updated_at')
+        self.assertEqual(after[:4], (before[0], 12, '#FF0000', '{"heal": 1}'))
+        self.assertNotEqual(after[4], before[2])
+        self.assertFalse(self.repo.update_fields(9999, title_x=1))
+
+    def test_update_fields_rejects_unknown(self):
+        """Les champs inconnus (ou non modifiables) sont refusés."""
+        card_id = self.repo.insert(make_card())
+        for fields in ({'title_z': 1}, {'id': 3}, {'created_at': 'x'}):
+            with self.assertRaises(ValueError):
+                self.repo.update_fields(card_id, **fields)
+
+    def test_update_fields_many_single_transaction(self):
+        """Appliquer un formatage à 500 cartes = une seule transaction."""
+        ids = self.repo.insert_many([make_card(f'C{i}') for i in range(500)])
+        statements = []
+        self.repo.db.writer.set_trace_callback(statements.append)
+        try:
+            updated = self.repo.update_fields_many((card_id, {'title_size': 22}) for card_id in ids)
+        finally:
+            self.repo.db.writer.set_trace_callback(None)
+        self.assertEqual(updated, 500)
+        self.assertEqual(sum(s.startswith('BEGIN') for s in statements), 1)
+        with self.repo.db.read() as con:
+            sizes = {r[0] for r in con.execute("SELECT title_size FROM cards")}
+        self.assertEqual(sizes, {22})
+
+    def test_apply_favorite_to_cards(self):
+        """Un favori s'applique en lot aux cartes demandées."""
+        ids = self.repo.insert_many([make_card(f'C{i}') for i in range(3)])
+        manager = FavoritesManager(self.db_path)
+        data = manager.get_default_formatting_data()
+        data['text_font'] = 'Verdana'
+        self.assertTrue(manager.save_favorite(1, data, 'Verdana')[0])
+
+        updated, _ = manager.apply_favorite_to_cards(1, ids[:2])
+        self.assertEqual(updated, 2)
+        self.assertEqual([self.repo.get(i).text_font for i in ids], ['Verdana', 'Verdana', 'Arial'])
+
+    def test_migration_adds_columns(self):
+        """Une base v7 sans colonnes de formatage est migrée."""
+        old_path = os.path.join(self.temp_dir, 'old.db')
+        con = sqlite3.connect(old_path)
+        con.execute("""
+            CREATE TABLE cards (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, side TEXT NOT NULL, name TEXT NOT NULL,
+                img TEXT NOT NULL, original_img TEXT NOT NULL DEFAULT '', description TEXT NOT NULL,
+                powerblow INTEGER NOT NULL DEFAULT 0, rarity TEXT NOT NULL DEFAULT 'commun',
+                types_json TEXT NOT NULL DEFAULT '[]', hero_json TEXT NOT NULL,
+                enemy_json TEXT NOT NULL, action TEXT NOT NULL, action_param TEXT NOT NULL DEFAULT '',
+                created_at TEXT NOT NULL, updated_at TEXT NOT NULL)
+        """)
+        con.commit()
+        con.close()
+        set_db_version(old_path, 7)
+
+        self.assertTrue(migrate_database(old_path))
+        con = sqlite3.connect(old_path)
+        columns = {row[1] for row in con.execute("PRAGMA table_info(cards)")}
+        con.close()
+        self.assertTrue(set(FORMATTING_COLUMNS) <= columns)
+        self.assertEqual(set(FORMATTING_COLUMNS), set(FORMATTING_DEFAULTS))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour la régénération en lot des images fusionnées
+"""
+
+import unittest
+import tempfile
+import io
+import shutil
+import os
+import sys
+
+# Ajouter le chemin lib pour les imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lib'))
+
+from PIL import Image
+
+from config import APP_SETTINGS
+from db_connection import close_connection_manager
+from database import Card, CardRepo, ensure_db
+from card_fusion import (TemplateFusionEngine, FusionTemplate, fuse_images, fuse_to_png,
+                         get_template, clear_template_cache)
+from render_cache import RenderCache
+
+
+class TestTemplateFusion(unittest.TestCase):
+    """Tests du moteur de fusion en lot."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        self.cards_dir = os.path.join(self.temp_dir, 'cards')
+        ensure_db(self.db_path)
+        self.repo = CardRepo(self.db_path)
+
+        self.templates = {}
+        for rarity, color in (('commun', (200, 0, 0, 255)), ('rare', (0, 0, 200, 255))):
+            template = Image.new('RGBA', (60, 80), color)
+            # Fenêtre transparente au centre, bord semi-transparent
+            template.paste((0, 0, 0, 0), (10, 10, 50, 60))
+            template.paste((255, 255, 255, 128), (5, 65, 55, 75))
+            path = os.path.join(self.temp_dir, f'template_{rarity}.png')
+            template.save(path)
+            self.templates[rarity] = path
+        self.old_templates = APP_SETTINGS.get('rarity_templates')
+        APP_SETTINGS['rarity_templates'] = dict(self.templates)
+
+        cards = []
+        for i in range(10):
+            source = os.path.join(self.temp_dir, f'source_{i}.png')
+            Image.new('RGB', (120, 160), (i * 20, 120, 60)).save(source)
+            card = Card()
+            card.name = f'Carte {i}'
+            card.img = source
+            card.original_img = source
+            card.rarity = 'rare' if i % 3 == 0 else 'commun'
+            cards.append(card)
+        self.repo.insert_many(cards)
+
+    def tearDown(self):
+        APP_SETTINGS['rarity_templates'] = self.old_templates
+        close_connection_manager(self.db_path)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def engine(self, workers=1, **kwargs):
+        return TemplateFusionEngine(self.repo, workers=workers, cards_dir=self.cards_dir,
+                                    use_render_cache=False, **kwargs)
+
+    def test_fuses_all_and_updates_cards(self):
+        """Chaque carte reçoit son image fusionnée ; l'original est conservé."""
+        report = self.engine().run()
+        self.assertEqual((report.total, report.fused, report.skipped), (10, 10, 0))
+        self.assertEqual(report.updated_cards, 10)
+        self.assertGreater(report.throughput, 0)
+
+        for card in self.repo.list_cards():
+            self.assertEqual(os.path.dirname(card.img), self.cards_dir.replace('\\', '/'))
+            self.assertTrue(card.original_img.endswith('.png'))
+            template = FusionTemplate.load(self.templates[card.rarity])
+            with Image.open(card.original_img) as source:
+                expected = fuse_images(source, template)
+            with Image.open(card.img) as produced:
+                self.assertEqual(produced.tobytes(), expected.tobytes())
+
+    def test_skips_unchanged_inputs(self):
+        """Deuxième passage : rien à refaire ; un template modifié ne touche que sa rareté."""
+        self.engine().run()
+        report = self.engine().run()
+        self.assertEqual((report.fused, report.skipped), (0, 10))
+
+        Image.new('RGBA', (60, 80), (0, 200, 0, 255)).save(self.templates['rare'])
+        os.utime(self.templates['rare'], ns=(1, 1))
+        report = self.engine().run()
+        self.assertEqual((report.fused, report.skipped), (4, 6))
+
+        self.assertEqual(self.engine().run(force=True).fused, 10)
+
+    def test_rarity_filter(self):
+        """Seules les raretés demandées sont traitées."""
+        report = self.engine().run(['rare'])
+        self.assertEqual((report.total, report.fused), (4, 4))
+
+    def test_parallel_matches_serial(self):
+        """La fusion multi-processus produit les mêmes fichiers que la fusion séquentielle."""
+        self.engine().run()
+        serial = {name: open(os.path.join(self.cards_dir, name), 'rb').read()
+                  for name in os.listdir(self.cards_dir) if name.endswith('.png')}
+        report = self.engine(workers=3).run(force=True)
+        self.assertEqual(report.fused, 10)
+        for name, data in serial.items():
+            with open(os.path.join(self.cards_dir, name), 'rb') as f:
+                self.assertEqual(f.read(), data, name)
+
+    def test_render_cache_reused(self):
+        """Une fusion déjà en cache est recopiée sans être recalculée."""
+        cache = RenderCache(os.path.join(self.temp_dir, '.cache'))
+        engine = TemplateFusionEngine(self.repo, workers=1, cards_dir=self.cards_dir, render_cache=cache)
+        self.assertEqual(engine.run().from_cache, 0)
+        report = engine.run(force=True)
+        self.assertEqual((report.fused, report.from_cache), (10, 10))
+
+    def test_errors_and_fused_sources(self):
+        """Image source illisible : erreur collectée ; source déjà fusionnée : ignorée."""
+        cards = self.repo.list_cards()
+        broken = os.path.join(self.temp_dir, 'cassee.png')
+        with open(broken, 'wb') as f:
+            f.write(b'pas une image')
+        self.repo.update_fields(cards[0].id, original_img=broken)
+        os.makedirs(self.cards_dir, exist_ok=True)
+        self.repo.update_fields(cards[1].id, original_img='', img=os.path.join(self.cards_dir, 'x.png'))
+
+        report = self.engine().run()
+        self.assertEqual([e['name'] for e in report.errors], [cards[0].name])
+        self.assertEqual((report.fused, report.ignored), (8, 1))
+
+    def test_fuse_to_png_opaque_template(self):
+        """Un template sans transparence recouvre toute la carte (comportement historique)."""
+        opaque = os.path.join(self.temp_dir, 'opaque.jpg')
+        Image.new('RGB', (30, 40), (10, 20, 30)).save(opaque)
+        template = FusionTemplate.load(opaque)
+        self.assertFalse(template.has_alpha)
+        data = fuse_to_png(os.path.join(self.temp_dir, 'source_1.png'), template)
+        with Image.open(opaque) as reference, Image.open(io.BytesIO(data)) as fused:
+            self.assertEqual(fused.size, (30, 40))
+            self.assertEqual(fused.convert('RGB').tobytes(), reference.convert('RGB').tobytes())
+
+
+class TestTemplateCompositing(unittest.TestCase):
+    """Tests du cache de templates et de la composition."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.template_path = os.path.join(self.temp_dir, 'template.png')
+        template = Image.new('RGBA', (40, 50), (0, 0, 200, 255))
+        template.paste((0, 0, 0, 0), (5, 5, 35, 30))
+        template.paste((255, 255, 0, 100), (5, 35, 35, 45))
+        template.save(self.template_path)
+        clear_template_cache()
+
+    def tearDown(self):
+        clear_template_cache()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_template_cached_by_mtime(self):
+        """Le template n'est décodé qu'une fois, puis relu s'il change sur le disque."""
+        template = get_template(self.template_path)
+        self.assertIs(get_template(self.template_path), template)
+        self.assertTrue(template.has_alpha)
+
+        Image.new('RGB', (40, 50), (1, 2, 3)).save(self.template_path)
+        os.utime(self.template_path, ns=(1, 1))
+        reloaded = get_template(self.template_path)
+        self.assertIsNot(reloaded, template)
+        self.assertFalse(reloaded.has_alpha)
+
+    def test_matches_alpha_composite(self):
+        """La composition équivaut à alpha_composite sur la carte opaque."""
+        template = get_template(self.template_path)
+        card = Image.new('RGB', (80, 100), (10, 150, 90))
+        card.paste((200, 20, 20), (0, 0, 40, 100))
+        fused = fuse_images(card, template)
+        self.assertEqual(fused.mode, 'RGB')
+
+        with Image.open(self.template_path) as original:
+            reference = Image.alpha_composite(
+                card.resize((40, 50), Image.Resampling.LANCZOS).convert('RGBA'), original.convert('RGBA'))
+        for a, b in zip(fused.tobytes(), reference.convert('RGB').tobytes()):
+            self.assertLessEqual(abs(a - b), 1)
+
+    def test_transparent_card_on_white(self):
+        """Les zones transparentes de l'image de carte deviennent blanches sous le template."""
+        template = get_template(self.template_path)
+        card = Image.new('RGBA', (40, 50), (0, 0, 0, 0))
+        fused = fuse_images(card, template)
+        self.assertEqual(fused.getpixel((20, 20)), (255, 255, 255))
+        self.assertEqual(fused.getpixel((1, 1)), (0, 0, 200))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour la lecture paginée des cartes (iter_cards / count_cards)
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+
+# Ajouter le chemin lib pour les imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lib'))
+
+from db_connection import close_connection_manager
+from database import Card, CardRepo, ensure_db
+
+RARITIES = ['commun', 'rare', 'legendaire', 'mythique']
+
+
+class TestCardIteration(unittest.TestCase):
+    """Tests de la pagination par clé."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        ensure_db(self.db_path)
+        self.repo = CardRepo(self.db_path)
+
+        cards = []
+        for i in range(97):
+            card = Card()
+            card.name = f'Carte {i}'
+            card.img = 'images/cards/test.png'
+            card.description = 'Feu' if i % 5 == 0 else 'Glace'
+            card.side = 'joueur' if i % 2 else 'ia'
+            card.rarity = RARITIES[i % len(RARITIES)]
+            cards.append(card)
+        self.repo.insert_many(cards)
+
+        # Dates identiques pour une partie des cartes : le départage se fait par id
+        with self.repo.db.transaction() as con:
+            con.execute("UPDATE cards SET updated_at = '2024-01-01T00:00:00' WHERE id % 3 = 0")
+
+    def tearDown(self):
+        close_connection_manager(self.db_path)
+        shutil.rmtree(self.temp_dir)
+
+    def test_same_order_as_list_cards(self):
+        """iter_cards renvoie les mêmes cartes, dans le même ordre, pour toute taille de page."""
+        for filters in ({}, {'side': 'ia'}, {'rarity': 'rare'}, {'search_text': 'feu'}):
+            expected = [c.id for c in self.repo.list_cards(**filters)]
+            for page_size in (1, 4, 10, 500):
+                with self.subTest(filters=filters, page_size=page_size):
+                    ids = [c.id for c in self.repo.iter_cards(page_size=page_size, **filters)]
+                    self.assertEqual(ids, expected)
+
+    def test_page_sizes(self):
+        """Les pages respectent la taille demandée."""
+        sizes = [len(page) for page in self.repo.iter_card_pages(page_size=10)]
+        self.assertEqual(sizes, [10] * 9 + [7])
+
+    def test_count_cards(self):
+        """count_cards applique les mêmes filtres que list_cards."""
+        self.assertEqual(self.repo.count_cards(), 97)
+        for filters in ({'side': 'joueur'}, {'rarity': 'mythique'}, {'search_text': 'glace'}):
+            with self.subTest(filters=filters):
+                self.assertEqual(self.repo.count_cards(**filters), len(self.repo.list_cards(**filters)))
+
+    def test_empty(self):
+        """Aucune page pour un filtre sans résultat."""
+        self.assertEqual(list(self.repo.iter_card_pages(search_text='inexistant')), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le modèle Card (décodage des lignes, JSON paresseux)
+"""
+
+import unittest
+import sqlite3
+import pickle
+import os
+import sys
+
+# Ajouter le chemin lib pour les imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lib'))
+
+from database import Card, FORMATTING_DEFAULTS
+
+
+def make_row(extra_columns=''):
+    con = sqlite3.connect(':memory:')
+    con.row_factory = sqlite3.Row
+    return con.execute(f"""
+        SELECT 7 AS id, 'ia' AS side, 'Griffure' AS name, 'cards/a.png' AS img,
+               '' AS original_img, 'Desc' AS description, 3 AS powerblow,
+               'rare' AS rarity, '["attaque"]' AS types_json,
+               '{{"heal": 2}}' AS hero_json, '{{"attack": 4}}' AS enemy_json,
+               '' AS action, '' AS action_param, 'c' AS created_at, 'u' AS updated_at
+               {extra_columns}
+    """)
+
+
+class TestCardModel(unittest.TestCase):
+    """Tests du décodage des lignes en Card."""
+
+    def test_decode_row(self):
+        """Les colonnes sont décodées et original_img retombe sur img."""
+        card = Card(make_row().fetchone())
+        self.assertEqual((card.id, card.name, card.rarity, card.powerblow), (7, 'Griffure', 'rare', 3))
+        self.assertEqual(card.original_img, 'cards/a.png')
+        self.assertEqual(card.types, ['attaque'])
+        self.assertEqual(card.hero, {'heal': 2})
+        self.assertEqual(card.enemy, {'attack': 4})
+
+    def test_json_is_lazy(self):
+        """Les JSON ne sont décodés qu'au premier accès."""
+        card = Card.from_cursor(make_row())[0]
+        self.assertIsNone(card._hero)
+        self.assertEqual(card._hero_json, '{"heal": 2}')
+        card.hero['heal'] = 5
+        self.assertIn('"heal": 5', card.to_db_tuple()[8])
+
+    def test_unparsed_json_kept_verbatim(self):
+        """Un JSON jamais lu est réenregistré tel quel."""
+        card = Card.from_cursor(make_row())[0]
+        self.assertEqual(card.to_db_tuple()[9], '{"attack": 4}')
+
+    def test_formatting_defaults_and_columns(self):
+        """Formatage : valeurs par défaut si colonne absente, valeur de la base sinon."""
+        card = Card.from_cursor(make_row())[0]
+        for name, default in FORMATTING_DEFAULTS.items():
+            self.assertEqual(getattr(card, name), default)
+        card = Card.from_cursor(make_row(", 120 AS title_x, NULL AS text_font, 1 AS extra"))[0]
+        self.assertEqual(card.title_x, 120)
+        self.assertEqual(card.text_font, 'Arial')
+
+    def test_slots(self):
+        """Card n'a pas de __dict__ et reste sérialisable."""
+        card = Card.from_cursor(make_row())[0]
+        with self.assertRaises(AttributeError):
+            card.unknown_attribute = 1
+        copy = pickle.loads(pickle.dumps(card))
+        self.assertEqual((copy.name, copy.hero), ('Griffure', {'heal': 2}))
+
+    def test_new_card_defaults(self):
+        """Une carte neuve a ses effets par défaut indépendants."""
+        first, second = Card(), Card()
+        first.hero['heal'] = 3
+        self.assertEqual(second.hero['heal'], 0)
+        self.assertEqual(first.types, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
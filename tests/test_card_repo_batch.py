@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour les opérations en lot de CardRepo
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+
+# Ajouter le chemin lib pour les imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lib'))
+
+from db_connection import close_connection_manager
+from database import Card, CardRepo, ensure_db
+
+
+def make_card(name, rarity='commun'):
+    card = Card()
+    card.name = name
+    card.img = f'images/cards/{name}.png'
+    card.description = f'Description de {name}'
+    card.rarity = rarity
+    return card
+
+
+class TestCardRepoBatch(unittest.TestCase):
+    """Tests de insert_many, update_many et upsert_many."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        ensure_db(self.db_path)
+        self.repo = CardRepo(self.db_path)
+
+    def tearDown(self):
+        close_connection_manager(self.db_path)
+        shutil.rmtree(self.temp_dir)
+
+    def test_insert_many_returns_ids(self):
+        """Les ids retournés correspondent aux cartes insérées."""
+        cards = [make_card(f'Carte {i}') for i in range(25)]
+        ids = self.repo.insert_many(cards)
+
+        self.assertEqual(len(ids), 25)
+        self.assertEqual(len(set(ids)), 25)
+        for card, card_id in zip(cards, ids):
+            self.assertEqual(card.id, card_id)
+            self.assertEqual(self.repo.get(card_id).name, card.name)
+
+    def test_insert_many_after_delete(self):
+        """Les ids restent exacts quand des lignes ont été supprimées."""
+        first = self.repo.insert(make_card('Supprimée'))
+        self.repo.delete(first)
+        ids = self.repo.insert_many([make_card('A'), make_card('B')])
+        self.assertEqual(self.repo.get(ids[0]).name, 'A')
+        self.assertEqual(self.repo.get(ids[1]).name, 'B')
+
+    def test_chunked_progress(self):
+        """Le callback de progression est appelé après chaque paquet."""
+        calls = []
+        cards = [make_card(f'Carte {i}') for i in range(10)]
+        self.repo.insert_many(cards, chunk_size=4, progress=lambda d, t: calls.append((d, t)))
+        self.assertEqual(calls, [(4, 10), (8, 10), (10, 10)])
+        self.assertEqual(len(self.repo.list_cards()), 10)
+
+    def test_update_many(self):
+        """update_many modifie toutes les cartes."""
+        cards = [make_card(f'Carte {i}') for i in range(5)]
+        self.repo.insert_many(cards)
+        for card in cards:
+            card.rarity = 'rare'
+        self.repo.update_many(cards)
+        self.assertTrue(all(c.rarity == 'rare' for c in self.repo.list_cards()))
+
+    def test_update_many_requires_ids(self):
+        """update_many refuse les cartes sans id."""
+        with self.assertRaises(ValueError):
+            self.repo.update_many([make_card('Sans id')])
+
+    def test_upsert_many(self):
+        """upsert_many insère les nouvelles cartes et met à jour les existantes."""
+        existing = make_card('Existante')
+        self.repo.insert(existing)
+        created_at = self.repo.get(existing.id).created_at
+        existing.powerblow = 7
+
+        ids = self.repo.upsert_many([existing, make_card('Nouvelle')])
+
+        self.assertEqual(ids[0], existing.id)
+        updated = self.repo.get(existing.id)
+        self.assertEqual(updated.powerblow, 7)
+        self.assertEqual(updated.created_at, created_at)
+        self.assertEqual(self.repo.get(ids[1]).name, 'Nouvelle')
+        self.assertEqual(len(self.repo.list_cards()), 2)
+
+    def test_batch_rollback(self):
+        """Une erreur annule l'ensemble du lot non découpé."""
+        cards = [make_card('Valide'), make_card('Invalide')]
+        cards[1].side = 'inconnu'  # Violation de la contrainte CHECK
+        with self.assertRaises(Exception):
+            self.repo.insert_many(cards)
+        self.assertEqual(self.repo.list_cards(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour la recherche plein texte des cartes (FTS5)
+"""
+
+import unittest
+import tempfile
+import shutil
+import sqlite3
+import os
+import sys
+
+# Ajouter le chemin lib pour les imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lib'))
+
+from db_connection import close_connection_manager
+from database import Card, CardRepo, ensure_db, build_fts_query
+from database_migration import (REQUIRED_SCHEMA, CURRENT_DB_VERSION,
+                                get_db_version, set_db_version, migrate_database)
+
+
+def make_card(name, description):
+    card = Card()
+    card.name = name
+    card.img = 'images/cards/test.png'
+    card.description = description
+    return card
+
+
+class TestCardSearch(unittest.TestCase):
+    """Tests de la recherche par index FTS5."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        ensure_db(self.db_path)
+        self.repo = CardRepo(self.db_path)
+        self.repo.insert_many([
+            make_card('Épée de feu', 'Une lame brûlante'),
+            make_card('Bouclier', 'Protège contre le feu'),
+            make_card('Éclair', 'Frappe un ennemi'),
+        ])
+
+    def tearDown(self):
+        close_connection_manager(self.db_path)
+        shutil.rmtree(self.temp_dir)
+
+    def names(self, cards):
+        return sorted(card.name for card in cards)
+
+    def test_fts_available(self):
+        """L'index est créé avec la base."""
+        self.assertTrue(self.repo.has_fts())
+
+    def test_build_fts_query(self):
+        """La saisie est convertie en préfixes protégés."""
+        self.assertEqual(build_fts_query('épée feu'), '"épée"* "feu"*')
+        self.assertEqual(build_fts_query('l\'"épée" OR'), '"l"* "épée"* "OR"*')
+        self.assertIsNone(build_fts_query('  -- '))
+
+    def test_prefix_and_accents(self):
+        """Recherche par préfixe, insensible aux accents et à la casse."""
+        self.assertEqual(self.names(self.repo.list_cards(search_text='epe')), ['Épée de feu'])
+        self.assertEqual(self.names(self.repo.list_cards(search_text='ECLA')), ['Éclair'])
+        self.assertEqual(self.names(self.repo.list_cards(search_text='feu')),
+                         ['Bouclier', 'Épée de feu'])
+
+    def test_ranking(self):
+        """Une correspondance dans le nom passe avant la description."""
+        results = self.repo.search_cards('feu')
+        self.assertEqual(results[0].name, 'Épée de feu')
+
+    def test_triggers_keep_index_in_sync(self):
+        """Les mises à jour et suppressions sont répercutées dans l'index."""
+        card = self.repo.list_cards(search_text='bouclier')[0]
+        card.name = 'Rempart'
+        self.repo.update(card)
+        self.assertEqual(self.repo.list_cards(search_text='bouclier'), [])
+        self.assertEqual(self.names(self.repo.list_cards(search_text='remp')), ['Rempart'])
+
+        self.repo.delete(card.id)
+        self.assertEqual(self.repo.list_cards(search_text='remp'), [])
+
+    def test_like_fallback(self):
+        """Sans index FTS5, la recherche utilise LIKE."""
+        with self.repo.db.transaction() as con:
+            for trigger in ('cards_fts_ai', 'cards_fts_ad', 'cards_fts_au'):
+                con.execute(f"DROP TRIGGER {trigger}")
+            con.execute("DROP TABLE cards_fts")
+        repo = CardRepo(self.db_path)
+        self.assertFalse(repo.has_fts())
+        self.assertEqual(self.names(repo.list_cards(search_text='lair')), ['Éclair'])
+        self.assertEqual(repo.search_cards('feu')[0].name, 'Épée de feu')
+
+
+class TestSearchMigration(unittest.TestCase):
+    """Tests de la migration v5 → v6."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.old_cwd = os.getcwd()
+        os.chdir(self.temp_dir)  # La migration crée une sauvegarde dans ./dbBackup
+        self.db_path = os.path.join(self.temp_dir, 'v5.db')
+
+        con = sqlite3.connect(self.db_path)
+        columns_def = ", ".join(f"{name} {definition}" for name, definition in REQUIRED_SCHEMA.items())
+        con.execute(f"CREATE TABLE cards ({columns_def})")
+        con.execute(
+            "INSERT INTO cards (side, name, img, description, hero_json, enemy_json, action, created_at, updated_at) "
+            "VALUES ('joueur', 'Fléau ancien', 'a.png', 'Ancienne carte', '{}', '{}', '', '', '')"
+        )
+        con.commit()
+        con.close()
+        set_db_version(self.db_path, 5)
+
+    def tearDown(self):
+        close_connection_manager(self.db_path)
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.temp_dir)
+
+    def test_migration_indexes_existing_cards(self):
+        """Les cartes existantes sont indexées par la migration."""
+        self.assertTrue(migrate_database(self.db_path))
+        self.assertEqual(get_db_version(self.db_path), CURRENT_DB_VERSION)
+
+        repo = CardRepo(self.db_path)
+        self.assertTrue(repo.has_fts())
+        self.assertEqual([c.name for c in repo.list_cards(search_text='fleau')], ['Fléau ancien'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le gestionnaire de connexions SQLite partagé
+"""
+
+import unittest
+import tempfile
+import threading
+import sqlite3
+import gc
+import os
+import sys
+
+# Ajouter le chemin lib pour les imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lib'))
+
+from db_connection import get_connection_manager, close_connection_manager
+from database import Card, CardRepo, ensure_db
+
+
+class TestConnectionManager(unittest.TestCase):
+    """Tests du pool de connexions."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        ensure_db(self.db_path)
+        self.manager = get_connection_manager(self.db_path)
+
+    def tearDown(self):
+        close_connection_manager(self.db_path)
+        for name in os.listdir(self.temp_dir):
+            os.unlink(os.path.join(self.temp_dir, name))
+        os.rmdir(self.temp_dir)
+
+    def test_shared_manager_per_database(self):
+        """Un seul gestionnaire par fichier de base."""
+        self.assertIs(self.manager, get_connection_manager(self.db_path))
+        self.assertIs(CardRepo(self.db_path).db, self.manager)
+
+    def test_wal_enabled(self):
+        """Le journal WAL est activé sur la connexion d'écriture."""
+        mode = self.manager.writer.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode.lower(), 'wal')
+
+    def test_reader_reused_within_thread(self):
+        """La connexion de lecture est réutilisée dans un même thread."""
+        with self.manager.read() as first:
+            pass
+        with self.manager.read() as second:
+            pass
+        self.assertIs(first, second)
+
+    def test_reader_per_thread(self):
+        """Chaque thread obtient sa propre connexion de lecture."""
+        connections = []
+
+        def worker():
+            with self.manager.read() as con:
+                connections.append(con)
+
+        thread = threading.Thread(target=worker)
+        thread.start(); thread.join()
+        with self.manager.read() as con:
+            connections.append(con)
+        self.assertIsNot(connections[0], connections[1])
+
+    def test_reader_closed_when_thread_ends(self):
+        """La connexion de lecture d'un thread terminé est fermée."""
+        repo = CardRepo(self.db_path)
+        connections = []
+
+        def worker():
+            repo.count_cards()
+            with self.manager.read() as con:
+                connections.append(con)
+
+        threads = [threading.Thread(target=worker) for _ in range(20)]
+        for thread in threads:
+            thread.start(); thread.join()
+        gc.collect()
+        self.assertEqual(len(self.manager._readers), 0)
+        for con in connections:
+            with self.assertRaises(sqlite3.ProgrammingError):
+                con.execute("SELECT 1")
+
+    def test_transaction_rollback(self):
+        """Une exception dans la transaction annule les écritures."""
+        with self.assertRaises(RuntimeError):
+            with self.manager.transaction() as con:
+                con.execute("CREATE TABLE tmp (x INTEGER)")
+                raise RuntimeError("échec")
+        with self.manager.read() as con:
+            row = con.execute("SELECT name FROM sqlite_master WHERE name='tmp'").fetchone()
+        self.assertIsNone(row)
+
+    def test_nested_transaction(self):
+        """Les transactions imbriquées partagent la transaction englobante."""
+        with self.manager.transaction() as outer:
+            with self.manager.transaction() as inner:
+                self.assertIs(outer, inner)
+            self.assertTrue(outer.in_transaction)
+        self.assertFalse(self.manager.writer.in_transaction)
+
+    def test_repo_roundtrip(self):
+        """CardRepo fonctionne à travers le pool."""
+        repo = CardRepo(self.db_path)
+        card = Card()
+        card.name = 'Boule de feu'
+        card.img = 'images/cards/boule.png'
+        card.description = 'Inflige 5 dégâts'
+        card_id = repo.insert(card)
+
+        loaded = repo.get(card_id)
+        self.assertEqual(loaded.name, 'Boule de feu')
+
+        loaded.powerblow = 3
+        repo.update(loaded)
+        self.assertEqual(repo.get(card_id).powerblow, 3)
+        self.assertEqual(len(repo.list_cards()), 1)
+
+        repo.delete(card_id)
+        self.assertIsNone(repo.get(card_id))
+
+    def test_replaced_database_file(self):
+        """Les connexions sont rouvertes si le fichier de base est recréé."""
+        repo = CardRepo(self.db_path)
+        card = Card()
+        card.name = 'Ancienne'
+        card.img = 'x.png'
+        card.description = 'x'
+        repo.insert(card)
+
+        self.manager.close()
+        for name in os.listdir(self.temp_dir):
+            os.unlink(os.path.join(self.temp_dir, name))
+        ensure_db(self.db_path)
+
+        self.assertEqual(repo.list_cards(), [])
+
+    def test_replaced_file_keeps_other_readers(self):
+        """Un remplacement du fichier ne ferme pas la lecture en cours d'un autre thread."""
+        repo = CardRepo(self.db_path)
+        for i in range(6):
+            card = Card()
+            card.name = f'Carte {i}'
+            repo.insert(card)
+
+        started = threading.Event()
+        swapped = threading.Event()
+        names = []
+        errors = []
+
+        def worker():
+            try:
+                with self.manager.read() as con:
+                    cursor = con.execute("SELECT name FROM cards ORDER BY id")
+                    names.append(cursor.fetchone()[0])
+                    started.set()
+                    swapped.wait(5)
+                    names.extend(row[0] for row in cursor)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                started.set()
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        started.wait(5)
+        with self.manager.read() as con:
+            old_reader = con
+        # Fichier remplacé pendant que l'autre thread parcourt son curseur
+        replacement = os.path.join(self.temp_dir, 'copie.db')
+        copy = sqlite3.connect(replacement)
+        self.manager.writer.backup(copy)
+        copy.close()
+        os.replace(replacement, self.db_path)
+        with self.manager.read() as con:
+            self.assertIsNot(con, old_reader)
+            self.assertEqual(con.execute("SELECT COUNT(*) FROM cards").fetchone()[0], 6)
+        swapped.set()
+        thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(names), 6)
+
+if __name__ == '__main__':
+    unittest.main()
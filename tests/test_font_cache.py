@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour l'index des polices et le cache des objets FreeTypeFont
+"""
+
+import unittest
+import tempfile
+import shutil
+import glob
+import os
+import sys
+
+# Ajouter le chemin lib pour les imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lib'))
+
+from PIL import Image
+
+import zipfile
+
+import font_index
+from db_connection import close_connection_manager
+from database import Card, CardRepo, ensure_db
+from font_index import FontIndex, get_font_index, load_truetype, font_cache_stats, clear_font_cache
+from game_package_exporter import GamePackageExporter
+from lua_exporter_love2d import get_font_path_with_extension
+
+
+def find_system_ttf():
+    """Une police TrueType installée sur la machine (ou None)."""
+    for pattern in ('/usr/share/fonts/**/*.ttf', 'C:/Windows/Fonts/*.ttf', '/Library/Fonts/*.ttf'):
+        found = sorted(glob.glob(pattern, recursive=True))
+        if found:
+            return found[0]
+    return None
+
+
+class TestFontIndex(unittest.TestCase):
+    """Tests de l'index nom -> fichier du dossier fonts/."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.fonts_dir = os.path.join(self.temp_dir, 'fonts')
+        for relative in ('titre/Epique.ttf', 'texte/Lisible.otf', 'Epique.ttf', 'divers/Rare.TTF', 'notes.txt'):
+            path = os.path.join(self.fonts_dir, relative)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(b'font')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_priority_and_case(self):
+        """Les sous-dossiers prioritaires passent avant la racine ; la casse est ignorée."""
+        index = FontIndex(self.fonts_dir)
+        self.assertEqual(index.find('Epique'), os.path.join(self.fonts_dir, 'titre', 'Epique.ttf'))
+        self.assertEqual(index.find('🎨 lisible'), os.path.join(self.fonts_dir, 'texte', 'Lisible.otf'))
+        self.assertEqual(index.find('rare.ttf'), os.path.join(self.fonts_dir, 'divers', 'Rare.TTF'))
+        self.assertIsNone(index.find('notes'))
+        self.assertEqual(len(index.files()), 4)
+
+    def test_shared_index(self):
+        """L'index est construit une fois par dossier puis partagé."""
+        index = get_font_index(self.fonts_dir)
+        self.assertIs(get_font_index(self.fonts_dir), index)
+        os.remove(os.path.join(self.fonts_dir, 'divers', 'Rare.TTF'))
+        self.assertIsNotNone(index.find('Rare'))
+        index.refresh()
+        self.assertIsNone(index.find('Rare'))
+
+    def test_invalidated_by_directory_mtime(self):
+        """Une police ajoutée est vue dès la vérification suivante des dossiers."""
+        titre_dir = os.path.join(self.fonts_dir, 'titre')
+        os.utime(titre_dir, ns=(1, 1))
+        index = get_font_index(self.fonts_dir)
+        index.revalidate()
+        version = index.version
+        with open(os.path.join(titre_dir, 'Nouvelle.ttf'), 'wb') as f:
+            f.write(b'font')
+
+        # Dans le délai de vérification : l'index n'est pas relu
+        self.assertIsNone(get_font_index(self.fonts_dir, max_age=3600).find('Nouvelle'))
+        self.assertIs(get_font_index(self.fonts_dir, max_age=0), index)
+        self.assertEqual(index.find('Nouvelle'), os.path.join(titre_dir, 'Nouvelle.ttf'))
+        self.assertNotEqual(index.version, version)
+        self.assertFalse(index.is_stale())
+
+    def test_resolve_exact_names(self):
+        """resolve() : titre, texte, special puis racine ; .ttf avant .otf ; nom tel quel."""
+        index = FontIndex(self.fonts_dir)
+        self.assertEqual(index.resolve('Epique'), os.path.join(self.fonts_dir, 'titre', 'Epique.ttf'))
+        self.assertEqual(index.resolve('Lisible'), os.path.join(self.fonts_dir, 'texte', 'Lisible.otf'))
+        # Les autres sous-dossiers ne sont pas consultés par resolve()
+        self.assertIsNone(index.resolve('Rare'))
+        self.assertIsNone(index.resolve('notes'))
+
+
+def legacy_font_path(font_name):
+    """Recherche historique de get_font_path_with_extension (une sonde par fichier)."""
+    from pathlib import Path
+    clean_name = font_name.replace("🎨 ", "").strip()
+    fonts_base = Path("fonts")
+    for subdir in ["titre", "texte", "special"]:
+        subdir_path = fonts_base / subdir
+        if subdir_path.exists():
+            for ext in [".ttf", ".otf"]:
+                font_file = subdir_path / f"{clean_name}{ext}"
+                if font_file.exists():
+                    return str(font_file).replace('\\', '/')
+    if fonts_base.exists():
+        for ext in [".ttf", ".otf"]:
+            font_file = fonts_base / f"{clean_name}{ext}"
+            if font_file.exists():
+                return str(font_file).replace('\\', '/')
+    return None
+
+
+class TestLuaFontPaths(unittest.TestCase):
+    """Chemins de polices de l'export Lua, résolus par l'index."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        for relative in ('titre/Epique.ttf', 'special/Epique.otf', 'texte/Lisible.otf',
+                         'special/Runes.ttf', 'Racine.otf', 'divers/Cachee.ttf'):
+            path = os.path.join(self.temp_dir, 'fonts', relative)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(b'font')
+        self.old_cwd = os.getcwd()
+        os.chdir(self.temp_dir)
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_same_paths_as_legacy_search(self):
+        """Mêmes chemins que la recherche historique, sans stat par police."""
+        for name in ('Epique', '🎨 Lisible', 'Runes', 'Racine', 'Cachee'):
+            expected = legacy_font_path(name)
+            if expected:
+                self.assertEqual(get_font_path_with_extension(name), expected, name)
+        self.assertEqual(get_font_path_with_extension('Epique'), 'fonts/titre/Epique.ttf')
+        self.assertEqual(get_font_path_with_extension('Cachee'), 'fonts/Cachee.ttf')
+        self.assertEqual(get_font_path_with_extension('Arial'), 'fonts/Arial.ttf')
+        self.assertEqual(get_font_path_with_extension('Times New Roman'), 'fonts/Times.ttf')
+        self.assertEqual(get_font_path_with_extension(''), 'fonts/Arial.ttf')
+        self.assertEqual(get_font_path_with_extension('fonts/x/Y.otf'), 'fonts/x/Y.otf')
+
+
+class TestFontCache(unittest.TestCase):
+    """Tests du cache LRU (chemin, taille) -> FreeTypeFont."""
+
+    def setUp(self):
+        self.font_path = find_system_ttf()
+        if not self.font_path:
+            self.skipTest("Aucune police TrueType installée")
+        clear_font_cache()
+
+    def tearDown(self):
+        clear_font_cache()
+
+    def test_hits_and_misses(self):
+        """Une même (police, taille) n'est chargée qu'une fois."""
+        font = load_truetype(self.font_path, 16)
+        self.assertIs(load_truetype(self.font_path, 16), font)
+        self.assertIsNot(load_truetype(self.font_path, 18), font)
+        stats = font_cache_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['size']), (1, 2, 2))
+
+    def test_lru_eviction(self):
+        """Au-delà de FONT_CACHE_SIZE, la police la moins récente est libérée."""
+        for size in range(8, 8 + font_index.FONT_CACHE_SIZE + 1):
+            load_truetype(self.font_path, size)
+        self.assertEqual(font_cache_stats()['size'], font_index.FONT_CACHE_SIZE)
+        load_truetype(self.font_path, 9)
+        load_truetype(self.font_path, 8)
+        stats = font_cache_stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], font_index.FONT_CACHE_SIZE + 2)
+
+
+class TestExporterFontCache(unittest.TestCase):
+    """Le rendu des cartes réutilise les polices chargées."""
+
+    def setUp(self):
+        font_path = find_system_ttf()
+        if not font_path:
+            self.skipTest("Aucune police TrueType installée")
+        self.temp_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.temp_dir, 'fonts', 'titre'))
+        shutil.copy(font_path, os.path.join(self.temp_dir, 'fonts', 'titre', 'Titre Test.ttf'))
+        self.old_cwd = os.getcwd()
+        os.chdir(self.temp_dir)
+        clear_font_cache()
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        clear_font_cache()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_render_counts_font_cache(self):
+        """Sur plusieurs cartes, seul le premier rendu charge les polices."""
+        img_path = os.path.join(self.temp_dir, 'fond.png')
+        Image.new('RGB', (100, 140), (40, 80, 160)).save(img_path)
+
+        class FakeCard:
+            pass
+
+        cards = []
+        for i in range(5):
+            card = FakeCard()
+            card.id = i + 1
+            card.name = f'Carte {i}'
+            card.img = img_path
+            card.description = 'Texte'
+            card.powerblow = i
+            card.title_font = 'Titre Test'
+            card.title_size = 20
+            card.text_font = 'Titre Test'
+            card.text_size = 12
+            cards.append(card)
+
+        exporter = GamePackageExporter(None, os.path.join(self.temp_dir, 'out'), workers=1,
+                                       use_render_cache=False)
+        images = {}
+        rendered = exporter.render_card_images(cards, images.__setitem__)
+        self.assertEqual(rendered, 5)
+        self.assertGreater(exporter.font_cache_misses, 0)
+        self.assertGreater(exporter.font_cache_hits, exporter.font_cache_misses)
+        self.assertEqual(exporter.font_cache_hits + exporter.font_cache_misses,
+                         font_cache_stats()['hits'] + font_cache_stats()['misses'])
+
+
+class TestPackageFontChanges(unittest.TestCase):
+    """Le rendu du package suit les polices ajoutées entre deux exports."""
+
+    def setUp(self):
+        self.font_path = find_system_ttf()
+        if not self.font_path:
+            self.skipTest("Aucune police TrueType installée")
+        self.temp_dir = tempfile.mkdtemp()
+        self.fonts_dir = os.path.join(self.temp_dir, 'fonts')
+        os.makedirs(self.fonts_dir)
+        # Date ancienne : l'ajout du sous-dossier change forcément la date du dossier
+        os.utime(self.fonts_dir, ns=(1, 1))
+        self.old_cwd = os.getcwd()
+        os.chdir(self.temp_dir)
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def render(self):
+        """Exporte une carte avec un nouvel exporteur (comme un nouvel export)."""
+        class FakeCard:
+            pass
+
+        card = FakeCard()
+        card.id = 1
+        card.name = 'Carte Police'
+        card.img = None
+        card.description = 'Texte de la carte'
+        card.powerblow = 3
+        card.title_font = 'Nouvelle Police'
+        card.title_size = 24
+        exporter = GamePackageExporter(None, os.path.join(self.temp_dir, 'out'), workers=1,
+                                       use_render_cache=False)
+        images = {}
+        exporter.render_card_images([card], images.__setitem__)
+        return exporter, exporter.render_cache_key(card), images['Carte_Police.png']
+
+    def test_font_added_between_exports(self):
+        """Une police ajoutée après un premier export est utilisée par le suivant."""
+        exporter, first_key, first_image = self.render()
+        self.assertIsNone(exporter._resolve_font_path('Nouvelle Police'))
+
+        os.makedirs(os.path.join(self.fonts_dir, 'titre'))
+        shutil.copy(self.font_path, os.path.join(self.fonts_dir, 'titre', 'Nouvelle Police.ttf'))
+        exporter, second_key, second_image = self.render()
+        self.assertEqual(exporter._resolve_font_path('Nouvelle Police'),
+                         os.path.join('fonts', 'titre', 'Nouvelle Police.ttf'))
+        self.assertNotEqual(first_key, second_key)
+        self.assertNotEqual(first_image, second_image)
+
+
+class TestPackageExportFonts(unittest.TestCase):
+    """Un export de package complet utilise l'index de polices à jour."""
+
+    def setUp(self):
+        self.font_path = find_system_ttf()
+        if not self.font_path:
+            self.skipTest("Aucune police TrueType installée")
+        self.temp_dir = tempfile.mkdtemp()
+        self.fonts_dir = os.path.join(self.temp_dir, 'fonts')
+        os.makedirs(self.fonts_dir)
+        # Date ancienne : l'ajout du sous-dossier change forcément la date du dossier
+        os.utime(self.fonts_dir, ns=(1, 1))
+        self.old_cwd = os.getcwd()
+        os.chdir(self.temp_dir)
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        ensure_db(self.db_path)
+        self.repo = CardRepo(self.db_path)
+        card = Card()
+        card.name = 'Carte Police'
+        card.description = 'Texte de la carte'
+        self.repo.insert_many([card])
+        card = self.repo.list_cards()[0]
+        self.repo.update_fields(card.id, title_font='Nouvelle Police', title_size=24)
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        close_connection_manager(self.db_path)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def export(self):
+        exporter = GamePackageExporter(self.repo, os.path.join(self.temp_dir, 'out'), workers=1,
+                                       use_render_cache=False)
+        with zipfile.ZipFile(exporter.export_complete_package('pkg')) as zf:
+            return {name: zf.read(name) for name in zf.namelist()}
+
+    def test_font_added_between_package_exports(self):
+        """Police ajoutée entre deux exports : dessinée sur l'image et copiée dans le package."""
+        first = self.export()
+        self.assertFalse([name for name in first if name.startswith('fonts/')])
+
+        os.makedirs(os.path.join(self.fonts_dir, 'titre'))
+        shutil.copy(self.font_path, os.path.join(self.fonts_dir, 'titre', 'Nouvelle Police.ttf'))
+        second = self.export()
+        self.assertIn('fonts/Nouvelle Police.ttf', second)
+        self.assertNotEqual(first['cards/Carte_Police.png'], second['cards/Carte_Police.png'])
+        self.assertIn("'fonts/titre/Nouvelle Police.ttf'", second['cards_data.lua'].decode('utf-8'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le chargement asynchrone des images de l'interface
+"""
+
+import unittest
+import threading
+import time
+import os
+import sys
+
+# Ajouter le chemin lib pour les imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lib'))
+
+from image_loader import AsyncImageLoader
+
+
+class FakeWidget:
+    """Remplace le widget Tk : after() enregistre les appels sans boucle d'événements."""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, delay, func):
+        self.scheduled.append(func)
+        return len(self.scheduled)
+
+    def after_cancel(self, after_id):
+        pass
+
+
+class TestAsyncImageLoader(unittest.TestCase):
+    """Tests de la file de chargement."""
+
+    def setUp(self):
+        self.widget = FakeWidget()
+        self.loaded = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.delivered = []
+
+    def load(self, source):
+        if source == 'bloquante':
+            self.gate.wait(5)
+        if source.startswith('cassee'):
+            raise OSError("image illisible")
+        self.loaded.append(source)
+        return f"image:{source}"
+
+    def make_loader(self, **kwargs):
+        kwargs.setdefault('max_workers', 1)
+        loader = AsyncImageLoader(self.widget, self.load,
+                                  photo_factory=lambda image: f"photo:{image}", **kwargs)
+        self.addCleanup(loader.shutdown)
+        return loader
+
+    def callback(self, source, photo, error):
+        self.delivered.append((source, photo, error))
+
+    def drain(self, loader, timeout=5):
+        """Fait tourner les passages after() jusqu'à épuisement du travail."""
+        deadline = time.time() + timeout
+        while loader.pending and time.time() < deadline:
+            loader.process_results()
+            time.sleep(0.005)
+
+    def test_delivers_photos(self):
+        """Chaque source est chargée puis remise avec sa PhotoImage."""
+        loader = self.make_loader(max_workers=3)
+        for i in range(5):
+            loader.request(f'carte_{i}', self.callback)
+        self.assertTrue(self.widget.scheduled)
+        self.drain(loader)
+        self.assertEqual(sorted(self.delivered),
+                         [(f'carte_{i}', f'photo:image:carte_{i}', None) for i in range(5)])
+
+    def test_priority_order(self):
+        """Les demandes sont décodées par priorité, y compris après une repriorisation."""
+        loader = self.make_loader()
+        self.gate.clear()
+        loader.request('bloquante', self.callback)
+        time.sleep(0.05)  # Le seul thread est occupé
+        for i in range(5):
+            loader.request(f'carte_{i}', self.callback, priority=i)
+        loader.request('visible', self.callback, priority=-1)
+        loader.prioritize(['carte_4'], priority=-5)
+        self.gate.set()
+        self.drain(loader)
+        self.assertEqual(self.loaded,
+                         ['bloquante', 'carte_4', 'visible', 'carte_0', 'carte_1', 'carte_2', 'carte_3'])
+
+    def test_shared_decode(self):
+        """Deux demandes pour la même source : un décodage, deux callbacks."""
+        loader = self.make_loader()
+        loader.request('carte', self.callback)
+        loader.request('carte', self.callback)
+        self.drain(loader)
+        self.assertEqual(self.loaded, ['carte'])
+        self.assertEqual(len(self.delivered), 2)
+
+    def test_cancel_drops_pending(self):
+        """cancel() : les demandes en attente et les résultats périmés ne sont jamais remis."""
+        loader = self.make_loader()
+        self.gate.clear()
+        loader.request('bloquante', self.callback)
+        time.sleep(0.05)
+        for i in range(5):
+            loader.request(f'carte_{i}', self.callback)
+        loader.cancel()
+        self.assertEqual(loader.pending, 0)
+        loader.request('nouvelle', self.callback)
+        self.gate.set()
+        self.drain(loader)
+        time.sleep(0.05)
+        loader.process_results()
+        self.assertEqual(self.delivered, [('nouvelle', 'photo:image:nouvelle', None)])
+        self.assertNotIn('carte_0', self.loaded)
+
+    def test_batch_size(self):
+        """Un passage dans la boucle Tk crée au plus batch_size PhotoImage."""
+        loader = self.make_loader(batch_size=2)
+        for i in range(5):
+            loader.request(f'carte_{i}', self.callback)
+        deadline = time.time() + 5
+        while len(self.loaded) < 5 and time.time() < deadline:
+            time.sleep(0.005)
+        time.sleep(0.02)
+        self.assertEqual(loader.process_results(), 2)
+        self.assertEqual(loader.process_results(), 2)
+        self.assertEqual(loader.process_results(), 1)
+        self.assertEqual(loader.pending, 0)
+
+    def test_errors_delivered(self):
+        """Une image illisible est remise avec son erreur, sans PhotoImage."""
+        loader = self.make_loader()
+        loader.request('cassee.png', self.callback)
+        self.drain(loader)
+        source, photo, error = self.delivered[0]
+        self.assertEqual(source, 'cassee.png')
+        self.assertIsNone(photo)
+        self.assertIsInstance(error, OSError)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour CardRepo sur une base créée par ensure_db_legacy
+(mode de secours quand les migrations échouent)
+"""
+
+import unittest
+import tempfile
+import shutil
+import sqlite3
+import json
+import os
+import sys
+
+# Ajouter le chemin lib pour les imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lib'))
+
+from db_connection import close_connection_manager
+from database import Card, CardRepo, ensure_db_legacy, _default_effects
+
+RARITIES = ['mythique', 'commun', 'legendaire', 'rare']
+
+
+class TestLegacyDatabase(unittest.TestCase):
+    """CardRepo doit rester utilisable sur le schéma legacy."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'legacy.db')
+        ensure_db_legacy(self.db_path)
+        effects = json.dumps(_default_effects())
+        con = sqlite3.connect(self.db_path)
+        con.executemany(
+            "INSERT INTO cards (side, name, img, description, rarity, hero_json, enemy_json, action, "
+            "created_at, updated_at) VALUES ('joueur', ?, '', '', ?, ?, ?, '', ?, ?)",
+            [(f'Carte {i}', RARITIES[i % 4], effects, effects, f'2024-01-{i + 1:02d}', f'2024-01-{i + 1:02d}')
+             for i in range(9)]
+        )
+        con.commit()
+        con.close()
+        self.repo = CardRepo(self.db_path)
+
+    def tearDown(self):
+        close_connection_manager(self.db_path)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_list_and_iterate(self):
+        """Liste triée par rareté puis date ; pagination identique à la liste."""
+        cards = self.repo.list_cards()
+        self.assertEqual(len(cards), 9)
+        self.assertEqual([card.rarity for card in cards[:3]], ['commun', 'commun', 'rare'])
+        self.assertEqual(cards[0].name, 'Carte 5')
+        self.assertEqual([card.name for card in self.repo.iter_cards(page_size=2)],
+                         [card.name for card in cards])
+        self.assertEqual(self.repo.count_cards(rarity='rare'), 2)
+
+    def test_save_cards(self):
+        """Insertion, mise à jour et formatage des cartes sur le schéma legacy."""
+        card = Card()
+        card.name = 'Nouvelle'
+        card.rarity = 'rare'
+        card_id = self.repo.insert(card)
+        saved = self.repo.get(card_id)
+        self.assertEqual((saved.name, saved.title_x, saved.text_font), ('Nouvelle', 50, 'Arial'))
+
+        saved.description = 'Modifiée'
+        saved.title_size = 22
+        self.repo.update(saved)
+        self.assertTrue(self.repo.update_fields(card_id, text_align='center'))
+        card = self.repo.get(card_id)
+        self.assertEqual((card.description, card.title_size, card.text_align), ('Modifiée', 22, 'center'))
+        self.assertEqual(self.repo.get(1).line_spacing, 1.2)
+
+    def test_legacy_setup_is_idempotent(self):
+        """Relancer ensure_db_legacy sur une base existante ne casse rien."""
+        close_connection_manager(self.db_path)
+        ensure_db_legacy(self.db_path)
+        self.assertEqual(len(CardRepo(self.db_path).list_cards()), 9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour l'export Lua par morceaux chargés à la demande
+"""
+
+import unittest
+import tempfile
+import shutil
+import json
+import re
+import zipfile
+import os
+import sys
+
+# Ajouter le chemin lib pour les imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lib'))
+
+from db_connection import close_connection_manager
+from database import Card, CardRepo, ensure_db
+from actors import ActorManager
+from lua_chunks import split_into_chunks, group_name, build_index_lua, LuaChunk, CARDS_DATA_COMPAT_LUA
+from lua_exporter_love2d import Love2DLuaExporter
+from game_package_exporter import GamePackageExporter
+
+NAME_PATTERN = re.compile(r"^        name = '([^']*)',$", re.MULTILINE)
+
+
+class TestChunkSplitting(unittest.TestCase):
+    """Tests du découpage en morceaux."""
+
+    def test_split_by_range(self):
+        """Plages consécutives de chunk_size cartes, dans l'ordre de l'export."""
+        parts = list(split_into_chunks(iter(range(7)), 3))
+        self.assertEqual([chunk for chunk, _ in parts], [
+            LuaChunk('cards_chunks.cartes_001', 'cartes', 1, 3),
+            LuaChunk('cards_chunks.cartes_002', 'cartes', 4, 6),
+            LuaChunk('cards_chunks.cartes_003', 'cartes', 7, 7),
+        ])
+        self.assertEqual([cards for _, cards in parts], [[0, 1, 2], [3, 4, 5], [6]])
+        self.assertEqual(parts[0][0].file_name, 'cards_chunks/cartes_001.lua')
+
+    def test_split_by_group(self):
+        """Groupes dans l'ordre d'apparition, découpés séparément ; numérotation continue."""
+        values = ['rare', 'commun', 'rare', 'rare', 'commun']
+        parts = list(split_into_chunks(range(5), 2, lambda i: values[i]))
+        self.assertEqual([(c.module, c.first, c.last) for c, _ in parts], [
+            ('cards_chunks.rare_001', 1, 2),
+            ('cards_chunks.rare_002', 3, 3),
+            ('cards_chunks.commun_001', 4, 5),
+        ])
+        self.assertEqual([cards for _, cards in parts], [[0, 2], [3], [1, 4]])
+
+    def test_group_names_and_errors(self):
+        """Noms de groupes ASCII ; taille de morceau invalide refusée."""
+        self.assertEqual(group_name('Épique Légendaire'), 'epique_legendaire')
+        self.assertEqual(group_name('🎭'), 'sans_groupe')
+        with self.assertRaises(ValueError):
+            list(split_into_chunks([1], 0))
+
+    def test_index_module(self):
+        """L'index liste les morceaux et le nombre total de cartes."""
+        chunks = [LuaChunk('cards_chunks.rare_001', 'rare', 1, 2), LuaChunk('cards_chunks.commun_001', 'commun', 3, 5)]
+        index = build_index_lua(chunks)
+        self.assertIn('{ module = "cards_chunks.rare_001", group = "rare", first = 1, last = 2 },', index)
+        self.assertIn('local Index = { count = 5, chunks = chunks }', index)
+        self.assertIn('return setmetatable(cards, {', index)
+        self.assertIn('require(chunk.module)', index)
+        self.assertIn('require("cards_index").all()', CARDS_DATA_COMPAT_LUA)
+
+
+class TestChunkedExport(unittest.TestCase):
+    """Tests de l'export par morceaux des cartes de la base."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        ensure_db(self.db_path)
+        self.repo = CardRepo(self.db_path)
+        cards = []
+        for i in range(7):
+            card = Card()
+            card.name = f'Carte {i}'
+            card.rarity = 'rare' if i % 3 == 0 else 'commun'
+            cards.append(card)
+        self.ids = self.repo.insert_many(cards)
+        self.exporter = Love2DLuaExporter(self.repo)
+        self.out_dir = os.path.join(self.temp_dir, 'lua')
+
+    def tearDown(self):
+        close_connection_manager(self.db_path)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def read(self, relative):
+        with open(os.path.join(self.out_dir, relative), 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def chunk_names(self, chunks):
+        """Noms des cartes dans l'ordre de l'index (morceau par morceau)."""
+        names = []
+        for chunk in chunks:
+            names += NAME_PATTERN.findall(self.read(chunk.file_name))
+        return names
+
+    def test_export_by_range(self):
+        """Mêmes cartes et même ordre que le fichier unique ; numérotation continue."""
+        chunks = self.exporter.export_chunked_to_dir(self.out_dir, 'id', 3)
+        self.assertEqual([(c.first, c.last) for c in chunks], [(1, 3), (4, 6), (7, 7)])
+
+        single = self.exporter.export_cards_love2d(self.repo.iter_cards())
+        self.assertEqual(self.chunk_names(chunks), NAME_PATTERN.findall(single))
+        second = self.read(chunks[1].file_name)
+        self.assertTrue(second.startswith("local cards = {\n    --[[ CARTE 4 - 🎮 Joueur ]]\n"))
+        self.assertTrue(second.endswith("}\n\nreturn cards\n"))
+
+        self.assertEqual(self.read('cards_data.lua'), CARDS_DATA_COMPAT_LUA)
+        self.assertEqual(self.read('cards_index.lua'), build_index_lua(chunks))
+
+    def test_export_by_rarity_and_actor(self):
+        """Chaque morceau ne contient que les cartes d'un groupe."""
+        chunks = self.exporter.export_chunked_to_dir(self.out_dir, 'rarity', 2)
+        cards_by_name = {card.name: card for card in self.repo.list_cards()}
+        for chunk in chunks:
+            for name in NAME_PATTERN.findall(self.read(chunk.file_name)):
+                self.assertEqual(cards_by_name[name].rarity, chunk.group)
+        self.assertEqual(chunks[-1].last, 7)
+
+        manager = ActorManager(self.db_path)
+        boss = manager.create_actor('Boss Final')
+        manager.link_card_to_actor(self.ids[0], boss)
+        chunks = Love2DLuaExporter(self.repo).export_chunked_to_dir(self.out_dir, 'actor', 10)
+        groups = {chunk.group: NAME_PATTERN.findall(self.read(chunk.file_name)) for chunk in chunks}
+        self.assertEqual(groups['boss_final'], ['Carte 0'])
+        self.assertEqual(sum(len(names) for names in groups.values()), 7)
+
+        with self.assertRaises(ValueError):
+            self.exporter.export_chunked_to_dir(self.out_dir, 'couleur', 2)
+
+    def test_stale_chunks_removed(self):
+        """Un nouvel export retire les morceaux que l'index ne référence plus."""
+        self.exporter.export_chunked_to_dir(self.out_dir, 'id', 2)
+        self.assertEqual(len(os.listdir(os.path.join(self.out_dir, 'cards_chunks'))), 4)
+        self.exporter.export_chunked_to_dir(self.out_dir, 'id', 5)
+        self.assertEqual(sorted(os.listdir(os.path.join(self.out_dir, 'cards_chunks'))),
+                         ['cartes_001.lua', 'cartes_002.lua'])
+
+    def test_package_chunks(self):
+        """Package de jeu : index, morceaux et cards_data.lua de compatibilité."""
+        exporter = GamePackageExporter(self.repo, os.path.join(self.temp_dir, 'out'), 'template',
+                                       workers=1, use_render_cache=False, lua_chunk_size=4)
+        path = exporter.export_complete_package('pkg')
+        with zipfile.ZipFile(path) as zf:
+            names = zf.namelist()
+            self.assertEqual(zf.read('cards_data.lua').decode('utf-8'), CARDS_DATA_COMPAT_LUA)
+            self.assertIn('count = 7', zf.read('cards_index.lua').decode('utf-8'))
+            config = json.loads(zf.read('package_config.json'))
+        self.assertIn('cards_chunks/cartes_001.lua', names)
+        self.assertIn('cards_chunks/cartes_002.lua', names)
+        self.assertEqual(config['structure']['lua_index'], 'cards_index.lua')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le profil d'export Lua compact
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+
+# Ajouter le chemin lib pour les imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lib'))
+
+from db_connection import close_connection_manager
+from database import Card, CardRepo, ensure_db
+from lua_compact import lua_table, strip_defaults, lua_number, lua_function
+from lua_exporter_love2d import Love2DLuaExporter
+
+
+def inherit(tree, defaults):
+    """Vue d'une carte compacte après héritage (équivalent Python de C{...})."""
+    result = dict(defaults)
+    for key, value in tree.items():
+        if isinstance(value, dict) and isinstance(defaults.get(key), dict):
+            value = inherit(value, defaults[key])
+        result[key] = value
+    return result
+
+
+class TestCompactHelpers(unittest.TestCase):
+    """Tests des fonctions de sérialisation compacte."""
+
+    def test_lua_table_and_numbers(self):
+        """Tables sans espaces ; 50.0 s'écrit 50."""
+        self.assertEqual(lua_table({'a': '1', 'b': ["'x'", "'y'"], 'c': {}}), "{a=1,b={'x','y'},c={}}")
+        self.assertEqual(lua_number(50.0), '50')
+        self.assertEqual(lua_number(1.2), '1.2')
+        self.assertEqual(lua_function([]), 'function()end')
+
+    def test_strip_defaults(self):
+        """Champs par défaut omis ; sous-table entièrement par défaut retirée."""
+        defaults = {'a': '0', 'b': {'x': '1', 'y': '2'}, 'c': {'z': '0'}}
+        tree = {'a': '0', 'b': {'x': '1', 'y': '3'}, 'c': {'z': '0'}, 'd': []}
+        self.assertEqual(strip_defaults(tree, defaults), {'b': {'y': '3'}, 'd': []})
+
+
+class TestCompactExport(unittest.TestCase):
+    """Tests de l'export des cartes en profil compact."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.old_cwd = os.getcwd()
+        # Dossier de travail isolé : fonts/ est relatif au dossier courant
+        os.chdir(self.temp_dir)
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        ensure_db(self.db_path)
+        self.repo = CardRepo(self.db_path)
+        plain = Card()
+        plain.name = 'Simple'
+        fire = Card()
+        fire.name = "Boule d'feu"
+        fire.types = ['Attaque']
+        fire.powerblow = 3
+        fire.hero['attack'] = 5
+        fire.enemy['bleeding']['value'] = 2
+        fire.action = "-- dégâts\nprint('feu')"
+        self.ids = self.repo.insert_many([plain, fire])
+        self.repo.update_fields(self.ids[1], title_size=20, text_wrap=0)
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        close_connection_manager(self.db_path)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def export(self, profile):
+        exporter = Love2DLuaExporter(self.repo, use_fragment_cache=False, profile=profile)
+        return exporter, exporter.export_cards_love2d(self.repo.list_cards())
+
+    def test_defaults_hoisted_and_omitted(self):
+        """Une seule table de valeurs par défaut ; les cartes ne gardent que leurs différences."""
+        _, content = self.export('compact')
+        self.assertTrue(content.startswith('local D={Description='))
+        self.assertIn('setmetatable(t,m)', content)
+        self.assertIn("C{name='Simple',ImgIlustration='cards/Simple.png',Type={},Cards={}}", content)
+        self.assertIn("Effect={Caster={attack=5},Target={bleeding={value=2}},action=function()\n"
+                      "-- dégâts\nprint('feu')\nend}", content)
+        self.assertIn("TextFormatting={title={size=20},text={wrap=false}}", content)
+        self.assertEqual(content.count('TextFormatting='), 2)
+        self.assertNotIn('--[[', content)
+        self.assertTrue(content.endswith('}\nreturn cards\n'))
+        _, verbose = self.export('verbose')
+        self.assertLess(len(content), len(verbose) / 2)
+
+    def test_inherited_view_matches_full_card(self):
+        """Carte compacte + valeurs par défaut = tous les champs de la carte."""
+        exporter, _ = self.export('compact')
+        defaults = exporter.compact_defaults()
+        for card in self.repo.list_cards():
+            tree = exporter.build_card_tree(card)
+            self.assertEqual(inherit(strip_defaults(tree, defaults), defaults), tree)
+
+    def test_fragment_cache_per_profile(self):
+        """Chaque profil a ses fragments en cache ; alterner ne les invalide pas."""
+        for expected in ({'hits': 0, 'misses': 2}, {'hits': 2, 'misses': 0}):
+            for profile in ('verbose', 'compact'):
+                exporter = Love2DLuaExporter(self.repo, profile=profile)
+                content = exporter.export_cards_love2d(self.repo.list_cards())
+                self.assertEqual(exporter.fragment_cache.stats(), expected, profile)
+                self.assertEqual(content, self.export(profile)[1])
+
+    def test_unknown_profile(self):
+        """Un profil inconnu est refusé."""
+        with self.assertRaises(ValueError):
+            Love2DLuaExporter(self.repo, profile='minifie')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le cache des fragments Lua par carte
+"""
+
+import unittest
+import tempfile
+import shutil
+import sqlite3
+import os
+import sys
+
+# Ajouter le chemin lib pour les imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lib'))
+
+from db_connection import close_connection_manager
+from database import Card, CardRepo, ensure_db, FORMATTING_DEFAULTS
+import lua_exporter_love2d
+from lua_exporter_love2d import Love2DLuaExporter
+from lua_fragment_cache import LuaFragmentCache
+from database_migration import set_db_version, get_db_version, CURRENT_DB_VERSION
+
+
+class TestLuaFragmentCache(unittest.TestCase):
+    """Tests de la réutilisation des fragments entre deux exportations."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.old_cwd = os.getcwd()
+        # Dossier de travail isolé : fonts/ est relatif au dossier courant
+        os.chdir(self.temp_dir)
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        ensure_db(self.db_path)
+        self.repo = CardRepo(self.db_path)
+        cards = []
+        for i in range(6):
+            card = Card()
+            card.name = f'Carte {i}'
+            card.description = f'Description {i}'
+            card.powerblow = i
+            cards.append(card)
+        self.ids = self.repo.insert_many(cards)
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        close_connection_manager(self.db_path)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def export(self, atlas_quads=None):
+        """Exporte avec un nouvel exporteur (comme une nouvelle exécution)."""
+        exporter = Love2DLuaExporter(self.repo)
+        content = exporter.export_cards_love2d(self.repo.list_cards(), atlas_quads)
+        return content, exporter.fragment_cache.stats()
+
+    def reference(self, atlas_quads=None):
+        """Export sans cache (référence)."""
+        exporter = Love2DLuaExporter(self.repo, use_fragment_cache=False)
+        return exporter.export_cards_love2d(self.repo.list_cards(), atlas_quads)
+
+    def test_reuse_across_runs(self):
+        """Deuxième exportation : tous les fragments viennent du cache, texte identique."""
+        first, stats = self.export()
+        self.assertEqual(stats, {'hits': 0, 'misses': 6})
+        second, stats = self.export()
+        self.assertEqual(stats, {'hits': 6, 'misses': 0})
+        self.assertEqual(first, second)
+        self.assertEqual(second, self.reference())
+
+    def test_only_edited_cards_rerendered(self):
+        """Une carte modifiée est la seule remise en forme ; son nouveau texte est exporté."""
+        self.export()
+        self.repo.update_fields(self.ids[2], description='Nouvelle description')
+        content, stats = self.export()
+        self.assertEqual(stats, {'hits': 5, 'misses': 1})
+        self.assertIn("'Nouvelle description'", content)
+        self.assertEqual(content, self.reference())
+
+    def test_invalidated_by_version_and_fonts(self):
+        """Nouvelle version de l'exporteur ou police ajoutée : tout est remis en forme."""
+        self.export()
+        old_version = lua_exporter_love2d.LUA_EXPORTER_VERSION
+        lua_exporter_love2d.LUA_EXPORTER_VERSION = old_version + 1
+        try:
+            self.assertEqual(self.export()[1]['misses'], 6)
+        finally:
+            lua_exporter_love2d.LUA_EXPORTER_VERSION = old_version
+
+        os.makedirs(os.path.join('fonts', 'titre'))
+        with open(os.path.join('fonts', 'titre', 'Arial.ttf'), 'wb') as f:
+            f.write(b'police')
+        content, stats = self.export()
+        self.assertEqual(stats['misses'], 6)
+        self.assertIn("'fonts/titre/Arial.ttf'", content)
+        self.assertEqual(content, self.reference())
+
+    def test_atlas_position_in_key(self):
+        """Le champ Atlas fait partie de la clé du fragment."""
+        quads = {'cards/Carte_0.png': {'sheet': 1, 'x': 0, 'y': 0, 'w': 10, 'h': 14}}
+        self.export(quads)
+        moved = {'cards/Carte_0.png': {'sheet': 1, 'x': 10, 'y': 0, 'w': 10, 'h': 14}}
+        content, stats = self.export(moved)
+        self.assertEqual(stats, {'hits': 5, 'misses': 1})
+        self.assertEqual(content, self.reference(moved))
+
+    def test_variants_kept_side_by_side(self):
+        """Fichier seul, package atlas, profil compact : chaque variante garde ses fragments."""
+        quads = {'cards/Carte_0.png': {'sheet': 1, 'x': 0, 'y': 0, 'w': 10, 'h': 14}}
+        self.assertEqual(self.export()[1], {'hits': 0, 'misses': 6})
+        self.assertEqual(self.export(quads)[1], {'hits': 0, 'misses': 6})
+        compact = Love2DLuaExporter(self.repo, profile='compact')
+        compact.export_cards_love2d(self.repo.list_cards())
+        self.assertEqual(compact.fragment_cache.stats(), {'hits': 0, 'misses': 6})
+
+        content, stats = self.export()
+        self.assertEqual(stats, {'hits': 6, 'misses': 0})
+        self.assertEqual(content, self.reference())
+        content, stats = self.export(quads)
+        self.assertEqual(stats, {'hits': 6, 'misses': 0})
+        self.assertEqual(content, self.reference(quads))
+
+    def test_table_created_by_migration(self):
+        """Une base v8 (un fragment par carte) passe au cache par variante."""
+        close_connection_manager(self.db_path)
+        con = sqlite3.connect(self.db_path)
+        con.execute("DROP TABLE lua_fragments")
+        con.execute("CREATE TABLE lua_fragments (card_id INTEGER PRIMARY KEY, "
+                    "cache_key TEXT NOT NULL, fragment TEXT NOT NULL)")
+        con.commit()
+        con.close()
+        set_db_version(self.db_path, 8)
+        ensure_db(self.db_path)
+        con = sqlite3.connect(self.db_path)
+        columns = [row[1] for row in con.execute("PRAGMA table_info(lua_fragments)")]
+        con.close()
+        self.assertEqual(columns, ['card_id', 'variant', 'cache_key', 'fragment'])
+        self.assertEqual(get_db_version(self.db_path), CURRENT_DB_VERSION)
+        self.assertEqual(self.export()[1], {'hits': 0, 'misses': 6})
+        self.assertEqual(self.export()[1], {'hits': 6, 'misses': 0})
+
+    def test_unmigrated_database(self):
+        """Sans table lua_fragments (base non migrée), l'export fonctionne sans cache."""
+        close_connection_manager(self.db_path)
+        con = sqlite3.connect(self.db_path)
+        con.execute("DROP TABLE lua_fragments")
+        con.commit()
+        con.close()
+        content, stats = self.export()
+        self.assertEqual(content, self.reference())
+        self.assertEqual(stats, {'hits': 0, 'misses': 6})
+        self.assertEqual(LuaFragmentCache(self.db_path).prune(), 0)
+
+    def test_prune_deleted_cards(self):
+        """Les fragments des cartes supprimées sont retirés par une exportation complète."""
+        self.export()
+        self.repo.delete(self.ids[0])
+        cache = LuaFragmentCache(self.db_path)
+        self.assertEqual(cache.prune(), 1)
+        exporter = Love2DLuaExporter(self.repo)
+        exporter.export_to_file(os.path.join(self.temp_dir, 'cards.lua'))
+        self.assertEqual(exporter.fragment_cache.stats(), {'hits': 5, 'misses': 0})
+
+    def test_unsaved_cards_not_cached(self):
+        """Les cartes sans id sont mises en forme sans passer par le cache."""
+        card = Card()
+        card.name = 'Brouillon'
+        for name, default in FORMATTING_DEFAULTS.items():
+            setattr(card, name, default)
+        exporter = Love2DLuaExporter(self.repo)
+        content = exporter.export_cards_love2d([card])
+        self.assertIn("'Brouillon'", content)
+        self.assertEqual(exporter.fragment_cache.stats(), {'hits': 0, 'misses': 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour l'écriture en flux des exports Lua
+"""
+
+import unittest
+import tempfile
+import shutil
+import hashlib
+import json
+import zipfile
+import os
+import sys
+
+# Ajouter le chemin lib pour les imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lib'))
+
+from db_connection import close_connection_manager
+from database import Card, CardRepo, ensure_db
+from actors import ActorManager, generate_lua_content, export_all_actors_lua, build_card_lua_content
+from lua_export import write_lua_file
+from lua_exporter_love2d import Love2DLuaExporter
+from game_package_exporter import GamePackageExporter, PackageWriter
+
+
+def legacy_export_cards(exporter, cards):
+    """Assemblage historique de export_cards_love2d (référence)."""
+    parts = [exporter.build_card_lua_love2d(card, i) for i, card in enumerate(cards, 1)]
+    lua_content = "local cards = {\n"
+    if parts:
+        lua_content += ",\n\n".join(parts) + "\n"
+    lua_content += "}\n\nreturn cards\n"
+    return lua_content
+
+
+def legacy_generate_lua_content(cards):
+    """Assemblage historique de generate_lua_content (référence)."""
+    if not cards:
+        return "-- Aucune carte disponible\nlocal cards = {}\nreturn cards"
+    lines = ["-- Cartes générées automatiquement", "local cards = {"]
+    for i, card in enumerate(cards, 1):
+        lines.append(f"    -- Carte {i}: {card.name}")
+        lines.append("    {")
+        lines.append(f'        name = "{card.name}",')
+        lines.append(f'        description = "{card.description}",')
+        lines.append(f'        rarity = "{card.rarity}",')
+        lines.append(f'        powerblow = {card.powerblow},')
+        types_str = ", ".join(f'"{t}"' for t in card.types)
+        lines.append(f'        types = {{{types_str}}},')
+        lines.append("    },")
+    lines.append("}")
+    lines.append("return cards")
+    return "\n".join(lines)
+
+
+class TestLuaStreaming(unittest.TestCase):
+    """Tests de l'équivalence octet pour octet avec l'assemblage historique."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        ensure_db(self.db_path)
+        self.repo = CardRepo(self.db_path)
+        cards = []
+        for i in range(7):
+            card = Card()
+            card.name = f"Carte {i} l'épée"
+            card.description = "Ligne 1\nLigne 2 é"
+            card.powerblow = i
+            card.types = ['Attaque'] if i % 2 else []
+            card.action = "print('a')\nprint('b')" if i == 3 else ""
+            cards.append(card)
+        self.repo.insert_many(cards)
+        self.exporter = Love2DLuaExporter(self.repo)
+
+    def tearDown(self):
+        close_connection_manager(self.db_path)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_export_matches_legacy(self):
+        """Le flux (liste ou générateur) reproduit l'ancien texte, y compris sans carte."""
+        cards = self.repo.list_cards()
+        expected = legacy_export_cards(self.exporter, cards)
+        self.assertEqual(self.exporter.export_cards_love2d(cards), expected)
+        self.assertEqual(self.exporter.export_cards_love2d(self.repo.iter_cards()), expected)
+        self.assertEqual(self.exporter.export_cards_love2d([]), legacy_export_cards(self.exporter, []))
+
+    def test_export_to_file_bytes(self):
+        """Le fichier écrit en flux est identique au texte assemblé."""
+        filename = os.path.join(self.temp_dir, 'cards.lua')
+        size = self.exporter.export_to_file(filename)
+        expected = legacy_export_cards(self.exporter, self.repo.list_cards())
+        with open(filename, 'r', encoding='utf-8', newline='') as f:
+            self.assertEqual(f.read(), expected.replace('\n', os.linesep))
+        self.assertEqual(size, len(expected))
+        self.assertEqual(os.listdir(self.temp_dir).count('cards.lua'), 1)
+        self.assertFalse([name for name in os.listdir(self.temp_dir) if name.endswith('.tmp')])
+
+    def test_generate_lua_content(self):
+        """generate_lua_content est inchangé pour une liste, un générateur ou aucune carte."""
+        cards = self.repo.list_cards()
+        self.assertEqual(generate_lua_content(cards), legacy_generate_lua_content(cards))
+        self.assertEqual(generate_lua_content(iter(cards)), legacy_generate_lua_content(cards))
+        self.assertEqual(generate_lua_content([]), legacy_generate_lua_content([]))
+
+    def test_export_all_actors(self):
+        """Export multi-acteurs : même texte que l'assemblage par sections."""
+        manager = ActorManager(self.db_path)
+        cards = self.repo.list_cards()
+        first = manager.create_actor('Héros')
+        second = manager.create_actor('Vide')
+        third = manager.create_actor('Ennemis', icon='🤖')
+        for card in cards[:3]:
+            manager.link_card_to_actor(card.id, first)
+        for card in cards[3:]:
+            manager.link_card_to_actor(card.id, third)
+
+        sections = []
+        for actor in manager.list_actors():
+            actor_cards = manager.get_actor_cards(actor['id'])
+            if actor_cards:
+                contents = [f"    --[[ CARTE {i} ]]\n{build_card_lua_content(card)}"
+                            for i, card in enumerate(actor_cards, start=1)]
+                sections.append(f"    --[[ ACTEUR: {actor['icon']} {actor['name']} - {len(actor_cards)} cartes ]]\n"
+                                + ",\n\n".join(contents))
+        expected = "local Cards = {\n\n" + ",\n\n".join(sections) + "\n\n}\n\nreturn Cards\n"
+        self.assertIsNotNone(second)
+
+        filename = os.path.join(self.temp_dir, 'all.lua')
+        export_all_actors_lua(self.repo, manager, filename)
+        with open(filename, 'r', encoding='utf-8') as f:
+            self.assertEqual(f.read(), expected)
+
+    def test_package_entry_streamed(self):
+        """cards_data.lua est écrit en flux dans l'archive ; empreinte du manifeste exacte."""
+        exporter = GamePackageExporter(self.repo, os.path.join(self.temp_dir, 'out'), 'template',
+                                       workers=1, use_render_cache=False)
+        written = []
+        original = PackageWriter.open_text
+
+        def spy(package, arcname):
+            written.append(arcname)
+            return original(package, arcname)
+
+        PackageWriter.open_text = spy
+        try:
+            path = exporter.export_complete_package('pkg')
+        finally:
+            PackageWriter.open_text = original
+        self.assertIn('cards_data.lua', written)
+
+        expected = legacy_export_cards(self.exporter, self.repo.list_cards()).encode('utf-8')
+        with zipfile.ZipFile(path) as zf:
+            self.assertEqual(zf.read('cards_data.lua'), expected)
+            self.assertEqual(zf.getinfo('cards_data.lua').compress_type, zipfile.ZIP_DEFLATED)
+            manifest = json.loads(zf.read('package_config.json'))['manifest']
+        self.assertEqual(manifest['files']['cards_data.lua'],
+                         {'sha256': hashlib.sha256(expected).hexdigest(), 'size': len(expected)})
+
+    def test_package_writer_text_chunks(self):
+        """write_text_chunks : même entrée et même empreinte que write_text."""
+        path = os.path.join(self.temp_dir, 'test.zip')
+        text = "local x = 'é'\n" * 1000
+        with PackageWriter(path) as package:
+            size = package.write_text_chunks('flux.lua', iter(text.splitlines(keepends=True)))
+            package.write_text('bloc.lua', text)
+        self.assertEqual(size, len(text))
+        self.assertEqual(package.files['flux.lua'], package.files['bloc.lua'])
+        with zipfile.ZipFile(path) as zf:
+            self.assertEqual(zf.read('flux.lua'), text.encode('utf-8'))
+
+    def test_failed_write_keeps_previous_file(self):
+        """Une erreur en cours d'écriture laisse l'ancien fichier intact."""
+        filename = os.path.join(self.temp_dir, 'cards.lua')
+        write_lua_file(filename, iter(["ancien"]))
+
+        def chunks():
+            yield "nouveau"
+            raise RuntimeError("export interrompu")
+
+        with self.assertRaises(RuntimeError):
+            write_lua_file(filename, chunks())
+        with open(filename, 'r', encoding='utf-8') as f:
+            self.assertEqual(f.read(), "ancien")
+        self.assertEqual(os.listdir(self.temp_dir).count('cards.lua'), 1)
+        self.assertFalse([name for name in os.listdir(self.temp_dir) if name.endswith('.tmp')])
+
+
+if __name__ == '__main__':
+    unittest.main()
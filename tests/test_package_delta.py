@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le manifeste et l'export delta des packages de jeu
+"""
+
+import unittest
+import tempfile
+import shutil
+import zipfile
+import json
+import os
+import sys
+
+# Ajouter le chemin lib pour les imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lib'))
+
+from PIL import Image
+
+from db_connection import close_connection_manager
+from database import Card, CardRepo, ensure_db
+from game_package_exporter import GamePackageExporter, read_package_manifest
+
+
+class TestPackageDelta(unittest.TestCase):
+    """Tests du manifeste de build et de l'export delta."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        ensure_db(self.db_path)
+        self.repo = CardRepo(self.db_path)
+        cards = []
+        for i in range(5):
+            img_path = os.path.join(self.temp_dir, f'fond_{i}.png')
+            Image.new('RGB', (100, 140), (i * 40, 80, 160)).save(img_path)
+            card = Card()
+            card.name = f'Carte {i}'
+            card.img = img_path
+            card.description = 'Description'
+            cards.append(card)
+        self.ids = self.repo.insert_many(cards)
+        self.output_dir = os.path.join(self.temp_dir, 'out')
+
+    def tearDown(self):
+        close_connection_manager(self.db_path)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def export(self, **options):
+        exporter = GamePackageExporter(self.repo, self.output_dir, 'complete', workers=1,
+                                       use_render_cache=False)
+        path = exporter.export_complete_package('pkg', **options)
+        return exporter, path
+
+    def test_manifest_in_package_config(self):
+        """package_config.json liste l'empreinte des fichiers et l'image de chaque carte."""
+        _, path = self.export()
+        manifest = read_package_manifest(path)
+        with zipfile.ZipFile(path) as zf:
+            names = set(zf.namelist())
+            lua = zf.read('cards_data.lua')
+        self.assertEqual(set(manifest['files']), names - {'package_config.json'})
+        self.assertEqual(manifest['files']['cards_data.lua']['size'], len(lua))
+        self.assertEqual(set(manifest['cards']), {str(i) for i in self.ids})
+        self.assertEqual(manifest['cards'][str(self.ids[0])]['image'], 'cards/Carte_0.png')
+
+    def test_delta_reuses_unchanged_images(self):
+        """Seules les cartes modifiées sont re-rendues ; le patch ne contient qu'elles."""
+        _, path = self.export()
+        with zipfile.ZipFile(path) as zf:
+            before = {name: zf.read(name) for name in zf.namelist()}
+        base_build = read_package_manifest(path)['build_id']
+
+        self.repo.update_fields(self.ids[2], title_color='#FF0000')
+        self.repo.delete(self.ids[4])
+        exporter, path = self.export(delta=True, write_patch=True)
+
+        self.assertEqual(exporter.reused_images, 3)
+        report = exporter.delta_report
+        self.assertIn('cards/Carte_2.png', report['changed'])
+        self.assertIn('cards_data.lua', report['changed'])
+        self.assertNotIn('cards/Carte_0.png', report['changed'])
+        self.assertEqual(report['removed'], ['cards/Carte_4.png'])
+
+        with zipfile.ZipFile(path) as zf:
+            self.assertEqual(zf.read('cards/Carte_0.png'), before['cards/Carte_0.png'])
+            self.assertNotEqual(zf.read('cards/Carte_2.png'), before['cards/Carte_2.png'])
+
+        with zipfile.ZipFile(report['patch']) as zf:
+            names = set(zf.namelist())
+            info = zf.read('patch_info.lua').decode('utf-8')
+        self.assertEqual(names, set(report['changed']) | {'package_config.json', 'patch_info.lua'})
+        self.assertIn(base_build, info)
+        self.assertIn('"cards/Carte_4.png"', info)
+
+    def test_delta_without_previous_build(self):
+        """Sans package précédent, le mode delta fait un export complet."""
+        exporter, path = self.export(delta=True, write_patch=True)
+        self.assertEqual(exporter.reused_images, 0)
+        self.assertIsNone(exporter.delta_report['patch'])
+        self.assertTrue(os.path.exists(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
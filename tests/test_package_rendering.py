@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le rendu parallèle des images du package de jeu
+"""
+
+import unittest
+import tempfile
+import io
+import shutil
+import zipfile
+import os
+import sys
+
+# Ajouter le chemin lib pour les imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lib'))
+
+from PIL import Image
+
+from db_connection import close_connection_manager
+from database import Card, CardRepo, ensure_db
+from game_package_exporter import GamePackageExporter
+from render_cache import RenderCache
+
+
+class TestPackageRendering(unittest.TestCase):
+    """Tests du rendu des images (séquentiel et multi-processus)."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        ensure_db(self.db_path)
+        self.repo = CardRepo(self.db_path)
+
+        cards = []
+        for i in range(12):
+            img_path = os.path.join(self.temp_dir, f'fond_{i}.png')
+            Image.new('RGB', (100, 140), (i * 20, 80, 160)).save(img_path)
+            card = Card()
+            card.name = f'Carte {i:02d}'
+            card.img = img_path
+            card.description = 'Une description assez longue pour tenir sur plusieurs lignes'
+            card.powerblow = i
+            cards.append(card)
+        # Image illisible : l'erreur doit être collectée, pas interrompre l'export
+        broken = os.path.join(self.temp_dir, 'cassee.png')
+        with open(broken, 'wb') as f:
+            f.write(b'pas une image')
+        cards[5].img = broken
+        self.repo.insert_many(cards)
+
+    def tearDown(self):
+        close_connection_manager(self.db_path)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def export(self, workers, export_type='complete'):
+        output_dir = os.path.join(self.temp_dir, f'out_{export_type}_{workers}')
+        exporter = GamePackageExporter(self.repo, output_dir, export_type, workers=workers,
+                                       use_render_cache=False)
+        calls = []
+        path = exporter.export_complete_package('pkg', progress=lambda *args: calls.append(args))
+        with zipfile.ZipFile(path) as zf:
+            images = {name: zf.read(name) for name in zf.namelist() if name.startswith('cards/')}
+        return exporter, calls, images
+
+    def test_parallel_output_matches_serial(self):
+        """Le rendu multi-processus produit les mêmes fichiers que le rendu séquentiel."""
+        for export_type in ('complete', 'template'):
+            _, _, serial = self.export(1, export_type)
+            _, _, parallel = self.export(3, export_type)
+            self.assertEqual(len(serial), 11)
+            self.assertEqual(serial, parallel)
+
+    def test_errors_collected_per_card(self):
+        """Une carte en erreur est signalée sans bloquer les autres."""
+        exporter, _, images = self.export(2)
+        self.assertEqual([e['name'] for e in exporter.render_errors], ['Carte 05'])
+        self.assertIn('cards/Carte_04.png', images)
+        self.assertNotIn('cards/Carte_05.png', images)
+        self.assertTrue(exporter.render_errors[0]['error'])
+
+    def test_progress_reported(self):
+        """La progression est rapportée pour chaque image, dans l'ordre."""
+        _, calls, _ = self.export(2)
+        self.assertEqual([done for done, _, _ in calls], list(range(1, 13)))
+        self.assertTrue(all(total == 12 for _, total, _ in calls))
+
+    def test_duplicate_names_last_wins(self):
+        """Deux cartes au même nom de fichier : une seule tâche, la dernière carte."""
+        exporter = GamePackageExporter(self.repo, os.path.join(self.temp_dir, 'dup'), 'template', workers=1,
+                                       use_render_cache=False)
+        first, second = Card(), Card()
+        first.name = second.name = 'Même nom'
+        first.img = os.path.join(self.temp_dir, 'fond_0.png')
+        second.img = os.path.join(self.temp_dir, 'fond_1.png')
+        written = {}
+        self.assertEqual(exporter.render_card_images([first, second], written.__setitem__), 1)
+        self.assertEqual(len(written), 1)
+        with Image.open(io.BytesIO(next(iter(written.values())))) as image:
+            self.assertEqual(image.getpixel((10, 10))[0], 20)
+
+    def test_streamed_zip_entries(self):
+        """Le package est écrit sans dossier temporaire ; PNG et polices sont stockés."""
+        output_dir = os.path.join(self.temp_dir, 'stream')
+        exporter = GamePackageExporter(self.repo, output_dir, 'complete', workers=1,
+                                       use_render_cache=False)
+        path = exporter.export_complete_package('pkg')
+        self.assertEqual(os.listdir(output_dir), [os.path.basename(path)])
+        with zipfile.ZipFile(path) as zf:
+            infos = {info.filename: info for info in zf.infolist()}
+            self.assertIn('cards_data.lua', infos)
+            self.assertIn('README.md', infos)
+            self.assertIn('package_config.json', infos)
+            self.assertEqual(infos['cards_data.lua'].compress_type, zipfile.ZIP_DEFLATED)
+            for name, info in infos.items():
+                if name.endswith(('.png', '.ttf', '.otf')):
+                    self.assertEqual(info.compress_type, zipfile.ZIP_STORED, name)
+            self.assertIn('📁 pkg/', zf.read('README.md').decode('utf-8'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests de non-régression des plans de requête (EXPLAIN QUERY PLAN)
+
+Chaque forme de requête de list_cards et des requêtes acteurs doit utiliser
+un index : un parcours complet de table suivi d'un tri en B-tree temporaire
+fait échouer le test.
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+
+# Ajouter le chemin lib pour les imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lib'))
+
+from db_connection import close_connection_manager
+from database import Card, CardRepo, ensure_db
+from actors import ActorManager, CARD_ORDERINGS
+
+RARITIES = ['commun', 'rare', 'legendaire', 'mythique']
+
+
+class TestQueryPlans(unittest.TestCase):
+    """Vérifie que les requêtes courantes ne trient pas par parcours complet."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.db_path = os.path.join(cls.temp_dir, 'test.db')
+        ensure_db(cls.db_path)
+        cls.repo = CardRepo(cls.db_path)
+        cls.actors = ActorManager(cls.db_path)
+
+        cards = []
+        for i in range(200):
+            card = Card()
+            card.name = f'Carte {i}'
+            card.img = 'images/cards/test.png'
+            card.description = f'Description {i}'
+            card.side = 'joueur' if i % 2 else 'ia'
+            card.rarity = RARITIES[i % len(RARITIES)]
+            cards.append(card)
+        cls.repo.insert_many(cards)
+
+    @classmethod
+    def tearDownClass(cls):
+        close_connection_manager(cls.db_path)
+        shutil.rmtree(cls.temp_dir)
+
+    def query_plan(self, query, params):
+        with self.repo.db.read() as con:
+            return [row[3] for row in con.execute(f"EXPLAIN QUERY PLAN {query}", params)]
+
+    def assertIndexedPlan(self, query, params):
+        plan = self.query_plan(query, params)
+        full_scan = any(
+            step.startswith('SCAN') and 'USING' not in step and 'VIRTUAL TABLE' not in step
+            for step in plan
+        )
+        temp_sort = any('TEMP B-TREE' in step for step in plan)
+        self.assertFalse(full_scan and temp_sort,
+                         f"Parcours complet + tri temporaire pour :\n{query}\nPlan : {plan}")
+        return plan
+
+    def test_list_cards_shapes(self):
+        """Toutes les combinaisons de filtres side/rarity de list_cards."""
+        for side in (None, 'joueur'):
+            for rarity in (None, 'rare'):
+                with self.subTest(side=side, rarity=rarity):
+                    query, params = self.repo.build_list_query(side=side, rarity=rarity)
+                    plan = self.assertIndexedPlan(query, params)
+                    self.assertFalse(any('TEMP B-TREE' in step for step in plan), plan)
+
+    def test_list_cards_search(self):
+        """La recherche passe par l'index plein texte."""
+        query, params = self.repo.build_list_query(search_text='carte', rarity='rare')
+        self.assertIndexedPlan(query, params)
+
+    def capture_statements(self, call):
+        """Requêtes SQL réellement exécutées (paramètres inclus) pendant call()."""
+        statements = []
+        with self.repo.db.read() as con:
+            con.set_trace_callback(statements.append)
+        try:
+            call()
+        finally:
+            with self.repo.db.read() as con:
+                con.set_trace_callback(None)
+        return statements
+
+    def plan_of(self, sql):
+        with self.repo.db.read() as con:
+            return [row[3] for row in con.execute(f"EXPLAIN QUERY PLAN {sql}")]
+
+    def test_iter_cards_pages(self):
+        """Les requêtes de pagination par clé reprennent via l'index, sans tri."""
+        for side in (None, 'joueur'):
+            with self.subTest(side=side):
+                statements = self.capture_statements(
+                    lambda: list(self.repo.iter_card_pages(side=side, page_size=30))
+                )
+                pages = [sql for sql in statements if 'LIMIT' in sql]
+                self.assertGreater(len(pages), 2)
+                for sql in pages:
+                    plan = self.plan_of(sql)
+                    self.assertFalse(any('TEMP B-TREE' in step for step in plan), (sql, plan))
+
+    def actor_statement(self, call):
+        """Unique requête de lecture d'ActorManager exécutée par call()."""
+        statements = [sql for sql in self.capture_statements(call) if 'card_actors' in sql]
+        self.assertEqual(len(statements), 1, statements)
+        return statements[0]
+
+    def test_actor_cards_orderings(self):
+        """Les requêtes de get_actor_cards et get_cards_by_actor utilisent l'index de liaison."""
+        for order_by in CARD_ORDERINGS:
+            for method in (self.actors.get_actor_cards, self.actors.get_cards_by_actor):
+                with self.subTest(order_by=order_by, method=method.__name__):
+                    sql = self.actor_statement(lambda: method([1, 2], order_by=order_by))
+                    self.assertIn('json_each', sql)
+                    plan = self.plan_of(sql)
+                    self.assertTrue(any('idx_card_actors_actor_card' in step for step in plan), (sql, plan))
+
+    def test_actors_for_cards(self):
+        """get_actors_for_cards utilise l'index (card_id, actor_id)."""
+        sql = self.actor_statement(lambda: self.actors.get_actors_for_cards([1, 2]))
+        plan = self.assertIndexedPlan(sql, ())
+        self.assertFalse(any(step == 'SCAN ca' for step in plan), plan)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le cache de rendu des images de cartes
+"""
+
+import unittest
+import tempfile
+import shutil
+import zipfile
+import time
+import os
+import sys
+
+# Ajouter le chemin lib pour les imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lib'))
+
+from PIL import Image
+
+from db_connection import close_connection_manager
+from database import Card, CardRepo, ensure_db
+from game_package_exporter import GamePackageExporter
+from render_cache import RenderCache, render_key, file_signature
+
+
+class TestRenderCache(unittest.TestCase):
+    """Tests du stockage et de l'éviction LRU."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = RenderCache(os.path.join(self.temp_dir, '.cache'), max_bytes=1000)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_put_get(self):
+        """Un rendu enregistré est relu à l'identique."""
+        key = render_key('test', 1)
+        self.assertIsNone(self.cache.get(key))
+        self.cache.put(key, b'png')
+        self.assertEqual(self.cache.get(key), b'png')
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_key_depends_on_inputs(self):
+        """La clé change avec les paramètres et la signature des fichiers."""
+        path = os.path.join(self.temp_dir, 'source.png')
+        with open(path, 'wb') as f:
+            f.write(b'a')
+        before = render_key('fusion', file_signature(path), {'title_x': 1})
+        self.assertEqual(before, render_key('fusion', file_signature(path), {'title_x': 1}))
+        self.assertNotEqual(before, render_key('fusion', file_signature(path), {'title_x': 2}))
+        with open(path, 'wb') as f:
+            f.write(b'ab')
+        self.assertNotEqual(before, render_key('fusion', file_signature(path), {'title_x': 1}))
+
+    def test_lru_eviction(self):
+        """Au-delà de la limite, les entrées les moins récemment lues sont supprimées."""
+        keys = [render_key('test', i) for i in range(4)]
+        for key in keys[:3]:
+            self.cache.put(key, b'x' * 300)
+            time.sleep(0.01)
+        self.cache.get(keys[0])  # keys[0] redevient la plus récente
+        time.sleep(0.01)
+        self.cache.put(keys[3], b'x' * 300)
+
+        self.assertLessEqual(self.cache.stats()['size'], 900)
+        self.assertIsNotNone(self.cache.get(keys[0]))
+        self.assertIsNone(self.cache.get(keys[1]))
+        self.assertIsNotNone(self.cache.get(keys[3]))
+
+
+class TestExporterRenderCache(unittest.TestCase):
+    """Tests du cache dans l'export de package."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        ensure_db(self.db_path)
+        self.repo = CardRepo(self.db_path)
+        self.cache = RenderCache(os.path.join(self.temp_dir, '.cache'))
+        cards = []
+        for i in range(10):
+            img_path = os.path.join(self.temp_dir, f'fond_{i}.png')
+            Image.new('RGB', (100, 140), (i * 20, 80, 160)).save(img_path)
+            card = Card()
+            card.name = f'Carte {i}'
+            card.img = img_path
+            card.description = 'Description'
+            cards.append(card)
+        self.ids = self.repo.insert_many(cards)
+
+    def tearDown(self):
+        close_connection_manager(self.db_path)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def export(self, workers=1, **options):
+        output_dir = os.path.join(self.temp_dir, 'out')
+        exporter = GamePackageExporter(self.repo, output_dir, 'complete', workers=workers, **options)
+        with zipfile.ZipFile(exporter.export_complete_package('pkg')) as zf:
+            images = {name: zf.read(name) for name in zf.namelist() if name.startswith('cards/')}
+        return exporter, images
+
+    def test_reexport_uses_cache(self):
+        """Un ré-export ne rend que les cartes modifiées, avec un résultat identique."""
+        _, reference = self.export(use_render_cache=False)
+        first, images = self.export(render_cache=self.cache)
+        self.assertEqual(first.cached_images, 0)
+        self.assertEqual(images, reference)
+
+        second, images = self.export(render_cache=self.cache)
+        self.assertEqual(second.cached_images, 10)
+        self.assertEqual(images, reference)
+
+        self.repo.update_fields(self.ids[3], description='Nouvelle description')
+        third, images = self.export(workers=2, render_cache=self.cache)
+        self.assertEqual(third.cached_images, 9)
+        self.assertNotEqual(images['cards/Carte_3.png'], reference['cards/Carte_3.png'])
+
+
+if __name__ == '__main__':
+    unittest.main()
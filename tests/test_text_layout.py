@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le module commun de mise en page du texte
+"""
+
+import unittest
+import glob
+import shutil
+import tempfile
+import os
+import sys
+
+# Ajouter le chemin lib pour les imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lib'))
+
+from PIL import ImageFont
+
+from text_layout import (GlyphMetrics, measure_text, wrap_text, layout_text,
+                         layout_stats, clear_layout_cache)
+from database import Card, FORMATTING_DEFAULTS
+from game_package_exporter import GamePackageExporter
+from text_formatting_editor import TextFormattingEditor
+
+
+def find_system_ttf():
+    """Une police TrueType installée sur la machine (ou None)."""
+    for pattern in ('/usr/share/fonts/**/*.ttf', 'C:/Windows/Fonts/*.ttf', '/Library/Fonts/*.ttf'):
+        found = sorted(glob.glob(pattern, recursive=True))
+        if found:
+            return found[0]
+    return None
+
+
+TEXT = ("Inflige trois points de dégâts à la cible puis pioche une carte. "
+        "Si l'adversaire est Vulnérable, AVANCE d'une case et gagne deux points d'énergie.")
+
+
+class TestTextLayout(unittest.TestCase):
+    """Tests du découpage en lignes et des boîtes de ligne."""
+
+    def setUp(self):
+        font_path = find_system_ttf()
+        if not font_path:
+            self.skipTest("Aucune police TrueType installée")
+        self.font = ImageFont.truetype(font_path, 14)
+        clear_layout_cache()
+
+    def tearDown(self):
+        clear_layout_cache()
+
+    def test_width_matches_pil(self):
+        """Avances + crénage = largeur mesurée par PIL."""
+        for text in ("AVANCE", "Vulnérable", "Tour d'énergie", TEXT):
+            self.assertAlmostEqual(measure_text(text, self.font), self.font.getlength(text), delta=0.5)
+
+    def test_wrap_matches_reference(self):
+        """Même découpage que l'algorithme historique mesurant chaque ligne entière."""
+        for max_width in (60, 120, 200, 333):
+            reference, current = [], ""
+            for word in TEXT.split():
+                test_line = f"{current} {word}" if current else word
+                if self.font.getlength(test_line) <= max_width + 0.5:
+                    current = test_line
+                else:
+                    if current:
+                        reference.append(current)
+                    current = word
+            reference.append(current)
+            lines = [line for line, _ in wrap_text(TEXT, self.font, max_width)]
+            self.assertEqual(lines, reference)
+            for line, width in wrap_text(TEXT, self.font, max_width):
+                if " " in line:
+                    self.assertLessEqual(width, max_width)
+
+    def test_long_word_on_own_line(self):
+        """Un mot plus large que la zone n'est pas coupé."""
+        lines = wrap_text("a anticonstitutionnellement b", self.font, 40)
+        self.assertEqual([line for line, _ in lines], ["a", "anticonstitutionnellement", "b"])
+
+    def test_memo(self):
+        """Un même (texte, police, taille, largeur) n'est découpé qu'une fois."""
+        wrap_text(TEXT, self.font, 150)
+        wrap_text(TEXT, self.font, 150)
+        wrap_text(TEXT, self.font, 151)
+        stats = layout_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 2))
+
+    def test_line_boxes(self):
+        """Boîtes alignées, limitées en hauteur et en nombre de lignes."""
+        boxes = layout_text(TEXT, self.font, 150, line_height=20, align='right')
+        self.assertGreater(len(boxes), 3)
+        for i, box in enumerate(boxes):
+            self.assertEqual(box.y, i * 20)
+            self.assertAlmostEqual(box.x + box.width, 150)
+        centered = layout_text(TEXT, self.font, 150, line_height=20, align='center')
+        self.assertAlmostEqual(centered[0].x, (150 - centered[0].width) / 2)
+        self.assertEqual(len(layout_text(TEXT, self.font, 150, line_height=20, max_height=50)), 2)
+        self.assertEqual(len(layout_text(TEXT, self.font, 150, line_height=20, max_lines=3)), 3)
+
+    def test_glyph_cache(self):
+        """Chaque glyphe n'est mesuré qu'une fois par police."""
+        calls = []
+
+        class CountingFont:
+            def getlength(self, text):
+                calls.append(text)
+                return 7.0 * len(text)
+
+        metrics = GlyphMetrics(CountingFont())
+        metrics.text_width("abab")
+        metrics.text_width("baba")
+        self.assertEqual(sorted(c for c in calls if len(c) == 1), ["a", "b"])
+        self.assertEqual(sorted(c for c in calls if len(c) == 2), ["ab", "ba"])
+
+    def test_exporter_uses_shared_layout(self):
+        """GamePackageExporter._wrap_text délègue au module commun."""
+        exporter = GamePackageExporter.__new__(GamePackageExporter)
+        lines = exporter._wrap_text(TEXT, self.font, 150, None)
+        self.assertEqual(lines, [line for line, _ in wrap_text(TEXT, self.font, 150)])
+
+
+class FakeCanvas:
+    """Canvas Tk minimal : enregistre les textes dessinés."""
+
+    def __init__(self):
+        self.texts = []
+
+    def create_text(self, x, y, text, **kwargs):
+        self.texts.append((x, y, text))
+
+
+class TestPreviewMatchesExport(unittest.TestCase):
+    """L'aperçu de l'éditeur et l'image du package placent les mêmes lignes."""
+
+    def setUp(self):
+        font_path = find_system_ttf()
+        if not font_path:
+            self.skipTest("Aucune police TrueType installée")
+        self.temp_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.temp_dir, 'fonts', 'texte'))
+        shutil.copy(font_path, os.path.join(self.temp_dir, 'fonts', 'texte', 'Texte Test.ttf'))
+        self.old_cwd = os.getcwd()
+        os.chdir(self.temp_dir)
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def card(self, **formatting):
+        card = Card()
+        for name, default in FORMATTING_DEFAULTS.items():
+            setattr(card, name, default)
+        card.description = TEXT + "\n" + TEXT
+        card.text_font = 'Texte Test'
+        for name, value in formatting.items():
+            setattr(card, name, value)
+        return card
+
+    def preview_lines(self, card):
+        """Lignes dessinées par l'aperçu de l'éditeur pour cette carte."""
+        editor = TextFormattingEditor.__new__(TextFormattingEditor)
+        editor.preview_canvas = FakeCanvas()
+        editor.draw_wrapped_text(card.text_x, card.text_y, card.text_width, card.text_height,
+                                 card.description, (card.text_font, card.text_size), card.text_color,
+                                 card.text_align, card.line_spacing, card.text_wrap)
+        return editor.preview_canvas.texts
+
+    def export_lines(self, card):
+        """Lignes dessinées sur l'image du package pour cette carte."""
+        exporter = GamePackageExporter.__new__(GamePackageExporter)
+        font, boxes = exporter.layout_description(card)
+        self.assertTrue(font.path.endswith('Texte Test.ttf'))
+        return boxes, [(card.text_x + box.x, card.text_y + box.y, box.text) for box in boxes]
+
+    def test_same_line_boxes(self):
+        """Interligne, alignement, hauteur de zone et retour à la ligne de la carte respectés."""
+        for formatting in ({},
+                           {'line_spacing': 1.8, 'text_align': 'center', 'text_size': 15},
+                           {'text_align': 'right', 'text_height': 400, 'text_width': 120},
+                           {'text_wrap': 0, 'text_height': 60}):
+            card = self.card(**formatting)
+            boxes, exported = self.export_lines(card)
+            self.assertEqual(self.preview_lines(card), exported, formatting)
+
+        # Plus de 6 lignes si la zone de texte le permet
+        self.assertGreater(len(self.export_lines(self.card(text_height=400, text_width=120))[0]), 6)
+        boxes, _ = self.export_lines(self.card(line_spacing=1.8, text_size=15))
+        self.assertEqual(boxes[1].y, int(15 * 1.8))
+        # Sans retour à la ligne : une ligne par paragraphe
+        boxes, _ = self.export_lines(self.card(text_wrap=0))
+        self.assertEqual([box.text for box in boxes], [TEXT, TEXT])
+
+if __name__ == '__main__':
+    unittest.main()
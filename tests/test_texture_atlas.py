@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour l'atlas de textures (bin packing et export Love2D)
+"""
+
+import unittest
+import tempfile
+import shutil
+import zipfile
+import io
+import os
+import sys
+import random
+
+# Ajouter le chemin lib pour les imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lib'))
+
+from PIL import Image
+
+from db_connection import close_connection_manager
+from database import Card, CardRepo, ensure_db
+from game_package_exporter import GamePackageExporter
+from texture_atlas import pack_rectangles, build_atlas
+
+
+def overlaps(a, b, gap):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    return not (ax + aw + gap <= bx or bx + bw + gap <= ax or ay + ah + gap <= by or by + bh + gap <= ay)
+
+
+class TestPacking(unittest.TestCase):
+    """Tests de l'algorithme de placement."""
+
+    def test_no_overlap_and_power_of_two(self):
+        """Aucun chevauchement (marge comprise), planches en puissances de deux."""
+        rng = random.Random(4)
+        sizes = {f'img{i}': (rng.randint(10, 200), rng.randint(10, 200)) for i in range(120)}
+        sheets = pack_rectangles(sizes, max_size=512, padding=2)
+
+        placed = {}
+        for sheet in sheets:
+            self.assertLessEqual(max(sheet.width, sheet.height), 512)
+            for dim in (sheet.width, sheet.height):
+                self.assertEqual(dim & (dim - 1), 0)
+            rects = list(sheet.placements.values())
+            for i, rect in enumerate(rects):
+                x, y, w, h = rect
+                self.assertGreaterEqual(min(x, y), 2)
+                self.assertLessEqual(x + w + 2, sheet.width)
+                self.assertLessEqual(y + h + 2, sheet.height)
+                for other in rects[i + 1:]:
+                    self.assertFalse(overlaps(rect, other, 4), (rect, other))
+            placed.update(sheet.placements)
+        self.assertEqual({name: rect[2:] for name, rect in placed.items()}, sizes)
+        self.assertGreater(len(sheets), 1)
+
+    def test_identical_cards_fill_sheet(self):
+        """Des cartes de même taille remplissent une planche en grille."""
+        sheets = pack_rectangles({f'c{i}': (280, 392) for i in range(35)}, max_size=2048, padding=2)
+        self.assertEqual(len(sheets), 1)
+
+    def test_too_large(self):
+        """Une image plus grande qu'une planche est refusée."""
+        with self.assertRaises(ValueError):
+            pack_rectangles({'big': (300, 10)}, max_size=256, padding=0)
+
+    def test_build_atlas_pixels(self):
+        """Chaque quad désigne bien les pixels de son image."""
+        images = {}
+        for i, color in enumerate([(255, 0, 0), (0, 255, 0), (0, 0, 255)]):
+            buffer = io.BytesIO()
+            Image.new('RGB', (30 + i * 10, 20), color).save(buffer, 'PNG')
+            images[f'cards/{i}.png'] = buffer.getvalue()
+        sheet_pngs, quads, _ = build_atlas(images, max_size=128, padding=1)
+        sheet = Image.open(io.BytesIO(sheet_pngs[0]))
+        for name, quad in quads.items():
+            expected = Image.open(io.BytesIO(images[name])).getpixel((0, 0))
+            self.assertEqual(sheet.getpixel((quad['x'], quad['y']))[:3], expected)
+            self.assertEqual(sheet.getpixel((quad['x'] + quad['w'] - 1, quad['y'] + quad['h'] - 1))[:3], expected)
+
+
+class TestAtlasExport(unittest.TestCase):
+    """Tests du mode atlas de l'export de package."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        ensure_db(self.db_path)
+        self.repo = CardRepo(self.db_path)
+        cards = []
+        for i in range(4):
+            img_path = os.path.join(self.temp_dir, f'fond_{i}.png')
+            Image.new('RGB', (100, 140), (i * 60, 80, 160)).save(img_path)
+            card = Card()
+            card.name = f'Carte {i}'
+            card.img = img_path
+            card.description = 'Description'
+            cards.append(card)
+        self.repo.insert_many(cards)
+
+    def tearDown(self):
+        close_connection_manager(self.db_path)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_atlas_package(self):
+        """Le package contient les planches, le chargeur et les quads dans le Lua."""
+        exporter = GamePackageExporter(self.repo, os.path.join(self.temp_dir, 'out'), 'template',
+                                       workers=1, use_render_cache=False,
+                                       atlas=True, atlas_max_size=1024, atlas_padding=2)
+        path = exporter.export_complete_package('pkg')
+        with zipfile.ZipFile(path) as zf:
+            names = set(zf.namelist())
+            lua = zf.read('cards_data.lua').decode('utf-8')
+            atlas_data = zf.read('atlas_data.lua').decode('utf-8')
+        self.assertIn('atlas/sheet_1.png', names)
+        self.assertIn('atlas_loader.lua', names)
+        self.assertFalse(any(name.startswith('cards/') for name in names))
+        self.assertEqual(lua.count('Atlas = { sheet = 1,'), 4)
+        self.assertIn('file = "atlas/sheet_1.png", width = 1024, height = 1024', atlas_data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le cache disque des miniatures
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+
+# Ajouter le chemin lib pour les imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lib'))
+
+from PIL import Image
+
+from thumbnails import ThumbnailCache, THUMBNAIL_WIDTHS
+
+
+class TestThumbnailCache(unittest.TestCase):
+    """Tests de la pyramide de miniatures."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = ThumbnailCache(os.path.join(self.temp_dir, '.thumbs'))
+        self.source = os.path.join(self.temp_dir, 'carte.png')
+        Image.new('RGB', (750, 1050), (30, 90, 150)).save(self.source)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_pyramid_built_once(self):
+        """Un seul décodage produit tous les niveaux ; les appels suivants les réutilisent."""
+        for width in (50, 64, 100, 140, 280, 400):
+            path = self.cache.get_path(self.source, width)
+            with Image.open(path) as thumb:
+                self.assertEqual(thumb.width, self.cache.level_for(width))
+                self.assertEqual(thumb.height, round(1050 * thumb.width / 750))
+        self.assertEqual(self.cache.generated, 1)
+        for level in THUMBNAIL_WIDTHS:
+            self.assertTrue(self.cache.path_for(self.source, level).exists())
+
+    def test_invalidated_by_source_mtime(self):
+        """Une source modifiée régénère ses miniatures."""
+        self.cache.get_path(self.source, 64)
+        Image.new('RGB', (750, 1050), (200, 10, 10)).save(self.source)
+        os.utime(self.source, ns=(1, 1))
+        path = self.cache.get_path(self.source, 64)
+        self.assertEqual(self.cache.generated, 2)
+        with Image.open(path) as thumb:
+            self.assertEqual(thumb.convert('RGB').getpixel((10, 10))[0], 200)
+
+    def test_load_sizes(self):
+        """Taille exacte (grille) ou contenue dans une zone (aperçu)."""
+        exact = self.cache.load(self.source, (120, 160))
+        self.assertEqual(exact.size, (120, 160))
+        fitted = self.cache.load(self.source, (360, 220), keep_ratio=True)
+        self.assertEqual(fitted.height, 220)
+        self.assertLessEqual(fitted.width, 360)
+        self.assertAlmostEqual(fitted.width / fitted.height, 750 / 1050, delta=0.01)
+
+    def test_small_and_transparent_sources(self):
+        """Source plus petite que les niveaux : jamais agrandie ; l'alpha est conservé."""
+        small = os.path.join(self.temp_dir, 'petite.png')
+        Image.new('RGBA', (100, 50), (0, 0, 0, 0)).save(small)
+        with Image.open(self.cache.get_path(small, 280)) as thumb:
+            self.assertEqual(thumb.size, (100, 50))
+            self.assertEqual(thumb.mode, 'RGBA')
+
+    def test_missing_source(self):
+        """Source absente : None, sans erreur."""
+        missing = os.path.join(self.temp_dir, 'absente.png')
+        self.assertIsNone(self.cache.get_path(missing, 64))
+        self.assertIsNone(self.cache.load(missing, (120, 160)))
+
+
+if __name__ == '__main__':
+    unittest.main()